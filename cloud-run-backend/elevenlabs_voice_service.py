@@ -7,17 +7,44 @@ Addresses voice quality, speed, variety, and natural speaker names
 import asyncio
 import aiohttp
 import logging
-from typing import List, Dict, Optional
+import os
+import random
+import threading
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 import io
 import json
 import time
 from google.cloud import secretmanager
 
+from services.mp3_frames import Mp3Format, Mp3Stream, parse_mp3, splice_mp3
+from services.tts_segment_cache import get_tts_segment_cache, tts_segment_key
+from utils.profiling import api_call, profile_phase, record_transfer
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Segment synthesis scheduling: how many TTS requests run at once, how fast
+# new ones may start (0 = no rate limit), and per-segment retry policy.
+ELEVENLABS_MAX_CONCURRENCY = int(os.getenv("ELEVENLABS_MAX_CONCURRENCY", "4"))
+ELEVENLABS_REQUESTS_PER_SECOND = float(os.getenv("ELEVENLABS_REQUESTS_PER_SECOND", "4"))
+ELEVENLABS_SEGMENT_MAX_ATTEMPTS = int(os.getenv("ELEVENLABS_SEGMENT_MAX_ATTEMPTS", "4"))
+ELEVENLABS_RETRY_BASE_DELAY_SECONDS = float(os.getenv("ELEVENLABS_RETRY_BASE_DELAY_SECONDS", "1.0"))
+ELEVENLABS_REQUEST_TIMEOUT_SECONDS = float(os.getenv("ELEVENLABS_REQUEST_TIMEOUT_SECONDS", "120"))
+ELEVENLABS_MODEL_ID = "eleven_multilingual_v2"  # Latest model for best quality
+
+# Local ffmpeg concat: time budget, and where segments are spooled (default: TMPDIR)
+AUDIO_CONCAT_TIMEOUT_SECONDS = float(os.getenv("AUDIO_CONCAT_TIMEOUT_SECONDS", "480"))
+AUDIO_CONCAT_SPOOL_DIR = os.getenv("AUDIO_CONCAT_SPOOL_DIR") or None
+
+# Bumpers are spliced onto the episode by MP3 frame copy; "false" forces the pydub re-encode
+AUDIO_BUMPER_SPLICE = os.getenv("AUDIO_BUMPER_SPLICE", "true").lower() == "true"
+
+# Bumpers re-encoded to an episode's format, keyed by (path, mtime, size, format)
+_normalized_bumpers: Dict[tuple, Mp3Stream] = {}
+_normalized_bumpers_lock = threading.Lock()
+
 @dataclass
 class ElevenLabsVoiceConfig:
     """ElevenLabs voice configuration with natural speaker names"""
@@ -47,6 +74,51 @@ class SynthesisResult:
     speakers_used: List[str]
     quality_metrics: Dict[str, any]
 
+class ElevenLabsAPIError(Exception):
+    """Non-200 response from the ElevenLabs API"""
+
+    def __init__(self, status: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(f"ElevenLabs API error {status}: {message}")
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        # Rate limiting, timeouts and server-side failures are worth another try
+        return self.status in (408, 409, 429) or self.status >= 500
+
+
+class _RequestRateLimiter:
+    """Spaces request starts at least 1/rate seconds apart (rate <= 0 disables)"""
+
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_start - now
+            self._next_start = max(now, self._next_start) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class _LoopHTTPState:
+    """Pooled HTTP session plus the concurrency and rate gates, bound to one event loop"""
+
+    def __init__(self):
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=max(1, ELEVENLABS_MAX_CONCURRENCY), ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=ELEVENLABS_REQUEST_TIMEOUT_SECONDS),
+        )
+        self.synthesis_slots = asyncio.Semaphore(max(1, ELEVENLABS_MAX_CONCURRENCY))
+        self.rate_limiter = _RequestRateLimiter(ELEVENLABS_REQUESTS_PER_SECOND)
+
+
 class ElevenLabsVoiceService:
     """
     Enhanced voice service using ElevenLabs for natural, varied speech
@@ -96,6 +168,11 @@ class ElevenLabsVoiceService:
             )
         }
         
+        # One pooled HTTP session per event loop, reused by every segment request
+        # on that loop (aiohttp sessions can't be shared across loops)
+        self._loop_states: Dict[asyncio.AbstractEventLoop, _LoopHTTPState] = {}
+        self._loop_states_lock = threading.Lock()
+        
         logger.info("✅ ElevenLabs Voice Service initialized with natural speaker names")
     
     def _get_api_key(self) -> str:
@@ -161,8 +238,9 @@ class ElevenLabsVoiceService:
             'correspondent': 'correspondent'
         }
         
-        # Process each segment
-        for i, segment in enumerate(script_segments):
+        # Resolve voices and clean text for each segment
+        requests = []
+        for segment in script_segments:
             speaker_name = segment.get('speaker', 'host').lower()
             content = segment.get('content', '').strip()
             
@@ -176,31 +254,23 @@ class ElevenLabsVoiceService:
             voice_config = self.voice_configs.get(speaker_role, self.voice_configs['host'])
             speakers_used.add(voice_config.speaker_name)
             
-            logger.info(f"🔊 Synthesizing segment {i+1}/{len(script_segments)} ({voice_config.speaker_name})")
-            
             # Clean content for natural speech
-            clean_content = self._preprocess_text_for_natural_speech(content)
-            
-            # Synthesize audio
-            try:
-                audio_data, duration = await self._synthesize_segment(clean_content, voice_config)
-                
-                audio_segment = AudioSegment(
-                    audio_data=audio_data,
-                    duration_seconds=duration,
-                    speaker_name=voice_config.speaker_name,
-                    content=clean_content,
-                    voice_config=voice_config
-                )
-                
-                audio_segments.append(audio_segment)
-                total_duration += duration
-                
-                logger.info(f"✅ Segment complete: {duration:.1f}s ({voice_config.speaker_name})")
-                
-            except Exception as e:
-                logger.error(f"❌ Failed to synthesize segment {i+1}: {e}")
+            requests.append((self._preprocess_text_for_natural_speech(content), voice_config))
+        
+        # Synthesize concurrently; results come back in script order
+        results = await self._synthesize_segments_concurrently(requests)
+        for (clean_content, voice_config), result in zip(requests, results):
+            if result is None:
                 continue
+            audio_data, duration = result
+            audio_segments.append(AudioSegment(
+                audio_data=audio_data,
+                duration_seconds=duration,
+                speaker_name=voice_config.speaker_name,
+                content=clean_content,
+                voice_config=voice_config
+            ))
+            total_duration += duration
         
         # Combine audio segments
         logger.info("🔗 Combining audio segments...")
@@ -479,19 +549,138 @@ class ElevenLabsVoiceService:
         logger.info(f"🔄 Created {len(segments)} multi-voice segments from script")
         return segments
     
+    def _loop_state(self) -> _LoopHTTPState:
+        """Session and gates for the running event loop, created on first use"""
+        loop = asyncio.get_running_loop()
+        with self._loop_states_lock:
+            # Loops that have finished (asyncio.run in another thread, tests) can't
+            # close their sessions any more; forget them instead of leaking them here
+            for stale in [l for l in self._loop_states if l.is_closed()]:
+                logger.warning("⚠️ Dropping ElevenLabs session of a closed event loop")
+                del self._loop_states[stale]
+            state = self._loop_states.get(loop)
+            if state is None or state.session.closed:
+                state = self._loop_states[loop] = _LoopHTTPState()
+        return state
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Pooled HTTP session for the running event loop"""
+        return self._loop_state().session
+    
+    async def close(self) -> None:
+        """Close the pooled HTTP sessions of every event loop"""
+        loop = asyncio.get_running_loop()
+        with self._loop_states_lock:
+            states, self._loop_states = self._loop_states, {}
+        for owner, state in states.items():
+            if state.session.closed:
+                continue
+            if owner is loop:
+                await state.session.close()
+            elif owner.is_running():
+                # A session must be closed on its own loop
+                closing = asyncio.run_coroutine_threadsafe(state.session.close(), owner)
+                await asyncio.wrap_future(closing)
+    
+    @profile_phase("tts_synthesis")
+    async def _synthesize_segments_concurrently(
+        self,
+        requests: List[Tuple[str, ElevenLabsVoiceConfig]]
+    ) -> List[Optional[Tuple[bytes, float]]]:
+        """
+        Synthesize (text, voice) requests concurrently, returning results in request order.
+        
+        Segments already in the TTS segment cache skip the API. The rest share the
+        pooled session and run under the service-wide concurrency
+        (ELEVENLABS_MAX_CONCURRENCY) and rate (ELEVENLABS_REQUESTS_PER_SECOND)
+        limits. Each segment is retried on its own; one that still fails yields None
+        instead of failing the job.
+        """
+        started = time.time()
+        
+        async def run(i: int, text: str, voice_config: ElevenLabsVoiceConfig) -> Optional[Tuple[bytes, float]]:
+            try:
+                audio_data, duration = await self._synthesize_segment_cached(i, text, voice_config)
+                logger.info(f"✅ Segment {i+1}/{len(requests)} complete: {duration:.1f}s ({voice_config.speaker_name})")
+                return audio_data, duration
+            except Exception as e:
+                logger.error(f"❌ Failed to synthesize segment {i+1}: {e}")
+                return None
+        
+        results = await asyncio.gather(*(run(i, text, vc) for i, (text, vc) in enumerate(requests)))
+        logger.info(
+            f"🎙️ Synthesized {sum(r is not None for r in results)}/{len(requests)} segments "
+            f"in {time.time() - started:.1f}s (concurrency {ELEVENLABS_MAX_CONCURRENCY})"
+        )
+        return list(results)
+    
+    def _voice_settings(self, voice_config: ElevenLabsVoiceConfig) -> Dict[str, object]:
+        return {
+            "stability": voice_config.stability,
+            "similarity_boost": voice_config.similarity_boost,
+            "style": voice_config.style,
+            "use_speaker_boost": voice_config.use_speaker_boost
+        }
+    
+    @staticmethod
+    def _estimate_duration(text: str) -> float:
+        # Rough calculation for MP3; more accurate would require audio analysis
+        return len(text.split()) * 0.6  # ~0.6 seconds per word
+    
+    async def _synthesize_segment_cached(
+        self,
+        index: int,
+        text: str,
+        voice_config: ElevenLabsVoiceConfig
+    ) -> Tuple[bytes, float]:
+        """Serve a segment from the TTS segment cache, synthesizing (and storing) it on a miss"""
+        cache = get_tts_segment_cache()
+        if cache is None:
+            return await self._synthesize_segment_with_retry(index, text, voice_config)
+        key = tts_segment_key(text, voice_config.voice_id, ELEVENLABS_MODEL_ID, self._voice_settings(voice_config))
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            return cached, self._estimate_duration(text)
+        audio_data, duration = await self._synthesize_segment_with_retry(index, text, voice_config)
+        await asyncio.to_thread(cache.put, key, audio_data)
+        return audio_data, duration
+    
+    async def _synthesize_segment_with_retry(
+        self,
+        index: int,
+        text: str,
+        voice_config: ElevenLabsVoiceConfig
+    ) -> Tuple[bytes, float]:
+        """_synthesize_segment under the concurrency/rate gates, with backoff on retryable failures"""
+        attempts = max(1, ELEVENLABS_SEGMENT_MAX_ATTEMPTS)
+        for attempt in range(1, attempts + 1):
+            state = self._loop_state()
+            async with state.synthesis_slots:
+                await state.rate_limiter.wait()
+                try:
+                    return await self._synthesize_segment(text, voice_config)
+                except ElevenLabsAPIError as e:
+                    if not e.retryable or attempt == attempts:
+                        raise
+                    error, delay = e, e.retry_after
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if attempt == attempts:
+                        raise
+                    error, delay = e, None
+            # Back off outside the slot so other segments keep going
+            if delay is None:
+                delay = ELEVENLABS_RETRY_BASE_DELAY_SECONDS * (2 ** (attempt - 1)) * (0.5 + random.random())
+            logger.warning(f"⚠️ Segment {index+1} attempt {attempt}/{attempts} failed ({error}); retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+    
     async def _synthesize_segment(self, text: str, voice_config: ElevenLabsVoiceConfig) -> tuple[bytes, float]:
-        """Synthesize a single text segment using ElevenLabs"""
+        """Synthesize a single text segment using ElevenLabs (one request on the pooled session)"""
         
         # Prepare request data
         data = {
             "text": text,
-            "model_id": "eleven_multilingual_v2",  # Latest model for best quality
-            "voice_settings": {
-                "stability": voice_config.stability,
-                "similarity_boost": voice_config.similarity_boost,
-                "style": voice_config.style,
-                "use_speaker_boost": voice_config.use_speaker_boost
-            }
+            "model_id": ELEVENLABS_MODEL_ID,
+            "voice_settings": self._voice_settings(voice_config)
         }
         
         headers = {
@@ -502,20 +691,22 @@ class ElevenLabsVoiceService:
         
         url = f"{self.base_url}/text-to-speech/{voice_config.voice_id}"
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=data, headers=headers) as response:
-                if response.status == 200:
-                    audio_data = await response.read()
-                    
-                    # Estimate duration (rough calculation for MP3)
-                    # More accurate would require audio analysis, but this is sufficient
-                    estimated_duration = len(text.split()) * 0.6  # ~0.6 seconds per word
-                    
-                    return audio_data, estimated_duration
-                else:
-                    error_text = await response.text()
-                    raise Exception(f"ElevenLabs API error {response.status}: {error_text}")
+        session = await self._get_session()
+        async with api_call("elevenlabs"), session.post(url, json=data, headers=headers) as response:
+            if response.status == 200:
+                audio_data = await response.read()
+                record_transfer(up=len(text.encode("utf-8")), down=len(audio_data))
+                return audio_data, self._estimate_duration(text)
+            else:
+                error_text = await response.text()
+                retry_after = response.headers.get("Retry-After")
+                try:
+                    retry_after = float(retry_after) if retry_after else None
+                except ValueError:
+                    retry_after = None
+                raise ElevenLabsAPIError(response.status, error_text, retry_after)
     
+    @profile_phase("audio_concat")
     async def _combine_audio_segments(self, segments: List[bytes]) -> bytes:
         """Combine audio segments into a single audio file using streaming ffmpeg"""
         if not segments:
@@ -541,11 +732,65 @@ class ElevenLabsVoiceService:
             return await self._combine_audio_segments_internal(segments)
     
     async def _combine_audio_segments_streaming(self, segments: List[bytes]) -> bytes:
-        """Combine audio segments using streaming ffmpeg with temporary files (memory efficient)"""
+        """
+        Combine audio segments with a local ffmpeg concat (stream copy, no re-encode)
+        
+        Segments are spooled to a private temp directory and listed in an ffconcat
+        file; ffmpeg copies their MP3 frames into one output without decoding, so
+        memory stays at the inputs plus the output. Nothing leaves the container and
+        concurrent jobs never share paths.
+        """
+        import shutil
+        import tempfile
+        
+        started = time.time()
+        work_dir = tempfile.mkdtemp(prefix="concat_", dir=AUDIO_CONCAT_SPOOL_DIR)
+        try:
+            list_path = os.path.join(work_dir, "segments.ffconcat")
+            with open(list_path, "w") as listing:
+                listing.write("ffconcat version 1.0\n")
+                for i, segment_data in enumerate(segments):
+                    segment_path = os.path.join(work_dir, f"segment_{i:04d}.mp3")
+                    with open(segment_path, "wb") as f:
+                        f.write(segment_data)
+                    listing.write(f"file '{segment_path}'\n")
+            
+            output_path = os.path.join(work_dir, "combined.mp3")
+            process = await asyncio.create_subprocess_exec(
+                "ffmpeg", "-v", "error", "-hide_banner", "-nostdin",
+                "-f", "concat", "-safe", "0", "-i", list_path,
+                "-c", "copy",  # Stream copy: frames are copied, never decoded
+                "-y", output_path,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                _, stderr = await asyncio.wait_for(process.communicate(), timeout=AUDIO_CONCAT_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                raise Exception(f"ffmpeg concat timed out after {AUDIO_CONCAT_TIMEOUT_SECONDS:.0f}s")
+            if process.returncode != 0:
+                raise Exception(f"ffmpeg concat failed ({process.returncode}): {stderr.decode(errors='replace')[-2000:]}")
+            
+            with open(output_path, "rb") as f:
+                combined_audio = f.read()
+            logger.info(f"✅ Local concat of {len(segments)} segments: {len(combined_audio)} bytes in {time.time() - started:.2f}s")
+            return combined_audio
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    
+    async def _combine_audio_segments_via_gcs(self, segments: List[bytes]) -> bytes:
+        """
+        Legacy concat: upload segments to GCS and let ffmpeg fetch them over signed URLs
+        
+        No longer used by _combine_audio_segments; kept as the baseline for
+        scripts/benchmark_audio_concat.py. Segment paths are unique per call.
+        """
         from google.cloud import storage
         import tempfile
         import subprocess
-        import os
+        import uuid
         import psutil
         import gc
         from datetime import timedelta
@@ -560,11 +805,13 @@ class ElevenLabsVoiceService:
         # Upload segments to GCS first
         segment_paths = []
         temp_files = []
+        concat_file_path = output_path = None
+        run_prefix = f"temp_segments/{uuid.uuid4().hex}"
         
         try:
             # Upload each segment to GCS
             for i, segment_data in enumerate(segments):
-                segment_blob_name = f"temp_segments/segment_{i:04d}.mp3"
+                segment_blob_name = f"{run_prefix}/segment_{i:04d}.mp3"
                 blob = bucket.blob(segment_blob_name)
                 
                 # Upload segment
@@ -981,6 +1228,7 @@ class ElevenLabsVoiceService:
         
         return final_buffer.getvalue()
     
+    @profile_phase("bumpers")
     async def add_audio_bumpers(self, main_audio: bytes, intro_path: str, outro_path: str) -> bytes:
         """
         Add intro and outro bumpers to the main audio content
@@ -994,6 +1242,11 @@ class ElevenLabsVoiceService:
         
         logger.info(f"📊 Main audio size: {len(main_audio)} bytes")
         
+        if AUDIO_BUMPER_SPLICE:
+            spliced_audio = await self._splice_audio_bumpers(main_audio, intro_path, outro_path)
+            if spliced_audio is not None:
+                return spliced_audio
+        
         try:
             # Read bumper files
             logger.info(f"📁 Reading intro bumper: {intro_path}")
@@ -1047,6 +1300,56 @@ class ElevenLabsVoiceService:
             logger.warning("⚠️ Returning audio without bumpers")
             return main_audio  # Return original audio if bumpers fail
     
+    def _normalized_bumper(self, path: str, target: Mp3Format) -> Mp3Stream:
+        """Bumper frames in the episode's MP3 format, re-encoded at most once per file and format"""
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, target)
+        with _normalized_bumpers_lock:
+            cached = _normalized_bumpers.get(key)
+        if cached is not None:
+            return cached
+        
+        with open(path, 'rb') as f:
+            bumper = parse_mp3(f.read())
+        if bumper.format != target:
+            from pydub import AudioSegment
+            
+            logger.info(f"🎚️ Normalizing bumper {path} from {bumper.format} to {target}")
+            segment = AudioSegment.from_file(path)
+            segment = segment.set_frame_rate(target.sample_rate).set_channels(target.channels)
+            buffer = io.BytesIO()
+            segment.export(buffer, format="mp3", bitrate=f"{target.bitrate_kbps}k")
+            bumper = parse_mp3(buffer.getvalue())
+        
+        with _normalized_bumpers_lock:
+            _normalized_bumpers[key] = bumper
+        return bumper
+    
+    async def _splice_audio_bumpers(self, main_audio: bytes, intro_path: str, outro_path: str) -> Optional[bytes]:
+        """
+        Join intro + episode + outro by MP3 frame copy, without decoding the episode
+        
+        Returns None when the episode is not constant-bitrate MP3 or a bumper cannot
+        be brought to its format; add_audio_bumpers then uses the PCM path.
+        """
+        try:
+            main_stream = parse_mp3(main_audio)
+            if main_stream.format is None or not main_stream.format.bitrate_kbps:
+                logger.info(f"🔄 Episode audio format {main_stream.format} not spliceable, re-encoding bumpers with pydub")
+                return None
+            intro_stream = await asyncio.to_thread(self._normalized_bumper, intro_path, main_stream.format)
+            outro_stream = await asyncio.to_thread(self._normalized_bumper, outro_path, main_stream.format)
+            final_audio = splice_mp3([intro_stream, main_stream, outro_stream])
+        except Exception as e:
+            logger.warning(f"⚠️ Bumper splice unavailable ({e}), re-encoding with pydub")
+            return None
+        
+        duration = intro_stream.duration_seconds + main_stream.duration_seconds + outro_stream.duration_seconds
+        logger.info(f"📊 Final audio size: {len(final_audio)} bytes")
+        logger.info(f"📊 Final audio duration: {duration * 1000:.0f}ms")
+        logger.info("✅ Audio bumpers spliced without re-encoding")
+        return final_audio
+    
     async def generate_multi_voice_audio_with_bumpers(self, script: str, job_id: str, canonical_filename: str, intro_path: str, outro_path: str, host_voice_id: Optional[str] = None, expert_voice_id: Optional[str] = None) -> str:
         """Generate multi-voice audio with bumpers and upload to GCS"""
         from google.cloud import storage
@@ -1094,12 +1397,10 @@ class ElevenLabsVoiceService:
             # Fallback to single voice
             clean_script = self._preprocess_text_for_natural_speech(script)
             voice_config = self.voice_configs['host']
-            audio_data, duration = await self._synthesize_segment(clean_script, voice_config)
+            audio_data, duration = await self._synthesize_segment_cached(0, clean_script, voice_config)
         else:
-            # Generate audio for each segment with appropriate voice
-            audio_segments = []
-            total_duration = 0.0
-            
+            # Generate audio for each segment with appropriate voice, concurrently
+            requests = []
             for i, segment in enumerate(segments):
                 speaker_role = segment['speaker']
                 content = segment['content']
@@ -1107,16 +1408,12 @@ class ElevenLabsVoiceService:
                 # Get voice config for this speaker
                 voice_config = self.voice_configs.get(speaker_role, self.voice_configs['host'])
                 logger.info(f"🔊 Segment {i+1}: {voice_config.speaker_name} ({speaker_role}) - {len(content)} chars")
-                
-                try:
-                    audio_data, duration = await self._synthesize_segment(content, voice_config)
-                    audio_segments.append(audio_data)
-                    total_duration += duration
-                    logger.info(f"✅ Segment {i+1} generated: {duration:.1f}s")
-                except Exception as e:
-                    logger.error(f"❌ Failed to generate segment {i+1}: {e}")
-                    # Continue with other segments
-                    continue
+                requests.append((content, voice_config))
+            
+            # Failed segments (after per-segment retries) are skipped, as before
+            results = [r for r in await self._synthesize_segments_concurrently(requests) if r is not None]
+            audio_segments = [audio for audio, _ in results]
+            total_duration = sum(duration for _, duration in results)
             
             if not audio_segments:
                 raise Exception("No audio segments were generated successfully")
@@ -1143,8 +1440,10 @@ class ElevenLabsVoiceService:
             # Upload to GCS
             blob_name = f"audio/{canonical_filename}.mp3"
             blob = bucket.blob(blob_name)
-            blob.upload_from_filename(temp_path, content_type="audio/mpeg")
-            blob.make_public()
+            with profile_phase("audio_upload"), api_call("gcs"):
+                blob.upload_from_filename(temp_path, content_type="audio/mpeg")
+                blob.make_public()
+                record_transfer(up=len(audio_with_bumpers))
             
             logger.info(f"✅ Multi-voice audio with bumpers uploaded: {blob.public_url}")
             return blob.public_url
@@ -7,15 +7,17 @@ Handles all admin-related API endpoints including:
 - Episode management
 """
 
+import asyncio
+
 from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from google.cloud import firestore
 
 from utils.logging import structured_logger
 from utils.auth import verify_admin_api_key
 from config.database import db
 from config.constants import EPISODE_COLLECTION_NAME
+from services.podcast_database_snapshot import get_podcast_database_snapshot
 
 router = APIRouter()
 
@@ -183,149 +185,67 @@ async def get_podcast_catalog(admin_auth: bool = Depends(verify_admin_api_key)):
         raise HTTPException(status_code=500, detail="Failed to get catalog")
 
 
+@router.get("/api/admin/embedding-cache")
+async def get_embedding_cache_stats(admin_auth: bool = Depends(verify_admin_api_key)):
+    """Query-embedding cache hit/miss counters and estimated latency saved (this worker)"""
+    from services.embedding_cache import get_embedding_cache
+    return get_embedding_cache().stats()
+
+
+@router.get("/api/admin/tts-segment-cache")
+async def get_tts_segment_cache_stats(admin_auth: bool = Depends(verify_admin_api_key)):
+    """TTS segment cache hit/miss/eviction counters (this worker)"""
+    from services.tts_segment_cache import get_tts_segment_cache
+    cache = get_tts_segment_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
+
+
+@router.get("/api/admin/podcast-job-queue")
+async def get_podcast_job_queue_stats(admin_auth: bool = Depends(verify_admin_api_key)):
+    """Podcast job queue depth per state and this instance's worker pool"""
+    from services.podcast_job_queue import get_podcast_job_queue, get_podcast_job_worker_pool
+    queue = get_podcast_job_queue()
+    if queue is None:
+        raise HTTPException(status_code=503, detail="Podcast job queue is not available")
+    worker_pool = get_podcast_job_worker_pool()
+    return {
+        "backend": queue.backend,
+        "jobs": queue.counts(),
+        "workers": worker_pool.stats() if worker_pool else None,
+    }
+
+
+@router.get("/api/admin/podcast-job-profiles")
+async def get_podcast_job_profiles(limit: int = Query(200, ge=1, le=1000), admin_auth: bool = Depends(verify_admin_api_key)):
+    """p50/p95/max wall time, CPU, peak RSS, bytes and API latency per pipeline phase over recent jobs"""
+    if not db:
+        raise HTTPException(status_code=503, detail="Firestore service is unavailable")
+    from utils.profiling import load_job_profiles, summarize_profiles
+    try:
+        profiles = load_job_profiles(db, limit=limit)
+    except Exception as e:
+        structured_logger.error("Failed to load job profiles", error=str(e))
+        raise HTTPException(status_code=500, detail=f"Failed to load job profiles: {str(e)}")
+    return summarize_profiles(profiles)
+
+
 @router.get("/api/admin/podcasts/database")
-async def get_podcast_database(admin_auth: bool = Depends(verify_admin_api_key)):
-    """Get comprehensive podcast database with all episodes - ordered by newest first"""
+async def get_podcast_database(
+    refresh: bool = Query(False, description="Rebuild the snapshot instead of refreshing it incrementally"),
+    admin_auth: bool = Depends(verify_admin_api_key),
+):
+    """Get comprehensive podcast database with all episodes - ordered by newest first
+
+    Served from an in-memory snapshot (services/podcast_database_snapshot.py)
+    that is built with one audio listing and batched subscriber reads, then
+    refreshed from episodes and jobs updated since the last load.
+    """
     if not db:
         raise HTTPException(status_code=503, detail="Firestore service is unavailable")
     
     try:
-        from google.cloud import storage
-        from config.constants import EPISODE_BASE_URL
-        from urllib.parse import urlparse
-        
-        podcasts_by_id = {}
-        
-        # First, get all episodes (ordered by created_at DESCENDING - newest first)
-        episodes_query = db.collection(EPISODE_COLLECTION_NAME).order_by('created_at', direction=firestore.Query.DESCENDING).stream()
-        
-        for episode_doc in episodes_query:
-            episode_data = episode_doc.to_dict() or {}
-            canonical = episode_doc.id
-            
-            if canonical and canonical not in podcasts_by_id:
-                # Get subscriber info
-                subscriber_id = episode_data.get('subscriber_id', '')
-                subscriber_email = episode_data.get('subscriber_email', 'Unknown')
-                if subscriber_id and subscriber_email == 'Unknown':
-                    subscriber_doc = db.collection('subscribers').document(subscriber_id).get()
-                    if subscriber_doc.exists:
-                        subscriber_email = subscriber_doc.to_dict().get('email', 'Unknown')
-                
-                # Extract duration
-                duration = episode_data.get('duration') or 'Unknown'
-                audio_url = episode_data.get('audio_url', '')
-                
-                # Get file size from GCS if possible
-                file_size_display = 'Unknown'
-                if audio_url:
-                    try:
-                        storage_client = storage.Client()
-                        bucket_name = 'regal-scholar-453620-r7-podcast-storage'
-                        bucket = storage_client.bucket(bucket_name)
-                        
-                        # Extract blob name from URL
-                        parsed_url = urlparse(audio_url)
-                        blob_name = parsed_url.path.lstrip('/')
-                        if blob_name.startswith(bucket_name + '/'):
-                            blob_name = blob_name[len(bucket_name) + 1:]
-                        
-                        blob = bucket.blob(blob_name)
-                        if blob.exists():
-                            size_bytes = blob.size or 0
-                            if size_bytes > 0:
-                                size_mb = size_bytes / (1024 * 1024)
-                                file_size_display = f"{size_mb:.1f} MB"
-                    except Exception:
-                        pass  # Keep as Unknown if we can't get size
-                
-                # Get created_at (prioritize episode's created_at)
-                created_at = episode_data.get('created_at') or episode_data.get('generated_at') or ''
-                
-                # Get category from episode or extract from canonical
-                category = episode_data.get('category', '')
-                if not category and canonical:
-                    parts = canonical.split('-')
-                    if len(parts) >= 2:
-                        cat_map = {'bio': 'Biology', 'chem': 'Chemistry', 'compsci': 'Computer Science', 
-                                  'math': 'Mathematics', 'phys': 'Physics'}
-                        cat_slug = parts[1] if len(parts) > 1 else ''
-                        category = cat_map.get(cat_slug, '')
-                
-                podcasts_by_id[canonical] = {
-                    'canonical_filename': canonical,
-                    'podcast_id': canonical,  # For compatibility
-                    'id': canonical,  # For compatibility
-                    'title': episode_data.get('title', 'Untitled'),
-                    'subscriber_email': subscriber_email,
-                    'subscriber_id': subscriber_id,
-                    'duration': duration,
-                    'file_size_display': file_size_display,
-                    'created_at': created_at,
-                    'submitted_to_rss': episode_data.get('submitted_to_rss', False),
-                    'in_rss': episode_data.get('submitted_to_rss', False),  # Alias
-                    'category': category,
-                    'episode_page_url': f"{EPISODE_BASE_URL}/{canonical}",
-                    'episode_json_url': f"{EPISODE_BASE_URL}/{canonical}.json",
-                    'source': 'episodes'
-                }
-        
-        # Also check podcast_jobs for any missing podcasts (backup)
-        jobs_query = db.collection('podcast_jobs').stream()
-        for job_doc in jobs_query:
-            job_data = job_doc.to_dict() or {}
-            result = job_data.get('result', {})
-            canonical = result.get('canonical_filename')
-            
-            if canonical and canonical not in podcasts_by_id:
-                # This podcast exists in jobs but not episodes - include it
-                subscriber_id = job_data.get('subscriber_id', '')
-                subscriber_email = 'Unknown'
-                if subscriber_id:
-                    subscriber_doc = db.collection('subscribers').document(subscriber_id).get()
-                    if subscriber_doc.exists:
-                        subscriber_email = subscriber_doc.to_dict().get('email', 'Unknown')
-                
-                podcasts_by_id[canonical] = {
-                    'canonical_filename': canonical,
-                    'podcast_id': canonical,
-                    'id': canonical,
-                    'title': result.get('title') or job_data.get('request', {}).get('topic', 'Untitled'),
-                    'subscriber_email': subscriber_email,
-                    'subscriber_id': subscriber_id,
-                    'duration': result.get('duration') or job_data.get('request', {}).get('duration', 'Unknown'),
-                    'file_size_display': 'Unknown',
-                    'created_at': job_data.get('created_at') or job_data.get('updated_at') or '',
-                    'submitted_to_rss': job_data.get('submitted_to_rss', False),
-                    'in_rss': job_data.get('submitted_to_rss', False),
-                    'category': job_data.get('request', {}).get('category', ''),
-                    'episode_page_url': f"{EPISODE_BASE_URL}/{canonical}",
-                    'episode_json_url': f"{EPISODE_BASE_URL}/{canonical}.json",
-                    'source': 'podcast_jobs'
-                }
-        
-        # Convert to list and sort by created_at (newest first)
-        podcasts_list = list(podcasts_by_id.values())
-        
-        # Sort with proper date handling - newest podcasts first
-        def get_sort_key(podcast):
-            timestamp = (
-                podcast.get('created_at') or 
-                ''
-            )
-            
-            if not timestamp:
-                return ''  # Will sort last
-            
-            if isinstance(timestamp, str):
-                timestamp = timestamp.replace('+00:00', '').replace('Z', '')
-                return timestamp
-            
-            if hasattr(timestamp, 'isoformat'):
-                return timestamp.isoformat()
-            return str(timestamp)
-        
-        podcasts_list.sort(key=get_sort_key, reverse=True)
+        snapshot = get_podcast_database_snapshot()
+        podcasts_list = await asyncio.to_thread(snapshot.podcasts, refresh)
         
         structured_logger.info("Podcast database retrieved",
                               total_count=len(podcasts_list),
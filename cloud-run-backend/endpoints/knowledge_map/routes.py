@@ -9,11 +9,11 @@ Licensed under MIT License
 
 from fastapi import APIRouter, HTTPException, Query
 from typing import Optional, List
-from datetime import datetime
 import json
 
 from services.knowledge_map_service import get_knowledge_map_service
 from services.knowledge_map_queries import get_query_service
+from services.knowledge_graph_snapshots import get_graph_snapshot_store
 from utils.logging import structured_logger
 from config.database import db as firestore_db
 
@@ -42,7 +42,9 @@ async def get_knowledge_graph(
     Get the full knowledge graph.
     
     Returns nodes and edges for visualization.
-    Caches the graph in memory for faster subsequent requests.
+    Built graphs are snapshotted per filter combination and data version, so
+    repeated views (including filtered ones) skip Firestore entirely;
+    force_rebuild=true bypasses the snapshot and replaces it.
     """
     try:
         service = get_knowledge_map_service()
@@ -52,67 +54,8 @@ async def get_knowledge_graph(
         disciplines_list = disciplines.split(',') if disciplines else None
         sources_list = sources.split(',') if sources else None
         
-        # Check if any filters are present - if so, force rebuild
-        has_filters = any([
-            content_types_list,
-            disciplines_list,
-            sources_list,
-            date_start,
-            date_end,
-            keyword,
-            question,
-            process_family,
-        ])
-        
-        # Always clear cache and rebuild when filters are present or force_rebuild is True
-        # This ensures we get fresh data matching the filters
-        if force_rebuild or has_filters:
-            structured_logger.info("Clearing cache and rebuilding graph due to filters or force_rebuild",
-                                 has_filters=has_filters,
-                                 force_rebuild=force_rebuild,
-                                 filters={
-                                     'content_types': content_types_list,
-                                     'disciplines': disciplines_list,
-                                     'sources': sources_list,
-                                     'date_start': date_start,
-                                     'date_end': date_end,
-                                     'keyword': keyword,
-                                     'question': question,
-                                     'process_family': process_family,
-                                 })
-            service.clear_cache()
-        elif service.nodes and len(service.nodes) > 0:
-            # Only use cached graph if no filters and not forcing rebuild
-            structured_logger.info("Using cached knowledge graph", 
-                                 node_count=len(service.nodes),
-                                 edge_count=len(service.edges))
-            # Export existing graph
-            if format == "raw":
-                graph = {
-                    'nodes': list(service.nodes.values()),
-                    'edges': service.edges,
-                    'metadata': {
-                        'papers': sum(1 for n in service.nodes.values() if n.get('type') == 'paper'),
-                        'concepts': sum(1 for n in service.nodes.values() if n.get('type') == 'concept'),
-                        'relationships': len(service.edges),
-                        'built_at': datetime.now().isoformat(),
-                        'cached': True
-                    }
-                }
-                return graph
-            else:
-                export_data = service.export_for_visualization(format=format)
-                export_data['metadata'] = {
-                    'papers': sum(1 for n in service.nodes.values() if n.get('type') == 'paper'),
-                    'concepts': sum(1 for n in service.nodes.values() if n.get('type') == 'concept'),
-                    'relationships': len(service.edges),
-                    'built_at': datetime.now().isoformat(),
-                    'cached': True
-                }
-                return export_data
-        
-        # Build new graph with filters
-        graph = await service.build_graph(
+        graph = await service.get_or_build_graph(
+            force_rebuild=force_rebuild,
             max_papers=max_papers,
             include_concepts=include_concepts,
             include_similarity=include_similarity,
@@ -153,22 +96,17 @@ async def get_subgraph(
     try:
         service = get_knowledge_map_service()
         
-        # Build graph first if not already built
-        if not service.nodes:
-            await service.build_graph(max_papers=1000)  # Build with reasonable limit
+        await service.get_or_build_graph(max_papers=1000)  # Build with reasonable limit
         
         subgraph = service.get_subgraph(paper_id, depth=depth, max_nodes=max_nodes)
         
-        # Export for visualization
-        export_data = service.export_for_visualization(format="cytoscape")
-        
-        # Filter to only subgraph nodes and edges
-        subgraph_node_ids = {n['id'] for n in subgraph['nodes']}
-        filtered_nodes = [n for n in export_data['nodes'] if n['data']['id'] in subgraph_node_ids]
-        filtered_edges = [
-            e for e in export_data['edges']
-            if e['data']['source'] in subgraph_node_ids and e['data']['target'] in subgraph_node_ids
-        ]
+        # Export only the subgraph nodes and the edges between them
+        export_data = service.export_for_visualization(
+            format="cytoscape",
+            node_ids=[n['id'] for n in subgraph['nodes']],
+        )
+        filtered_nodes = export_data['nodes']
+        filtered_edges = export_data['edges']
         
         return {
             'nodes': filtered_nodes,
@@ -206,23 +144,24 @@ async def get_knowledge_map_stats():
         except Exception as e:
             structured_logger.warning("Failed to count research_papers for knowledge-map stats", error=str(e))
 
-        # Try to use cached knowledge map if available
+        # Most recently served graph snapshot on this worker, if any
         try:
-            service = get_knowledge_map_service()
-            if service.nodes and len(service.nodes) > 0:
-                papers = sum(1 for n in service.nodes.values() if n.get('type') == 'paper')
-                concepts = sum(1 for n in service.nodes.values() if n.get('type') == 'concept')
+            snapshot_store = get_graph_snapshot_store()
+            snapshot = snapshot_store.latest()
+            if snapshot is not None:
+                papers = sum(1 for n in snapshot.nodes.values() if n.get('type') == 'paper')
+                concepts = sum(1 for n in snapshot.nodes.values() if n.get('type') == 'concept')
                 return {
                     'papers': papers,
                     'concepts': concepts,
-                    'nodes': len(service.nodes),
-                    'edges': len(service.edges),
+                    'nodes': len(snapshot.nodes),
+                    'edges': len(snapshot.edges),
                     'cached': True,
                     'papers_total_in_firestore': papers_total,
+                    'snapshots': snapshot_store.stats(),
                 }
         except Exception as e:
-            # If the knowledge map service can't initialize (e.g. Vertex disabled), that's fine.
-            structured_logger.info("Knowledge map service unavailable for stats; returning Firestore-only baseline", error=str(e))
+            structured_logger.info("Knowledge graph snapshots unavailable for stats; returning Firestore-only baseline", error=str(e))
 
         return {
             'papers': 0,
@@ -248,9 +187,7 @@ async def query_papers_by_concept(
     try:
         service = get_knowledge_map_service()
         
-        # Build graph if not already built
-        if not service.nodes:
-            await service.build_graph(max_papers=1000)
+        await service.get_or_build_graph(max_papers=1000)
         
         query_service = get_query_service(service)
         papers = query_service.find_papers_by_concept(concept, limit=limit)
@@ -277,8 +214,7 @@ async def query_path(
     try:
         service = get_knowledge_map_service()
         
-        if not service.nodes:
-            await service.build_graph(max_papers=1000)
+        await service.get_or_build_graph(max_papers=1000)
         
         query_service = get_query_service(service)
         path = query_service.find_path(source, target, max_depth=max_depth, relationship_types=relationship_types)
@@ -315,8 +251,7 @@ async def query_related_papers(
     try:
         service = get_knowledge_map_service()
         
-        if not service.nodes:
-            await service.build_graph(max_papers=1000)
+        await service.get_or_build_graph(max_papers=1000)
         
         query_service = get_query_service(service)
         related = query_service.find_related_papers(
@@ -346,8 +281,7 @@ async def query_search_papers(
     try:
         service = get_knowledge_map_service()
         
-        if not service.nodes:
-            await service.build_graph(max_papers=1000)
+        await service.get_or_build_graph(max_papers=1000)
         
         query_service = get_query_service(service)
         results = query_service.search_papers(q, limit=limit)
@@ -372,8 +306,7 @@ async def query_paper_cluster(
     try:
         service = get_knowledge_map_service()
         
-        if not service.nodes:
-            await service.build_graph(max_papers=1000)
+        await service.get_or_build_graph(max_papers=1000)
         
         query_service = get_query_service(service)
         cluster = query_service.get_paper_cluster(paper_id, min_cluster_size=min_cluster_size)
@@ -1,5 +1,7 @@
 """Research papers endpoints"""
 
+import asyncio
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
@@ -113,7 +115,28 @@ async def upload_research_paper(paper_request: PaperUploadRequest):
         
         # Store in Firestore
         db.collection('research_papers').document(paper_id).set(paper_dict)
-        
+
+        # Keep the keyword-fallback index current (no-op when none is configured);
+        # the store's background flush persists it
+        try:
+            from mcp_server.utils.keyword_index import get_keyword_index_store
+            keyword_store = get_keyword_index_store()
+            if keyword_store is not None:
+                await asyncio.to_thread(keyword_store.index_documents, 'research_papers', [(paper_id, paper_dict)])
+        except Exception as e:
+            structured_logger.warning("Failed to update keyword index for paper (non-blocking)",
+                                     paper_id=paper_id,
+                                     error=str(e))
+
+        # Let persisted knowledge-map snapshots pick the paper up incrementally
+        try:
+            from services.knowledge_graph_changes import record_graph_changes
+            record_graph_changes(db, 'research_papers', [paper_id])
+        except Exception as e:
+            structured_logger.warning("Failed to record knowledge graph change for paper (non-blocking)",
+                                     paper_id=paper_id,
+                                     error=str(e))
+
         structured_logger.info("Paper uploaded",
                               paper_id=paper_id,
                               paper_title=paper.title)
@@ -9,6 +9,7 @@ from utils.logging import structured_logger
 from config.database import db
 from utils.subscriber_helpers import resolve_generation_subscriber_id
 from models.podcast import PodcastRequest, ResolvePaperRequest, GeneratePodcastFromPaperRequest
+from services.podcast_job_queue import get_podcast_job_queue, get_podcast_job_worker_pool
 from services.paper_resolver import (
     resolve_paper,
     get_paper_by_id,
@@ -22,15 +23,24 @@ from services.paper_resolver import (
 router = APIRouter()
 
 
-def _get_service():
-    """Get podcast generation service from main module"""
-    # Lazy import to avoid circular dependencies
-    # Service is initialized in main.py before routers are registered
-    import sys
-    main_module = sys.modules.get('main')
-    if main_module:
-        return getattr(main_module, 'podcast_generation_service', None)
-    return None
+def _enqueue_podcast_job(job_id: str, job_data: dict) -> None:
+    """Hand a created podcast_jobs entry to the job queue; a worker runs the pipeline."""
+    queue = get_podcast_job_queue()
+    if not queue:
+        raise HTTPException(status_code=503, detail="Podcast job queue is not available")
+    try:
+        queue.enqueue(job_id, job_data)
+    except Exception as e:
+        db.collection('podcast_jobs').document(job_id).update({
+            'status': 'failed',
+            'error': f"Failed to enqueue job: {e}",
+            'updated_at': datetime.utcnow().isoformat()
+        })
+        raise HTTPException(status_code=500, detail=f"Failed to enqueue podcast job: {e}")
+    worker_pool = get_podcast_job_worker_pool()
+    if worker_pool:
+        worker_pool.notify()
+    structured_logger.info("Podcast job queued", job_id=job_id, backend=queue.backend)
 
 
 @router.post("/generate-podcast")
@@ -75,47 +85,9 @@ async def generate_podcast(request: PodcastRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create job in Firestore: {e}")
     
-    # Run podcast generation synchronously (not as background task)
-    # This fixes the issue where background tasks don't execute in Cloud Run
-    try:
-        structured_logger.info("Starting synchronous podcast generation", 
-                              job_id=job_id,
-                              topic=request.topic)
-        
-        service = _get_service()
-        if not service:
-            raise HTTPException(status_code=503, detail="Podcast generation service is not available")
-        
-        await service.run_podcast_generation_job(
-            job_id, request, subscriber_id=subscriber_id
-        )
-        
-        # Get final status
-        job_doc = db.collection('podcast_jobs').document(job_id).get()
-        if job_doc.exists:
-            job_data = job_doc.to_dict()
-            return {
-                "job_id": job_id, 
-                "status": job_data.get('status', 'completed'),
-                "result": job_data.get('result')
-            }
-        
-        return {"job_id": job_id, "status": "completed"}
-        
-    except Exception as e:
-        structured_logger.error("Podcast generation failed", 
-                              job_id=job_id,
-                              error=str(e))
-        
-        # Update job status to failed
-        job_ref = db.collection('podcast_jobs').document(job_id)
-        job_ref.update({
-            'status': 'failed',
-            'error': str(e),
-            'updated_at': datetime.utcnow().isoformat()
-        })
-        
-        raise HTTPException(status_code=500, detail=f"Podcast generation failed: {str(e)}")
+    # Generation runs on the job queue's worker pool; poll /status/{job_id}
+    _enqueue_podcast_job(job_id, job_data)
+    return {"job_id": job_id, "status": "queued", "status_url": f"/status/{job_id}"}
 
 
 @router.post("/generate-podcast-with-subscriber")
@@ -173,47 +145,9 @@ async def generate_podcast_with_subscriber(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create job in Firestore: {e}")
     
-    # Run the same podcast generation logic as the original endpoint
-    try:
-        structured_logger.info("Starting synchronous podcast generation with subscriber", 
-                              job_id=job_id,
-                              subscriber_id=subscriber_id,
-                              topic=request.topic)
-        
-        service = _get_service()
-        if not service:
-            raise HTTPException(status_code=503, detail="Podcast generation service is not available")
-        
-        await service.run_podcast_generation_job(job_id, request, subscriber_id)
-        
-        # Get final status
-        job_doc = db.collection('podcast_jobs').document(job_id).get()
-        if job_doc.exists:
-            job_data = job_doc.to_dict()
-            return {
-                "job_id": job_id, 
-                "status": job_data.get('status', 'completed'),
-                "result": job_data.get('result'),
-                "subscriber_id": subscriber_id
-            }
-        
-        return {"job_id": job_id, "status": "completed", "subscriber_id": subscriber_id}
-        
-    except Exception as e:
-        structured_logger.error("Podcast generation failed",
-                              job_id=job_id,
-                              subscriber_id=subscriber_id,
-                              error=str(e))
-
-        # Update job status to failed
-        job_ref = db.collection('podcast_jobs').document(job_id)
-        job_ref.update({
-            'status': 'failed',
-            'error': str(e),
-            'updated_at': datetime.utcnow().isoformat()
-        })
-
-        raise HTTPException(status_code=500, detail=f"Podcast generation failed: {str(e)}")
+    # Generation runs on the job queue's worker pool; poll /status/{job_id}
+    _enqueue_podcast_job(job_id, job_data)
+    return {"job_id": job_id, "status": "queued", "status_url": f"/status/{job_id}", "subscriber_id": subscriber_id}
 
 
 def _paper_preview(paper: dict) -> dict:
@@ -353,30 +287,40 @@ async def generate_podcast_from_paper(request: GeneratePodcastFromPaperRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create job in Firestore: {e}")
 
-    try:
-        service = _get_service()
-        if not service:
-            raise HTTPException(status_code=503, detail="Podcast generation service is not available")
+    _enqueue_podcast_job(job_id, job_data)
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/status/{job_id}",
+        "source_paper_id": paper.get("paper_id"),
+        "subscriber_id": subscriber_id,
+    }
 
-        await service.run_podcast_generation_job(job_id, podcast_request, subscriber_id=subscriber_id)
 
-        job_doc = db.collection("podcast_jobs").document(job_id).get()
-        if job_doc.exists:
-            job_data = job_doc.to_dict()
-            return {
-                "job_id": job_id,
-                "status": job_data.get("status", "completed"),
-                "result": job_data.get("result"),
-                "source_paper_id": paper.get("paper_id"),
-                "subscriber_id": subscriber_id,
-            }
-        return {"job_id": job_id, "status": "completed", "source_paper_id": paper.get("paper_id"), "subscriber_id": subscriber_id}
+@router.post("/retry-podcast/{job_id}")
+async def retry_podcast(job_id: str):
+    """Requeue a failed podcast job. It resumes from its last checkpointed phase,
+    so research, script and audio that already succeeded are not paid for again."""
+    if not db:
+        raise HTTPException(status_code=503, detail="Firestore service is unavailable. Cannot retry job.")
 
-    except Exception as e:
-        structured_logger.error("Paper-sourced podcast generation failed", job_id=job_id, error=str(e))
-        db.collection("podcast_jobs").document(job_id).update({
-            "status": "failed",
-            "error": str(e),
-            "updated_at": datetime.utcnow().isoformat(),
-        })
-        raise HTTPException(status_code=500, detail=f"Podcast generation failed: {str(e)}")
+    job_ref = db.collection("podcast_jobs").document(job_id)
+    job_doc = job_ref.get()
+    if not job_doc.exists:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    job_data = job_doc.to_dict() or {}
+    if job_data.get("status") != "failed":
+        raise HTTPException(
+            status_code=409,
+            detail=f"Only failed jobs can be retried (status is {job_data.get('status')!r})",
+        )
+
+    job_ref.update({
+        "status": "pending",
+        "retry_count": int(job_data.get("retry_count") or 0) + 1,
+        "last_error": job_data.get("error"),
+        "updated_at": datetime.utcnow().isoformat(),
+    })
+    structured_logger.info("Podcast job retry requested", job_id=job_id, previous_error=job_data.get("error"))
+    _enqueue_podcast_job(job_id, job_data)
+    return {"job_id": job_id, "status": "queued", "status_url": f"/status/{job_id}"}
@@ -11,6 +11,7 @@ from utils.logging import structured_logger
 from utils.auth import verify_admin_api_key
 from utils.step_tracking import with_step
 from config.database import db
+from services.podcast_job_queue import get_podcast_job_queue
 
 # Import the PodcastRequest model from models (avoid circular import)
 from models.podcast import PodcastRequest
@@ -96,11 +97,20 @@ async def debug_content_generation(
 
 @router.post("/debug/watchdog")
 async def debug_watchdog(admin_auth: bool = Depends(verify_admin_api_key)):
-    """Watchdog endpoint to check for stuck jobs and mark them as failed (Admin only)"""
+    """
+    Watchdog endpoint to check for stuck jobs and mark them as failed (Admin only)
+    
+    Queued jobs are covered by job-queue leases: workers reclaim a job whose
+    lease lapsed without any polling. This sweeps expired leases on demand and
+    still fails stuck jobs created before the queue (no queue_state).
+    """
     try:
         if not db:
             return {"status": "error", "message": "Firestore not available"}
         
+        queue = get_podcast_job_queue()
+        recovered_leases = queue.recover_expired() if queue else []
+        
         # Find jobs stuck in generating_content for more than 15 minutes
         cutoff_time = datetime.utcnow() - timedelta(minutes=15)
         
@@ -114,6 +124,8 @@ async def debug_watchdog(admin_auth: bool = Depends(verify_admin_api_key)):
         for job in stuck_jobs:
             job_id = job.id
             job_data = job.to_dict()
+            if job_data.get('queue_state'):
+                continue  # Lease-managed
             
             structured_logger.warning("Found stuck job, marking as failed", 
                                      job_id=job_id,
@@ -139,6 +151,7 @@ async def debug_watchdog(admin_auth: bool = Depends(verify_admin_api_key)):
             "status": "success",
             "stuck_jobs_found": len(results),
             "jobs": results,
+            "recovered_leases": recovered_leases,
             "timestamp": datetime.utcnow().isoformat()
         }
         
@@ -1,14 +1,21 @@
 """Public and episode endpoints"""
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from typing import Optional
-from datetime import datetime
+import asyncio
 import re
 import traceback
 
 from google.cloud import firestore
 from google.cloud import storage
 
+from services.episode_search_index import EpisodeSearchIndex, get_episode_search_store, parse_query
+from services.public_episode_listing import (
+    build_listing_entries,
+    episode_sort_ts,
+    get_public_episode_listing,
+    public_podcast_payload,
+)
 from utils.logging import structured_logger
 from config.database import db
 from config.constants import (
@@ -21,92 +28,78 @@ from config.constants import (
 router = APIRouter()
 
 
-def _public_podcast_payload(episode) -> dict:
-    data = episode.to_dict() or {}
-    return {
-        'episode_id': episode.id,
-        'title': data.get('title', 'Untitled'),
-        'category': data.get('category', 'Unknown'),
-        'category_slug': data.get('category_slug'),
-        'expertise_level': data.get('request', {}).get('expertise_level', 'intermediate'),
-        'duration': data.get('duration', '5-10 minutes'),
-        'created_at': data.get('generated_at', data.get('created_at', '')),
-        'status': 'published',
-        'creator_attribution': data.get('creator_attribution'),
-        'summary': data.get('summary'),
-        'audio_url': data.get('audio_url'),
-        'thumbnail_url': data.get('thumbnail_url'),
-        'episode_link': data.get('episode_link'),
-        'submitted_to_rss': bool(data.get('submitted_to_rss')),
-        'visible_on_web': bool(data.get('visible_on_web') or data.get('submitted_to_rss')),
-        'animation_player_url': data.get('animation_player_url'),
-    }
+def _scan_public_podcasts(category_slug: Optional[str], limit: int) -> list:
+    """Public episodes straight from the catalog (used until the listing is bootstrapped)."""
+    seen_ids = set()
+    podcast_list = []
+    for field, field_limit in (('submitted_to_rss', limit * 2), ('visible_on_web', limit)):
+        query = db.collection(EPISODE_COLLECTION_NAME).where(field, '==', True)
+        if category_slug:
+            query = query.where('category_slug', '==', category_slug)
+        for episode in query.limit(field_limit).stream():
+            if episode.id not in seen_ids:
+                seen_ids.add(episode.id)
+                podcast_list.append(public_podcast_payload(episode.id, episode.to_dict() or {}))
+    podcast_list.sort(key=lambda ep: episode_sort_ts(ep.get('created_at')), reverse=True)
+    return podcast_list[:limit]
+
+
+def _bootstrapped_listing():
+    """The public episode listing, bootstrapping it from the catalog on first use."""
+    listing = get_public_episode_listing()
+    if listing is None:
+        return None
+    if not listing.is_bootstrapped():
+        listing.bootstrap(build_listing_entries(db, EPISODE_COLLECTION_NAME))
+    return listing
 
 
 @router.get("/api/public/podcasts")
-async def get_public_podcasts(category: Optional[str] = None, limit: int = 500):
-    """Get podcasts shown on the public website.
+async def get_public_podcasts(
+    request: Request,
+    response: Response,
+    category: Optional[str] = None,
+    limit: int = 500,
+    cursor: Optional[str] = None,
+):
+    """Get podcasts shown on the public website, newest first.
 
     Includes RSS-published episodes and website-only episodes
     (`visible_on_web=true`, not necessarily in the Spotify/Apple feed).
+    Served from the materialized public episode listing: pass `next_cursor`
+    back as `cursor` for the next page; the ETag changes whenever the listing
+    does, so clients can revalidate with If-None-Match.
     """
     if not db:
         raise HTTPException(status_code=503, detail="Firestore service is unavailable")
     
     try:
         category_slug = _category_value_to_slug(category) if category else None
-        query = db.collection(EPISODE_COLLECTION_NAME).where('submitted_to_rss', '==', True)
-        if category_slug:
-            query = query.where('category_slug', '==', category_slug)
-        
         # Cap limit at 1000 to prevent excessive queries
-        limit = min(limit, 1000)
+        limit = max(1, min(limit, 1000))
         
-        # Get episodes without ordering (Firestore requires index for filtered + ordered queries)
-        # We'll sort in Python instead
-        seen_ids = set()
-        podcast_list = []
-        for episode in query.limit(limit * 2).stream():
-            seen_ids.add(episode.id)
-            podcast_list.append(_public_podcast_payload(episode))
-
-        # Website-only episodes are public on copernicusai.fyi but not in RSS.
-        web_query = db.collection(EPISODE_COLLECTION_NAME).where('visible_on_web', '==', True)
-        if category_slug:
-            web_query = web_query.where('category_slug', '==', category_slug)
-        for episode in web_query.limit(limit).stream():
-            if episode.id not in seen_ids:
-                seen_ids.add(episode.id)
-                podcast_list.append(_public_podcast_payload(episode))
-        
-        # Sort by generated_at in Python (descending - newest first)
-        def get_sort_key(ep):
-            gen_at = ep.get('created_at', '')
-            # Handle datetime objects
-            if isinstance(gen_at, datetime):
-                return gen_at
-            # Convert string dates to datetime for proper comparison
-            if isinstance(gen_at, str):
-                try:
-                    # Try parsing common formats
-                    for fmt in ['%Y-%m-%dT%H:%M:%S', '%a, %d %b %Y %H:%M:%S %Z', '%Y-%m-%d']:
-                        try:
-                            if 'T' in gen_at:
-                                # ISO format with time
-                                return datetime.fromisoformat(gen_at.replace('Z', '+00:00')[:19])
-                            else:
-                                # Try format string
-                                return datetime.strptime(gen_at[:19], fmt)
-                        except:
-                            continue
-                except:
-                    pass
-            # Fallback: use string comparison or very old date
-            return datetime.min if isinstance(gen_at, str) and gen_at else datetime.min
+        next_cursor = None
+        try:
+            listing = await asyncio.to_thread(_bootstrapped_listing)
+        except Exception as e:
+            structured_logger.warning("Public episode listing unavailable, scanning catalog",
+                                     error=str(e))
+            listing = None
         
-        podcast_list.sort(key=get_sort_key, reverse=True)
-        # Limit after sorting
-        podcast_list = podcast_list[:limit]
+        if listing is not None:
+            try:
+                version, podcast_list, next_cursor = await asyncio.to_thread(
+                    listing.page, category_slug, limit, cursor
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            etag = f'W/"public-podcasts-{version}"'
+            if request.headers.get("if-none-match") == etag:
+                return Response(status_code=304, headers={"ETag": etag})
+            response.headers["ETag"] = etag
+            response.headers["Cache-Control"] = "no-cache"
+        else:
+            podcast_list = await asyncio.to_thread(_scan_public_podcasts, category_slug, limit)
         
         structured_logger.info("Found published podcasts from episode catalog",
                               podcast_count=len(podcast_list),
@@ -115,9 +108,12 @@ async def get_public_podcasts(category: Optional[str] = None, limit: int = 500):
         return {
             "podcasts": podcast_list,
             "total_count": len(podcast_list),
-            "category_filter": category_slug or category
+            "category_filter": category_slug or category,
+            "next_cursor": next_cursor
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         error_trace = traceback.format_exc()
         structured_logger.error("Error fetching public podcasts",
@@ -165,6 +161,51 @@ async def list_episode_catalog(
         raise HTTPException(status_code=500, detail="Failed to list episodes")
 
 
+def _search_result_payload(episode_id: str, data: dict) -> dict:
+    """An episode document as returned by /api/episodes/search."""
+    payload = data.copy()
+    payload['episode_id'] = episode_id
+    
+    # Ensure episode_link is set (construct if missing)
+    if not payload.get('episode_link') and payload.get('slug'):
+        payload['episode_link'] = f"{EPISODE_BASE_URL}/{payload.get('slug')}"
+    elif not payload.get('episode_link') and payload.get('episode_id'):
+        payload['episode_link'] = f"{EPISODE_BASE_URL}/{payload.get('episode_id')}"
+    
+    # Ensure audio_url is included (use audio_url field)
+    if not payload.get('audio_url'):
+        # Try alternative field names
+        payload['audio_url'] = data.get('audioUrl') or data.get('audio_url') or ''
+    
+    # Ensure slug is always included for category detection
+    if not payload.get('slug') and payload.get('episode_id'):
+        payload['slug'] = payload.get('episode_id')
+    return payload
+
+
+def _indexed_search(index: EpisodeSearchIndex, q: str, limit: int, search_transcripts: bool) -> list:
+    """Rank episodes from the search index, then batch-read only the hits."""
+    hits = index.search(parse_query(q), include_transcript=search_transcripts, limit=limit)
+    if not hits:
+        return []
+    refs = [db.collection(EPISODE_COLLECTION_NAME).document(hit.episode_id) for hit in hits]
+    docs = {doc.id: doc for doc in db.get_all(refs)}
+    episodes = []
+    for hit in hits:
+        doc = docs.get(hit.episode_id)
+        if doc is None or not doc.exists:
+            continue
+        payload = _search_result_payload(doc.id, doc.to_dict() or {})
+        payload['match_score'] = round(hit.score, 3)
+        if hit.transcript_position is not None:
+            timestamp, snippet = index.transcript_excerpt(hit.episode_id, hit.transcript_position)
+            payload['transcript_match'] = True
+            payload['transcript_timestamp'] = timestamp
+            payload['transcript_snippet'] = snippet
+        episodes.append(payload)
+    return episodes
+
+
 @router.get("/api/episodes/search")
 async def search_episodes(
     q: str = Query(...),
@@ -176,7 +217,11 @@ async def search_episodes(
     Args:
         q: Search query string
         limit: Maximum number of results (default 100, max 500)
-        search_transcripts: If True, also search transcript content (slower, requires GCS access)
+        search_transcripts: If True, also search transcript content
+    
+    Served from the episode search index (services/episode_search_index.py)
+    once it has been built, which also supports "quoted phrases"; until then
+    the most recent episodes are scanned and transcripts are read from GCS.
     """
     if not db:
         raise HTTPException(status_code=503, detail="Firestore service is unavailable")
@@ -185,8 +230,19 @@ async def search_episodes(
         raise HTTPException(status_code=400, detail="Search query is required")
     
     try:
-        search_terms = q.strip().lower().split()
         limit = min(limit, 500)
+        search_store = get_episode_search_store()
+        index = await asyncio.to_thread(search_store.get) if search_store else None
+        if index is not None:
+            episodes = await asyncio.to_thread(_indexed_search, index, q, limit, search_transcripts)
+            return {
+                "query": q,
+                "episodes": episodes,
+                "total_count": len(episodes),
+                "searched_transcripts": search_transcripts,
+            }
+        
+        search_terms = q.strip().lower().split()
         
         # Fetch all episodes (or a large subset)
         # We'll filter in Python since Firestore doesn't have full-text search
@@ -213,23 +269,7 @@ async def search_episodes(
             matches = all(term in title or term in description_plain or term in summary for term in search_terms)
             
             if matches:
-                payload = data.copy()
-                payload['episode_id'] = episode_id
-                
-                # Ensure episode_link is set (construct if missing)
-                if not payload.get('episode_link') and payload.get('slug'):
-                    payload['episode_link'] = f"{EPISODE_BASE_URL}/{payload.get('slug')}"
-                elif not payload.get('episode_link') and payload.get('episode_id'):
-                    payload['episode_link'] = f"{EPISODE_BASE_URL}/{payload.get('episode_id')}"
-                
-                # Ensure audio_url is included (use audio_url field)
-                if not payload.get('audio_url'):
-                    # Try alternative field names
-                    payload['audio_url'] = data.get('audioUrl') or data.get('audio_url') or ''
-                
-                # Ensure slug is always included for category detection
-                if not payload.get('slug') and payload.get('episode_id'):
-                    payload['slug'] = payload.get('episode_id')
+                payload = _search_result_payload(episode_id, data)
                 
                 # Debug logging
                 structured_logger.debug("Search result",
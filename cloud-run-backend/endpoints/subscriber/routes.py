@@ -1,8 +1,11 @@
 """Subscriber management endpoints"""
 
+import asyncio
+import contextlib
+
 from fastapi import APIRouter, HTTPException
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 from google.cloud import firestore
 
 from utils.logging import structured_logger
@@ -20,13 +23,21 @@ from models.subscriber import (
     PasswordResetRequest,
     PasswordReset,
     SubscriberProfileUpdate,
-    PodcastSubmission
+    PodcastSubmission,
+    BulkPodcastSubmission
 )
 from services.rss_service import rss_service
 from services.episode_service import episode_service
+from services.related_content_index import unindex_episode
+from services.public_episode_listing import sync_episode_listing
+from services.episode_search_index import remove_episode_from_search
+from services.podcast_database_snapshot import forget_podcast
 
 router = APIRouter()
 
+# Submissions whose Firestore reads/writes a bulk RSS request runs at once
+RSS_BULK_FIRESTORE_CONCURRENCY = 16
+
 
 @router.post("/api/subscribers/register")
 async def register_subscriber(registration: SubscriberRegistration):
@@ -480,6 +491,190 @@ async def get_subscriber_podcasts(subscriber_id: str):
         raise HTTPException(status_code=500, detail="Failed to fetch podcasts")
 
 
+def _decrement_rss_submission_count(subscriber_id: str) -> None:
+    """Count one RSS removal against the subscriber, atomically so concurrent removals all land (floored at 0)."""
+    subscriber_ref = db.collection('subscribers').document(subscriber_id)
+
+    @firestore.transactional
+    def run(transaction):
+        snap = subscriber_ref.get(transaction=transaction)
+        if not snap.exists:
+            return
+        current_count = (snap.to_dict() or {}).get('podcasts_submitted_to_rss', 0)
+        if current_count > 0:
+            transaction.update(subscriber_ref, {'podcasts_submitted_to_rss': firestore.Increment(-1)})
+
+    run(db.transaction())
+
+
+def _find_rss_submission_job(podcast_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """(job data, job id) for a podcast given by job ID or canonical filename, or (None, None)."""
+    # The podcast_id might be either a job ID or a canonical filename
+    # Try to find by document ID first (if it's a job ID)
+    podcast_doc = db.collection('podcast_jobs').document(podcast_id).get()
+    
+    if podcast_doc.exists:
+        # Found by job ID
+        structured_logger.info("Found podcast by job ID",
+                              job_id=podcast_id,
+                              podcast_id=podcast_id)
+        return podcast_doc.to_dict(), podcast_id
+
+    # Not found by job ID - try searching by canonical filename
+    # Search in podcast_jobs where canonical_filename matches
+    jobs_query = db.collection('podcast_jobs').where('result.canonical_filename', '==', podcast_id).limit(1).stream()
+    for job_doc in jobs_query:
+        structured_logger.info("Found podcast by canonical filename",
+                              canonical=podcast_id,
+                              job_id=job_doc.id)
+        return job_doc.to_dict(), job_doc.id
+    
+    # Also check episodes collection (canonical filename is the document ID there)
+    episode_doc = db.collection(EPISODE_COLLECTION_NAME).document(podcast_id).get()
+    if episode_doc.exists:
+        # Found in episodes - need to find corresponding job
+        episode_data = episode_doc.to_dict()
+        subscriber_id_from_ep = episode_data.get('subscriber_id')
+        if subscriber_id_from_ep:
+            # Search for job with this canonical and subscriber
+            jobs_query = db.collection('podcast_jobs').where(
+                'subscriber_id', '==', subscriber_id_from_ep
+            ).where(
+                'result.canonical_filename', '==', podcast_id
+            ).limit(1).stream()
+            for job_doc in jobs_query:
+                structured_logger.info("Found podcast via episode collection",
+                                      canonical=podcast_id,
+                                      job_id=job_doc.id)
+                return job_doc.to_dict(), job_doc.id
+    return None, None
+
+
+def _creator_attribution(subscriber_data: Dict[str, Any]) -> Optional[str]:
+    """The subscriber's initials for the feed entry, if they opted in to attribution."""
+    if not subscriber_data.get('show_attribution', False):
+        return None
+    initials = subscriber_data.get('initials')
+    if initials:
+        return initials
+    if subscriber_data.get('display_name'):
+        display_name = subscriber_data['display_name']
+        return "".join(part[0].upper() for part in display_name.split() if part).strip() or None
+    return None
+
+
+def _prepare_rss_submission(submission: PodcastSubmission) -> Dict[str, Any]:
+    """Blocking reads ahead of a feed change: the job, its episode document and its subscriber."""
+    podcast_data, job_id = _find_rss_submission_job(submission.podcast_id)
+    if not podcast_data or not job_id:
+        raise HTTPException(status_code=404, detail=f"Podcast not found: {submission.podcast_id}")
+    
+    subscriber_id = podcast_data.get('subscriber_id')
+    
+    if not subscriber_id:
+        raise HTTPException(status_code=400, detail="Podcast not associated with a subscriber")
+    
+    # Ensure episode document exists (use job_id for this)
+    episode_service.ensure_episode_document_from_job(job_id, podcast_data)
+    subscriber_doc = db.collection('subscribers').document(subscriber_id).get()
+    subscriber_payload = subscriber_doc.to_dict() if subscriber_doc.exists else None
+    return {
+        'podcast_data': podcast_data,
+        'job_id': job_id,
+        'subscriber_id': subscriber_id,
+        'subscriber_payload': subscriber_payload,
+        'canonical': (podcast_data.get('result') or {}).get('canonical_filename') or submission.podcast_id,
+        'creator_attribution': (
+            _creator_attribution(subscriber_payload)
+            if submission.submit_to_rss and subscriber_payload is not None else None
+        ),
+    }
+
+
+def _record_rss_submission(submission: PodcastSubmission, prepared: Dict[str, Any]) -> None:
+    """Blocking writes once the feed is published: the job, the episode and the subscriber's count."""
+    job_id = prepared['job_id']
+    subscriber_id = prepared['subscriber_id']
+    creator_attribution = prepared['creator_attribution']
+    if submission.submit_to_rss:
+        # Update subscriber's RSS submission count
+        if prepared['subscriber_payload'] is not None:
+            db.collection('subscribers').document(subscriber_id).update({
+                'podcasts_submitted_to_rss': firestore.Increment(1)
+            })
+        
+        # Update podcast with RSS info and attribution
+        update_data = {
+            'submitted_to_rss': True,
+            'rss_submitted_at': datetime.utcnow().isoformat()
+        }
+        
+        if creator_attribution:
+            update_data['creator_attribution'] = creator_attribution
+        
+        # Use job_id (not submission.podcast_id which might be canonical)
+        db.collection('podcast_jobs').document(job_id).update(update_data)
+        rss_service.update_episode_submission_state(prepared['canonical'], True, creator_attribution)
+    else:
+        # Use job_id (not submission.podcast_id which might be canonical)
+        db.collection('podcast_jobs').document(job_id).update({
+            'submitted_to_rss': False,
+            'rss_removed_at': datetime.utcnow().isoformat()
+        })
+        rss_service.update_episode_submission_state(prepared['canonical'], False, None)
+
+        if prepared['subscriber_payload'] is not None:
+            _decrement_rss_submission_count(subscriber_id)
+
+
+async def _apply_rss_submission(
+    submission: PodcastSubmission,
+    firestore_slots: Optional[asyncio.Semaphore] = None,
+) -> Dict[str, Any]:
+    """
+    Add a podcast to (or remove it from) the RSS feed and record it on the job, episode and subscriber.
+
+    The Firestore reads and writes are blocking, so they run in worker
+    threads (at most `firestore_slots` at a time); the feed change itself is
+    awaited outside the slots so concurrent submissions share one publish.
+    """
+    async def _off_loop(fn, *args):
+        async with firestore_slots or contextlib.nullcontext():
+            return await asyncio.to_thread(fn, *args)
+
+    prepared = await _off_loop(_prepare_rss_submission, submission)
+    creator_attribution = prepared['creator_attribution']
+
+    # Update RSS feed before committing Firestore changes
+    await rss_service.update_rss_feed(
+        prepared['podcast_data'], prepared['subscriber_payload'], submission.submit_to_rss, creator_attribution
+    )
+    await _off_loop(_record_rss_submission, submission, prepared)
+
+    if submission.submit_to_rss:
+        structured_logger.info("Podcast submitted to RSS feed",
+                              podcast_id=submission.podcast_id,
+                              job_id=prepared['job_id'],
+                              canonical=prepared['canonical'],
+                              creator_attribution=creator_attribution if creator_attribution else None)
+        
+        return {
+            "podcast_id": submission.podcast_id,
+            "submitted_to_rss": True,
+            "creator_attribution": creator_attribution,
+            "message": "Podcast successfully submitted to RSS feed"
+        }
+
+    structured_logger.info("Podcast removed from RSS feed",
+                          podcast_id=submission.podcast_id)
+    
+    return {
+        "podcast_id": submission.podcast_id,
+        "submitted_to_rss": False,
+        "message": "Podcast removed from RSS feed"
+    }
+
+
 @router.post("/api/subscribers/podcasts/submit-to-rss")
 async def submit_podcast_to_rss(submission: PodcastSubmission):
     """Submit a podcast to the RSS feed"""
@@ -487,147 +682,7 @@ async def submit_podcast_to_rss(submission: PodcastSubmission):
         raise HTTPException(status_code=503, detail="Firestore service is unavailable")
     
     try:
-        # The podcast_id might be either a job ID or a canonical filename
-        # Try to find by document ID first (if it's a job ID)
-        podcast_doc = db.collection('podcast_jobs').document(submission.podcast_id).get()
-        podcast_data = None
-        job_id = None
-        
-        if podcast_doc.exists:
-            # Found by job ID
-            podcast_data = podcast_doc.to_dict()
-            job_id = submission.podcast_id
-            structured_logger.info("Found podcast by job ID",
-                                  job_id=job_id,
-                                  podcast_id=submission.podcast_id)
-        else:
-            # Not found by job ID - try searching by canonical filename
-            # Search in podcast_jobs where canonical_filename matches
-            jobs_query = db.collection('podcast_jobs').where('result.canonical_filename', '==', submission.podcast_id).limit(1).stream()
-            job_found = False
-            for job_doc in jobs_query:
-                podcast_data = job_doc.to_dict()
-                job_id = job_doc.id
-                job_found = True
-                structured_logger.info("Found podcast by canonical filename",
-                                      canonical=submission.podcast_id,
-                                      job_id=job_id)
-                break
-            
-            if not job_found:
-                # Also check episodes collection (canonical filename is the document ID there)
-                episode_doc = db.collection(EPISODE_COLLECTION_NAME).document(submission.podcast_id).get()
-                if episode_doc.exists:
-                    # Found in episodes - need to find corresponding job
-                    episode_data = episode_doc.to_dict()
-                    subscriber_id_from_ep = episode_data.get('subscriber_id')
-                    if subscriber_id_from_ep:
-                        # Search for job with this canonical and subscriber
-                        jobs_query = db.collection('podcast_jobs').where(
-                            'subscriber_id', '==', subscriber_id_from_ep
-                        ).where(
-                            'result.canonical_filename', '==', submission.podcast_id
-                        ).limit(1).stream()
-                        for job_doc in jobs_query:
-                            podcast_data = job_doc.to_dict()
-                            job_id = job_doc.id
-                            structured_logger.info("Found podcast via episode collection",
-                                                  canonical=submission.podcast_id,
-                                                  job_id=job_id)
-                            break
-        
-        if not podcast_data or not job_id:
-            raise HTTPException(status_code=404, detail=f"Podcast not found: {submission.podcast_id}")
-        
-        subscriber_id = podcast_data.get('subscriber_id')
-        
-        if not subscriber_id:
-            raise HTTPException(status_code=400, detail="Podcast not associated with a subscriber")
-        
-        # Ensure episode document exists (use job_id for this)
-        episode_service.ensure_episode_document_from_job(job_id, podcast_data)
-        canonical = (podcast_data.get('result') or {}).get('canonical_filename') or submission.podcast_id
-        
-        # Update podcast to mark as submitted to RSS
-        if submission.submit_to_rss:
-            # Get subscriber attribution info if they opted in
-            subscriber_doc = db.collection('subscribers').document(subscriber_id).get()
-            creator_attribution = None
-            subscriber_payload = subscriber_doc.to_dict() if subscriber_doc.exists else None
-            
-            if subscriber_doc.exists:
-                subscriber_data = subscriber_payload
-                # Check if user wants attribution
-                if subscriber_data.get('show_attribution', False):
-                    initials = subscriber_data.get('initials')
-                    if initials:
-                        creator_attribution = initials
-                    elif subscriber_data.get('display_name'):
-                        display_name = subscriber_data['display_name']
-                        creator_attribution = "".join(part[0].upper() for part in display_name.split() if part).strip() or None
-
-            # Update RSS feed with new entry before committing Firestore changes
-            await rss_service.update_rss_feed(podcast_data, subscriber_payload, True, creator_attribution)
-                
-            # Update subscriber's RSS submission count
-            if subscriber_payload is not None:
-                new_count = subscriber_payload.get('podcasts_submitted_to_rss', 0) + 1
-                db.collection('subscribers').document(subscriber_id).update({
-                    'podcasts_submitted_to_rss': new_count
-                })
-            
-            # Update podcast with RSS info and attribution
-            update_data = {
-                'submitted_to_rss': True,
-                'rss_submitted_at': datetime.utcnow().isoformat()
-            }
-            
-            if creator_attribution:
-                update_data['creator_attribution'] = creator_attribution
-            
-            # Use job_id (not submission.podcast_id which might be canonical)
-            db.collection('podcast_jobs').document(job_id).update(update_data)
-            rss_service.update_episode_submission_state(canonical, True, creator_attribution)
-            
-            structured_logger.info("Podcast submitted to RSS feed",
-                                  podcast_id=submission.podcast_id,
-                                  job_id=job_id,
-                                  canonical=canonical,
-                                  creator_attribution=creator_attribution if creator_attribution else None)
-            
-            return {
-                "podcast_id": submission.podcast_id,
-                "submitted_to_rss": True,
-                "creator_attribution": creator_attribution,
-                "message": "Podcast successfully submitted to RSS feed"
-            }
-        else:
-            # Remove from RSS feed
-            subscriber_doc = db.collection('subscribers').document(subscriber_id).get()
-            await rss_service.update_rss_feed(podcast_data, subscriber_doc.to_dict() if subscriber_doc.exists else None, False, None)
-
-            # Use job_id (not submission.podcast_id which might be canonical)
-            db.collection('podcast_jobs').document(job_id).update({
-                'submitted_to_rss': False,
-                'rss_removed_at': datetime.utcnow().isoformat()
-            })
-            rss_service.update_episode_submission_state(canonical, False, None)
-
-            if subscriber_doc.exists:
-                subscriber_data = subscriber_doc.to_dict()
-                current_count = subscriber_data.get('podcasts_submitted_to_rss', 0)
-                db.collection('subscribers').document(subscriber_id).update({
-                    'podcasts_submitted_to_rss': max(current_count - 1, 0)
-                })
-            
-            structured_logger.info("Podcast removed from RSS feed",
-                                  podcast_id=submission.podcast_id)
-            
-            return {
-                "podcast_id": submission.podcast_id,
-                "submitted_to_rss": False,
-                "message": "Podcast removed from RSS feed"
-            }
+        return await _apply_rss_submission(submission)
         
     except HTTPException:
         raise
@@ -638,6 +693,43 @@ async def submit_podcast_to_rss(submission: PodcastSubmission):
         raise HTTPException(status_code=500, detail="Failed to submit podcast to RSS")
 
 
+@router.post("/api/subscribers/podcasts/submit-to-rss/bulk")
+async def submit_podcasts_to_rss_bulk(bulk: BulkPodcastSubmission):
+    """Add or remove many podcasts in the RSS feed with a single feed publish"""
+    if not db:
+        raise HTTPException(status_code=503, detail="Firestore service is unavailable")
+
+    # Submitted together, every feed change lands in the same coalescer flush;
+    # the Firestore work around it is spread over a bounded number of threads
+    firestore_slots = asyncio.Semaphore(RSS_BULK_FIRESTORE_CONCURRENCY)
+    outcomes = await asyncio.gather(
+        *(_apply_rss_submission(submission, firestore_slots) for submission in bulk.submissions),
+        return_exceptions=True,
+    )
+    results = []
+    for submission, outcome in zip(bulk.submissions, outcomes):
+        if isinstance(outcome, HTTPException):
+            results.append({"podcast_id": submission.podcast_id, "error": outcome.detail, "status_code": outcome.status_code})
+        elif isinstance(outcome, Exception):
+            structured_logger.error("Error in bulk RSS submission",
+                                   podcast_id=submission.podcast_id,
+                                   error=str(outcome))
+            results.append({"podcast_id": submission.podcast_id, "error": "Failed to submit podcast to RSS", "status_code": 500})
+        else:
+            results.append(outcome)
+
+    failed = sum(1 for result in results if "error" in result)
+    structured_logger.info("Bulk RSS submission processed",
+                          total=len(results),
+                          failed=failed)
+    return {
+        "total": len(results),
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "results": results,
+    }
+
+
 @router.post("/api/subscribers/password-reset-request")
 async def request_password_reset(reset_request: PasswordResetRequest):
     """Request a password reset for a subscriber"""
@@ -723,6 +815,25 @@ async def delete_subscriber_podcast(podcast_id: str):
         db.collection('podcast_jobs').document(podcast_id).delete()
         if canonical:
             db.collection(EPISODE_COLLECTION_NAME).document(canonical).delete()
+            forget_podcast(canonical)
+            try:
+                sync_episode_listing(canonical, None)
+            except Exception as e:
+                structured_logger.warning("Failed to update public episode listing for deleted podcast",
+                                         podcast_id=podcast_id,
+                                         error=str(e))
+            try:
+                remove_episode_from_search(canonical)
+            except Exception as e:
+                structured_logger.warning("Failed to update episode search index for deleted podcast",
+                                         podcast_id=podcast_id,
+                                         error=str(e))
+        try:
+            unindex_episode(db, podcast_id, podcast_data.get('request'))
+        except Exception as e:
+            structured_logger.warning("Failed to update related content index for deleted podcast",
+                                     podcast_id=podcast_id,
+                                     error=str(e))
         
         # Update subscriber's podcast count
         subscriber_doc = db.collection('subscribers').document(subscriber_id).get()
@@ -264,7 +264,39 @@ except ImportError as e:
 # Copyright (c) 2025 Gary Welz / CopernicusAI
 # Licensed under MIT License
 
-app = FastAPI(title="Copernicus Podcast API - Google AI")
+async def _run_queued_podcast_job(job: Dict[str, Any]) -> None:
+    """Worker-pool handler: run one claimed podcast_jobs entry through the pipeline."""
+    await podcast_generation_service.run_podcast_generation_job(
+        job["job_id"], PodcastRequest(**job["request"]), subscriber_id=job.get("subscriber_id")
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from services.podcast_job_queue import start_podcast_job_workers
+    from services.episode_search_index import get_episode_search_store
+    from mcp_server.utils.keyword_index import get_keyword_index_store
+    worker_pool = start_podcast_job_workers(_run_queued_podcast_job)
+    search_store = get_episode_search_store()
+    # Load the episode search index in the background; searches wait on its lock meanwhile
+    search_index_load = asyncio.create_task(asyncio.to_thread(search_store.get)) if search_store else None
+    yield
+    if search_index_load:
+        search_index_load.cancel()
+    if worker_pool:
+        await worker_pool.stop()
+    if search_store:
+        # Write episode changes still waiting for the debounced flush
+        await asyncio.to_thread(search_store.close)
+    keyword_store = get_keyword_index_store()
+    if keyword_store:
+        # Same for papers indexed into the keyword-fallback index
+        await asyncio.to_thread(keyword_store.close)
+    # Close the pooled ElevenLabs HTTP sessions (one per event loop that used them)
+    await podcast_generation_service.elevenlabs_voice_service.close()
+
+
+app = FastAPI(title="Copernicus Podcast API - Google AI", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
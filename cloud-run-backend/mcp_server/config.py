@@ -36,10 +36,39 @@ COLLECTION_VIDEOS = "science_videos"
 DEFAULT_QUERY_LIMIT = 10
 MAX_QUERY_LIMIT = 100
 
+# Per-collection search fan-out (mcp_server/utils/fanout.py): searches run on a
+# shared thread pool; a collection slower than the timeout is reported as
+# "timeout" and returned empty instead of holding up the others.
+SEARCH_FANOUT_TIMEOUT_SECONDS = float(os.getenv("SEARCH_FANOUT_TIMEOUT_SECONDS", "8"))
+SEARCH_FANOUT_MAX_WORKERS = int(os.getenv("SEARCH_FANOUT_MAX_WORKERS", "16"))
+
+# Local ANN vector index (mcp_server/utils/vector_index.py). Empty dir disables
+# the engine and every semantic query goes to Firestore find_nearest as before.
+# Snapshots older than the max age are treated as stale and skipped.
+VECTOR_INDEX_DIR = os.getenv("VECTOR_INDEX_DIR", "")
+VECTOR_INDEX_MAX_AGE_SECONDS = int(os.getenv("VECTOR_INDEX_MAX_AGE_SECONDS", "21600"))
+
+# BM25 keyword index for the keyword fallback (mcp_server/utils/keyword_index.py).
+# Set a local dir and/or a gs://bucket/prefix; with neither, the fallback scans
+# Firestore as before.
+KEYWORD_INDEX_DIR = os.getenv("KEYWORD_INDEX_DIR", "")
+KEYWORD_INDEX_GCS_URI = os.getenv("KEYWORD_INDEX_GCS_URI", "")
+KEYWORD_INDEX_REFRESH_SECONDS = int(os.getenv("KEYWORD_INDEX_REFRESH_SECONDS", "300"))
+# Incremental updates are written at most this long after the first unwritten one
+KEYWORD_INDEX_FLUSH_SECONDS = int(os.getenv("KEYWORD_INDEX_FLUSH_SECONDS", "30"))
+
 # Google Cloud Storage Configuration
 GCS_BUCKET_NAME = os.getenv("GCP_AUDIO_BUCKET", "regal-scholar-453620-r7-podcast-storage")
 GLMP_BUCKET_PATH = os.getenv("GLMP_BUCKET_PATH", "glmp-v2/processes")
 
+# In-memory GLMP catalog (mcp_server/utils/glmp_catalog.py). A prefix is
+# re-listed at most every refresh interval and only blobs whose generation
+# changed are downloaded again. A mirror dir keeps the downloaded JSON on local
+# disk so a restarted instance only fetches what changed while it was down.
+GLMP_CATALOG_REFRESH_SECONDS = float(os.getenv("GLMP_CATALOG_REFRESH_SECONDS", "60"))
+GLMP_CATALOG_MIRROR_DIR = os.getenv("GLMP_CATALOG_MIRROR_DIR", "")
+GLMP_CATALOG_FETCH_WORKERS = int(os.getenv("GLMP_CATALOG_FETCH_WORKERS", "8"))
+
 # MCP Server Metadata
 MCP_SERVER_NAME = "copernicusai-knowledge-engine"
 MCP_SERVER_VERSION = "1.0.0"
@@ -12,7 +12,9 @@ import json
 from mcp_server.tools.papers import query_research_papers, get_paper_by_id
 from mcp_server.tools.glmp import list_glmp_processes, search_glmp_by_entity
 from mcp_server.tools.podcasts import list_podcasts, get_podcast_details
+from mcp_server.utils.firestore_client import get_firestore_client
 from mcp_server.config import DEFAULT_QUERY_LIMIT, MAX_QUERY_LIMIT
+from services.related_content_index import lookup_related
 
 logger = logging.getLogger(__name__)
 
@@ -56,45 +58,30 @@ async def find_related_content(
             paper = paper_data.get("paper")
             
             if paper:
-                # Extract entities and keywords from paper
+                # Same entity selection the scan used: first 3 of each type
                 preprocessing = paper.get("preprocessing", {})
-                entities = preprocessing.get("entities_extracted", {})
-                title = paper.get("title", "")
-                abstract = paper.get("abstract", "")
+                entities = [
+                    entity
+                    for entity_list in (preprocessing.get("entities_extracted") or {}).values()
+                    if isinstance(entity_list, list)
+                    for entity in entity_list[:3]
+                    if isinstance(entity, str)
+                ]
                 
-                # Find podcasts that might reference this paper
-                # Search by DOI, title keywords, or entity overlap
-                podcasts_result = await list_podcasts(limit=MAX_QUERY_LIMIT)
-                podcasts_data = json.loads(podcasts_result)
-                
-                for podcast in podcasts_data.get("podcasts", []):
-                    podcast_details_result = await get_podcast_details(podcast.get("job_id"))
-                    podcast_details = json.loads(podcast_details_result)
-                    podcast_data = podcast_details.get("podcast", {})
-                    
-                    # Check if podcast references this paper
-                    source_papers = podcast_data.get("source_papers", [])
-                    paper_doi = podcast_data.get("paper_doi")
-                    
-                    if (paper.get("doi") and paper_doi == paper.get("doi")) or \
-                       any(paper.get("doi") in str(sp) for sp in source_papers):
-                        related_content["podcasts"].append({
-                            "job_id": podcast.get("job_id"),
-                            "title": podcast.get("title"),
-                            "category": podcast.get("category")
-                        })
+                related = None
+                try:
+                    related = lookup_related(
+                        get_firestore_client(),
+                        dois=[paper.get("doi")],
+                        entities=entities
+                    )
+                except Exception as e:
+                    logger.warning(f"Related content index unavailable, scanning instead: {e}")
                 
-                # Find GLMP processes related to paper entities
-                if entities:
-                    for entity_type, entity_list in entities.items():
-                        if isinstance(entity_list, list):
-                            for entity in entity_list[:3]:  # Check first 3 entities
-                                if isinstance(entity, str):
-                                    glmp_result = await search_glmp_by_entity(entity=entity, limit=5)
-                                    glmp_data = json.loads(glmp_result)
-                                    related_content["glmp_processes"].extend(
-                                        glmp_data.get("processes", [])
-                                    )
+                if related is None:
+                    related = await _scan_related_to_paper(paper, entities)
+                related_content["podcasts"].extend(related["podcasts"])
+                related_content["glmp_processes"].extend(related["glmp_processes"])
         
         # If podcast_id provided, find related papers and GLMP processes
         elif podcast_id:
@@ -208,6 +195,43 @@ async def find_related_content(
         })
 
 
+async def _scan_related_to_paper(paper: Dict[str, Any], entities: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Podcasts citing the paper's DOI and processes involving its entities, by
+    scanning. Used until the related-content index has been built.
+    """
+    related = {"podcasts": [], "glmp_processes": []}
+    
+    # Find podcasts that reference this paper by DOI
+    podcasts_result = await list_podcasts(limit=MAX_QUERY_LIMIT)
+    podcasts_data = json.loads(podcasts_result)
+    
+    for podcast in podcasts_data.get("podcasts", []):
+        podcast_details_result = await get_podcast_details(podcast.get("job_id"))
+        podcast_details = json.loads(podcast_details_result)
+        podcast_data = podcast_details.get("podcast", {})
+        
+        # Check if podcast references this paper
+        source_papers = podcast_data.get("source_papers", [])
+        paper_doi = podcast_data.get("paper_doi")
+        
+        if (paper.get("doi") and paper_doi == paper.get("doi")) or \
+           any(paper.get("doi") in str(sp) for sp in source_papers):
+            related["podcasts"].append({
+                "job_id": podcast.get("job_id"),
+                "title": podcast.get("title"),
+                "category": podcast.get("category")
+            })
+    
+    # Find GLMP processes related to paper entities
+    for entity in entities:
+        glmp_result = await search_glmp_by_entity(entity=entity, limit=5)
+        glmp_data = json.loads(glmp_result)
+        related["glmp_processes"].extend(glmp_data.get("processes", []))
+    
+    return related
+
+
 async def get_paper_visualizations(
     paper_id: Optional[str] = None,
     doi: Optional[str] = None
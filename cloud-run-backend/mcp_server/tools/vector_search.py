@@ -6,9 +6,10 @@ knowledge engine components (papers, podcasts, GLMP processes).
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import json
 from datetime import datetime
+from functools import partial
 import re
 import os
 
@@ -17,6 +18,7 @@ from google.cloud.firestore_v1.vector import Vector
 from google.cloud.firestore_v1.base_query import FieldFilter
 from google.cloud.firestore_v1._helpers import DatetimeWithNanoseconds
 from services.embedding_service import get_embedding_service
+from services.embedding_cache import embed_query
 from mcp_server.utils.firestore_client import get_firestore_client
 from mcp_server.config import (
     COLLECTION_PAPERS,
@@ -32,15 +34,14 @@ from mcp_server.config import (
     MAX_QUERY_LIMIT
 )
 from mcp_server.utils.gcs_client import list_glmp_files, get_glmp_file
+from mcp_server.utils.vector_index import get_vector_index_registry
+from mcp_server.utils.keyword_index import STOPWORDS, extract_keyword_fields, get_keyword_index_store
+from mcp_server.utils.fanout import fan_out
 from mcp_server.config import GCS_BUCKET_NAME, GLMP_BUCKET_PATH
 
 logger = logging.getLogger(__name__)
 
-_STOPWORDS = {
-    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "i",
-    "in", "is", "it", "of", "on", "or", "that", "the", "this", "to", "was", "were",
-    "what", "when", "where", "which", "who", "why", "with", "you", "your"
-}
+_STOPWORDS = STOPWORDS
 
 def _env_flag(name: str, default: str = "0") -> bool:
     return (os.getenv(name, default) or "").strip().lower() in {"1", "true", "yes", "y", "on"}
@@ -75,6 +76,129 @@ def _serialize_firestore_value(value: Any) -> Any:
         return value
 
 
+def _nearest_neighbours(
+    db,
+    collection: str,
+    query_embedding: List[float],
+    limit: int,
+    distance_threshold: float,
+    engines: Optional[Dict[str, str]] = None,
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Top-`limit` docs nearest to `query_embedding` as (doc_id, doc_dict) pairs,
+    each doc_dict carrying a cosine `distance` like find_nearest's
+    distance_result_field.
+
+    Served from the local ANN snapshot when one is loaded, fresh, and built for
+    the query's dimension; otherwise a Firestore find_nearest round trip.
+    `engines[collection]` records which one answered.
+    """
+    registry = get_vector_index_registry()
+    index = registry.get(collection) if registry is not None else None
+    if index is not None and index.dimension == len(query_embedding):
+        hits = index.search(query_embedding, limit=limit, distance_threshold=distance_threshold)
+        if engines is not None:
+            engines[collection] = "local_index"
+        return [(doc_id, {**payload, "distance": distance}) for doc_id, distance, payload in hits]
+
+    vector_query = db.collection(collection).find_nearest(
+        vector_field="embedding",
+        query_vector=Vector(query_embedding),
+        limit=limit,
+        distance_measure=DistanceMeasure.COSINE,
+        distance_threshold=distance_threshold,
+        distance_result_field="distance"
+    )
+    if engines is not None:
+        engines[collection] = "firestore"
+    return [(doc.id, doc.to_dict() or {}) for doc in vector_query.stream()]
+
+
+def _finish_vector_doc(id_field: str, doc_id: str, d: Dict[str, Any]) -> Dict[str, Any]:
+    """Attach the id field and similarity score, and strip bulky fields, on a vector hit."""
+    if id_field == "video_id":
+        d["video_id"] = d.get("video_id") or doc_id
+        d.pop("transcript", None)
+    else:
+        d[id_field] = doc_id
+    d["similarity_score"] = 1.0 - d.get("distance", 1.0)
+    # Remove embedding from response (too large)
+    d.pop("embedding", None)
+    # Remove large mermaid_code from response (can be fetched separately if needed)
+    if id_field == "process_id" and "mermaid_code" in d and len(str(d["mermaid_code"])) > 500:
+        d["has_mermaid"] = True
+        d.pop("mermaid_code", None)
+    # Convert Firestore types to JSON-serializable
+    return _serialize_firestore_value(d)
+
+
+def _vector_search_collection(
+    db,
+    collection: str,
+    id_field: str,
+    query_embedding: List[float],
+    limit: int,
+    distance_threshold: float,
+    engines: Optional[Dict[str, str]] = None,
+    exclude_id: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Vector search one collection; `exclude_id` drops the source doc for find-similar."""
+    hits = [
+        _finish_vector_doc(id_field, doc_id, d)
+        for doc_id, d in _nearest_neighbours(db, collection, query_embedding, limit, distance_threshold, engines)
+        if doc_id != exclude_id
+    ]
+    logger.info(f"Found {len(hits)} {collection} docs via vector search")
+    return hits
+
+
+def _scoped_paper_search(
+    db,
+    question: str,
+    query_embedding: List[float],
+    limit: int,
+    distance_threshold: float,
+) -> List[Dict[str, Any]]:
+    """
+    Search directly within the question-scoped candidate set rather than
+    over-fetching a global top-K by raw query-text similarity and filtering in
+    Python. The old over-fetch pattern let a legitimately-attributed,
+    well-ranked paper be entirely absent from the pre-filter pool whenever it
+    didn't also rank well by literal text similarity to the query -- confirmed
+    severe (not cosmetic) in GLMP_MASTER_TODO.md item 53: the glmp-q11 ChIP-seq
+    paper ranked 60th of 471 within its own scoped set but wasn't in the top 80
+    of the global candidate pool, so it never reached the filter at all.
+    question_scope_ids is a flat array field (backfilled from
+    acquisition_matches[].question + cited_for_question) that Firestore can
+    array-contains query directly, since it can't query into an array of maps.
+    """
+    scoped_docs = db.collection(COLLECTION_PAPERS).where(
+        filter=FieldFilter("question_scope_ids", "array_contains", question)
+    ).stream()
+
+    scored: List[tuple] = []
+    for doc in scoped_docs:
+        paper_data = doc.to_dict()
+        embedding = paper_data.get("embedding")
+        if embedding is None:
+            continue
+        similarity = _cosine_similarity(query_embedding, list(embedding))
+        if (1.0 - similarity) > distance_threshold:
+            continue
+        paper_data["paper_id"] = doc.id
+        paper_data["similarity_score"] = similarity
+        paper_data.pop("embedding", None)
+        paper_data = _serialize_firestore_value(paper_data)
+        scored.append((similarity, paper_data))
+
+    scored.sort(key=lambda pair: pair[0], reverse=True)
+    logger.info(
+        f"Found {min(len(scored), limit)} papers via scoped search "
+        f"(question={question}, candidate_pool={len(scored)})"
+    )
+    return [p for _, p in scored[:limit]]
+
+
 def _tokenize_query(query: str) -> List[str]:
     tokens = [t for t in re.split(r"[^a-zA-Z0-9]+", (query or "").lower()) if t]
     # Keep short tokens only if they're meaningful (e.g., "ph", "ai" are ambiguous)
@@ -112,7 +236,57 @@ def _score_text(tokens: List[str], title: str, body: str) -> float:
     return float(score)
 
 
-def _keyword_fallback_search(
+# content_types value -> (collection, results key, id field)
+_CONTENT_TYPE_SPECS: Dict[str, Tuple[str, str, str]] = {
+    "papers": (COLLECTION_PAPERS, "papers", "paper_id"),
+    "podcasts": (COLLECTION_PODCASTS, "podcasts", "job_id"),
+    "videos": (COLLECTION_VIDEOS, "videos", "video_id"),
+    "glmp": (COLLECTION_GLMP_PROCESSES, "glmp_processes", "process_id"),
+    "math": (COLLECTION_MATH_PROCESSES, "math_processes", "process_id"),
+    "chemistry": (COLLECTION_CHEMISTRY_PROCESSES, "chemistry_processes", "process_id"),
+    "physics": (COLLECTION_PHYSICS_PROCESSES, "physics_processes", "process_id"),
+    "computer_science": (COLLECTION_COMPUTER_SCIENCE_PROCESSES, "computer_science_processes", "process_id"),
+    "biology": (COLLECTION_BIOLOGY_PROCESSES, "biology_processes", "process_id"),
+}
+
+
+def _finish_keyword_doc(id_field: str, doc_id: str, d: Dict[str, Any]) -> Dict[str, Any]:
+    """Attach the id field and strip bulky fields from a keyword-matched doc."""
+    if id_field == "video_id":
+        d["video_id"] = d.get("video_id") or doc_id
+        d.pop("transcript", None)
+    else:
+        d[id_field] = doc_id
+    d.pop("embedding", None)
+    return _serialize_firestore_value(d)
+
+
+def _keyword_index_lookup(db, index, collection: str, id_field: str, tokens: List[str], limit: int) -> List[Dict[str, Any]]:
+    """
+    Rank with the BM25 index, then hydrate the winners with one batched read.
+
+    Over-fetches 2x so docs deleted since the index was last updated don't
+    shrink the result list.
+    """
+    hits = index.search(tokens, limit * 2)
+    if not hits:
+        return []
+    refs = [db.collection(collection).document(doc_id) for doc_id, _, _ in hits]
+    snapshots = {snap.id: snap for snap in db.get_all(refs)}
+    results: List[Dict[str, Any]] = []
+    for doc_id, _score, similarity in hits:
+        snap = snapshots.get(doc_id)
+        if snap is None or not snap.exists:
+            continue
+        d = _finish_keyword_doc(id_field, doc_id, snap.to_dict() or {})
+        d["similarity_score"] = similarity
+        results.append(d)
+        if len(results) >= limit:
+            break
+    return results
+
+
+async def _keyword_fallback_search(
     db,
     query: str,
     content_types: List[str],
@@ -121,8 +295,14 @@ def _keyword_fallback_search(
     """
     Fallback retrieval when vector search returns no results (e.g., embeddings missing).
 
-    Strategy: sample a limited number of docs per collection and rank by keyword overlap.
-    This is intentionally simple, predictable, and index-free.
+    Strategy: when a BM25 keyword index exists for a collection (see
+    mcp_server/utils/keyword_index.py), rank from the index and batch-read only
+    the top hits. Otherwise sample a limited number of docs per collection and
+    rank by keyword overlap -- simple, predictable, and index-free.
+    `keyword_engines` in the returned dict records which path served each type.
+
+    Collections are searched concurrently via fan_out; a collection that times
+    out or fails comes back empty and is flagged in `keyword_fanout_report`.
     """
     tokens = _tokenize_query(query)
     # Sample more than 'limit' so we have room to rank.
@@ -194,6 +374,7 @@ def _keyword_fallback_search(
         "computer_science_processes": [],
         "biology_processes": [],
         "videos": [],
+        "keyword_engines": {},
     }
 
     def _top_k(scored: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -207,180 +388,42 @@ def _keyword_fallback_search(
             item.pop("_kw_score", None)
         return top
 
-    # Papers
-    if "papers" in content_types:
-        scored: List[Dict[str, Any]] = []
-        try:
-            scanned = 0
-            for doc in _stream_candidates(db.collection(COLLECTION_PAPERS)):
-                d = doc.to_dict() or {}
-                title = d.get("title") or ""
-                body = " ".join([
-                    d.get("abstract") or "",
-                    " ".join(d.get("keywords") or []) if isinstance(d.get("keywords"), list) else str(d.get("keywords") or ""),
-                    " ".join(d.get("categories") or []) if isinstance(d.get("categories"), list) else str(d.get("categories") or ""),
-                ])
-                score = _score_text(tokens, title, body)
-                if score <= 0:
-                    scanned += 1
-                    continue
-                d["paper_id"] = doc.id
-                d.pop("embedding", None)
-                d = _serialize_firestore_value(d)
-                d["_kw_score"] = score
-                scored.append(d)
-                scanned += 1
-                # Early exit once we have plenty to rank
-                if len(scored) >= (limit * 20) and scanned >= min(candidate_limit, 2000):
-                    break
-        except Exception as e:
-            logger.warning(f"Keyword fallback for papers failed: {e}")
-        results["papers"] = _top_k(scored)
-
-    # Podcasts
-    if "podcasts" in content_types:
-        scored = []
-        try:
-            scanned = 0
-            for doc in _stream_candidates(db.collection(COLLECTION_PODCASTS)):
-                d = doc.to_dict() or {}
-                title = d.get("title") or (d.get("result", {}) or {}).get("title") or ""
-                desc = d.get("description") or (d.get("result", {}) or {}).get("description") or ""
-                script = (d.get("result", {}) or {}).get("script") or d.get("transcript") or ""
-                body = " ".join([desc, script[:1500]])
-                score = _score_text(tokens, title, body)
-                if score <= 0:
-                    scanned += 1
-                    continue
-                d["job_id"] = doc.id
-                d.pop("embedding", None)
-                d = _serialize_firestore_value(d)
-                d["_kw_score"] = score
-                scored.append(d)
-                scanned += 1
-                if len(scored) >= (limit * 20) and scanned >= min(candidate_limit, 2000):
-                    break
-        except Exception as e:
-            logger.warning(f"Keyword fallback for podcasts failed: {e}")
-        results["podcasts"] = _top_k(scored)
-
-    if "videos" in content_types:
-        scored = []
-        try:
-            scanned = 0
-            for doc in _stream_candidates(db.collection(COLLECTION_VIDEOS)):
-                d = doc.to_dict() or {}
-                title = d.get("title") or ""
-                desc = d.get("description") or ""
-                transcript = str(d.get("transcript") or "")[:1500]
-                tags = d.get("tags") or []
-                tag_text = " ".join(str(t) for t in tags) if isinstance(tags, list) else str(tags)
-                body = " ".join([desc, transcript, tag_text])
-                score = _score_text(tokens, title, body)
-                if score <= 0:
-                    scanned += 1
-                    continue
-                d["video_id"] = d.get("video_id") or doc.id
-                d.pop("embedding", None)
-                d.pop("transcript", None)
-                d = _serialize_firestore_value(d)
-                d["_kw_score"] = score
-                scored.append(d)
-                scanned += 1
-                if len(scored) >= (limit * 20) and scanned >= min(candidate_limit, 2000):
-                    break
-        except Exception as e:
-            logger.warning(f"Keyword fallback for videos failed: {e}")
-        results["videos"] = _top_k(scored)
-
-    def _keyword_processes(collection: str, key: str, title_fields: List[str], body_fields: List[str]) -> List[Dict[str, Any]]:
+    def _keyword_scan(collection: str, id_field: str) -> List[Dict[str, Any]]:
         scored_local: List[Dict[str, Any]] = []
-        try:
-            scanned = 0
-            for doc in _stream_candidates(db.collection(collection)):
-                d = doc.to_dict() or {}
-                title = ""
-                for f in title_fields:
-                    if d.get(f):
-                        title = str(d.get(f))
-                        break
-                body_parts: List[str] = []
-                for f in body_fields:
-                    v = d.get(f)
-                    if isinstance(v, list):
-                        body_parts.append(" ".join([str(x) for x in v[:50]]))
-                    elif v:
-                        body_parts.append(str(v)[:2000])
-                body = " ".join(body_parts)
-                score = _score_text(tokens, title, body)
-                if score <= 0:
-                    scanned += 1
-                    continue
-                d["process_id"] = doc.id
-                d.pop("embedding", None)
-                d = _serialize_firestore_value(d)
-                d["_kw_score"] = score
-                scored_local.append(d)
-                scanned += 1
-                if len(scored_local) >= (limit * 20) and scanned >= min(candidate_limit, 2000):
-                    break
-        except Exception as e:
-            logger.warning(f"Keyword fallback for {key} failed: {e}")
+        scanned = 0
+        for doc in _stream_candidates(db.collection(collection)):
+            d = doc.to_dict() or {}
+            title, body = extract_keyword_fields(collection, d)
+            score = _score_text(tokens, title, body)
+            scanned += 1
+            if score <= 0:
+                continue
+            d = _finish_keyword_doc(id_field, doc.id, d)
+            d["_kw_score"] = score
+            scored_local.append(d)
+            # Early exit once we have plenty to rank
+            if len(scored_local) >= (limit * 20) and scanned >= min(candidate_limit, 2000):
+                break
         return _top_k(scored_local)
 
-    # GLMP processes
-    if "glmp" in content_types:
-        results["glmp_processes"] = _keyword_processes(
-            COLLECTION_GLMP_PROCESSES,
-            "glmp_processes",
-            title_fields=["title", "name"],
-            body_fields=["description", "category", "entities", "keywords"]
-        )
-
-    # Math processes
-    if "math" in content_types:
-        results["math_processes"] = _keyword_processes(
-            COLLECTION_MATH_PROCESSES,
-            "math_processes",
-            title_fields=["title", "name"],
-            body_fields=["description", "category", "subcategory", "entities", "keywords"]
-        )
-
-    # Chemistry processes
-    if "chemistry" in content_types:
-        results["chemistry_processes"] = _keyword_processes(
-            COLLECTION_CHEMISTRY_PROCESSES,
-            "chemistry_processes",
-            title_fields=["title", "name"],
-            body_fields=["description", "category", "subcategory", "entities", "keywords"]
-        )
-
-    # Physics processes
-    if "physics" in content_types:
-        results["physics_processes"] = _keyword_processes(
-            COLLECTION_PHYSICS_PROCESSES,
-            "physics_processes",
-            title_fields=["title", "name"],
-            body_fields=["description", "category", "subcategory", "entities", "keywords"]
-        )
+    keyword_store = get_keyword_index_store()
 
-    # CS processes
-    if "computer_science" in content_types:
-        results["computer_science_processes"] = _keyword_processes(
-            COLLECTION_COMPUTER_SCIENCE_PROCESSES,
-            "computer_science_processes",
-            title_fields=["title", "name"],
-            body_fields=["description", "category", "subcategory", "entities", "keywords"]
-        )
+    def _search_type(collection: str, key: str, id_field: str) -> List[Dict[str, Any]]:
+        index = keyword_store.get(collection) if keyword_store is not None else None
+        if index is not None and index.size > 0:
+            results["keyword_engines"][key] = "bm25_index"
+            return _keyword_index_lookup(db, index, collection, id_field, tokens, limit)
+        results["keyword_engines"][key] = "scan"
+        return _keyword_scan(collection, id_field)
 
-    # Biology processes
-    if "biology" in content_types:
-        results["biology_processes"] = _keyword_processes(
-            COLLECTION_BIOLOGY_PROCESSES,
-            "biology_processes",
-            title_fields=["title", "name"],
-            body_fields=["description", "category", "subcategory", "entities", "keywords"]
-        )
+    tasks = {
+        key: partial(_search_type, collection, key, id_field)
+        for content_type, (collection, key, id_field) in _CONTENT_TYPE_SPECS.items()
+        if content_type in content_types
+    }
+    found, report = await fan_out(tasks, default=[])
+    results.update(found)
+    results["keyword_fanout_report"] = report
 
     return results
 
@@ -450,14 +493,17 @@ async def search_semantic(
         db = get_firestore_client()
 
         # Query embedding: OpenAI (preferred) or Vertex via embedding_factory — not gated on DISABLE_VERTEX_AI.
-        query_embedding = None
-        try:
-            embedding_service = get_embedding_service()
-            query_embedding = embedding_service.embed_text(query)
-        except Exception as e:
-            logger.warning(f"Embedding generation unavailable; using keyword search only: {e}")
-            query_embedding = None
-        
+        # It is a blocking network call, so it runs on the fan-out pool under the
+        # same timeout as the collection searches; a slow or failing provider
+        # drops the search to keyword-only instead of stalling the event loop.
+        embedded, embedding_report = await fan_out({"query_embedding": partial(embed_query, query)}, default=None)
+        query_embedding = embedded["query_embedding"]
+        if query_embedding is None:
+            logger.warning(
+                "Embedding generation unavailable; using keyword search only: "
+                f"{embedding_report['query_embedding']}"
+            )
+
         results = {
             "query": query,
             "content_types_searched": content_types,
@@ -471,13 +517,14 @@ async def search_semantic(
             "computer_science_processes": [],
             "biology_processes": [],
             "videos": [],
-            "search_method": "vector_semantic" if query_embedding is not None else "keyword_only"
+            "search_method": "vector_semantic" if query_embedding is not None else "keyword_only",
+            "embedding_report": embedding_report["query_embedding"],
         }
 
         # Keyword-first mode (no embeddings available)
         if query_embedding is None:
             try:
-                fallback = _keyword_fallback_search(
+                fallback = await _keyword_fallback_search(
                     db=db,
                     query=query,
                     content_types=content_types,
@@ -502,335 +549,31 @@ async def search_semantic(
                 logger.warning(f"Keyword-only search failed: {e}")
                 return json.dumps(results, indent=2)
         
-        # Search papers using vector search
-        if "papers" in content_types:
-            try:
-                papers_ref = db.collection(COLLECTION_PAPERS)
-
-                if question:
-                    # Search directly within the question-scoped candidate set
-                    # rather than over-fetching a global top-K by raw query-text
-                    # similarity and filtering in Python. The old over-fetch
-                    # pattern let a legitimately-attributed, well-ranked paper
-                    # be entirely absent from the pre-filter pool whenever it
-                    # didn't also rank well by literal text similarity to the
-                    # query -- confirmed severe (not cosmetic) in
-                    # GLMP_MASTER_TODO.md item 53: the glmp-q11 ChIP-seq paper
-                    # ranked 60th of 471 within its own scoped set but wasn't
-                    # in the top 80 of the global candidate pool, so it never
-                    # reached the filter at all. question_scope_ids is a flat
-                    # array field (backfilled from acquisition_matches[].question
-                    # + cited_for_question) that Firestore can array-contains
-                    # query directly, since it can't query into an array of maps.
-                    scoped_docs = papers_ref.where(
-                        filter=FieldFilter("question_scope_ids", "array_contains", question)
-                    ).stream()
-
-                    scored: List[tuple] = []
-                    for doc in scoped_docs:
-                        paper_data = doc.to_dict()
-                        embedding = paper_data.get("embedding")
-                        if embedding is None:
-                            continue
-                        similarity = _cosine_similarity(query_embedding, list(embedding))
-                        if (1.0 - similarity) > distance_threshold:
-                            continue
-                        paper_data["paper_id"] = doc.id
-                        paper_data["similarity_score"] = similarity
-                        paper_data.pop("embedding", None)
-                        paper_data = _serialize_firestore_value(paper_data)
-                        scored.append((similarity, paper_data))
-
-                    scored.sort(key=lambda pair: pair[0], reverse=True)
-                    results["papers"] = [p for _, p in scored[:limit]]
-
-                    logger.info(
-                        f"Found {len(results['papers'])} papers via scoped search "
-                        f"(question={question}, candidate_pool={len(scored)})"
-                    )
-                else:
-                    # Use Firestore vector search (find_nearest)
-                    # Note: This requires documents to have an 'embedding' field
-                    vector_query = papers_ref.find_nearest(
-                        vector_field="embedding",
-                        query_vector=Vector(query_embedding),
-                        limit=limit,
-                        distance_measure=DistanceMeasure.COSINE,
-                        distance_threshold=distance_threshold,
-                        distance_result_field="distance"
-                    )
-
-                    paper_docs = vector_query.stream()
-
-                    for doc in paper_docs:
-                        paper_data = doc.to_dict()
-                        paper_data["paper_id"] = doc.id
-                        paper_data["similarity_score"] = 1.0 - paper_data.get("distance", 1.0)
-                        # Remove embedding from response (too large)
-                        paper_data.pop("embedding", None)
-                        # Convert Firestore types to JSON-serializable
-                        paper_data = _serialize_firestore_value(paper_data)
-                        results["papers"].append(paper_data)
-
-                    logger.info(f"Found {len(results['papers'])} papers via vector search")
-                
-            except Exception as e:
-                logger.warning(f"Vector search for papers failed, may not have embeddings: {e}")
-                # Fallback: return empty results rather than failing
-                results["papers"] = []
-        
-        # Search podcasts using vector search
-        if "podcasts" in content_types:
-            try:
-                podcasts_ref = db.collection(COLLECTION_PODCASTS)
-                
-                vector_query = podcasts_ref.find_nearest(
-                    vector_field="embedding",
-                    query_vector=Vector(query_embedding),
-                    limit=limit,
-                    distance_measure=DistanceMeasure.COSINE,
-                    distance_threshold=distance_threshold,
-                        distance_result_field="distance"
-                )
-                
-                podcast_docs = vector_query.stream()
-                
-                for doc in podcast_docs:
-                    podcast_data = doc.to_dict()
-                    podcast_data["job_id"] = doc.id
-                    podcast_data["similarity_score"] = 1.0 - podcast_data.get("distance", 1.0)
-                    # Remove embedding from response
-                    podcast_data.pop("embedding", None)
-                    # Convert Firestore types to JSON-serializable
-                    podcast_data = _serialize_firestore_value(podcast_data)
-                    results["podcasts"].append(podcast_data)
-                
-                logger.info(f"Found {len(results['podcasts'])} podcasts via vector search")
-                
-            except Exception as e:
-                logger.warning(f"Vector search for podcasts failed, may not have embeddings: {e}")
-                results["podcasts"] = []
-
-        if "videos" in content_types:
-            try:
-                videos_ref = db.collection(COLLECTION_VIDEOS)
-                vector_query = videos_ref.find_nearest(
-                    vector_field="embedding",
-                    query_vector=Vector(query_embedding),
-                    limit=limit,
-                    distance_measure=DistanceMeasure.COSINE,
-                    distance_threshold=distance_threshold,
-                    distance_result_field="distance",
-                )
-                for doc in vector_query.stream():
-                    video_data = doc.to_dict() or {}
-                    video_data["video_id"] = video_data.get("video_id") or doc.id
-                    video_data["similarity_score"] = 1.0 - video_data.get("distance", 1.0)
-                    video_data.pop("embedding", None)
-                    video_data.pop("transcript", None)
-                    video_data = _serialize_firestore_value(video_data)
-                    results["videos"].append(video_data)
-                logger.info(f"Found {len(results['videos'])} videos via vector search")
-            except Exception as e:
-                logger.warning(f"Vector search for videos failed, may not have embeddings: {e}")
-                results["videos"] = []
-        
-        # Search GLMP processes using vector search
-        if "glmp" in content_types:
-            try:
-                glmp_ref = db.collection(COLLECTION_GLMP_PROCESSES)
-                
-                # Use Firestore vector search (find_nearest)
-                vector_query = glmp_ref.find_nearest(
-                    vector_field="embedding",
-                    query_vector=Vector(query_embedding),
-                    limit=limit,
-                    distance_measure=DistanceMeasure.COSINE,
-                    distance_threshold=distance_threshold,
-                        distance_result_field="distance"
-                )
-                
-                glmp_docs = vector_query.stream()
-                
-                for doc in glmp_docs:
-                    glmp_data = doc.to_dict()
-                    glmp_data["process_id"] = doc.id
-                    glmp_data["similarity_score"] = 1.0 - glmp_data.get("distance", 1.0)
-                    # Remove embedding from response (too large)
-                    glmp_data.pop("embedding", None)
-                    # Remove large mermaid_code from response (can be fetched separately if needed)
-                    if "mermaid_code" in glmp_data and len(str(glmp_data["mermaid_code"])) > 500:
-                        glmp_data["has_mermaid"] = True
-                        glmp_data.pop("mermaid_code", None)
-                    # Convert Firestore types to JSON-serializable
-                    glmp_data = _serialize_firestore_value(glmp_data)
-                    results["glmp_processes"].append(glmp_data)
-                
-                logger.info(f"Found {len(results['glmp_processes'])} GLMP processes via vector search")
-                
-            except Exception as e:
-                logger.warning(f"Vector search for GLMP processes failed: {e}")
-                results["glmp_processes"] = []
-        
-        # Search math processes using vector search
-        if "math" in content_types:
-            try:
-                math_ref = db.collection(COLLECTION_MATH_PROCESSES)
-                
-                # Use Firestore vector search (find_nearest)
-                vector_query = math_ref.find_nearest(
-                    vector_field="embedding",
-                    query_vector=Vector(query_embedding),
-                    limit=limit,
-                    distance_measure=DistanceMeasure.COSINE,
-                    distance_threshold=distance_threshold,
-                        distance_result_field="distance"
-                )
-                
-                math_docs = vector_query.stream()
-                
-                for doc in math_docs:
-                    math_data = doc.to_dict()
-                    math_data["process_id"] = doc.id
-                    math_data["similarity_score"] = 1.0 - math_data.get("distance", 1.0)
-                    # Remove embedding from response (too large)
-                    math_data.pop("embedding", None)
-                    # Remove large mermaid_code from response (can be fetched separately if needed)
-                    if "mermaid_code" in math_data and len(str(math_data["mermaid_code"])) > 500:
-                        math_data["has_mermaid"] = True
-                        math_data.pop("mermaid_code", None)
-                    # Convert Firestore types to JSON-serializable
-                    math_data = _serialize_firestore_value(math_data)
-                    results["math_processes"].append(math_data)
-                
-                logger.info(f"Found {len(results['math_processes'])} math processes via vector search")
-                
-            except Exception as e:
-                logger.warning(f"Vector search for math processes failed: {e}")
-                results["math_processes"] = []
-        
-        # Search chemistry processes using vector search
-        if "chemistry" in content_types:
-            try:
-                chemistry_ref = db.collection(COLLECTION_CHEMISTRY_PROCESSES)
-                vector_query = chemistry_ref.find_nearest(
-                    vector_field="embedding",
-                    query_vector=Vector(query_embedding),
-                    limit=limit,
-                    distance_measure=DistanceMeasure.COSINE,
-                    distance_threshold=distance_threshold,
-                        distance_result_field="distance"
-                )
-                
-                chemistry_docs = vector_query.stream()
-                
-                for doc in chemistry_docs:
-                    chemistry_data = doc.to_dict()
-                    chemistry_data["process_id"] = doc.id
-                    chemistry_data["similarity_score"] = 1.0 - chemistry_data.get("distance", 1.0)
-                    chemistry_data.pop("embedding", None)
-                    if "mermaid_code" in chemistry_data and len(str(chemistry_data["mermaid_code"])) > 500:
-                        chemistry_data["has_mermaid"] = True
-                        chemistry_data.pop("mermaid_code", None)
-                    chemistry_data = _serialize_firestore_value(chemistry_data)
-                    results["chemistry_processes"].append(chemistry_data)
-                
-                logger.info(f"Found {len(results['chemistry_processes'])} chemistry processes via vector search")
-                
-            except Exception as e:
-                logger.warning(f"Vector search for chemistry processes failed: {e}")
-                results["chemistry_processes"] = []
-        
-        # Search physics processes using vector search
-        if "physics" in content_types:
-            try:
-                physics_ref = db.collection(COLLECTION_PHYSICS_PROCESSES)
-                vector_query = physics_ref.find_nearest(
-                    vector_field="embedding",
-                    query_vector=Vector(query_embedding),
-                    limit=limit,
-                    distance_measure=DistanceMeasure.COSINE,
-                    distance_threshold=distance_threshold,
-                        distance_result_field="distance"
+        # Which engine answered each collection: "local_index" or "firestore".
+        vector_engines: Dict[str, str] = {}
+
+        # One task per content type, run concurrently. A type that errors or
+        # times out comes back empty and is flagged in fanout_report rather
+        # than failing the whole search.
+        tasks = {}
+        for content_type, (collection, key, id_field) in _CONTENT_TYPE_SPECS.items():
+            if content_type not in content_types:
+                continue
+            if content_type == "papers" and question:
+                tasks[key] = partial(
+                    _scoped_paper_search, db, question, query_embedding, limit, distance_threshold
                 )
-                
-                physics_docs = vector_query.stream()
-                
-                for doc in physics_docs:
-                    physics_data = doc.to_dict()
-                    physics_data["process_id"] = doc.id
-                    physics_data["similarity_score"] = 1.0 - physics_data.get("distance", 1.0)
-                    physics_data.pop("embedding", None)
-                    if "mermaid_code" in physics_data and len(str(physics_data["mermaid_code"])) > 500:
-                        physics_data["has_mermaid"] = True
-                        physics_data.pop("mermaid_code", None)
-                    physics_data = _serialize_firestore_value(physics_data)
-                    results["physics_processes"].append(physics_data)
-                
-                logger.info(f"Found {len(results['physics_processes'])} physics processes via vector search")
-                
-            except Exception as e:
-                logger.warning(f"Vector search for physics processes failed: {e}")
-                results["physics_processes"] = []
-        
-        # Search computer science processes using vector search
-        if "computer_science" in content_types:
-            try:
-                cs_ref = db.collection(COLLECTION_COMPUTER_SCIENCE_PROCESSES)
-                vector_query = cs_ref.find_nearest(
-                    vector_field="embedding",
-                    query_vector=Vector(query_embedding),
-                    limit=limit,
-                    distance_measure=DistanceMeasure.COSINE,
-                    distance_threshold=distance_threshold,
-                        distance_result_field="distance"
+            else:
+                # Local ANN snapshot or Firestore vector search (find_nearest)
+                # Note: This requires documents to have an 'embedding' field
+                tasks[key] = partial(
+                    _vector_search_collection, db, collection, id_field,
+                    query_embedding, limit, distance_threshold, vector_engines
                 )
-                
-                cs_docs = vector_query.stream()
-                
-                for doc in cs_docs:
-                    cs_data = doc.to_dict()
-                    cs_data["process_id"] = doc.id
-                    cs_data["similarity_score"] = 1.0 - cs_data.get("distance", 1.0)
-                    cs_data.pop("embedding", None)
-                    if "mermaid_code" in cs_data and len(str(cs_data["mermaid_code"])) > 500:
-                        cs_data["has_mermaid"] = True
-                        cs_data.pop("mermaid_code", None)
-                    cs_data = _serialize_firestore_value(cs_data)
-                    results["computer_science_processes"].append(cs_data)
-                
-                logger.info(f"Found {len(results['computer_science_processes'])} computer science processes via vector search")
-                
-            except Exception as e:
-                logger.warning(f"Vector search for computer science processes failed: {e}")
-                results["computer_science_processes"] = []
-        
-        # Search biology processes using vector search
-        if "biology" in content_types:
-            try:
-                bio_ref = db.collection(COLLECTION_BIOLOGY_PROCESSES)
-                vector_query = bio_ref.find_nearest(
-                    vector_field="embedding",
-                    query_vector=Vector(query_embedding),
-                    limit=limit,
-                    distance_measure=DistanceMeasure.COSINE,
-                    distance_threshold=distance_threshold,
-                        distance_result_field="distance"
-                )
-                for doc in vector_query.stream():
-                    bio_data = doc.to_dict()
-                    bio_data["process_id"] = doc.id
-                    bio_data["similarity_score"] = 1.0 - bio_data.get("distance", 1.0)
-                    bio_data.pop("embedding", None)
-                    if "mermaid_code" in bio_data and len(str(bio_data["mermaid_code"])) > 500:
-                        bio_data["has_mermaid"] = True
-                        bio_data.pop("mermaid_code", None)
-                    bio_data = _serialize_firestore_value(bio_data)
-                    results["biology_processes"].append(bio_data)
-                logger.info(f"Found {len(results['biology_processes'])} biology processes via vector search")
-            except Exception as e:
-                logger.warning(f"Vector search for biology processes failed: {e}")
-                results["biology_processes"] = []
+        found, fanout_report = await fan_out(tasks, default=[])
+        results.update(found)
+        results["fanout_report"] = fanout_report
+        results["vector_engines"] = vector_engines
 
         # Add summary counts
         results["counts"] = {
@@ -850,7 +593,7 @@ async def search_semantic(
         # fall back to a lightweight keyword search over a limited sample.
         if results["counts"]["total"] == 0:
             try:
-                fallback = _keyword_fallback_search(
+                fallback = await _keyword_fallback_search(
                     db=db,
                     query=query,
                     content_types=content_types,
@@ -916,169 +659,33 @@ async def find_similar_content(
         # Validate limit
         limit = min(max(1, limit), MAX_QUERY_LIMIT)
         
-        # Initialize services
-        embedding_service = get_embedding_service()
-        db = get_firestore_client()
-        
-        # Get the source content and its embedding
-        source_embedding = None
-        source_info = {}
-        
-        if content_type == "paper":
-            paper_ref = db.collection(COLLECTION_PAPERS).document(content_id)
-            paper_doc = paper_ref.get()
-            
-            if not paper_doc.exists:
-                return json.dumps({
-                    "error": f"Paper not found: {content_id}",
-                    "similar_content": []
-                })
-            
-            paper_data = paper_doc.to_dict()
-            source_embedding = paper_data.get("embedding")
-            source_info = {
-                "type": "paper",
-                "id": content_id,
-                "title": paper_data.get("title")
-            }
-            
-            # If no embedding, generate one
-            if not source_embedding:
-                text = create_text_for_paper(paper_data)
-                source_embedding = embedding_service.embed_text(text)
-        
-        elif content_type == "podcast":
-            podcast_ref = db.collection(COLLECTION_PODCASTS).document(content_id)
-            podcast_doc = podcast_ref.get()
-            
-            if not podcast_doc.exists:
-                return json.dumps({
-                    "error": f"Podcast not found: {content_id}",
-                    "similar_content": []
-                })
-            
-            podcast_data = podcast_doc.to_dict()
-            source_embedding = podcast_data.get("embedding")
-            source_info = {
-                "type": "podcast",
-                "id": content_id,
-                "title": podcast_data.get("title")
-            }
-            
-            # If no embedding, generate one
-            if not source_embedding:
-                text = create_text_for_podcast(podcast_data)
-                source_embedding = embedding_service.embed_text(text)
-        
-        elif content_type == "glmp":
-            # Get GLMP process from Firestore
-            glmp_doc = db.collection(COLLECTION_GLMP_PROCESSES).document(content_id).get()
-            if not glmp_doc.exists:
-                return json.dumps({
-                    "error": f"GLMP process not found: {content_id}",
-                    "similar_content": []
-                })
-            
-            glmp_data = glmp_doc.to_dict()
-            source_embedding = glmp_data.get("embedding")
-            source_info = {
-                "type": "glmp",
-                "id": content_id,
-                "title": glmp_data.get("title") or glmp_data.get("name")
-            }
-            
-            # If no embedding, generate one
-            if not source_embedding:
-                text = create_text_for_glmp(glmp_data)
-                source_embedding = embedding_service.embed_text(text)
-        
-        elif content_type == "math":
-            # Get math process from Firestore
-            math_doc = db.collection(COLLECTION_MATH_PROCESSES).document(content_id).get()
-            if not math_doc.exists:
-                return json.dumps({
-                    "error": f"Math process not found: {content_id}",
-                    "similar_content": []
-                })
-            
-            math_data = math_doc.to_dict()
-            source_embedding = math_data.get("embedding")
-            source_info = {
-                "type": "math",
-                "id": content_id,
-                "title": math_data.get("title")
-            }
-            
-            # If no embedding, generate one
-            if not source_embedding:
-                text = create_text_for_math(math_data)
-                source_embedding = embedding_service.embed_text(text)
-        
-        elif content_type == "chemistry":
-            chemistry_doc = db.collection(COLLECTION_CHEMISTRY_PROCESSES).document(content_id).get()
-            if not chemistry_doc.exists:
-                return json.dumps({
-                    "error": f"Chemistry process not found: {content_id}",
-                    "similar_content": []
-                })
-            
-            chemistry_data = chemistry_doc.to_dict()
-            source_embedding = chemistry_data.get("embedding")
-            source_info = {
-                "type": "chemistry",
-                "id": content_id,
-                "title": chemistry_data.get("title")
-            }
-            
-            if not source_embedding:
-                text = create_text_for_chemistry(chemistry_data)
-                source_embedding = embedding_service.embed_text(text)
-        
-        elif content_type == "physics":
-            physics_doc = db.collection(COLLECTION_PHYSICS_PROCESSES).document(content_id).get()
-            if not physics_doc.exists:
-                return json.dumps({
-                    "error": f"Physics process not found: {content_id}",
-                    "similar_content": []
-                })
-            
-            physics_data = physics_doc.to_dict()
-            source_embedding = physics_data.get("embedding")
-            source_info = {
-                "type": "physics",
-                "id": content_id,
-                "title": physics_data.get("title")
-            }
-            
-            if not source_embedding:
-                text = create_text_for_physics(physics_data)
-                source_embedding = embedding_service.embed_text(text)
-        
-        elif content_type == "computer_science":
-            cs_doc = db.collection(COLLECTION_COMPUTER_SCIENCE_PROCESSES).document(content_id).get()
-            if not cs_doc.exists:
-                return json.dumps({
-                    "error": f"Computer science process not found: {content_id}",
-                    "similar_content": []
-                })
-            
-            cs_data = cs_doc.to_dict()
-            source_embedding = cs_data.get("embedding")
-            source_info = {
-                "type": "computer_science",
-                "id": content_id,
-                "title": cs_data.get("title")
-            }
-            
-            if not source_embedding:
-                text = create_text_for_computer_science(cs_data)
-                source_embedding = embedding_service.embed_text(text)
-        
-        else:
+        if content_type not in _SIMILARITY_SOURCES:
             return json.dumps({
                 "error": f"Unknown content type: {content_type}",
                 "similar_content": []
             })
+
+        db = get_firestore_client()
+
+        # The source lookup (and embedding it when it has none stored) is
+        # blocking I/O, so it runs on the fan-out pool under the same timeout
+        # as the searches below rather than on the event loop.
+        loaded, source_report = await fan_out(
+            {"source": partial(_load_similarity_source, db, content_id, content_type)}, default=None
+        )
+        source = loaded["source"]
+        if source is None:
+            return json.dumps({
+                "error": f"Could not load source content: {source_report['source']}",
+                "similar_content": []
+            })
+        if "error" in source:
+            return json.dumps({
+                "error": source["error"],
+                "similar_content": []
+            })
+        source_info = source["info"]
+        source_embedding = source["embedding"]
         
         if not source_embedding:
             return json.dumps({
@@ -1098,125 +705,26 @@ async def find_similar_content(
             "similar_computer_science_processes": []
         }
         
-        # Find similar papers
-        try:
-            papers_ref = db.collection(COLLECTION_PAPERS)
-            vector_query = papers_ref.find_nearest(
-                vector_field="embedding",
-                query_vector=Vector(source_embedding),
-                limit=limit,
-                distance_measure=DistanceMeasure.COSINE,
-                distance_threshold=0.8,  # Slightly more lenient for similarity
-                distance_result_field="distance"
-            )
-            
-            for doc in vector_query.stream():
-                if doc.id == content_id and content_type == "paper":
-                    continue  # Skip the source paper itself
-                
-                paper_data = doc.to_dict()
-                paper_data["paper_id"] = doc.id
-                paper_data["similarity_score"] = 1.0 - paper_data.get("distance", 1.0)
-                paper_data.pop("embedding", None)
-                # Convert Firestore types to JSON-serializable
-                paper_data = _serialize_firestore_value(paper_data)
-                results["similar_papers"].append(paper_data)
-        
-        except Exception as e:
-            logger.warning(f"Similar papers search failed: {e}")
-            results["similar_papers"] = []
-        
-        # Find similar podcasts
-        try:
-            podcasts_ref = db.collection(COLLECTION_PODCASTS)
-            vector_query = podcasts_ref.find_nearest(
-                vector_field="embedding",
-                query_vector=Vector(source_embedding),
-                limit=limit,
-                distance_measure=DistanceMeasure.COSINE,
-                distance_threshold=0.8,
-                distance_result_field="distance"
+        # Find similar papers, podcasts, GLMP and math processes concurrently.
+        # (source content_type, collection, id field, results key)
+        similar_targets = [
+            ("paper", COLLECTION_PAPERS, "paper_id", "similar_papers"),
+            ("podcast", COLLECTION_PODCASTS, "job_id", "similar_podcasts"),
+            ("glmp", COLLECTION_GLMP_PROCESSES, "process_id", "similar_glmp_processes"),
+            ("math", COLLECTION_MATH_PROCESSES, "process_id", "similar_math_processes"),
+        ]
+        tasks = {
+            key: partial(
+                _vector_search_collection, db, collection, id_field, source_embedding,
+                limit, 0.8,  # Slightly more lenient for similarity
+                # Skip the source item itself
+                exclude_id=content_id if target_type == content_type else None,
             )
-            
-            for doc in vector_query.stream():
-                if doc.id == content_id and content_type == "podcast":
-                    continue  # Skip the source podcast itself
-                
-                podcast_data = doc.to_dict()
-                podcast_data["job_id"] = doc.id
-                podcast_data["similarity_score"] = 1.0 - podcast_data.get("distance", 1.0)
-                podcast_data.pop("embedding", None)
-                # Convert Firestore types to JSON-serializable
-                podcast_data = _serialize_firestore_value(podcast_data)
-                results["similar_podcasts"].append(podcast_data)
-        
-        except Exception as e:
-            logger.warning(f"Similar podcasts search failed: {e}")
-            results["similar_podcasts"] = []
-        
-        # Find similar GLMP processes
-        try:
-            glmp_ref = db.collection(COLLECTION_GLMP_PROCESSES)
-            vector_query = glmp_ref.find_nearest(
-                vector_field="embedding",
-                query_vector=Vector(source_embedding),
-                limit=limit,
-                distance_measure=DistanceMeasure.COSINE,
-                distance_threshold=0.8,
-                distance_result_field="distance"
-            )
-            
-            for doc in vector_query.stream():
-                if doc.id == content_id and content_type == "glmp":
-                    continue  # Skip the source GLMP process itself
-                
-                glmp_data = doc.to_dict()
-                glmp_data["process_id"] = doc.id
-                glmp_data["similarity_score"] = 1.0 - glmp_data.get("distance", 1.0)
-                glmp_data.pop("embedding", None)
-                # Remove large mermaid_code from response
-                if "mermaid_code" in glmp_data and len(str(glmp_data["mermaid_code"])) > 500:
-                    glmp_data["has_mermaid"] = True
-                    glmp_data.pop("mermaid_code", None)
-                # Convert Firestore types to JSON-serializable
-                glmp_data = _serialize_firestore_value(glmp_data)
-                results["similar_glmp_processes"].append(glmp_data)
-        
-        except Exception as e:
-            logger.warning(f"Similar GLMP processes search failed: {e}")
-            results["similar_glmp_processes"] = []
-        
-        # Find similar math processes
-        try:
-            math_ref = db.collection(COLLECTION_MATH_PROCESSES)
-            vector_query = math_ref.find_nearest(
-                vector_field="embedding",
-                query_vector=Vector(source_embedding),
-                limit=limit,
-                distance_measure=DistanceMeasure.COSINE,
-                distance_threshold=0.8,
-                distance_result_field="distance"
-            )
-            
-            for doc in vector_query.stream():
-                if doc.id == content_id and content_type == "math":
-                    continue  # Skip the source math process itself
-                
-                math_data = doc.to_dict()
-                math_data["process_id"] = doc.id
-                math_data["similarity_score"] = 1.0 - math_data.get("distance", 1.0)
-                math_data.pop("embedding", None)
-                # Remove large mermaid_code from response
-                if "mermaid_code" in math_data and len(str(math_data["mermaid_code"])) > 500:
-                    math_data["has_mermaid"] = True
-                    math_data.pop("mermaid_code", None)
-                # Convert Firestore types to JSON-serializable
-                math_data = _serialize_firestore_value(math_data)
-                results["similar_math_processes"].append(math_data)
-        
-        except Exception as e:
-            logger.warning(f"Similar math processes search failed: {e}")
-            results["similar_math_processes"] = []
+            for target_type, collection, id_field, key in similar_targets
+        }
+        found, fanout_report = await fan_out(tasks, default=[])
+        results.update(found)
+        results["fanout_report"] = fanout_report
         
         # Add counts
         results["counts"] = {
@@ -1366,3 +874,40 @@ def create_text_for_computer_science(process: Dict[str, Any]) -> str:
         parts.append(f"Mermaid: {mermaid_text}")
     return '\n'.join(parts)
 
+
+# find_similar_content source types -> (collection, label for "not found"
+# errors, text builder for items stored without an embedding)
+_SIMILARITY_SOURCES: Dict[str, Tuple[str, str, Callable[[Dict[str, Any]], str]]] = {
+    "paper": (COLLECTION_PAPERS, "Paper", create_text_for_paper),
+    "podcast": (COLLECTION_PODCASTS, "Podcast", create_text_for_podcast),
+    "glmp": (COLLECTION_GLMP_PROCESSES, "GLMP process", create_text_for_glmp),
+    "math": (COLLECTION_MATH_PROCESSES, "Math process", create_text_for_math),
+    "chemistry": (COLLECTION_CHEMISTRY_PROCESSES, "Chemistry process", create_text_for_chemistry),
+    "physics": (COLLECTION_PHYSICS_PROCESSES, "Physics process", create_text_for_physics),
+    "computer_science": (COLLECTION_COMPUTER_SCIENCE_PROCESSES, "Computer science process", create_text_for_computer_science),
+}
+
+
+def _load_similarity_source(db, content_id: str, content_type: str) -> Dict[str, Any]:
+    """
+    Fetch the source item of find_similar_content and its embedding (blocking).
+
+    Returns {"info": ..., "embedding": ...}, or {"error": ...} when the item
+    doesn't exist. Items stored without an embedding are embedded here.
+    """
+    collection, label, text_builder = _SIMILARITY_SOURCES[content_type]
+    doc = db.collection(collection).document(content_id).get()
+    if not doc.exists:
+        return {"error": f"{label} not found: {content_id}"}
+
+    data = doc.to_dict()
+    title = data.get("title")
+    if content_type == "glmp":
+        title = title or data.get("name")
+    embedding = data.get("embedding")
+    if not embedding:
+        embedding = get_embedding_service().embed_text(text_builder(data))
+    return {
+        "info": {"type": content_type, "id": content_id, "title": title},
+        "embedding": embedding,
+    }
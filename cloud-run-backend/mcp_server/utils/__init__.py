@@ -4,6 +4,9 @@ Utility modules for MCP server
 
 from .firestore_client import get_firestore_client, query_collection, get_document
 from .gcs_client import get_storage_client, list_glmp_files, get_glmp_file, search_glmp_files
+from .glmp_catalog import get_glmp_catalog
+from .vector_index import get_vector_index_registry
+from .keyword_index import get_keyword_index_store
 
 __all__ = [
     # Firestore utilities
@@ -15,5 +18,9 @@ __all__ = [
     "list_glmp_files",
     "get_glmp_file",
     "search_glmp_files",
+    "get_glmp_catalog",
+    # Local search indexes
+    "get_vector_index_registry",
+    "get_keyword_index_store",
 ]
 
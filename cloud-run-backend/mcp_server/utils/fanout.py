@@ -0,0 +1,107 @@
+"""
+Concurrent fan-out for per-collection searches
+
+The Firestore client is synchronous, so searching nine collections from an
+async handler used to block the event loop for the sum of nine round trips.
+`fan_out` runs each per-collection callable on a shared, bounded thread pool
+and awaits them together with a per-task timeout, so latency becomes the
+slowest collection rather than the sum, and one slow collection cannot sink
+the whole response.
+
+The timeout runs from when a task starts on a worker, not from submission:
+when the pool is busy (or still occupied by earlier timed-out tasks) time
+spent queued doesn't eat into a task's budget. Queue time is reported
+separately and is bounded by the same timeout; a task that never got a
+worker is cancelled before it starts.
+
+A timed-out task is reported and its result dropped; the worker thread is
+not interrupted (Python threads can't be) and finishes in the background.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_fanout_executor() -> ThreadPoolExecutor:
+    """Shared pool for search fan-out (sized by SEARCH_FANOUT_MAX_WORKERS)."""
+    global _executor
+    if _executor is None:
+        from mcp_server.config import SEARCH_FANOUT_MAX_WORKERS
+        _executor = ThreadPoolExecutor(max_workers=SEARCH_FANOUT_MAX_WORKERS, thread_name_prefix="search-fanout")
+    return _executor
+
+
+async def fan_out(
+    tasks: Dict[str, Callable[[], Any]],
+    timeout: Optional[float] = None,
+    default: Any = None,
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """
+    Run synchronous callables concurrently, each bounded by `timeout` seconds.
+
+    Args:
+        tasks: key -> zero-argument callable (bind arguments with a lambda/partial)
+        timeout: Per-task timeout in seconds (default: SEARCH_FANOUT_TIMEOUT_SECONDS)
+        default: Value stored for a key whose task timed out or raised
+
+    Returns:
+        (results, report) -- results maps every key to its value or `default`;
+        report maps every key to {"status": "ok"|"timeout"|"error",
+        "latency_ms": int, "queue_ms": int} plus "error" for failures and
+        "queued": True for a task that timed out waiting for a worker.
+        latency_ms is measured from when the task started running.
+    """
+    if timeout is None:
+        from mcp_server.config import SEARCH_FANOUT_TIMEOUT_SECONDS
+        timeout = SEARCH_FANOUT_TIMEOUT_SECONDS
+    loop = asyncio.get_running_loop()
+    executor = get_fanout_executor()
+
+    def _mark_started(started: asyncio.Future) -> None:
+        if not started.done():
+            started.set_result(time.perf_counter())
+
+    async def _run(key: str, fn: Callable[[], Any]) -> Tuple[str, Any, Dict[str, Any]]:
+        submitted = time.perf_counter()
+        started = loop.create_future()
+
+        def work() -> Any:
+            loop.call_soon_threadsafe(_mark_started, started)
+            return fn()
+
+        future = loop.run_in_executor(executor, work)
+        begun = None
+        try:
+            try:
+                begun = await asyncio.wait_for(asyncio.shield(started), timeout=timeout)
+            except asyncio.TimeoutError:
+                future.cancel()  # never reached a worker: drop it from the queue
+                logger.warning(f"Fan-out task {key} waited {timeout}s for a worker")
+                value, entry = default, {"status": "timeout", "queued": True}
+            else:
+                value = await asyncio.wait_for(future, timeout=timeout)
+                entry: Dict[str, Any] = {"status": "ok"}
+        except asyncio.TimeoutError:
+            logger.warning(f"Fan-out task {key} timed out after {timeout}s")
+            value, entry = default, {"status": "timeout"}
+        except Exception as e:
+            logger.warning(f"Fan-out task {key} failed: {e}")
+            value, entry = default, {"status": "error", "error": str(e)}
+        finished = time.perf_counter()
+        if begun is None and started.done():
+            begun = started.result()  # started just as its queue wait ran out
+        entry["queue_ms"] = int(((begun or finished) - submitted) * 1000)
+        entry["latency_ms"] = int((finished - (begun or finished)) * 1000)
+        return key, value, entry
+
+    outcomes = await asyncio.gather(*(_run(key, fn) for key, fn in tasks.items()))
+    results = {key: value for key, value, _ in outcomes}
+    report = {key: entry for key, _, entry in outcomes}
+    return results, report
@@ -1,14 +1,17 @@
 """
 Google Cloud Storage client utilities for MCP server
 
-Provides functions for accessing GLMP process files stored in GCS.
+Provides functions for accessing GLMP process files stored in GCS. Listing
+and reads go through the in-memory catalog (glmp_catalog.py), so repeated
+calls only touch GCS for files that changed.
 """
 
 from google.cloud import storage
 from typing import List, Dict, Any, Optional
-import json
 import logging
 
+from mcp_server.utils.glmp_catalog import get_glmp_catalog
+
 logger = logging.getLogger(__name__)
 
 # Global GCS client (initialized on first use)
@@ -25,7 +28,7 @@ def get_storage_client() -> storage.Client:
 
 def list_glmp_files(bucket_name: str, prefix: str = "glmp-v2/") -> List[str]:
     """
-    List all GLMP JSON files in GCS bucket.
+    List all GLMP JSON files in GCS bucket (from the in-memory catalog).
     
     Args:
         bucket_name: GCS bucket name
@@ -35,16 +38,7 @@ def list_glmp_files(bucket_name: str, prefix: str = "glmp-v2/") -> List[str]:
         List of blob names (file paths)
     """
     try:
-        client = get_storage_client()
-        bucket = client.bucket(bucket_name)
-        blobs = bucket.list_blobs(prefix=prefix)
-        
-        file_names = []
-        for blob in blobs:
-            if blob.name.endswith('.json'):
-                file_names.append(blob.name)
-        
-        return sorted(file_names)
+        return get_glmp_catalog(bucket_name).names(prefix)
         
     except Exception as e:
         logger.error(f"Error listing GLMP files: {e}", exc_info=True)
@@ -53,7 +47,9 @@ def list_glmp_files(bucket_name: str, prefix: str = "glmp-v2/") -> List[str]:
 
 def get_glmp_file(bucket_name: str, blob_name: str) -> Optional[Dict[str, Any]]:
     """
-    Get and parse a GLMP JSON file from GCS.
+    Get and parse a GLMP JSON file from GCS (from the in-memory catalog).
+    
+    The returned dictionary is shared with other callers; don't modify it.
     
     Args:
         bucket_name: GCS bucket name
@@ -63,15 +59,12 @@ def get_glmp_file(bucket_name: str, blob_name: str) -> Optional[Dict[str, Any]]:
         Parsed JSON as dictionary, or None if not found
     """
     try:
-        client = get_storage_client()
-        bucket = client.bucket(bucket_name)
-        blob = bucket.blob(blob_name)
-        
-        if not blob.exists():
+        entry = get_glmp_catalog(bucket_name).entry(blob_name)
+        if entry is None:
             return None
-        
-        content = blob.download_as_text()
-        return json.loads(content)
+        if entry.error:
+            logger.error(f"Error getting GLMP file {blob_name}: {entry.error}")
+        return entry.data
         
     except Exception as e:
         logger.error(f"Error getting GLMP file {blob_name}: {e}", exc_info=True)
@@ -85,7 +78,7 @@ def search_glmp_files(
     category: Optional[str] = None
 ) -> List[Dict[str, Any]]:
     """
-    Search GLMP files by name, category, or content.
+    Search GLMP files by name, category, or content (in memory, via the catalog).
     
     Args:
         bucket_name: GCS bucket name
@@ -97,11 +90,10 @@ def search_glmp_files(
         List of process dictionaries
     """
     try:
-        file_names = list_glmp_files(bucket_name, prefix)
         results = []
         
-        for file_name in file_names:
-            process = get_glmp_file(bucket_name, file_name)
+        for entry in get_glmp_catalog(bucket_name).entries(prefix):
+            process = entry.data
             if not process:
                 continue
             
@@ -0,0 +1,314 @@
+"""
+In-memory catalog of GLMP process files in GCS
+
+Listing the process prefix and downloading every JSON file on each request
+made /api/glmp/processes, get/preview and the MCP GLMP tools cost one GCS
+round trip per process. The catalog keeps every process file under a listed
+prefix in memory (parsed JSON plus blob generation, etag, size, updated):
+
+- `names(prefix)` re-lists a prefix at most every `refresh_seconds`; the
+  listing carries each blob's generation, so only new or overwritten blobs are
+  downloaded again (with if_generation_match, so content always matches the
+  generation it is filed under) and deleted ones are dropped.
+- `entry(name)` serves from memory while a fresh listing covers the name;
+  otherwise it revalidates with a conditional GET (if_generation_not_match)
+  and downloads only on a change.
+- With a mirror dir, downloaded JSON and a manifest of generations are kept on
+  local disk, so a restarted instance starts warm and refetches only what
+  changed while it was down.
+
+Parsed documents are shared between callers and must be treated as read-only.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.api_core.exceptions import NotFound, NotModified, PreconditionFailed
+
+logger = logging.getLogger(__name__)
+
+_LIST_FIELDS = "items(name,generation,etag,size,updated),nextPageToken"
+_MANIFEST = "manifest.json"
+
+
+@dataclass
+class CatalogEntry:
+    """One process file: blob metadata plus its parsed JSON (or the parse error)."""
+    name: str
+    generation: int
+    etag: Optional[str] = None
+    size: Optional[int] = None
+    updated: Optional[str] = None
+    data: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    checked_at: float = 0.0
+
+    @property
+    def mermaid(self) -> str:
+        data = self.data or {}
+        return data.get("mermaid_syntax") or data.get("mermaid") or data.get("flowchart") or ""
+
+    def manifest_record(self) -> Dict[str, Any]:
+        return {"generation": self.generation, "etag": self.etag, "size": self.size, "updated": self.updated}
+
+
+def _parse(raw: bytes) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    try:
+        data = json.loads(raw.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        return None, str(e)
+    if not isinstance(data, dict):
+        return None, "Process file is not a JSON object"
+    return data, None
+
+
+class GLMPCatalog:
+    """Process files of one bucket, kept in memory and revalidated by generation."""
+
+    def __init__(
+        self,
+        bucket_name: str,
+        refresh_seconds: float = 60.0,
+        mirror_dir: str = "",
+        fetch_workers: int = 8,
+        client: Any = None,
+    ):
+        self.bucket_name = bucket_name
+        self.refresh_seconds = refresh_seconds
+        self.mirror_dir = mirror_dir
+        self.fetch_workers = max(1, fetch_workers)
+        self._client = client
+        self._entries: Dict[str, CatalogEntry] = {}
+        self._listed_at: Dict[str, float] = {}  # prefix -> last listing
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._mirror_lock = threading.Lock()
+        self.stats = {"listings": 0, "downloads": 0, "not_modified": 0}
+        if mirror_dir:
+            self._load_mirror()
+
+    def _bucket(self):
+        if self._client is None:
+            from mcp_server.utils.gcs_client import get_storage_client
+            self._client = get_storage_client()
+        return self._client.bucket(self.bucket_name)
+
+    def _covered(self, name: str, now: float) -> bool:
+        """Whether a listing younger than refresh_seconds includes `name` (caller holds _lock)."""
+        return any(
+            name.startswith(prefix) and now - listed_at < self.refresh_seconds
+            for prefix, listed_at in self._listed_at.items()
+        )
+
+    # --- reads ---
+
+    def names(self, prefix: str = "") -> List[str]:
+        """Sorted blob names of the .json files under `prefix`."""
+        self._ensure_listed(prefix)
+        with self._lock:
+            return sorted(name for name in self._entries if name.startswith(prefix))
+
+    def entries(self, prefix: str = "") -> List[CatalogEntry]:
+        """Entries under `prefix`, in name order."""
+        self._ensure_listed(prefix)
+        with self._lock:
+            return [self._entries[name] for name in sorted(self._entries) if name.startswith(prefix)]
+
+    def entry(self, name: str) -> Optional[CatalogEntry]:
+        """The entry for blob `name`, or None if it does not exist."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and (self._covered(name, now) or now - entry.checked_at < self.refresh_seconds):
+                return entry
+        try:
+            blob = self._bucket().get_blob(
+                name, if_generation_not_match=entry.generation if entry is not None else None
+            )
+        except NotModified:
+            with self._lock:
+                entry.checked_at = now
+                self.stats["not_modified"] += 1
+            return entry
+        if blob is None:
+            with self._lock:
+                self._entries.pop(name, None)
+            if entry is not None:
+                self._save_mirror([], [name])
+            return None
+        fetched = self._fetch(blob)
+        if fetched is None:
+            return entry
+        fetched.checked_at = now
+        with self._lock:
+            self._entries[name] = fetched
+        self._save_mirror([fetched], [])
+        return fetched
+
+    # --- refresh ---
+
+    def _ensure_listed(self, prefix: str) -> None:
+        with self._lock:
+            if self._covered(prefix, time.time()):
+                return
+        with self._refresh_lock:
+            with self._lock:
+                if self._covered(prefix, time.time()):
+                    return  # another thread just listed it
+            self.refresh(prefix)
+
+    def refresh(self, prefix: str = "") -> Dict[str, int]:
+        """List `prefix` and bring the catalog in line with it; returns change counts."""
+        listed = {
+            blob.name: blob
+            for blob in self._bucket().list_blobs(prefix=prefix, fields=_LIST_FIELDS)
+            if blob.name.endswith(".json")
+        }
+        with self._lock:
+            self.stats["listings"] += 1
+            changed = [
+                blob for name, blob in listed.items()
+                if name not in self._entries or self._entries[name].generation != blob.generation
+            ]
+            removed = [name for name in self._entries if name.startswith(prefix) and name not in listed]
+
+        if len(changed) > 1 and self.fetch_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.fetch_workers, len(changed))) as pool:
+                fetched = [e for e in pool.map(self._fetch, changed) if e is not None]
+        else:
+            fetched = [e for e in map(self._fetch, changed) if e is not None]
+
+        now = time.time()
+        with self._lock:
+            for name in removed:
+                self._entries.pop(name, None)
+            for entry in fetched:
+                self._entries[entry.name] = entry
+            for name in listed:
+                if name in self._entries:
+                    self._entries[name].checked_at = now
+            self._listed_at[prefix] = now
+        if fetched or removed:
+            self._save_mirror(fetched, removed)
+            logger.info(
+                f"GLMP catalog {self.bucket_name}/{prefix}: {len(listed)} files, "
+                f"{len(fetched)} fetched, {len(removed)} removed"
+            )
+        return {"listed": len(listed), "fetched": len(fetched), "removed": len(removed)}
+
+    def _fetch(self, blob: Any) -> Optional[CatalogEntry]:
+        """Download one blob at exactly the generation it was listed/fetched with."""
+        try:
+            raw = blob.download_as_bytes(if_generation_match=blob.generation)
+        except (NotFound, PreconditionFailed):
+            # Deleted or overwritten since listing; the next refresh sees its new state
+            return None
+        except Exception as e:
+            logger.warning(f"Could not fetch GLMP file {blob.name}: {e}")
+            return None
+        with self._lock:
+            self.stats["downloads"] += 1
+        data, error = _parse(raw)
+        if error:
+            logger.error(f"Invalid JSON in GLMP file {blob.name}: {error}")
+        updated = getattr(blob, "updated", None)
+        entry = CatalogEntry(
+            name=blob.name,
+            generation=blob.generation,
+            etag=getattr(blob, "etag", None),
+            size=getattr(blob, "size", None),
+            updated=updated.isoformat() if updated else None,
+            data=data,
+            error=error,
+        )
+        if self.mirror_dir:
+            try:
+                self._write_mirror_file(blob.name, raw)
+            except OSError as e:
+                logger.warning(f"Could not mirror GLMP file {blob.name}: {e}")
+        return entry
+
+    # --- local mirror ---
+
+    def _mirror_path(self, name: str) -> str:
+        return os.path.join(self.mirror_dir, "blobs", *name.split("/"))
+
+    def _write_mirror_file(self, name: str, raw: bytes) -> None:
+        path = self._mirror_path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp, "wb") as f:
+            f.write(raw)
+        os.replace(tmp, path)
+
+    def _save_mirror(self, fetched: List[CatalogEntry], removed: List[str]) -> None:
+        if not self.mirror_dir:
+            return
+        with self._mirror_lock:
+            try:
+                for name in removed:
+                    try:
+                        os.remove(self._mirror_path(name))
+                    except FileNotFoundError:
+                        pass
+                with self._lock:
+                    manifest = {name: e.manifest_record() for name, e in self._entries.items()}
+                path = os.path.join(self.mirror_dir, _MANIFEST)
+                tmp = f"{path}.tmp-{os.getpid()}"
+                with open(tmp, "w") as f:
+                    json.dump(manifest, f)
+                os.replace(tmp, path)
+            except OSError as e:
+                logger.warning(f"Could not update GLMP catalog mirror {self.mirror_dir}: {e}")
+
+    def _load_mirror(self) -> None:
+        """Start from the mirrored files; they are revalidated like any other entry."""
+        try:
+            with open(os.path.join(self.mirror_dir, _MANIFEST)) as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable GLMP catalog mirror {self.mirror_dir}: {e}")
+            return
+        for name, record in manifest.items():
+            try:
+                with open(self._mirror_path(name), "rb") as f:
+                    raw = f.read()
+            except OSError:
+                continue
+            data, error = _parse(raw)
+            self._entries[name] = CatalogEntry(name=name, data=data, error=error, **record)
+        logger.info(f"GLMP catalog loaded {len(self._entries)} files from mirror {self.mirror_dir}")
+
+
+_catalogs: Dict[str, GLMPCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_glmp_catalog(bucket_name: Optional[str] = None) -> GLMPCatalog:
+    """Get the catalog singleton for a bucket (default: the GLMP bucket)."""
+    from mcp_server.config import (
+        GCS_BUCKET_NAME,
+        GLMP_CATALOG_FETCH_WORKERS,
+        GLMP_CATALOG_MIRROR_DIR,
+        GLMP_CATALOG_REFRESH_SECONDS,
+    )
+    bucket_name = bucket_name or GCS_BUCKET_NAME
+    with _catalogs_lock:
+        catalog = _catalogs.get(bucket_name)
+        if catalog is None:
+            mirror_dir = os.path.join(GLMP_CATALOG_MIRROR_DIR, bucket_name) if GLMP_CATALOG_MIRROR_DIR else ""
+            catalog = _catalogs[bucket_name] = GLMPCatalog(
+                bucket_name,
+                refresh_seconds=GLMP_CATALOG_REFRESH_SECONDS,
+                mirror_dir=mirror_dir,
+                fetch_workers=GLMP_CATALOG_FETCH_WORKERS,
+            )
+        return catalog
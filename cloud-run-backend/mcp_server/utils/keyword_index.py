@@ -0,0 +1,398 @@
+"""
+BM25 keyword index for the semantic-search keyword fallback
+
+An inverted index (token -> postings with per-field term frequencies) over the
+same title/body text `_keyword_fallback_search` scores, one index per
+Firestore collection. Ranking is BM25F with title/body boosts; the reported
+pseudo `similarity_score` keeps the old title-hit/body-hit formula so callers
+see the same scale whichever path answered.
+
+Indexes are serialized as gzipped JSON and can be stored locally
+(KEYWORD_INDEX_DIR) and/or in GCS (KEYWORD_INDEX_GCS_URI). Documents can be
+added or removed incrementally as they are ingested: the change lands in a
+copy of the index that is swapped in (searches never see an index change
+under them) and a debounced background flush writes it with a GCS generation
+precondition, so concurrent writers re-apply their changes instead of
+overwriting each other's (see services/persisted_index.py).
+"""
+
+import gzip
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from mcp_server.config import (
+    COLLECTION_PAPERS,
+    COLLECTION_PODCASTS,
+    COLLECTION_GLMP_PROCESSES,
+    COLLECTION_MATH_PROCESSES,
+    COLLECTION_CHEMISTRY_PROCESSES,
+    COLLECTION_PHYSICS_PROCESSES,
+    COLLECTION_COMPUTER_SCIENCE_PROCESSES,
+    COLLECTION_BIOLOGY_PROCESSES,
+    COLLECTION_VIDEOS,
+)
+from services.persisted_index import CopyOnWritePostings, PersistedIndexStore
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "i",
+    "in", "is", "it", "of", "on", "or", "that", "the", "this", "to", "was", "were",
+    "what", "when", "where", "which", "who", "why", "with", "you", "your"
+}
+
+FIELDS = ("title", "body")
+FIELD_BOOSTS = {"title": 2.0, "body": 1.0}
+
+INDEX_FORMAT_VERSION = 1
+
+_PROCESS_TITLE_FIELDS = ["title", "name"]
+_PROCESS_BODY_FIELDS = ["description", "category", "subcategory", "entities", "keywords"]
+
+# Per-collection body fields for process families (glmp has no subcategory).
+PROCESS_BODY_FIELDS = {
+    COLLECTION_GLMP_PROCESSES: ["description", "category", "entities", "keywords"],
+    COLLECTION_MATH_PROCESSES: _PROCESS_BODY_FIELDS,
+    COLLECTION_CHEMISTRY_PROCESSES: _PROCESS_BODY_FIELDS,
+    COLLECTION_PHYSICS_PROCESSES: _PROCESS_BODY_FIELDS,
+    COLLECTION_COMPUTER_SCIENCE_PROCESSES: _PROCESS_BODY_FIELDS,
+    COLLECTION_BIOLOGY_PROCESSES: _PROCESS_BODY_FIELDS,
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens with stopwords removed."""
+    return [t for t in re.split(r"[^a-zA-Z0-9]+", (text or "").lower()) if t and t not in STOPWORDS]
+
+
+def _join_list_or_str(value: Any) -> str:
+    if isinstance(value, list):
+        return " ".join(str(x) for x in value)
+    return str(value or "")
+
+
+def extract_keyword_fields(collection: str, d: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    (title, body) text used for keyword scoring of a document in `collection`.
+
+    Shared by the index builder and the scan fallback so both rank the same
+    text.
+    """
+    if collection == COLLECTION_PAPERS:
+        title = d.get("title") or ""
+        body = " ".join([
+            d.get("abstract") or "",
+            _join_list_or_str(d.get("keywords")),
+            _join_list_or_str(d.get("categories")),
+        ])
+        return title, body
+
+    if collection == COLLECTION_PODCASTS:
+        result = d.get("result", {}) or {}
+        title = d.get("title") or result.get("title") or ""
+        desc = d.get("description") or result.get("description") or ""
+        script = result.get("script") or d.get("transcript") or ""
+        return title, " ".join([desc, script[:1500]])
+
+    if collection == COLLECTION_VIDEOS:
+        title = d.get("title") or ""
+        desc = d.get("description") or ""
+        transcript = str(d.get("transcript") or "")[:1500]
+        tags = d.get("tags") or []
+        tag_text = " ".join(str(t) for t in tags) if isinstance(tags, list) else str(tags)
+        return title, " ".join([desc, transcript, tag_text])
+
+    title = ""
+    for f in _PROCESS_TITLE_FIELDS:
+        if d.get(f):
+            title = str(d.get(f))
+            break
+    body_parts: List[str] = []
+    for f in PROCESS_BODY_FIELDS.get(collection, _PROCESS_BODY_FIELDS):
+        v = d.get(f)
+        if isinstance(v, list):
+            body_parts.append(" ".join([str(x) for x in v[:50]]))
+        elif v:
+            body_parts.append(str(v)[:2000])
+    return title, " ".join(body_parts)
+
+
+class KeywordIndex(CopyOnWritePostings):
+    """BM25F inverted index over one collection's title/body text."""
+
+    def __init__(self, collection: str, k1: float = 1.2, b: float = 0.75):
+        super().__init__()
+        self.collection = collection
+        self.k1 = k1
+        self.b = b
+        # token -> doc_id -> [tf_title, tf_body]
+        self.postings: Dict[str, Dict[str, List[int]]] = {}
+        # doc_id -> [len_title, len_body]
+        self.doc_lengths: Dict[str, List[int]] = {}
+        self._length_totals = [0, 0]
+        self._doc_terms: Dict[str, Tuple[str, ...]] = {}
+        self.updated_at = time.time()
+
+    @property
+    def size(self) -> int:
+        return len(self.doc_lengths)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.doc_lengths
+
+    def copy(self) -> "KeywordIndex":
+        """
+        A copy that shares structure with this index until it is changed.
+
+        Updates to the copy replace (never mutate) the postings they touch,
+        so this index stays valid for searches running against it.
+        """
+        clone = KeywordIndex(self.collection, k1=self.k1, b=self.b)
+        self._share_postings(clone)
+        clone.doc_lengths = dict(self.doc_lengths)
+        clone._length_totals = list(self._length_totals)
+        clone._doc_terms = dict(self._doc_terms)
+        clone.updated_at = self.updated_at
+        return clone
+
+    # --------------------------------------------------------------- updates
+
+    def add_document(self, doc_id: str, title: str, body: str) -> None:
+        """Index (or re-index) a document's title/body text."""
+        if doc_id in self.doc_lengths:
+            self.remove_document(doc_id)
+        title_tokens = tokenize(title)
+        body_tokens = tokenize(body)
+        title_tf = Counter(title_tokens)
+        body_tf = Counter(body_tokens)
+        terms = tuple(set(title_tf) | set(body_tf))
+        for term in terms:
+            self._own_postings(term)[doc_id] = [title_tf.get(term, 0), body_tf.get(term, 0)]
+        self.doc_lengths[doc_id] = [len(title_tokens), len(body_tokens)]
+        self._length_totals[0] += len(title_tokens)
+        self._length_totals[1] += len(body_tokens)
+        self._doc_terms[doc_id] = terms
+        self.updated_at = time.time()
+
+    def remove_document(self, doc_id: str) -> bool:
+        """Drop a document from the index; returns False if it wasn't indexed."""
+        lengths = self.doc_lengths.pop(doc_id, None)
+        if lengths is None:
+            return False
+        self._length_totals[0] -= lengths[0]
+        self._length_totals[1] -= lengths[1]
+        for term in self._doc_terms.pop(doc_id, ()):
+            if term not in self.postings:
+                continue
+            postings = self._own_postings(term)
+            postings.pop(doc_id, None)
+            if not postings:
+                self._drop_term(term)
+        self.updated_at = time.time()
+        return True
+
+    # ---------------------------------------------------------------- search
+
+    def search(self, tokens: List[str], limit: int) -> List[Tuple[str, float, float]]:
+        """
+        Rank documents for the query tokens.
+
+        Returns:
+            List of (doc_id, bm25_score, similarity_score) sorted by score.
+            similarity_score is (2 * title_hits + body_hits) / (2 * len(tokens)),
+            capped at 0.95 -- the same pseudo-similarity the scan path reports.
+        """
+        n_docs = self.size
+        if not tokens or n_docs == 0 or limit <= 0:
+            return []
+        avg_len = [
+            max(1.0, self._length_totals[i] / n_docs) for i in range(len(FIELDS))
+        ]
+        boosts = [FIELD_BOOSTS[f] for f in FIELDS]
+
+        scores: Dict[str, float] = {}
+        hits: Dict[str, float] = {}
+        for token in dict.fromkeys(tokens):
+            title_hit_docs = set()
+            body_hit_docs = set()
+            for term, weight in self._expand(token):
+                postings = self.postings[term]
+                idf = math.log(1.0 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tfs in postings.items():
+                    lengths = self.doc_lengths[doc_id]
+                    weighted_tf = 0.0
+                    for i, tf in enumerate(tfs):
+                        if tf:
+                            norm = 1.0 - self.b + self.b * (lengths[i] / avg_len[i])
+                            weighted_tf += boosts[i] * tf / norm
+                    if weighted_tf <= 0.0:
+                        continue
+                    score = weight * idf * weighted_tf * (self.k1 + 1.0) / (weighted_tf + self.k1)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + score
+                    if tfs[0]:
+                        title_hit_docs.add(doc_id)
+                    if tfs[1]:
+                        body_hit_docs.add(doc_id)
+            for doc_id in title_hit_docs:
+                hits[doc_id] = hits.get(doc_id, 0.0) + 2.0
+            for doc_id in body_hit_docs:
+                hits[doc_id] = hits.get(doc_id, 0.0) + 1.0
+
+        denom = max(1.0, float(len(tokens)) * 2.0)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [
+            (doc_id, score, round(min(0.95, hits.get(doc_id, 0.0) / denom), 3))
+            for doc_id, score in ranked
+        ]
+
+    # ----------------------------------------------------------- persistence
+
+    def to_bytes(self) -> bytes:
+        payload = {
+            "format_version": INDEX_FORMAT_VERSION,
+            "collection": self.collection,
+            "k1": self.k1,
+            "b": self.b,
+            "updated_at": self.updated_at,
+            "doc_lengths": self.doc_lengths,
+            "postings": self.postings,
+        }
+        return gzip.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "KeywordIndex":
+        payload = json.loads(gzip.decompress(data))
+        if payload.get("format_version") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported keyword index format: {payload.get('format_version')}")
+        index = cls(payload["collection"], k1=payload["k1"], b=payload["b"])
+        index.postings = payload["postings"]
+        index.doc_lengths = payload["doc_lengths"]
+        index._length_totals = [
+            sum(lengths[i] for lengths in index.doc_lengths.values()) for i in range(len(FIELDS))
+        ]
+        doc_terms: Dict[str, List[str]] = {doc_id: [] for doc_id in index.doc_lengths}
+        for term, postings in index.postings.items():
+            for doc_id in postings:
+                doc_terms[doc_id].append(term)
+        index._doc_terms = {doc_id: tuple(terms) for doc_id, terms in doc_terms.items()}
+        index.updated_at = payload.get("updated_at") or time.time()
+        return index
+
+
+class KeywordIndexStore(PersistedIndexStore[KeywordIndex, Tuple[str, Optional[Tuple[str, str]]]]):
+    """
+    Per-collection keyword indexes persisted as `<collection>.json.gz` in
+    `local_dir` and/or under the `gcs_uri` prefix.
+
+    Changes are (doc_id, (title, body) or None for a removal) pairs, written
+    by the background flush at most `flush_seconds` after the first unwritten
+    one.
+    """
+
+    label = "keyword index"
+
+    def __init__(
+        self,
+        local_dir: str = "",
+        gcs_uri: str = "",
+        refresh_seconds: float = 300.0,
+        flush_seconds: float = 30.0,
+        client: Any = None,
+    ):
+        super().__init__(refresh_seconds, flush_seconds, client)
+        self.local_dir = local_dir
+        self.gcs_uri = gcs_uri
+
+    @property
+    def persisted(self) -> bool:
+        return bool(self.local_dir or self.gcs_uri)
+
+    def _locations(self, key: str) -> Tuple[str, str]:
+        filename = f"{key}.json.gz"
+        return (
+            os.path.join(self.local_dir, filename) if self.local_dir else "",
+            f"{self.gcs_uri.rstrip('/')}/{filename}" if self.gcs_uri else "",
+        )
+
+    def _storage_client(self) -> Any:
+        from mcp_server.utils.gcs_client import get_storage_client
+        return get_storage_client()
+
+    def _load(self, data: bytes) -> KeywordIndex:
+        return KeywordIndex.from_bytes(data)
+
+    def _apply(self, index: KeywordIndex, changes: Iterable[Tuple[str, Optional[Tuple[str, str]]]]) -> bool:
+        changed = False
+        for doc_id, text in changes:
+            if text is None:
+                changed = index.remove_document(doc_id) or changed
+            else:
+                index.add_document(doc_id, *text)
+                changed = True
+        return changed
+
+    def get(self, collection: str) -> Optional[KeywordIndex]:
+        """Return the index for `collection` (treat it as read-only), or None if none has been built."""
+        return self._get(collection)
+
+    def put(self, index: KeywordIndex) -> None:
+        """Install a freshly built index; the next flush replaces any persisted copy."""
+        self._install(index.collection, index)
+
+    def index_documents(self, collection: str, docs: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Incrementally (re-)index ingested documents; the background flush persists them.
+
+        Only updates an index that already exists -- a partial index would make
+        the fallback silently miss everything not yet ingested through here.
+        Returns the number of documents indexed.
+        """
+        if self.get(collection) is None:
+            return 0
+        changes = [
+            (doc_id, extract_keyword_fields(collection, data or {}))
+            for doc_id, data in docs
+        ]
+        if changes:
+            self._update(collection, changes)
+        return len(changes)
+
+    def remove_documents(self, collection: str, doc_ids: Iterable[str]) -> int:
+        index = self.get(collection)
+        if index is None:
+            return 0
+        changes = [(doc_id, None) for doc_id in dict.fromkeys(doc_ids) if doc_id in index]
+        if changes:
+            self._update(collection, changes)
+        return len(changes)
+
+
+_store: Optional[KeywordIndexStore] = None
+_store_lock = threading.Lock()
+
+
+def get_keyword_index_store() -> Optional[KeywordIndexStore]:
+    """Get the store singleton, or None when no persistence location is configured."""
+    global _store
+    from mcp_server.config import (
+        KEYWORD_INDEX_DIR,
+        KEYWORD_INDEX_GCS_URI,
+        KEYWORD_INDEX_REFRESH_SECONDS,
+        KEYWORD_INDEX_FLUSH_SECONDS,
+    )
+    if not KEYWORD_INDEX_DIR and not KEYWORD_INDEX_GCS_URI:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = KeywordIndexStore(
+                    KEYWORD_INDEX_DIR,
+                    KEYWORD_INDEX_GCS_URI,
+                    KEYWORD_INDEX_REFRESH_SECONDS,
+                    KEYWORD_INDEX_FLUSH_SECONDS,
+                )
+    return _store
@@ -0,0 +1,480 @@
+"""
+Local ANN vector index for semantic search
+
+Memory-resident IVF (inverted file) index over a float32 matrix of the stored
+`embedding` fields, one index per Firestore collection. Snapshots are written
+as a directory of .npy arrays plus a JSONL payload file and are memory-mapped
+on load, so a query touches only the probed lists and the rows it returns.
+
+Layout under VECTOR_INDEX_DIR:
+
+    <collection>/CURRENT              -> name of the active version directory
+    <collection>/<version>/meta.json  -> ids, dimension, built_at, nlist, ...
+    <collection>/<version>/vectors.npy          (n, d) float32, L2-normalized
+    <collection>/<version>/centroids.npy        (nlist, d) float32
+    <collection>/<version>/list_offsets.npy     (nlist + 1,) int64
+    <collection>/<version>/list_members.npy     (n,) int32, grouped by list
+    <collection>/<version>/payloads.jsonl       one JSON doc per row
+    <collection>/<version>/payload_offsets.npy  (n + 1,) int64 byte offsets
+
+The index is optional: numpy is imported lazily, and every caller is expected
+to fall back to Firestore `find_nearest` when `get()` returns None (engine
+disabled, snapshot missing, stale, or built for a different dimension).
+"""
+
+import json
+import logging
+import mmap
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Below this many vectors a flat scan is cheaper than probing lists.
+BRUTE_FORCE_MAX_ROWS = 4096
+
+# Old snapshot versions kept around for readers that still hold a memory map.
+KEEP_SNAPSHOT_VERSIONS = 2
+
+
+def _json_default(value: Any) -> Any:
+    """JSON fallback for Firestore payload values (timestamps, refs, vectors)."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    try:
+        return list(value)
+    except TypeError:
+        return str(value)
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0.0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+def _kmeans(vectors, nlist: int, iterations: int, seed: int):
+    """Spherical k-means on already-normalized rows; returns (centroids, assignment)."""
+    rng = np.random.default_rng(seed)
+    n = vectors.shape[0]
+    centroids = vectors[rng.choice(n, size=nlist, replace=False)].copy()
+    assignment = np.zeros(n, dtype=np.int32)
+    block = 8192
+    for _ in range(max(1, iterations)):
+        for start in range(0, n, block):
+            sims = vectors[start:start + block] @ centroids.T
+            assignment[start:start + block] = np.argmax(sims, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        counts = np.bincount(assignment, minlength=nlist)
+        empty = np.flatnonzero(counts == 0)
+        if empty.size:
+            # Re-seed empty lists from random rows rather than leaving dead centroids.
+            sums[empty] = vectors[rng.choice(n, size=empty.size, replace=False)]
+        centroids = _normalize_rows(sums)
+    return centroids, assignment
+
+
+class VectorIndex:
+    """IVF cosine index over one collection's embeddings."""
+
+    def __init__(
+        self,
+        collection: str,
+        ids: List[str],
+        vectors,
+        centroids,
+        list_offsets,
+        list_members,
+        meta: Dict[str, Any],
+        payloads: Optional[List[Dict[str, Any]]] = None,
+        payload_buffer: Optional[mmap.mmap] = None,
+        payload_offsets=None,
+    ):
+        self.collection = collection
+        self.ids = ids
+        self.vectors = vectors
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self.list_members = list_members
+        self.meta = meta
+        self._payloads = payloads
+        self._payload_buffer = payload_buffer
+        self._payload_offsets = payload_offsets
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    @property
+    def dimension(self) -> int:
+        return int(self.meta.get("dimension") or 0)
+
+    @property
+    def nlist(self) -> int:
+        return int(self.centroids.shape[0])
+
+    @property
+    def built_at(self) -> float:
+        return float(self.meta.get("built_at") or 0.0)
+
+    def age_seconds(self, now: Optional[float] = None) -> float:
+        return (now if now is not None else time.time()) - self.built_at
+
+    def payload(self, row: int) -> Dict[str, Any]:
+        """Return the stored document (sans embedding) for a matrix row."""
+        if self._payloads is not None:
+            return dict(self._payloads[row])
+        start = int(self._payload_offsets[row])
+        end = int(self._payload_offsets[row + 1])
+        return json.loads(self._payload_buffer[start:end])
+
+    # ------------------------------------------------------------------ build
+
+    @classmethod
+    def build(
+        cls,
+        collection: str,
+        ids: Sequence[str],
+        vectors: Sequence[Sequence[float]],
+        payloads: Sequence[Dict[str, Any]],
+        nlist: Optional[int] = None,
+        iterations: int = 8,
+        seed: int = 0,
+        embedding_model: Optional[str] = None,
+    ) -> "VectorIndex":
+        """
+        Build an index in memory.
+
+        Args:
+            collection: Firestore collection the vectors came from
+            ids: Document ids, one per vector
+            vectors: Embedding vectors (all the same dimension)
+            payloads: Document dicts (embedding removed) returned on hits
+            nlist: Number of IVF lists (default: ~sqrt(n), 1 for small sets)
+            iterations: k-means iterations used to train the list centroids
+            seed: RNG seed so rebuilds of the same data are reproducible
+            embedding_model: Recorded in meta for staleness/debugging
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("numpy is required to build a local vector index")
+        if not (len(ids) == len(vectors) == len(payloads)):
+            raise ValueError("ids, vectors and payloads must have the same length")
+        if not ids:
+            raise ValueError(f"No embeddings to index for {collection}")
+
+        matrix = _normalize_rows(np.asarray(vectors, dtype=np.float32))
+        n, dim = matrix.shape
+        if nlist is None:
+            nlist = 1 if n <= BRUTE_FORCE_MAX_ROWS else int(round(n ** 0.5))
+        nlist = max(1, min(int(nlist), n))
+
+        if nlist == 1:
+            centroids = _normalize_rows(matrix.mean(axis=0, keepdims=True))
+            assignment = np.zeros(n, dtype=np.int32)
+        else:
+            centroids, assignment = _kmeans(matrix, nlist, iterations, seed)
+
+        list_members = np.argsort(assignment, kind="stable").astype(np.int32)
+        counts = np.bincount(assignment, minlength=nlist)
+        list_offsets = np.zeros(nlist + 1, dtype=np.int64)
+        np.cumsum(counts, out=list_offsets[1:])
+
+        meta = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "collection": collection,
+            "dimension": int(dim),
+            "count": int(n),
+            "nlist": int(nlist),
+            "built_at": time.time(),
+            "embedding_model": embedding_model,
+        }
+        return cls(
+            collection=collection,
+            ids=list(ids),
+            vectors=matrix,
+            centroids=centroids,
+            list_offsets=list_offsets,
+            list_members=list_members,
+            meta=meta,
+            payloads=[dict(p) for p in payloads],
+        )
+
+    # ----------------------------------------------------------------- search
+
+    def search(
+        self,
+        query_vector: Sequence[float],
+        limit: int,
+        distance_threshold: Optional[float] = None,
+        nprobe: Optional[int] = None,
+    ) -> List[Tuple[str, float, Dict[str, Any]]]:
+        """
+        Nearest neighbours by cosine distance (1 - cosine similarity).
+
+        Mirrors Firestore `find_nearest(distance_measure=COSINE)`: results are
+        ordered nearest-first and anything farther than `distance_threshold`
+        is dropped.
+
+        Returns:
+            List of (doc_id, distance, payload) tuples
+        """
+        if limit <= 0 or self.size == 0:
+            return []
+        q = np.asarray(query_vector, dtype=np.float32)
+        if q.shape != (self.dimension,):
+            raise ValueError(
+                f"Query dimension {q.shape[0] if q.ndim else 0} does not match index dimension {self.dimension}"
+            )
+        q_norm = float(np.linalg.norm(q))
+        if q_norm == 0.0:
+            return []
+        q = q / q_norm
+
+        if self.nlist <= 1:
+            candidates = None
+            sims = self.vectors @ q
+        else:
+            probe = nprobe or max(4, -(-self.nlist // 10))
+            probe = min(probe, self.nlist)
+            centroid_sims = self.centroids @ q
+            lists = np.argpartition(-centroid_sims, probe - 1)[:probe]
+            candidates = np.concatenate([
+                self.list_members[self.list_offsets[i]:self.list_offsets[i + 1]] for i in lists
+            ])
+            if candidates.size == 0:
+                return []
+            # Sorted fancy indexing on a memmap pages in only the candidate rows,
+            # in file order.
+            candidates = np.sort(candidates)
+            sims = self.vectors[candidates] @ q
+
+        k = min(limit, sims.shape[0])
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top], kind="stable")]
+
+        hits: List[Tuple[str, float, Dict[str, Any]]] = []
+        for pos in top:
+            distance = float(1.0 - sims[pos])
+            if distance_threshold is not None and distance > distance_threshold:
+                break
+            row = int(pos if candidates is None else candidates[pos])
+            hits.append((self.ids[row], distance, self.payload(row)))
+        return hits
+
+    # ------------------------------------------------------------ persistence
+
+    def save(self, root_dir: str) -> str:
+        """
+        Write this index as a new snapshot version and point CURRENT at it.
+
+        The version directory is fully written before CURRENT is swapped, so a
+        concurrent reader either sees the old snapshot or the new one, never a
+        half-written one.
+
+        Returns:
+            Path of the version directory written
+        """
+        collection_dir = os.path.join(root_dir, self.collection)
+        version = f"v{int(self.built_at * 1000)}"
+        version_dir = os.path.join(collection_dir, version)
+        os.makedirs(version_dir, exist_ok=True)
+
+        np.save(os.path.join(version_dir, "vectors.npy"), np.ascontiguousarray(self.vectors, dtype=np.float32))
+        np.save(os.path.join(version_dir, "centroids.npy"), np.ascontiguousarray(self.centroids, dtype=np.float32))
+        np.save(os.path.join(version_dir, "list_offsets.npy"), np.asarray(self.list_offsets, dtype=np.int64))
+        np.save(os.path.join(version_dir, "list_members.npy"), np.asarray(self.list_members, dtype=np.int32))
+
+        offsets = np.zeros(self.size + 1, dtype=np.int64)
+        with open(os.path.join(version_dir, "payloads.jsonl"), "wb") as f:
+            position = 0
+            for row in range(self.size):
+                line = json.dumps(self.payload(row), default=_json_default, separators=(",", ":")).encode("utf-8")
+                f.write(line + b"\n")
+                position += len(line) + 1
+                offsets[row + 1] = position
+        np.save(os.path.join(version_dir, "payload_offsets.npy"), offsets)
+
+        with open(os.path.join(version_dir, "meta.json"), "w") as f:
+            json.dump({**self.meta, "ids": self.ids}, f)
+
+        current_tmp = os.path.join(collection_dir, f"CURRENT.tmp-{os.getpid()}")
+        with open(current_tmp, "w") as f:
+            f.write(version)
+        os.replace(current_tmp, os.path.join(collection_dir, "CURRENT"))
+
+        _prune_versions(collection_dir, keep=KEEP_SNAPSHOT_VERSIONS)
+        logger.info(f"Saved vector index snapshot {version_dir} ({self.size} vectors, nlist={self.nlist})")
+        return version_dir
+
+    @classmethod
+    def load(cls, version_dir: str) -> "VectorIndex":
+        """Memory-map a snapshot version directory written by `save()`."""
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("numpy is required to load a local vector index")
+        with open(os.path.join(version_dir, "meta.json")) as f:
+            meta = json.load(f)
+        if meta.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported vector index snapshot format: {meta.get('format_version')}")
+        ids = meta.pop("ids")
+
+        def _load(name):
+            return np.load(os.path.join(version_dir, name), mmap_mode="r")
+
+        payload_file = open(os.path.join(version_dir, "payloads.jsonl"), "rb")
+        try:
+            payload_buffer = mmap.mmap(payload_file.fileno(), 0, access=mmap.ACCESS_READ)
+        finally:
+            payload_file.close()
+
+        return cls(
+            collection=meta["collection"],
+            ids=ids,
+            vectors=_load("vectors.npy"),
+            centroids=np.asarray(_load("centroids.npy")),
+            list_offsets=np.asarray(_load("list_offsets.npy")),
+            list_members=_load("list_members.npy"),
+            meta=meta,
+            payload_buffer=payload_buffer,
+            payload_offsets=_load("payload_offsets.npy"),
+        )
+
+
+def _prune_versions(collection_dir: str, keep: int) -> None:
+    versions = sorted(
+        d for d in os.listdir(collection_dir)
+        if d.startswith("v") and os.path.isdir(os.path.join(collection_dir, d))
+    )
+    for stale in versions[:-keep] if keep > 0 else versions:
+        # Unlinking is safe for readers with open memory maps (POSIX keeps the inode).
+        shutil.rmtree(os.path.join(collection_dir, stale), ignore_errors=True)
+
+
+def build_index_from_documents(
+    collection: str,
+    docs: Iterable[Tuple[str, Dict[str, Any]]],
+    nlist: Optional[int] = None,
+) -> "VectorIndex":
+    """
+    Build an index from (doc_id, doc_dict) pairs, e.g. a Firestore stream.
+
+    Docs without an `embedding` are skipped; vectors whose dimension differs
+    from the first one seen are skipped too (a half-migrated collection would
+    otherwise make the matrix ragged).
+    """
+    ids: List[str] = []
+    vectors: List[List[float]] = []
+    payloads: List[Dict[str, Any]] = []
+    dimension: Optional[int] = None
+    skipped = 0
+    models: Dict[str, int] = {}
+    for doc_id, data in docs:
+        data = dict(data or {})
+        raw = data.pop("embedding", None)
+        if raw is None:
+            continue
+        vector = [float(x) for x in raw]
+        if dimension is None:
+            dimension = len(vector)
+        if len(vector) != dimension or dimension == 0:
+            skipped += 1
+            continue
+        model = data.get("embedding_model")
+        if model:
+            models[str(model)] = models.get(str(model), 0) + 1
+        ids.append(doc_id)
+        vectors.append(vector)
+        payloads.append(json.loads(json.dumps(data, default=_json_default)))
+    if skipped:
+        logger.warning(f"Skipped {skipped} {collection} docs with embedding dimension != {dimension}")
+    embedding_model = max(models, key=models.get) if models else None
+    return VectorIndex.build(collection, ids, vectors, payloads, nlist=nlist, embedding_model=embedding_model)
+
+
+class VectorIndexRegistry:
+    """
+    Lazily loads per-collection snapshots and hands out only fresh ones.
+
+    A snapshot is reloaded when its CURRENT pointer changes, and treated as
+    unavailable (so callers fall back to Firestore) once it is older than
+    `max_age_seconds`.
+    """
+
+    def __init__(self, root_dir: str, max_age_seconds: float):
+        self.root_dir = root_dir
+        self.max_age_seconds = max_age_seconds
+        self._indexes: Dict[str, Tuple[str, VectorIndex]] = {}
+        self._lock = threading.Lock()
+
+    def _current_version(self, collection: str) -> Optional[str]:
+        try:
+            with open(os.path.join(self.root_dir, collection, "CURRENT")) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def get(self, collection: str) -> Optional[VectorIndex]:
+        """Return a fresh index for `collection`, or None if Firestore should be used."""
+        version = self._current_version(collection)
+        if version is None:
+            return None
+        with self._lock:
+            cached = self._indexes.get(collection)
+            if cached is None or cached[0] != version:
+                try:
+                    index = VectorIndex.load(os.path.join(self.root_dir, collection, version))
+                except Exception as e:
+                    logger.warning(f"Could not load vector index snapshot for {collection}: {e}")
+                    self._indexes.pop(collection, None)
+                    return None
+                self._indexes[collection] = (version, index)
+                cached = self._indexes[collection]
+        index = cached[1]
+        if self.max_age_seconds > 0 and index.age_seconds() > self.max_age_seconds:
+            logger.info(
+                f"Vector index snapshot for {collection} is stale "
+                f"({int(index.age_seconds())}s old); using Firestore"
+            )
+            return None
+        return index
+
+    def status(self) -> Dict[str, Any]:
+        """Loaded snapshots with size and age, for health/debug output."""
+        with self._lock:
+            return {
+                collection: {
+                    "version": version,
+                    "count": index.size,
+                    "dimension": index.dimension,
+                    "nlist": index.nlist,
+                    "age_seconds": int(index.age_seconds()),
+                }
+                for collection, (version, index) in self._indexes.items()
+            }
+
+
+_registry: Optional[VectorIndexRegistry] = None
+
+
+def get_vector_index_registry() -> Optional[VectorIndexRegistry]:
+    """Get the registry singleton, or None when the local engine is disabled."""
+    global _registry
+    from mcp_server.config import VECTOR_INDEX_DIR, VECTOR_INDEX_MAX_AGE_SECONDS
+    if not VECTOR_INDEX_DIR or not NUMPY_AVAILABLE:
+        return None
+    if _registry is None:
+        _registry = VectorIndexRegistry(VECTOR_INDEX_DIR, VECTOR_INDEX_MAX_AGE_SECONDS)
+    return _registry
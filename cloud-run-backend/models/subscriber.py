@@ -1,6 +1,6 @@
 """Subscriber-related data models"""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List, Dict
 
 
@@ -62,6 +62,10 @@ class PodcastSubmission(BaseModel):
     submit_to_rss: bool
 
 
+class BulkPodcastSubmission(BaseModel):
+    submissions: List[PodcastSubmission] = Field(..., min_length=1, max_length=200)
+
+
 class AssignPodcastsRequest(BaseModel):
     podcast_ids: Optional[List[str]] = None
     assign_all_legacy: bool = False
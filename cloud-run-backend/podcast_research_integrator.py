@@ -22,6 +22,7 @@ from enhanced_research_service import EnhancedResearchService, PaperAnalysis
 from paper_processor import analyze_paper_with_gemini, ResearchPaper, AnalyzeOptions, PaperAnalysis as GeminiPaperAnalysis
 from copernicus_character import get_copernicus_character, get_character_prompt, CopernicusCharacter
 from utils.script_validation import calculate_minimum_words_for_duration
+from utils.profiling import api_call, profile_phase
 
 @dataclass
 class PodcastResearchContext:
@@ -69,14 +70,15 @@ class PodcastResearchIntegrator:
         
         # PHASE 1: RESEARCH DISCOVERY (Multi-API)
         print(f"\n📡 Phase 1: Research Discovery")
-        research_sources = await self.research_pipeline.comprehensive_search(
-            subject=topic,
-            additional_context=additional_context,
-            source_links=source_links or [],
-            depth="comprehensive",
-            include_preprints=True,
-            include_social_trends=True  # Critical for current events like 3i/ATLAS
-        )
+        async with profile_phase("discovery"), api_call("research_search"):
+            research_sources = await self.research_pipeline.comprehensive_search(
+                subject=topic,
+                additional_context=additional_context,
+                source_links=source_links or [],
+                depth="comprehensive",
+                include_preprints=True,
+                include_social_trends=True  # Critical for current events like 3i/ATLAS
+            )
         
         print(f"✅ Found {len(research_sources)} sources:")
         source_breakdown = {}
@@ -95,10 +97,11 @@ class PodcastResearchIntegrator:
         
         # PHASE 2: MULTI-PAPER ANALYSIS (Paradigm Shifts & Connections)
         print(f"\n🧠 Phase 2: Multi-Paper Analysis & Synthesis")
-        paper_analyses = await self.enhanced_research_service.analyze_multiple_papers(
-            research_sources[:10],  # Top 10 most relevant
-            complexity=expertise_level
-        )
+        async with profile_phase("paper_analysis"), api_call("paper_analysis"):
+            paper_analyses = await self.enhanced_research_service.analyze_multiple_papers(
+                research_sources[:10],  # Top 10 most relevant
+                complexity=expertise_level
+            )
         
         print(f"✅ Analyzed {len(paper_analyses)} papers")
         
@@ -122,7 +125,8 @@ class PodcastResearchIntegrator:
                 interdisciplinary_connections=True
             )
             try:
-                gemini_analysis = await analyze_paper_with_gemini(paper, options, self.google_api_key)
+                async with profile_phase("gemini_deep_analysis"), api_call("gemini"):
+                    gemini_analysis = await analyze_paper_with_gemini(paper, options, self.google_api_key)
                 gemini_analyses.append(gemini_analysis)
             except Exception as e:
                 print(f"   ⚠️ Gemini analysis failed: {e}")
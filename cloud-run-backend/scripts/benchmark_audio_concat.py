@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark podcast audio concatenation engines.
+
+Compares the local ffmpeg concat used by ElevenLabsVoiceService
+(`_combine_audio_segments_streaming`: spool to a temp dir, stream copy) with
+the legacy GCS round trip (`_combine_audio_segments_via_gcs`: upload, signed
+URLs, ffmpeg over HTTPS) on synthetic episodes. Segments are ffmpeg-generated
+128k/44.1kHz mono MP3 tones of a few seconds each, roughly the size of a TTS
+line.
+
+Usage:
+    python scripts/benchmark_audio_concat.py                   # local engine, 20/60/150 segments
+    python scripts/benchmark_audio_concat.py --gcs --runs 3    # also the GCS path (needs credentials)
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from elevenlabs_voice_service import ElevenLabsVoiceService
+
+
+def _make_segments(count: int, seconds: float) -> list:
+    """`count` distinct MP3 segments (sine tones) in the ElevenLabs output format."""
+    segments = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(count):
+            path = os.path.join(tmp, f"tone_{i}.mp3")
+            subprocess.run(
+                [
+                    "ffmpeg", "-v", "error", "-nostdin", "-f", "lavfi",
+                    "-i", f"sine=frequency={220 + (i % 12) * 40}:duration={seconds}",
+                    "-ar", "44100", "-ac", "1", "-b:a", "128k", "-y", path,
+                ],
+                check=True,
+            )
+            segments.append(Path(path).read_bytes())
+    return segments
+
+
+async def _time_engine(engine, segments: list, runs: int) -> tuple:
+    timings = []
+    output_size = 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        output = await engine(segments)
+        timings.append(time.perf_counter() - started)
+        output_size = len(output)
+    return statistics.median(timings), min(timings), output_size
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark podcast audio concatenation engines")
+    parser.add_argument("--segments", default="20,60,150", help="Comma-separated episode sizes (segments)")
+    parser.add_argument("--segment-seconds", type=float, default=6.0, help="Length of each synthetic segment")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per engine and size (median reported)")
+    parser.add_argument("--gcs", action="store_true", help="Also benchmark the legacy GCS round trip")
+    args = parser.parse_args()
+
+    with patch.object(ElevenLabsVoiceService, "_get_api_key", return_value=""):
+        service = ElevenLabsVoiceService()
+    engines = [("local", service._combine_audio_segments_streaming)]
+    if args.gcs:
+        engines.append(("gcs", service._combine_audio_segments_via_gcs))
+
+    print(f"{'segments':>8}  {'engine':<6}  {'median s':>9}  {'best s':>8}  {'output MB':>9}  {'input MB':>8}")
+    for count in [int(c) for c in args.segments.split(",") if c.strip()]:
+        segments = _make_segments(count, args.segment_seconds)
+        input_mb = sum(len(s) for s in segments) / 1e6
+        for name, engine in engines:
+            median, best, size = asyncio.run(_time_engine(engine, segments, max(1, args.runs)))
+            print(f"{count:>8}  {name:<6}  {median:>9.2f}  {best:>8.2f}  {size / 1e6:>9.2f}  {input_mb:>8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
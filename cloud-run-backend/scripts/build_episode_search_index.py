@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Build the episode search index used by /api/episodes/search
+
+Streams every episode once, downloads each transcript from GCS (in parallel)
+and writes the index to $EPISODE_SEARCH_INDEX_GCS_URI or
+$EPISODE_SEARCH_INDEX_PATH (or the --gcs-uri / --output overrides),
+replacing any existing copy; see services/episode_search_index.py. After the
+first build, episode writes and transcript uploads keep it current.
+
+Usage:
+    python scripts/build_episode_search_index.py --gcs-uri gs://bucket/search/episode-search-index.json.gz
+    python scripts/build_episode_search_index.py --output /tmp/episode-search-index.json.gz --skip-transcripts
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.cloud import storage
+
+from mcp_server.utils.firestore_client import get_firestore_client
+from config.constants import EPISODE_COLLECTION_NAME
+from services.episode_search_index import (
+    EPISODE_SEARCH_INDEX_GCS_URI,
+    EPISODE_SEARCH_INDEX_PATH,
+    EpisodeSearchIndex,
+    EpisodeSearchIndexStore,
+    episode_text_fields,
+)
+
+
+def _download_transcript(client: storage.Client, transcript_url: str) -> str:
+    path = transcript_url.replace("https://storage.googleapis.com/", "")
+    bucket_name, _, blob_name = path.partition("/")
+    blob = client.bucket(bucket_name).blob(blob_name)
+    return blob.download_as_text()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the episode search index")
+    parser.add_argument("--output", default=EPISODE_SEARCH_INDEX_PATH, help="Local index file (default: $EPISODE_SEARCH_INDEX_PATH)")
+    parser.add_argument("--gcs-uri", default=EPISODE_SEARCH_INDEX_GCS_URI, help="gs://bucket/path (default: $EPISODE_SEARCH_INDEX_GCS_URI)")
+    parser.add_argument("--skip-transcripts", action="store_true", help="Index title/description/summary only")
+    parser.add_argument("--workers", type=int, default=16, help="Parallel transcript downloads")
+    args = parser.parse_args()
+
+    if not args.output and not args.gcs_uri:
+        parser.error("Set --output or --gcs-uri (or EPISODE_SEARCH_INDEX_PATH / EPISODE_SEARCH_INDEX_GCS_URI)")
+
+    db = get_firestore_client()
+    started = time.time()
+    index = EpisodeSearchIndex()
+    transcript_urls = {}
+    for doc in db.collection(EPISODE_COLLECTION_NAME).stream():
+        data = doc.to_dict() or {}
+        index.update_fields(doc.id, episode_text_fields(data))
+        if data.get("transcript_url"):
+            transcript_urls[doc.id] = data["transcript_url"]
+    print(f"✅ episodes: {index.size} indexed in {time.time() - started:.1f}s")
+
+    if not args.skip_transcripts and transcript_urls:
+        started = time.time()
+        client = storage.Client()
+        failures = 0
+
+        def fetch(item):
+            episode_id, url = item
+            try:
+                return episode_id, _download_transcript(client, url)
+            except Exception as e:
+                print(f"⚠️  {episode_id}: transcript not indexed ({e})")
+                return episode_id, None
+
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            for episode_id, transcript in pool.map(fetch, transcript_urls.items()):
+                if transcript is None:
+                    failures += 1
+                else:
+                    index.update_fields(episode_id, {"transcript": transcript})
+        print(f"✅ transcripts: {len(transcript_urls) - failures} indexed, {failures} failed "
+              f"in {time.time() - started:.1f}s")
+
+    store = EpisodeSearchIndexStore(args.output, args.gcs_uri, refresh_seconds=0)
+    if not store.put(index):
+        print("❌ Failed to write the index")
+        return 1
+    print(f"Persisted {index.size} episodes, {len(index.postings)} terms "
+          f"to {args.gcs_uri or args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
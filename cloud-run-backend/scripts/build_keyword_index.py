@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Build or incrementally update the BM25 keyword indexes used by the keyword fallback
+
+Full build streams every document of each collection once and replaces the
+index. With --since, the existing index is loaded and only documents whose
+`updated_at` is at or after the given ISO timestamp are (re-)indexed -- run it
+after an ingestion batch so new papers are keyword-searchable without a
+rebuild.
+
+Indexes are written to $KEYWORD_INDEX_DIR and/or $KEYWORD_INDEX_GCS_URI (or
+the --output-dir / --gcs-uri overrides); see mcp_server/utils/keyword_index.py.
+
+Usage:
+    python scripts/build_keyword_index.py --gcs-uri gs://bucket/search/keyword-index
+    python scripts/build_keyword_index.py --collections research_papers --since 2026-10-01T00:00:00
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+from mcp_server.utils.firestore_client import get_firestore_client
+from mcp_server.utils.keyword_index import KeywordIndex, KeywordIndexStore, extract_keyword_fields
+from mcp_server.config import (
+    COLLECTION_PAPERS,
+    COLLECTION_PODCASTS,
+    COLLECTION_GLMP_PROCESSES,
+    COLLECTION_MATH_PROCESSES,
+    COLLECTION_CHEMISTRY_PROCESSES,
+    COLLECTION_PHYSICS_PROCESSES,
+    COLLECTION_COMPUTER_SCIENCE_PROCESSES,
+    COLLECTION_BIOLOGY_PROCESSES,
+    COLLECTION_VIDEOS,
+    KEYWORD_INDEX_DIR,
+    KEYWORD_INDEX_GCS_URI,
+)
+
+ALL_COLLECTIONS = [
+    COLLECTION_PAPERS,
+    COLLECTION_PODCASTS,
+    COLLECTION_VIDEOS,
+    COLLECTION_GLMP_PROCESSES,
+    COLLECTION_MATH_PROCESSES,
+    COLLECTION_CHEMISTRY_PROCESSES,
+    COLLECTION_PHYSICS_PROCESSES,
+    COLLECTION_COMPUTER_SCIENCE_PROCESSES,
+    COLLECTION_BIOLOGY_PROCESSES,
+]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build or update BM25 keyword indexes")
+    parser.add_argument("--output-dir", default=KEYWORD_INDEX_DIR, help="Local index dir (default: $KEYWORD_INDEX_DIR)")
+    parser.add_argument("--gcs-uri", default=KEYWORD_INDEX_GCS_URI, help="gs://bucket/prefix (default: $KEYWORD_INDEX_GCS_URI)")
+    parser.add_argument("--collections", nargs="+", default=ALL_COLLECTIONS, help="Collections to index")
+    parser.add_argument(
+        "--since",
+        default="",
+        help="Incremental mode: only (re-)index docs with updated_at >= this ISO timestamp",
+    )
+    args = parser.parse_args()
+
+    if not args.output_dir and not args.gcs_uri:
+        parser.error("Set --output-dir and/or --gcs-uri (or KEYWORD_INDEX_DIR / KEYWORD_INDEX_GCS_URI)")
+
+    db = get_firestore_client()
+    store = KeywordIndexStore(args.output_dir, args.gcs_uri, refresh_seconds=0)
+    failures = 0
+    for collection in args.collections:
+        started = time.time()
+        try:
+            if args.since:
+                docs = (
+                    db.collection(collection)
+                    .where(filter=FieldFilter("updated_at", ">=", args.since))
+                    .stream()
+                )
+                count = store.index_documents(collection, ((doc.id, doc.to_dict() or {}) for doc in docs))
+                if store.get(collection) is None:
+                    print(f"⚠️  {collection}: no existing index to update; run a full build first")
+                    failures += 1
+                    continue
+                print(f"✅ {collection}: {count} docs re-indexed in {time.time() - started:.1f}s")
+            else:
+                index = KeywordIndex(collection)
+                for doc in db.collection(collection).stream():
+                    title, body = extract_keyword_fields(collection, doc.to_dict() or {})
+                    index.add_document(doc.id, title, body)
+                store.put(index)
+                print(
+                    f"✅ {collection}: {index.size} docs, {len(index.postings)} terms "
+                    f"in {time.time() - started:.1f}s"
+                )
+        except Exception as e:
+            failures += 1
+            print(f"❌ {collection}: {e}")
+
+    written = store.close()
+    print(f"Persisted: {', '.join(written) if written else '(nothing)'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,11 @@
 Build Mathematics Knowledge Map
 
 Extracts relationships from papers and builds a knowledge graph.
+
+Goes through the knowledge-graph snapshot store: with
+KNOWLEDGE_GRAPH_SNAPSHOT_DIR / KNOWLEDGE_GRAPH_SNAPSHOT_GCS_URI set, a run after
+an ingest applies only the logged changes to the persisted graph. Pass
+--full-rebuild to rebuild from scratch.
 """
 
 import sys
@@ -63,6 +68,11 @@ def main():
         action="store_true",
         help="Use LLM for concept extraction (more detailed)"
     )
+    parser.add_argument(
+        "--full-rebuild",
+        action="store_true",
+        help="Rebuild from Firestore even if a persisted snapshot can be updated incrementally"
+    )
     parser.add_argument(
         "--max-citations",
         type=int,
@@ -87,7 +97,8 @@ def main():
     service = get_knowledge_map_service()
     
     print("🔨 Building knowledge graph...")
-    graph = asyncio.run(service.build_graph(
+    graph = asyncio.run(service.get_or_build_graph(
+        force_rebuild=args.full_rebuild,
         max_papers=args.max_papers,
         include_concepts=not args.no_concepts,
         include_similarity=not args.no_similarity,
@@ -103,6 +114,8 @@ def main():
     print(f"   Papers: {graph['metadata']['papers']}")
     print(f"   Concepts: {graph['metadata']['concepts']}")
     print(f"   Relationships: {graph['metadata']['relationships']}")
+    if graph['metadata'].get('incremental_update'):
+        print(f"   Incremental update: {graph['metadata']['incremental_update']}")
     
     # Export for visualization
     if args.format == "raw":
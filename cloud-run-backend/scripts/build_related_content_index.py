@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Backfill the related-content reverse index (services/related_content_index.py)
+
+Indexes every episode under the DOIs its request cites and every GLMP process
+in GCS under its entities, then writes the `_meta` doc that switches
+find_related_content from scanning to indexed lookups. Safe to re-run: entries
+are merged, never duplicated. After the first build, episode writes and the
+GLMP sync keep the index current.
+
+Usage:
+    python scripts/build_related_content_index.py
+    python scripts/build_related_content_index.py --skip-glmp
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_server.utils.firestore_client import get_firestore_client
+from mcp_server.utils.gcs_client import list_glmp_files, get_glmp_file
+from mcp_server.config import COLLECTION_EPISODES, GCS_BUCKET_NAME, GLMP_BUCKET_PATH
+from services.related_content_index import index_episode, index_processes, mark_index_built
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Backfill the related-content reverse index")
+    parser.add_argument("--skip-episodes", action="store_true", help="Don't index episodes")
+    parser.add_argument("--skip-glmp", action="store_true", help="Don't index GLMP processes")
+    args = parser.parse_args()
+
+    db = get_firestore_client()
+    stats = {"episodes": 0, "episode_entries": 0, "processes": 0, "process_entries": 0}
+
+    if not args.skip_episodes:
+        started = time.time()
+        query = db.collection(COLLECTION_EPISODES).select(["job_id", "title", "category", "request"])
+        for doc in query.stream():
+            data = doc.to_dict() or {}
+            stats["episode_entries"] += index_episode(
+                db,
+                data.get("job_id") or doc.id,
+                data.get("request"),
+                title=data.get("title"),
+                category=data.get("category"),
+            )
+            stats["episodes"] += 1
+        print(f"✅ episodes: {stats['episodes']} scanned, {stats['episode_entries']} DOI entries "
+              f"in {time.time() - started:.1f}s")
+
+    if not args.skip_glmp:
+        started = time.time()
+        processes = []
+        for file_name in list_glmp_files(GCS_BUCKET_NAME, GLMP_BUCKET_PATH):
+            process = get_glmp_file(GCS_BUCKET_NAME, file_name)
+            if process:
+                processes.append(process)
+        stats["processes"] = len(processes)
+        stats["process_entries"] = index_processes(db, processes)
+        print(f"✅ glmp: {stats['processes']} processes, {stats['process_entries']} entity entries "
+              f"in {time.time() - started:.1f}s")
+
+    if args.skip_episodes or args.skip_glmp:
+        print("Partial run: leaving the index marked as it was")
+    else:
+        mark_index_built(db, stats)
+        print("Index marked as built")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Build local ANN vector index snapshots for semantic search
+
+Streams every document with an `embedding` field from the searchable
+collections, trains an IVF index per collection, and writes a memory-mappable
+snapshot under --output-dir (see mcp_server/utils/vector_index.py for the
+layout). Point the API at the same directory with VECTOR_INDEX_DIR; snapshots
+older than VECTOR_INDEX_MAX_AGE_SECONDS are ignored and Firestore find_nearest
+is used instead, so re-run this on a schedule shorter than that window.
+
+Usage:
+    python scripts/build_vector_index.py --output-dir /mnt/vector-index
+    python scripts/build_vector_index.py --output-dir ./vector-index --collections research_papers episodes
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_server.utils.firestore_client import get_firestore_client
+from mcp_server.utils.vector_index import build_index_from_documents
+from mcp_server.config import (
+    COLLECTION_PAPERS,
+    COLLECTION_PODCASTS,
+    COLLECTION_GLMP_PROCESSES,
+    COLLECTION_MATH_PROCESSES,
+    COLLECTION_CHEMISTRY_PROCESSES,
+    COLLECTION_PHYSICS_PROCESSES,
+    COLLECTION_COMPUTER_SCIENCE_PROCESSES,
+    COLLECTION_BIOLOGY_PROCESSES,
+    COLLECTION_VIDEOS,
+    VECTOR_INDEX_DIR,
+)
+
+ALL_COLLECTIONS = [
+    COLLECTION_PAPERS,
+    COLLECTION_PODCASTS,
+    COLLECTION_VIDEOS,
+    COLLECTION_GLMP_PROCESSES,
+    COLLECTION_MATH_PROCESSES,
+    COLLECTION_CHEMISTRY_PROCESSES,
+    COLLECTION_PHYSICS_PROCESSES,
+    COLLECTION_COMPUTER_SCIENCE_PROCESSES,
+    COLLECTION_BIOLOGY_PROCESSES,
+]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build local ANN vector index snapshots")
+    parser.add_argument(
+        "--output-dir",
+        default=VECTOR_INDEX_DIR,
+        help="Snapshot root directory (default: $VECTOR_INDEX_DIR)",
+    )
+    parser.add_argument(
+        "--collections",
+        nargs="+",
+        default=ALL_COLLECTIONS,
+        help="Collections to index (default: all semantic-search collections)",
+    )
+    parser.add_argument(
+        "--nlist",
+        type=int,
+        default=None,
+        help="IVF list count (default: ~sqrt(n); flat scan for small collections)",
+    )
+    args = parser.parse_args()
+
+    if not args.output_dir:
+        parser.error("--output-dir is required when VECTOR_INDEX_DIR is not set")
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    db = get_firestore_client()
+    failures = 0
+    for collection in args.collections:
+        started = time.time()
+        try:
+            docs = ((doc.id, doc.to_dict() or {}) for doc in db.collection(collection).stream())
+            index = build_index_from_documents(collection, docs, nlist=args.nlist)
+            path = index.save(args.output_dir)
+            print(
+                f"✅ {collection}: {index.size} vectors, dim={index.dimension}, "
+                f"nlist={index.nlist} in {time.time() - started:.1f}s -> {path}"
+            )
+        except Exception as e:
+            failures += 1
+            print(f"❌ {collection}: {e}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
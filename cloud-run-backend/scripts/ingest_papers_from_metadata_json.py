@@ -12,10 +12,15 @@ and writes them to Firestore:
 
 Design goals:
 - Vertex-free (no embeddings, no Gemini calls)
-- Batch writes (up to 500 ops per commit)
+- Pipelined: file discovery -> process pool (JSON parse, stub gate, id and
+  document normalization) -> existence check (batched get_all) -> BulkWriter,
+  joined by bounded queues so a slow stage applies backpressure upstream
 - Safe to re-run (skip-existing by default)
 - Stub gate: observe (log-only) then enforce; every hit logged with full payload
 - Stable last-resort ids via sha256(fingerprint of source payload), never Python hash()
+- Written ids go to the knowledge-graph change log, so persisted knowledge-map
+  snapshots pick them up incrementally (--no-graph-changes to skip)
+- Reports docs/sec and per-stage queue depth while running
 """
 
 from __future__ import annotations
@@ -25,14 +30,22 @@ import fnmatch
 import hashlib
 import json
 import os
+import queue
 import re
+import sys
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from google.cloud import firestore
-from google.api_core.exceptions import AlreadyExists
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.knowledge_graph_changes import record_graph_changes  # noqa: E402
 
 # Minimal identity core for last-resort ids — fail CLOSED.
 # Hash identity of the paper, not the record's current enrichment state.
@@ -42,6 +55,10 @@ _DEFAULT_REJECT_GCS_PREFIX = (
     "gs://regal-scholar-453620-r7-podcast-storage/research_data/ingest_rejects"
 )
 
+# gRPC status code BulkWriter reports for create() on an existing document
+_GRPC_ALREADY_EXISTS = 6
+_WRITE_MAX_ATTEMPTS = 5
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
@@ -418,9 +435,315 @@ def _iter_json_files(root: Path, include_glob: str) -> Iterable[Path]:
         yield p
 
 
-def _batched(items: List[Tuple[str, Dict[str, Any]]], batch_size: int) -> Iterable[List[Tuple[str, Dict[str, Any]]]]:
-    for i in range(0, len(items), batch_size):
-        yield items[i:i + batch_size]
+# ---------------------------------------------------------------------------
+# Pipeline stages
+#
+#   discovery (sorted file list)
+#     -> parse: process pool, ordered, at most 2 chunks per worker in flight
+#     -> main thread: reject log, batches of --batch-size        [check queue]
+#     -> existence: one get_all per batch (skip-existing)         [write queue]
+#     -> writer: BulkWriter, flushed every --max-pending-writes (checkpoint +
+#        graph change log at each flush)
+#
+# Queues are bounded (--queue-depth batches), so a slow writer stalls the
+# existence check, which stalls parsing, instead of buffering the corpus. A
+# stage that dies sets the shared `stage_failed` event, which stops the main
+# thread instead of leaving it blocked on a queue nobody reads.
+# ---------------------------------------------------------------------------
+
+def _prepare_paper(path: str, stub_gate_mode: str) -> Dict[str, Any]:
+    """Parse one file and compute everything the writer needs (runs in a pool worker)."""
+    fp = Path(path)
+    try:
+        paper = json.loads(fp.read_text(encoding="utf-8"))
+    except Exception as e:
+        return {"path": path, "error": f"Failed to read {fp}: {e}"}
+    if not isinstance(paper, dict):
+        return {"path": path, "error": f"Skipping non-object JSON {fp}: {type(paper).__name__}"}
+
+    doc_id = _doc_id_for_paper(paper)
+    out: Dict[str, Any] = {"path": path, "doc_id": doc_id, "reject": None, "blocked": False}
+    reason = _reject_stub_reason(paper) if stub_gate_mode != "off" else None
+    if reason:
+        out["reject"] = {
+            "ts_utc": _now_iso(),
+            "gate_mode": stub_gate_mode,
+            "action": "observe_would_reject" if stub_gate_mode == "observe" else "rejected",
+            "reason": reason,
+            "path": path,
+            "payload_sha256": _payload_sha256_hex(paper),
+            "doc_id_if_written": doc_id,
+            "source": paper.get("source") or paper.get("sources"),
+            "title": paper.get("title"),
+            "keys": sorted(paper.keys()),
+            "paper": paper,
+        }
+        if stub_gate_mode == "enforce":
+            out["blocked"] = True
+            return out
+        # observe: fall through and still write
+    out["doc"] = _to_firestore_paper(paper, fp)
+    return out
+
+
+def _prepare_chunk(paths: List[str], stub_gate_mode: str) -> List[Dict[str, Any]]:
+    return [_prepare_paper(path, stub_gate_mode) for path in paths]
+
+
+class _PipelineStats:
+    """Counters shared by the stages, plus sampled queue depths."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.parsed = 0
+        self.attempted = 0
+        self.written = 0
+        self.skipped = 0
+        self.failed = 0
+        self.parse_in_flight = 0
+        self.writer_pending = 0
+        self.max_depth = {"parse": 0, "check": 0, "write": 0, "writer": 0}
+
+    def add(self, **counts: int) -> None:
+        with self.lock:
+            for name, n in counts.items():
+                setattr(self, name, getattr(self, name) + n)
+
+    def depths(self, check_q: "queue.Queue", write_q: "queue.Queue") -> Dict[str, int]:
+        with self.lock:
+            depths = {
+                "parse": self.parse_in_flight,
+                "check": check_q.qsize(),
+                "write": write_q.qsize(),
+                "writer": self.writer_pending,
+            }
+            for stage, depth in depths.items():
+                self.max_depth[stage] = max(self.max_depth[stage], depth)
+            return depths
+
+    def rate(self) -> float:
+        elapsed = max(0.001, time.time() - self.started)
+        return (self.written + self.skipped) / elapsed
+
+
+def _iter_prepared(
+    files: List[Path], stub_gate_mode: str, workers: int, chunk_size: int, stats: _PipelineStats
+) -> Iterator[Dict[str, Any]]:
+    """Prepared records in file order, parsed by a process pool with bounded look-ahead."""
+    chunks = [[str(fp) for fp in files[i:i + chunk_size]] for i in range(0, len(files), chunk_size)]
+    if workers <= 1:
+        for chunk in chunks:
+            results = _prepare_chunk(chunk, stub_gate_mode)
+            stats.add(parsed=len(results))
+            yield from results
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight: deque = deque()
+        pending = iter(chunks)
+        while True:
+            while len(in_flight) < workers * 2:
+                chunk = next(pending, None)
+                if chunk is None:
+                    break
+                in_flight.append(pool.submit(_prepare_chunk, chunk, stub_gate_mode))
+            if not in_flight:
+                return
+            with stats.lock:
+                stats.parse_in_flight = len(in_flight)
+            results = in_flight.popleft().result()
+            stats.add(parsed=len(results))
+            yield from results
+
+
+def _stage_put(q: "queue.Queue", item: Any, stage_failed: threading.Event) -> bool:
+    """Hand `item` to the next stage; False (item dropped) once any stage has failed."""
+    while not stage_failed.is_set():
+        try:
+            q.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _existence_stage(
+    db: Any,
+    col: Any,
+    check_q: "queue.Queue",
+    write_q: "queue.Queue",
+    skip_existing: bool,
+    stats: _PipelineStats,
+    stage_failed: threading.Event,
+) -> None:
+    """Drop batch entries whose document already exists, with one get_all per batch."""
+    seen: set = set()
+    try:
+        while True:
+            batch = check_q.get()
+            if batch is None:
+                return
+            if not batch:
+                continue
+            stats.add(attempted=len(batch))
+            if skip_existing:
+                ids = list(dict.fromkeys(doc_id for doc_id, _doc, _fp in batch))
+                try:
+                    existing = {
+                        snap.id
+                        for snap in db.get_all([col.document(doc_id) for doc_id in ids], field_paths=[])
+                        if snap.exists
+                    }
+                except Exception as e:
+                    # create() still refuses existing docs; they are counted as skips by the writer
+                    print(f"⚠️  Existence check failed for {len(ids)} ids, relying on create(): {e}")
+                    existing = set()
+                fresh = []
+                for entry in batch:
+                    if entry[0] in existing or entry[0] in seen:
+                        stats.add(skipped=1)
+                        continue
+                    seen.add(entry[0])
+                    fresh.append(entry)
+                # An empty batch still carries its checkpoint position
+                batch = fresh or [(None, None, batch[-1][2])]
+            write_q.put(batch)
+    except Exception as e:
+        print(f"❌ Existence-check stage stopped: {e}")
+        stage_failed.set()
+    finally:
+        # The writer drains its queue until this, whatever happened upstream
+        write_q.put(None)
+
+
+def _writer_stage(
+    db: Any,
+    col: Any,
+    write_q: "queue.Queue",
+    skip_existing: bool,
+    dry_run: bool,
+    graph_changes: bool,
+    checkpoint_file: Optional[Path],
+    max_pending: int,
+    stats: _PipelineStats,
+    stage_failed: threading.Event,
+) -> None:
+    """
+    Write batches through a BulkWriter, flushing (and checkpointing) every max_pending ops.
+
+    The checkpoint never moves past a write that failed for good, so
+    --resume-from-checkpoint retries it.
+    """
+    written_ids: List[str] = []
+    # Writes given up on since the last flush
+    failed_ids: List[str] = []
+    ids_lock = threading.Lock()
+    writer = None
+    if not dry_run:
+        writer = db.bulk_writer()
+
+        def on_result(ref: Any, _result: Any, _writer: Any) -> None:
+            stats.add(written=1)
+            with ids_lock:
+                written_ids.append(ref.id)
+
+        def on_error(failure: Any, _writer: Any) -> bool:
+            if failure.code == _GRPC_ALREADY_EXISTS:
+                stats.add(skipped=1)
+                return False
+            if failure.attempts < _WRITE_MAX_ATTEMPTS:
+                return True
+            stats.add(failed=1)
+            with ids_lock:
+                failed_ids.append(failure.operation.reference.id)
+            if stats.failed <= 5:
+                print(f"❌ Failed writing doc {failure.operation.reference.id}: {failure.message}")
+            return False
+
+        writer.on_write_result(on_result)
+        writer.on_write_error(on_error)
+
+    pending = 0
+    last_path: Optional[str] = None
+    checkpoint_held = False
+
+    def flush() -> None:
+        nonlocal pending, checkpoint_held
+        if writer is None:
+            return
+        writer.flush()
+        with ids_lock:
+            ids = written_ids[:]
+            written_ids.clear()
+            failed = failed_ids[:]
+            failed_ids.clear()
+        if ids and graph_changes:
+            try:
+                record_graph_changes(db, "research_papers", ids)
+            except Exception as e:
+                print(f"⚠️  Failed recording knowledge-graph changes ({len(ids)} ids): {e}")
+        if failed and not checkpoint_held:
+            checkpoint_held = True
+            if checkpoint_file:
+                print(f"⚠️  Checkpoint held before {len(failed)} failed writes (e.g. {failed[0]}); "
+                      "a resumed run starts there again")
+        # Everything up to last_path is now durable (written or skipped), unless a write failed
+        if checkpoint_file and last_path and not checkpoint_held:
+            try:
+                checkpoint_file.write_text(last_path + "\n", encoding="utf-8")
+            except Exception as e:
+                print(f"⚠️  Failed writing checkpoint file {checkpoint_file}: {e}")
+        pending = 0
+        with stats.lock:
+            stats.writer_pending = 0
+
+    fatal: Optional[Exception] = None
+    while True:
+        batch = write_q.get()
+        if batch is None:
+            break
+        if fatal is not None:
+            continue  # keep draining so upstream stages can finish
+        try:
+            for doc_id, doc, _fp in batch:
+                if doc_id is None:
+                    continue
+                if writer is None:
+                    stats.add(written=1)
+                    continue
+                doc_ref = col.document(doc_id)
+                if skip_existing:
+                    writer.create(doc_ref, doc)
+                else:
+                    writer.set(doc_ref, doc, merge=True)
+                pending += 1
+            last_path = batch[-1][2]
+            with stats.lock:
+                stats.writer_pending = pending
+            if pending >= max_pending:
+                flush()
+        except Exception as e:
+            fatal = e
+            print(f"❌ Writer stage stopped: {e}")
+            stage_failed.set()
+    if fatal is None:
+        flush()
+    if writer is not None:
+        writer.close()
+
+
+def _report_progress(
+    stats: _PipelineStats, check_q: "queue.Queue", write_q: "queue.Queue", stop: threading.Event, interval: float
+) -> None:
+    while not stop.wait(interval):
+        depths = stats.depths(check_q, write_q)
+        print(
+            f"Progress: parsed={stats.parsed} attempted={stats.attempted} wrote={stats.written} "
+            f"skipped={stats.skipped} failed={stats.failed} rate={stats.rate():.1f} docs/s "
+            f"queues(parse={depths['parse']} check={depths['check']} "
+            f"write={depths['write']} writer={depths['writer']})"
+        )
 
 
 def main() -> int:
@@ -445,7 +768,37 @@ def main() -> int:
     parser.add_argument("--dry-run", action="store_true", help="Do not write; just report what would happen")
     parser.add_argument("--skip-existing", action="store_true", default=True, help="Skip docs that already exist (default)")
     parser.add_argument("--no-skip-existing", action="store_true", help="Overwrite existing docs")
-    parser.add_argument("--batch-size", type=int, default=400, help="Firestore batch size (<=500)")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=400,
+        help="Docs per existence-check read and per hand-off to the writer (<=500)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=min(8, os.cpu_count() or 1),
+        help="Parse/normalize worker processes (1 = parse in the main process)",
+    )
+    parser.add_argument("--parse-chunk-size", type=int, default=64, help="Files per parse task")
+    parser.add_argument(
+        "--queue-depth",
+        type=int,
+        default=4,
+        help="Batches buffered between the parse, existence-check and write stages",
+    )
+    parser.add_argument(
+        "--max-pending-writes",
+        type=int,
+        default=2000,
+        help="BulkWriter ops buffered before a flush (each flush also writes the checkpoint)",
+    )
+    parser.add_argument("--progress-interval", type=float, default=10.0, help="Seconds between progress lines")
+    parser.add_argument(
+        "--no-graph-changes",
+        action="store_true",
+        help="Do not append written ids to the knowledge-graph change log",
+    )
     parser.add_argument(
         "--checkpoint-file",
         default="",
@@ -497,6 +850,10 @@ def main() -> int:
 
     skip_existing = args.skip_existing and (not args.no_skip_existing)
     batch_size = max(1, min(int(args.batch_size), 500))
+    workers = max(1, int(args.workers))
+    parse_chunk_size = max(1, int(args.parse_chunk_size))
+    queue_depth = max(1, int(args.queue_depth))
+    max_pending_writes = max(batch_size, int(args.max_pending_writes))
     skip_first = max(0, int(args.skip_first))
     checkpoint_file = Path(args.checkpoint_file).expanduser().resolve() if args.checkpoint_file else None
     resume_from_checkpoint = bool(args.resume_from_checkpoint)
@@ -573,10 +930,12 @@ def main() -> int:
     print(f"Reject GCS:      {reject_gcs_uri if not args.no_reject_gcs else '(disabled)'}")
     print(f"Checkpoint file: {str(checkpoint_file) if checkpoint_file else '(none)'}")
     print(f"Batch size:      {batch_size}")
+    print(f"Parse workers:   {workers} (chunks of {parse_chunk_size})")
+    print(f"Queue depth:     {queue_depth} batches; writer flush every {max_pending_writes} ops")
     print("============================================================")
 
-    prepared: List[Tuple[str, Dict[str, Any], str]] = []
     load_failed = 0
+    prepared_count = 0
     gate_hits = 0
     gate_enforced = 0
     reject_reasons: Dict[str, int] = {}
@@ -584,63 +943,85 @@ def main() -> int:
     reject_log_path.parent.mkdir(parents=True, exist_ok=True)
     reject_fh = reject_log_path.open("a", encoding="utf-8")
 
+    stats = _PipelineStats()
+    check_q: "queue.Queue" = queue.Queue(maxsize=queue_depth)
+    write_q: "queue.Queue" = queue.Queue(maxsize=queue_depth)
+    stage_failed = threading.Event()
+    existence_thread = threading.Thread(
+        target=_existence_stage,
+        args=(db, col, check_q, write_q, skip_existing, stats, stage_failed),
+        name="ingest-existence",
+        daemon=True,
+    )
+    writer_thread = threading.Thread(
+        target=_writer_stage,
+        args=(
+            db, col, write_q, skip_existing, bool(args.dry_run), not args.no_graph_changes,
+            checkpoint_file, max_pending_writes, stats, stage_failed,
+        ),
+        name="ingest-writer",
+        daemon=True,
+    )
+    stop_reporting = threading.Event()
+    reporter_thread = threading.Thread(
+        target=_report_progress,
+        args=(stats, check_q, write_q, stop_reporting, max(0.5, float(args.progress_interval))),
+        name="ingest-progress",
+        daemon=True,
+    )
+    existence_thread.start()
+    writer_thread.start()
+    reporter_thread.start()
+
+    batch: List[Tuple[str, Dict[str, Any], str]] = []
     try:
-        for fp in files:
-            try:
-                paper = json.loads(fp.read_text(encoding="utf-8"))
-            except Exception as e:
-                load_failed += 1
-                if load_failed <= 5:
-                    print(f"⚠️  Failed to read {fp}: {e}")
-                continue
-            if not isinstance(paper, dict):
+        for record in _iter_prepared(files, stub_gate_mode, workers, parse_chunk_size, stats):
+            if "error" in record:
                 load_failed += 1
                 if load_failed <= 5:
-                    print(f"⚠️  Skipping non-object JSON {fp}: {type(paper).__name__}")
+                    print(f"⚠️  {record['error']}")
                 continue
 
-            reason = None
-            if stub_gate_mode != "off":
-                reason = _reject_stub_reason(paper)
-            if reason:
+            reject = record["reject"]
+            if reject:
                 gate_hits += 1
-                reject_reasons[reason] = reject_reasons.get(reason, 0) + 1
-                action = "observe_would_reject" if stub_gate_mode == "observe" else "rejected"
-                line = (
-                    json.dumps(
-                        {
-                            "ts_utc": _now_iso(),
-                            "gate_mode": stub_gate_mode,
-                            "action": action,
-                            "reason": reason,
-                            "path": str(fp),
-                            "payload_sha256": _payload_sha256_hex(paper),
-                            "doc_id_if_written": _doc_id_for_paper(paper),
-                            "source": paper.get("source") or paper.get("sources"),
-                            "title": paper.get("title"),
-                            "keys": sorted(paper.keys()),
-                            "paper": paper,
-                        },
-                        ensure_ascii=False,
-                        default=str,
-                    )
-                    + "\n"
-                )
+                reject_reasons[reject["reason"]] = reject_reasons.get(reject["reason"], 0) + 1
+                line = json.dumps(reject, ensure_ascii=False, default=str) + "\n"
                 reject_fh.write(line)
                 run_reject_lines.append(line)
-                if stub_gate_mode == "enforce":
+                if record["blocked"]:
                     gate_enforced += 1
                     continue
-                # observe: fall through and still write
 
-            doc_id = _doc_id_for_paper(paper)
-            prepared.append((doc_id, _to_firestore_paper(paper, fp), str(fp)))
+            prepared_count += 1
+            batch.append((record["doc_id"], record["doc"], record["path"]))
+            if len(batch) >= batch_size:
+                if not _stage_put(check_q, batch, stage_failed):
+                    break
+                batch = []
+        if batch:
+            _stage_put(check_q, batch, stage_failed)
     finally:
         reject_fh.close()
-
+        # The existence stage exits on this; once it has died nobody reads the queue
+        while existence_thread.is_alive():
+            try:
+                check_q.put(None, timeout=0.5)
+                break
+            except queue.Full:
+                continue
+        existence_thread.join()
+        writer_thread.join()
+        stop_reporting.set()
+        reporter_thread.join()
+
+    written = stats.written
+    skipped = stats.skipped
+    failed = stats.failed
+    elapsed = max(0.001, time.time() - stats.started)
     day_log_lines = _count_jsonl_lines(reject_log_path)
     print(
-        f"Prepared: {len(prepared)} docs "
+        f"Prepared: {prepared_count} docs "
         f"(failed to load: {load_failed}, gate_hits_this_run: {gate_hits}, "
         f"gate_hits_day_log: {day_log_lines}, gate_enforced: {gate_enforced})"
     )
@@ -665,75 +1046,6 @@ def main() -> int:
         else:
             print("Reject GCS: skipped (no gate hits this run)")
 
-    written = 0
-    skipped = 0
-    failed = 0
-    attempted = 0
-    started = time.time()
-    last_checkpoint: Optional[str] = None
-
-    for chunk in _batched(prepared, batch_size):
-        batch = db.batch()
-        staged_in_batch = 0
-        for doc_id, doc, _fp in chunk:
-            try:
-                doc_ref = col.document(doc_id)
-                attempted += 1
-                if skip_existing:
-                    # Avoid expensive per-doc reads: use create() with exists=False semantics.
-                    # We stage it in the batch; if it already exists, commit will fail, so we
-                    # fall back to per-doc create below (outside batch) for this chunk.
-                    batch.create(doc_ref, doc)
-                else:
-                    batch.set(doc_ref, doc, merge=True)
-                staged_in_batch += 1
-            except Exception as e:
-                failed += 1
-                if failed <= 5:
-                    print(f"❌ Failed preparing doc {doc_id}: {e}")
-
-        if args.dry_run:
-            written += staged_in_batch
-            continue
-
-        # Only commit if we actually staged any writes in this batch
-        try:
-            if staged_in_batch:
-                batch.commit()
-                written += staged_in_batch
-                last_checkpoint = chunk[-1][2] if chunk else None
-        except Exception as e:
-            # Batch commit can fail if any doc already exists when using batch.create.
-            # Fall back to per-doc create to count skips precisely.
-            if skip_existing:
-                for doc_id, doc, _fp in chunk:
-                    try:
-                        doc_ref = col.document(doc_id)
-                        doc_ref.create(doc)
-                        written += 1
-                    except AlreadyExists:
-                        skipped += 1
-                    except Exception as e2:
-                        failed += 1
-                        if failed <= 5:
-                            print(f"❌ Failed writing doc {doc_id}: {e2}")
-                last_checkpoint = chunk[-1][2] if chunk else None
-            else:
-                failed += len(chunk)
-                print(f"❌ Batch commit failed ({len(chunk)} items): {e}")
-
-        # Persist checkpoint if requested
-        if checkpoint_file and last_checkpoint:
-            try:
-                checkpoint_file.write_text(last_checkpoint + "\n", encoding="utf-8")
-            except Exception as e:
-                if failed <= 5:
-                    print(f"⚠️  Failed writing checkpoint file {checkpoint_file}: {e}")
-
-        elapsed = max(0.001, time.time() - started)
-        rate = (attempted / elapsed) if attempted else 0.0
-        print(f"Progress: attempted={attempted} wrote={written} skipped={skipped} failed={failed} rate={rate:.1f}/s")
-
     print("============================================================")
     print("Done")
     print("============================================================")
@@ -745,6 +1057,13 @@ def main() -> int:
     )
     print(f"Gate hits (day log lines, AM+PM): {day_log_lines}")
     print(f"Failed:      {failed}")
+    if stage_failed.is_set():
+        print("❌ Stopped early: a pipeline stage failed (see above); resume from the checkpoint")
+    print(f"Throughput:  {(written + skipped) / elapsed:.1f} docs/s over {elapsed:.1f}s")
+    print(
+        "Max queue depth: "
+        + " ".join(f"{stage}={depth}" for stage, depth in stats.max_depth.items())
+    )
     if gate_hits or day_log_lines:
         print(f"Reject log:  {reject_log_path}")
         if not args.no_reject_gcs and run_reject_lines:
@@ -755,7 +1074,7 @@ def main() -> int:
             "This-run gate_hits resets each process and is often ~half the daily total. "
             "Persistently rising day-log hits after enforce → upstream still leaking."
         )
-    return 0
+    return 1 if stage_failed.is_set() else 0
 
 
 if __name__ == "__main__":
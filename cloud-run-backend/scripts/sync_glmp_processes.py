@@ -20,6 +20,7 @@ from services.embedding_service import get_embedding_service
 from utils.auto_embedding import resolve_embedding_model_name
 from mcp_server.utils.gcs_client import list_glmp_files, get_glmp_file
 from mcp_server.config import GCS_BUCKET_NAME, GLMP_BUCKET_PATH
+from services.related_content_index import index_process
 from utils.logging import structured_logger
 import logging
 
@@ -264,6 +265,8 @@ def sync_glmp_processes(
                 # Write to Firestore
                 if not dry_run:
                     firestore_glmp_ref.document(process_id).set(glmp_doc)
+                    # Entity -> process entries for find_related_content (keyed by the JSON id it returns)
+                    index_process(firestore_db, {**process_data, "id": process_data.get("id") or process_id})
                 
                 stats["synced"] += 1
                 
@@ -0,0 +1,254 @@
+"""
+Query Embedding Cache
+
+Search, RAG and the knowledge-map keyword seed all embed the user's query on
+every request, so repeated queries (findability-probe anchors, popular UI
+searches) pay an embedding round trip and OpenAI spend each time. This cache
+keys vectors by (provider, model, normalized text) and keeps them in:
+
+1. an in-process LRU bounded by EMBEDDING_CACHE_MAX_ENTRIES, and
+2. optionally, a SQLite file at EMBEDDING_CACHE_SQLITE_PATH that every worker
+   process in the container shares (e.g. /tmp/embedding_cache.sqlite3).
+
+Both tiers expire entries after EMBEDDING_CACHE_TTL_SECONDS. Hit/miss counters
+and the average miss latency are exposed via `stats()` so the savings are
+visible on /api/admin/embedding-cache.
+
+Only query-time callers go through `embed_query`; bulk document embedding in
+the sync scripts calls the provider directly so it doesn't churn the cache.
+
+Copyright (c) 2025 Gary Welz / CopernicusAI
+Licensed under MIT License
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "2048"))
+EMBEDDING_CACHE_TTL_SECONDS = float(os.getenv("EMBEDDING_CACHE_TTL_SECONDS", "86400"))
+EMBEDDING_CACHE_SQLITE_PATH = os.getenv("EMBEDDING_CACHE_SQLITE_PATH", "")
+
+
+def normalize_query_text(text: str) -> str:
+    """Unicode-normalize and collapse whitespace; case is preserved."""
+    return " ".join(unicodedata.normalize("NFKC", text or "").split())
+
+
+def _cache_key(provider: str, model: str, text: str) -> str:
+    raw = f"{provider}\x00{model}\x00{normalize_query_text(text)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Thread-safe LRU + TTL cache of query embeddings with an optional SQLite tier."""
+
+    def __init__(
+        self,
+        max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = EMBEDDING_CACHE_TTL_SECONDS,
+        sqlite_path: str = "",
+    ):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.sqlite_path = sqlite_path
+        # Vectors are held as tuples so no caller can modify a cached one
+        self._entries: "OrderedDict[str, Tuple[float, Tuple[float, ...]]]" = OrderedDict()
+        # Guards the in-process tier and counters; never held during SQLite I/O
+        self._lock = threading.Lock()
+        # Serializes use of the shared SQLite connection
+        self._sqlite_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._counters = {
+            "memory_hits": 0,
+            "sqlite_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "errors": 0,
+        }
+        self._miss_latency_ms = 0.0
+        if sqlite_path:
+            self._open_sqlite()
+
+    # --- SQLite tier ---
+
+    def _open_sqlite(self) -> None:
+        try:
+            parent = os.path.dirname(self.sqlite_path)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            conn = sqlite3.connect(self.sqlite_path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                "key TEXT PRIMARY KEY, embedding BLOB NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+        except Exception as e:
+            logger.warning(f"Embedding cache SQLite tier disabled ({self.sqlite_path}): {e}")
+            self._conn = None
+
+    def _sqlite_get(self, key: str, now: float) -> Optional[Tuple[float, ...]]:
+        if self._conn is None:
+            return None
+        try:
+            with self._sqlite_lock:
+                row = self._conn.execute(
+                    "SELECT embedding, created_at FROM query_embeddings WHERE key = ?", (key,)
+                ).fetchone()
+        except Exception as e:
+            with self._lock:
+                self._counters["errors"] += 1
+            logger.debug(f"Embedding cache SQLite read failed: {e}")
+            return None
+        if row is None or now - row[1] > self.ttl_seconds:
+            return None
+        return tuple(array("d", row[0]))
+
+    def _sqlite_put(self, key: str, embedding: Tuple[float, ...], now: float) -> None:
+        if self._conn is None:
+            return
+        try:
+            with self._sqlite_lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO query_embeddings (key, embedding, created_at) VALUES (?, ?, ?)",
+                    (key, array("d", embedding).tobytes(), now),
+                )
+                # Opportunistic purge so the shared file doesn't grow without bound
+                self._conn.execute(
+                    "DELETE FROM query_embeddings WHERE created_at < ?", (now - self.ttl_seconds,)
+                )
+                self._conn.commit()
+        except Exception as e:
+            with self._lock:
+                self._counters["errors"] += 1
+            logger.debug(f"Embedding cache SQLite write failed: {e}")
+
+    # --- public API ---
+
+    def get(self, provider: str, model: str, text: str) -> Optional[List[float]]:
+        """Cached embedding for `text` (a fresh list the caller may modify), or None (counts a miss)."""
+        key = _cache_key(provider, model, text)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return list(entry[1])
+            if entry is not None:
+                del self._entries[key]
+        # Memory hits never wait behind disk I/O
+        embedding = self._sqlite_get(key, now)
+        with self._lock:
+            if embedding is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["sqlite_hits"] += 1
+            self._remember(key, embedding, now)
+        return list(embedding)
+
+    def put(self, provider: str, model: str, text: str, embedding: List[float]) -> None:
+        key = _cache_key(provider, model, text)
+        embedding = tuple(embedding)
+        now = time.time()
+        with self._lock:
+            self._remember(key, embedding, now)
+        self._sqlite_put(key, embedding, now)
+
+    def _remember(self, key: str, embedding: Tuple[float, ...], now: float) -> None:
+        self._entries[key] = (now, embedding)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def record_miss_latency(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self._miss_latency_ms += elapsed_ms
+
+    def clear(self) -> None:
+        """Drop the in-process tier (the shared SQLite file is left alone)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            hits = counters["memory_hits"] + counters["sqlite_hits"]
+            lookups = hits + counters["misses"]
+            avg_miss_ms = self._miss_latency_ms / counters["misses"] if counters["misses"] else 0.0
+            return {
+                **counters,
+                "hits": hits,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "sqlite_path": self.sqlite_path if self._conn is not None else None,
+                "avg_miss_latency_ms": round(avg_miss_ms, 1),
+                # Each hit skipped one provider call of roughly the average miss latency
+                "estimated_saved_ms": int(hits * avg_miss_ms),
+                "provider_calls_saved": hits,
+            }
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get or create the process-wide query embedding cache."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        with _embedding_cache_lock:
+            if _embedding_cache is None:
+                _embedding_cache = EmbeddingCache(sqlite_path=EMBEDDING_CACHE_SQLITE_PATH)
+    return _embedding_cache
+
+
+def _service_identity(embedding_service: Any) -> Tuple[str, str]:
+    provider = getattr(embedding_service, "provider", None) or "vertex_ai"
+    model = getattr(embedding_service, "model_name", None) or type(embedding_service).__name__
+    return str(provider), str(model)
+
+
+def embed_query(text: str, embedding_service: Any = None) -> List[float]:
+    """
+    Embed a search query, serving repeats from the cache.
+
+    Args:
+        text: Query text (must be non-empty after normalization)
+        embedding_service: Provider to use (default: get_embedding_service())
+
+    Returns:
+        Embedding vector
+
+    Raises:
+        Whatever the provider raises on a miss (empty text, no provider, API errors)
+    """
+    if embedding_service is None:
+        from services.embedding_service import get_embedding_service
+        embedding_service = get_embedding_service()
+    provider, model = _service_identity(embedding_service)
+    cache = get_embedding_cache()
+    cached = cache.get(provider, model, text)
+    if cached is not None:
+        return cached
+
+    started = time.perf_counter()
+    embedding = embedding_service.embed_text(normalize_query_text(text))
+    cache.record_miss_latency((time.perf_counter() - started) * 1000)
+    cache.put(provider, model, text, embedding)
+    return embedding
@@ -0,0 +1,511 @@
+"""
+Episode Search Index
+
+/api/episodes/search used to stream the 1,000 most recent episodes on every
+query, strip HTML with a regex per document and substring-match each term;
+with search_transcripts=True it then downloaded every candidate's transcript
+from GCS during the request.
+
+Episodes are now also kept in a positional inverted index over four fields:
+
+    postings: {token: {episode_id: [[title positions], [description positions],
+                                    [summary positions], [transcript positions]]}}
+
+A query is a list of clauses that must all match -- bare words, or "quoted
+phrases" matched by position within one field -- ranked with BM25F. Positions
+count stopwords, so "origin of life" matches those words in that order only.
+The cleaned field text is kept alongside the postings, so transcript snippets
+and timestamps come from the index instead of GCS.
+
+Once the index has been built (scripts/build_episode_search_index.py),
+EpisodeService.upsert_episode_document (title/description/summary),
+generate_and_upload_transcript (transcript) and podcast deletion update it
+incrementally: each update swaps in a copy-on-write copy of the index, so
+searches run lock-free against an index that never changes under them. It is
+persisted as gzipped JSON to EPISODE_SEARCH_INDEX_GCS_URI (or the local file
+EPISODE_SEARCH_INDEX_PATH) by a background flush that batches the changes of
+EPISODE_SEARCH_INDEX_FLUSH_SECONDS, loaded at startup and re-read when another
+instance has written a newer copy. GCS writes are conditional on the
+generation that was loaded; on a conflict the newer copy is reloaded and the
+pending changes are re-applied to it (see services/persisted_index.py).
+
+Copyright (c) 2025 Gary Welz / CopernicusAI
+Licensed under MIT License
+"""
+
+import gzip
+import json
+import math
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from mcp_server.utils.keyword_index import STOPWORDS
+from services.persisted_index import CopyOnWritePostings, PersistedIndexStore
+
+# Configuration
+EPISODE_SEARCH_INDEX_PATH = os.getenv("EPISODE_SEARCH_INDEX_PATH", "")
+EPISODE_SEARCH_INDEX_GCS_URI = os.getenv("EPISODE_SEARCH_INDEX_GCS_URI", "")
+EPISODE_SEARCH_INDEX_REFRESH_SECONDS = float(os.getenv("EPISODE_SEARCH_INDEX_REFRESH_SECONDS", "60"))
+EPISODE_SEARCH_INDEX_FLUSH_SECONDS = float(os.getenv("EPISODE_SEARCH_INDEX_FLUSH_SECONDS", "30"))
+
+FIELDS = ("title", "description", "summary", "transcript")
+# Same relative weights the scan path's match_score gave title/description/summary hits
+FIELD_BOOSTS = {"title": 3.0, "description": 2.0, "summary": 2.0, "transcript": 1.0}
+TEXT_FIELDS = tuple(range(FIELDS.index("transcript")))
+TRANSCRIPT_FIELD = FIELDS.index("transcript")
+
+INDEX_FORMAT_VERSION = 1
+
+# Average speaking rate (~150 words per minute), used to turn a transcript
+# word position into an approximate playback timestamp
+WORDS_PER_SECOND = 2.5
+SNIPPET_CHARS = 250
+
+_TOKEN_RE = re.compile(r"[A-Za-z0-9]+")
+_PHRASE_RE = re.compile(r'"([^"]*)"')
+_SPEAKER_LABEL_RE = re.compile(r"\b(HOST|EXPERT|QUESTIONER|CORRESPONDENT):\s*", re.IGNORECASE)
+
+Clause = Tuple[Tuple[str, int], ...]
+
+
+def analyze(text: str) -> List[Tuple[str, int, int]]:
+    """(token, position, char offset) of each non-stopword token; positions count stopwords too."""
+    terms = []
+    for position, match in enumerate(_TOKEN_RE.finditer(text or "")):
+        token = match.group().lower()
+        if token not in STOPWORDS:
+            terms.append((token, position, match.start()))
+    return terms
+
+
+def clean_text(text: Optional[str]) -> str:
+    """Plain text of a title/description/summary: HTML tags and markdown markup removed."""
+    text = re.sub(r"<[^>]+>", " ", text or "")
+    text = re.sub(r"\[([^\]]+)\]\([^\)]+\)", r"\1", text)  # Links
+    text = re.sub(r"\*\*([^*]+)\*\*", r"\1", text)  # Bold
+    text = re.sub(r"\*([^*]+)\*", r"\1", text)  # Italic
+    text = re.sub(r"#+\s*", "", text)  # Headers
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def clean_transcript(text: Optional[str]) -> str:
+    """Plain transcript text with markdown and speaker labels removed."""
+    return re.sub(r"\s+", " ", _SPEAKER_LABEL_RE.sub("", clean_text(text))).strip()
+
+
+def episode_text_fields(data: Dict[str, Any]) -> Dict[str, str]:
+    """The title/description/summary text indexed for an episode document."""
+    return {
+        "title": data.get("title") or "",
+        "description": data.get("description_markdown") or data.get("description_html") or "",
+        "summary": data.get("summary") or "",
+    }
+
+
+def parse_query(query: str) -> List[Clause]:
+    """
+    Split a query into clauses of (token, offset from the clause's first token).
+
+    Quoted text is one phrase clause; each other whitespace-separated word is
+    its own clause (a word like "x-ray" becomes a two-token phrase).
+    """
+    clauses: List[Clause] = []
+
+    def add(text: str) -> None:
+        terms = analyze(text)
+        if terms:
+            base = terms[0][1]
+            clauses.append(tuple((token, position - base) for token, position, _ in terms))
+
+    last = 0
+    for match in _PHRASE_RE.finditer(query or ""):
+        for word in query[last:match.start()].split():
+            add(word)
+        add(match.group(1))
+        last = match.end()
+    for word in (query or "")[last:].split():
+        add(word)
+    return list(dict.fromkeys(clauses))
+
+
+def _delta_encode(positions: List[int]) -> List[int]:
+    return [p - positions[i - 1] if i else p for i, p in enumerate(positions)]
+
+
+def _delta_decode(deltas: List[int]) -> List[int]:
+    positions, total = [], 0
+    for delta in deltas:
+        total += delta
+        positions.append(total)
+    return positions
+
+
+@dataclass
+class SearchHit:
+    episode_id: str
+    score: float
+    # First transcript word position of a match, set when every clause matched in the transcript
+    transcript_position: Optional[int] = None
+
+
+class EpisodeSearchIndex(CopyOnWritePostings):
+    """Positional BM25F index over episode title/description/summary/transcript text."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        super().__init__()
+        self.k1 = k1
+        self.b = b
+        # token -> episode_id -> positions per field
+        self.postings: Dict[str, Dict[str, List[List[int]]]] = {}
+        # episode_id -> field -> cleaned text
+        self.texts: Dict[str, Dict[str, str]] = {}
+        # episode_id -> indexed token count per field
+        self.lengths: Dict[str, List[int]] = {}
+        self._length_totals = [0] * len(FIELDS)
+        self.updated_at = time.time()
+
+    @property
+    def size(self) -> int:
+        return len(self.texts)
+
+    def __contains__(self, episode_id: str) -> bool:
+        return episode_id in self.texts
+
+    # --------------------------------------------------------------- updates
+
+    def copy(self) -> "EpisodeSearchIndex":
+        """
+        A copy that shares structure with this index until it is changed.
+
+        Updates to the copy replace (never mutate) the per-token postings and
+        per-episode entries they touch, so this index stays valid for searches
+        running against it.
+        """
+        clone = EpisodeSearchIndex(k1=self.k1, b=self.b)
+        self._share_postings(clone)
+        clone.texts = dict(self.texts)
+        clone.lengths = dict(self.lengths)
+        clone._length_totals = list(self._length_totals)
+        clone.updated_at = self.updated_at
+        return clone
+
+    def update_fields(self, episode_id: str, fields: Dict[str, Optional[str]]) -> bool:
+        """
+        (Re-)index the given fields of an episode, leaving its other fields as they are.
+
+        Returns False if nothing changed.
+        """
+        texts = dict(self.texts.get(episode_id, {}))
+        lengths = list(self.lengths.get(episode_id, [0] * len(FIELDS)))
+        changed = False
+        for field, raw in fields.items():
+            i = FIELDS.index(field)
+            text = clean_transcript(raw) if i == TRANSCRIPT_FIELD else clean_text(raw)
+            if texts.get(field, "") == text:
+                continue
+            if field in texts:
+                self._unpost(episode_id, i, texts.pop(field))
+            self._length_totals[i] -= lengths[i]
+            lengths[i] = self._post(episode_id, i, text) if text else 0
+            self._length_totals[i] += lengths[i]
+            if text:
+                texts[field] = text
+            changed = True
+        if not changed:
+            return False
+        if texts:
+            self.texts[episode_id] = texts
+            self.lengths[episode_id] = lengths
+        else:
+            self.texts.pop(episode_id, None)
+            self.lengths.pop(episode_id, None)
+        self.updated_at = time.time()
+        return True
+
+    def remove(self, episode_id: str) -> bool:
+        """Drop an episode from the index; returns False if it wasn't indexed."""
+        if episode_id not in self.texts:
+            return False
+        return self.update_fields(episode_id, {field: None for field in self.texts[episode_id]})
+
+    def _post(self, episode_id: str, field_index: int, text: str) -> int:
+        terms = analyze(text)
+        positions_by_token: Dict[str, List[int]] = {}
+        for token, position, _ in terms:
+            positions_by_token.setdefault(token, []).append(position)
+        for token, positions in positions_by_token.items():
+            postings = self._own_postings(token)
+            entry = postings.get(episode_id)
+            entry = [list(p) for p in entry] if entry else [[] for _ in FIELDS]
+            entry[field_index] = positions
+            postings[episode_id] = entry
+        return len(terms)
+
+    def _unpost(self, episode_id: str, field_index: int, text: str) -> None:
+        for token in {token for token, _, _ in analyze(text)}:
+            if episode_id not in self.postings.get(token, {}):
+                continue
+            postings = self._own_postings(token)
+            entry = [list(p) for p in postings[episode_id]]
+            entry[field_index] = []
+            if any(entry):
+                postings[episode_id] = entry
+                continue
+            del postings[episode_id]
+            if not postings:
+                self._drop_term(token)
+
+    # ---------------------------------------------------------------- search
+
+    def _phrase_matches(self, clause: Clause, fields: Tuple[int, ...]) -> Dict[str, List[List[int]]]:
+        """episode_id -> start positions of the phrase per field (only episodes with a match)."""
+        first = self.postings.get(clause[0][0])
+        rest = [(self.postings.get(token), offset) for token, offset in clause[1:]]
+        if not first or any(postings is None for postings, _ in rest):
+            return {}
+        matches: Dict[str, List[List[int]]] = {}
+        for episode_id, entry in first.items():
+            others = [(postings.get(episode_id), offset) for postings, offset in rest]
+            if any(other is None for other, _ in others):
+                continue
+            starts = [[] for _ in FIELDS]
+            for i in fields:
+                candidates = set(entry[i])
+                for other, offset in others:
+                    if not candidates:
+                        break
+                    candidates &= {position - offset for position in other[i]}
+                starts[i] = sorted(candidates)
+            if any(starts):
+                matches[episode_id] = starts
+        return matches
+
+    def _clause_variants(self, clause: Clause, fields: Tuple[int, ...]) -> List[Tuple[float, Dict[str, List[List[int]]]]]:
+        if len(clause) > 1:
+            return [(1.0, self._phrase_matches(clause, fields))]
+        variants = []
+        for term, weight in self._expand(clause[0][0]):
+            matches = {
+                episode_id: entry
+                for episode_id, entry in self.postings[term].items()
+                if any(entry[i] for i in fields)
+            }
+            variants.append((weight, matches))
+        return variants
+
+    def search(self, clauses: List[Clause], include_transcript: bool = False, limit: int = 100) -> List[SearchHit]:
+        """Episodes matching every clause, best BM25F score first."""
+        n_docs = self.size
+        if not clauses or n_docs == 0 or limit <= 0:
+            return []
+        fields = TEXT_FIELDS + ((TRANSCRIPT_FIELD,) if include_transcript else ())
+        avg_len = [max(1.0, self._length_totals[i] / n_docs) for i in range(len(FIELDS))]
+        boosts = [FIELD_BOOSTS[f] for f in FIELDS]
+
+        scores: Optional[Dict[str, float]] = None
+        transcript_starts: Dict[str, List[int]] = {}
+        for clause in clauses:
+            clause_scores: Dict[str, float] = {}
+            clause_starts: Dict[str, int] = {}
+            for weight, matches in self._clause_variants(clause, fields):
+                if not matches:
+                    continue
+                idf = math.log(1.0 + (n_docs - len(matches) + 0.5) / (len(matches) + 0.5))
+                for episode_id, starts in matches.items():
+                    if scores is not None and episode_id not in scores:
+                        continue
+                    lengths = self.lengths[episode_id]
+                    weighted_tf = 0.0
+                    for i in fields:
+                        if starts[i]:
+                            norm = 1.0 - self.b + self.b * (lengths[i] / avg_len[i])
+                            weighted_tf += boosts[i] * len(starts[i]) / norm
+                    if weighted_tf <= 0.0:
+                        continue
+                    score = weight * idf * weighted_tf * (self.k1 + 1.0) / (weighted_tf + self.k1)
+                    clause_scores[episode_id] = clause_scores.get(episode_id, 0.0) + score
+                    transcript = starts[TRANSCRIPT_FIELD]
+                    if transcript:
+                        first = clause_starts.get(episode_id)
+                        clause_starts[episode_id] = transcript[0] if first is None else min(first, transcript[0])
+            if scores is None:
+                scores = clause_scores
+            else:
+                scores = {eid: scores[eid] + s for eid, s in clause_scores.items()}
+            for episode_id in scores:
+                if episode_id in clause_starts:
+                    transcript_starts.setdefault(episode_id, []).append(clause_starts[episode_id])
+            if not scores:
+                return []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        hits = []
+        for episode_id, score in ranked:
+            starts = transcript_starts.get(episode_id, [])
+            position = min(starts) if include_transcript and len(starts) == len(clauses) else None
+            hits.append(SearchHit(episode_id, score, position))
+        return hits
+
+    def transcript_excerpt(self, episode_id: str, position: int) -> Tuple[int, str]:
+        """(approximate timestamp in seconds, snippet) around a transcript word position."""
+        text = self.texts.get(episode_id, {}).get("transcript", "")
+        offset, length = len(text), 0
+        for i, match in enumerate(_TOKEN_RE.finditer(text)):
+            if i == position:
+                offset, length = match.start(), len(match.group())
+                break
+        start = max(0, offset - SNIPPET_CHARS)
+        end = min(len(text), offset + length + SNIPPET_CHARS)
+        snippet = text[start:end]
+        if start > 0:
+            snippet = "..." + snippet
+        if end < len(text):
+            snippet = snippet + "..."
+        return max(0, int(position / WORDS_PER_SECOND)), snippet
+
+    # ----------------------------------------------------------- persistence
+
+    def to_bytes(self) -> bytes:
+        payload = {
+            "format_version": INDEX_FORMAT_VERSION,
+            "k1": self.k1,
+            "b": self.b,
+            "updated_at": self.updated_at,
+            "texts": self.texts,
+            "postings": {
+                token: {eid: [_delta_encode(positions) for positions in entry] for eid, entry in postings.items()}
+                for token, postings in self.postings.items()
+            },
+        }
+        return gzip.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "EpisodeSearchIndex":
+        payload = json.loads(gzip.decompress(data))
+        if payload.get("format_version") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported episode search index format: {payload.get('format_version')}")
+        index = cls(k1=payload["k1"], b=payload["b"])
+        index.texts = payload["texts"]
+        index.lengths = {episode_id: [0] * len(FIELDS) for episode_id in index.texts}
+        for token, postings in payload["postings"].items():
+            decoded = index.postings[token] = {}
+            for episode_id, entry in postings.items():
+                decoded[episode_id] = [_delta_decode(deltas) for deltas in entry]
+                lengths = index.lengths[episode_id]
+                for i, positions in enumerate(entry):
+                    lengths[i] += len(positions)
+        index._length_totals = [
+            sum(lengths[i] for lengths in index.lengths.values()) for i in range(len(FIELDS))
+        ]
+        index.updated_at = payload.get("updated_at") or time.time()
+        return index
+
+
+_INDEX_KEY = "episodes"
+
+
+class EpisodeSearchIndexStore(PersistedIndexStore[EpisodeSearchIndex, Tuple[str, Dict[str, Optional[str]]]]):
+    """
+    The persisted episode search index (one object at `local_path` and/or
+    `gcs_uri`), kept in memory.
+
+    Changes are (episode_id, {field: text or None}) pairs, written by the
+    background flush at most `flush_seconds` after the first unwritten one.
+    """
+
+    label = "episode search index"
+
+    def __init__(
+        self,
+        local_path: str = "",
+        gcs_uri: str = "",
+        refresh_seconds: float = 60.0,
+        flush_seconds: float = 30.0,
+        client: Any = None,
+    ):
+        super().__init__(refresh_seconds, flush_seconds, client)
+        self.local_path = local_path
+        self.gcs_uri = gcs_uri
+
+    @property
+    def persisted(self) -> bool:
+        return bool(self.local_path or self.gcs_uri)
+
+    def _locations(self, key: str) -> Tuple[str, str]:
+        return self.local_path, self.gcs_uri
+
+    def _load(self, data: bytes) -> EpisodeSearchIndex:
+        return EpisodeSearchIndex.from_bytes(data)
+
+    def _apply(self, index: EpisodeSearchIndex, changes: Iterable[Tuple[str, Dict[str, Optional[str]]]]) -> bool:
+        changed = False
+        for episode_id, fields in changes:
+            changed = index.update_fields(episode_id, fields) or changed
+        return changed
+
+    def get(self) -> Optional[EpisodeSearchIndex]:
+        """The current index (treat it as read-only), or None if none has been built."""
+        return self._get(_INDEX_KEY)
+
+    def put(self, index: EpisodeSearchIndex) -> bool:
+        """Install a freshly built index and write it, replacing any persisted copy."""
+        self._install(_INDEX_KEY, index)
+        return self.flush() == [_INDEX_KEY]
+
+    def update(self, episode_id: str, fields: Dict[str, Optional[str]]) -> bool:
+        """Re-index some fields of one episode; returns False if nothing changed (or no index exists yet)."""
+        return self._update(_INDEX_KEY, [(episode_id, fields)])
+
+    def remove(self, episode_id: str) -> bool:
+        index = self._indexes.get(_INDEX_KEY) or self.get()
+        if index is None or episode_id not in index:
+            return False
+        return self.update(episode_id, {field: None for field in index.texts[episode_id]})
+
+
+_store: Optional[EpisodeSearchIndexStore] = None
+_store_lock = threading.Lock()
+
+
+def get_episode_search_store() -> Optional[EpisodeSearchIndexStore]:
+    """Process-wide store, or None when no index location is configured."""
+    global _store
+    if not EPISODE_SEARCH_INDEX_PATH and not EPISODE_SEARCH_INDEX_GCS_URI:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = EpisodeSearchIndexStore(
+                    EPISODE_SEARCH_INDEX_PATH,
+                    EPISODE_SEARCH_INDEX_GCS_URI,
+                    EPISODE_SEARCH_INDEX_REFRESH_SECONDS,
+                    EPISODE_SEARCH_INDEX_FLUSH_SECONDS,
+                )
+    return _store
+
+
+def index_episode_text(episode_id: str, data: Dict[str, Any]) -> bool:
+    """Re-index an episode document's title/description/summary."""
+    store = get_episode_search_store()
+    if store is None or not episode_id:
+        return False
+    return store.update(episode_id, episode_text_fields(data))
+
+
+def index_episode_transcript(episode_id: str, transcript: str) -> bool:
+    """Index an episode's transcript text as it is uploaded."""
+    store = get_episode_search_store()
+    if store is None or not episode_id:
+        return False
+    return store.update(episode_id, {"transcript": transcript})
+
+
+def remove_episode_from_search(episode_id: str) -> bool:
+    store = get_episode_search_store()
+    if store is None or not episode_id:
+        return False
+    return store.remove(episode_id)
@@ -11,6 +11,10 @@ from config.constants import (
     CATEGORY_SLUG_TO_LABEL,
 )
 from config.database import db
+from services.knowledge_graph_changes import record_graph_changes
+from services.related_content_index import index_episode
+from services.public_episode_listing import sync_episode_listing
+from services.episode_search_index import index_episode_text
 from utils.logging import structured_logger
 from content_fixes import extract_itunes_summary
 
@@ -317,13 +321,39 @@ class EpisodeService:
             episode_id = episode_doc["episode_id"]
             episode_ref = db.collection(EPISODE_COLLECTION_NAME).document(episode_id)
             existing = episode_ref.get()
+            existing_data = (existing.to_dict() or {}) if existing.exists else {}
             if existing.exists:
-                existing_data = existing.to_dict() or {}
                 episode_doc.setdefault("created_at", existing_data.get("created_at"))
             episode_ref.set(episode_doc, merge=True)
             structured_logger.debug("Episode catalog updated",
                                    episode_id=episode_id,
                                    job_id=job_id)
+            try:
+                record_graph_changes(db, EPISODE_COLLECTION_NAME, [episode_id])
+            except Exception as e:
+                structured_logger.warning("Failed to record knowledge graph change for episode",
+                                         episode_id=episode_id,
+                                         error=str(e))
+            try:
+                index_episode(db, job_id, request_data,
+                              title=episode_doc["title"],
+                              category=episode_doc["category"])
+            except Exception as e:
+                structured_logger.warning("Failed to update related content index for episode",
+                                         episode_id=episode_id,
+                                         error=str(e))
+            try:
+                sync_episode_listing(episode_id, {**existing_data, **episode_doc})
+            except Exception as e:
+                structured_logger.warning("Failed to update public episode listing",
+                                         episode_id=episode_id,
+                                         error=str(e))
+            try:
+                index_episode_text(episode_id, {**existing_data, **episode_doc})
+            except Exception as e:
+                structured_logger.warning("Failed to update episode search index",
+                                         episode_id=episode_id,
+                                         error=str(e))
         except Exception as e:
             structured_logger.error("Failed to upsert episode document",
                                    job_id=job_id,
@@ -0,0 +1,104 @@
+"""
+Knowledge Graph Change Log
+
+Writers that add, update or delete documents the knowledge map draws from
+(research_papers, episodes, science_videos, the process-family collections)
+append one small entry per document to a Firestore change log:
+
+    {seq, collection, doc_id, op: "upsert" | "remove", recorded_at}
+
+`seq` is a nanosecond wall-clock stamp, offset per entry so a batch keeps its
+order. A persisted graph snapshot remembers the highest seq it has applied
+(its high-water mark); KnowledgeMapService.get_or_build_graph replays only
+the entries above it instead of rebuilding the whole graph.
+
+Entries from a writer whose clock lags another's by more than the replay
+interval can land below an already-advanced high-water mark; snapshot max
+age (KNOWLEDGE_GRAPH_SNAPSHOT_MAX_AGE_SECONDS) forces a periodic full
+rebuild that picks those up.
+
+This module only needs a Firestore client, so ingestion scripts can import
+it without pulling in the rest of the service layer.
+
+Copyright (c) 2025 Gary Welz / CopernicusAI
+Licensed under MIT License
+"""
+
+import logging
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+KNOWLEDGE_GRAPH_CHANGE_LOG_COLLECTION = os.getenv("KNOWLEDGE_GRAPH_CHANGE_LOG_COLLECTION", "knowledge_graph_changes")
+
+GRAPH_CHANGE_OPS = ("upsert", "remove")
+_MAX_BATCH_WRITES = 500
+
+
+def record_graph_changes(db: Any, collection: str, doc_ids: Iterable[str], op: str = "upsert") -> int:
+    """
+    Append change-log entries for documents written to (or deleted from) `collection`.
+
+    Args:
+        db: Firestore client
+        collection: Source collection of the documents
+        doc_ids: Document ids that changed
+        op: "upsert" (created or updated) or "remove" (deleted)
+
+    Returns:
+        Number of entries written
+    """
+    if op not in GRAPH_CHANGE_OPS:
+        raise ValueError(f"Unknown graph change op: {op}")
+    ids = [str(doc_id) for doc_id in doc_ids if doc_id]
+    if not ids:
+        return 0
+    log = db.collection(KNOWLEDGE_GRAPH_CHANGE_LOG_COLLECTION)
+    base_seq = time.time_ns()
+    recorded_at = datetime.utcnow().isoformat()
+    for start in range(0, len(ids), _MAX_BATCH_WRITES):
+        batch = db.batch()
+        for offset, doc_id in enumerate(ids[start:start + _MAX_BATCH_WRITES], start=start):
+            seq = base_seq + offset
+            batch.set(log.document(f"{seq:020d}-{uuid.uuid4().hex[:8]}"), {
+                "seq": seq,
+                "collection": collection,
+                "doc_id": doc_id,
+                "op": op,
+                "recorded_at": recorded_at,
+            })
+        batch.commit()
+    return len(ids)
+
+
+def read_graph_changes(db: Any, after_seq: int = 0, limit: int = 1000) -> List[Dict[str, Any]]:
+    """Change-log entries with seq > `after_seq`, oldest first (at most `limit`)."""
+    query = (
+        db.collection(KNOWLEDGE_GRAPH_CHANGE_LOG_COLLECTION)
+        .where(filter=FieldFilter("seq", ">", int(after_seq)))
+        .order_by("seq")
+        .limit(limit)
+    )
+    return [doc.to_dict() for doc in query.stream()]
+
+
+def latest_graph_change_seq(db: Any) -> int:
+    """Highest recorded seq (0 when the log is empty or unreadable)."""
+    try:
+        query = (
+            db.collection(KNOWLEDGE_GRAPH_CHANGE_LOG_COLLECTION)
+            .order_by("seq", direction="DESCENDING")
+            .limit(1)
+        )
+        for doc in query.stream():
+            return int((doc.to_dict() or {}).get("seq") or 0)
+    except Exception as e:
+        logger.warning(f"Could not read knowledge graph change log: {e}")
+    return 0
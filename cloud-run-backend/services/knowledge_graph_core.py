@@ -0,0 +1,260 @@
+"""
+Knowledge Graph Core
+
+Compact, read-only adjacency for a built knowledge graph, shared by
+KnowledgeMapService.get_subgraph and KnowledgeMapQueryService.
+
+Nodes get integer ids (real nodes first, then edge endpoints with no node,
+e.g. citations leaving the filtered set). Edges are columnar -- source and
+target ids plus a type code -- and adjacency is two CSR arrays over edge
+indexes:
+
+    out_edges[out_offsets[i]:out_offsets[i + 1]]   edges with source i
+    in_edges[in_offsets[i]:in_offsets[i + 1]]      edges with target i
+
+both in original edge order, so traversals visit neighbours in the same order
+the old list scans did. A relationship-type filter is compiled once into a
+per-type-code mask instead of comparing strings per edge.
+
+The core is built once per graph (or loaded from a snapshot) and reused by
+every query on it; BFS costs O(visited edges) instead of O(V * E).
+
+Copyright (c) 2025 Gary Welz / CopernicusAI
+Licensed under MIT License
+"""
+
+from array import array
+from collections import deque
+from heapq import merge
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def edge_field(edge: Dict[str, Any], key: str) -> Any:
+    """Edge attribute from a raw edge or a Cytoscape-style {'data': {...}} edge."""
+    value = edge.get(key)
+    if value is None:
+        value = (edge.get("data") or {}).get(key)
+    return value
+
+
+def node_type(node: Dict[str, Any]) -> Optional[str]:
+    return node.get("type", (node.get("data") or {}).get("type"))
+
+
+def _csr(num_ids: int, keys: array) -> Tuple[array, array]:
+    """CSR grouping edge indexes by `keys[e]`, preserving edge order within a row."""
+    counts = [0] * (num_ids + 1)
+    for k in keys:
+        counts[k + 1] += 1
+    for i in range(num_ids):
+        counts[i + 1] += counts[i]
+    offsets = array("I", counts)
+    cursor = counts[:num_ids]
+    rows = array("I", bytes(4 * len(keys)))
+    for e, k in enumerate(keys):
+        rows[cursor[k]] = e
+        cursor[k] += 1
+    return offsets, rows
+
+
+class GraphCore:
+    """Integer-id graph with CSR out/in adjacency and edge-type codes."""
+
+    # Array attributes persisted by knowledge-graph snapshots
+    ARRAY_NAMES = ("edge_src", "edge_dst", "edge_type", "out_offsets", "out_edges", "in_offsets", "in_edges")
+
+    def __init__(self, nodes: Dict[str, Dict[str, Any]], edges: List[Dict[str, Any]]):
+        self.nodes = nodes
+        self.edges = edges
+        self.node_count = len(nodes)
+        self.ids: List[str] = list(nodes.keys())
+        self.index: Dict[str, int] = {node_id: i for i, node_id in enumerate(self.ids)}
+        self.edge_types: List[str] = []
+        type_codes: Dict[str, int] = {}
+        self.edge_src = array("I")
+        self.edge_dst = array("I")
+        self.edge_type = array("H")
+        for edge in edges:
+            ends = []
+            for end in (edge_field(edge, "source"), edge_field(edge, "target")):
+                i = self.index.get(end)
+                if i is None:
+                    i = self.index[end] = len(self.ids)
+                    self.ids.append(end)
+                ends.append(i)
+            self.edge_src.append(ends[0])
+            self.edge_dst.append(ends[1])
+            t = edge_field(edge, "type") or ""
+            if t not in type_codes:
+                type_codes[t] = len(self.edge_types)
+                self.edge_types.append(t)
+            self.edge_type.append(type_codes[t])
+        self.out_offsets, self.out_edges = _csr(len(self.ids), self.edge_src)
+        self.in_offsets, self.in_edges = _csr(len(self.ids), self.edge_dst)
+        self._index_node_types()
+
+    @classmethod
+    def from_arrays(
+        cls,
+        nodes: Dict[str, Dict[str, Any]],
+        edges: List[Dict[str, Any]],
+        ids: List[str],
+        edge_types: List[str],
+        arrays: Dict[str, array],
+    ) -> "GraphCore":
+        """Rebuild from persisted arrays (see knowledge_graph_snapshots)."""
+        core = cls.__new__(cls)
+        core.nodes = nodes
+        core.edges = edges
+        core.node_count = len(nodes)
+        core.ids = ids
+        core.index = {node_id: i for i, node_id in enumerate(ids)}
+        core.edge_types = edge_types
+        for name in cls.ARRAY_NAMES:
+            setattr(core, name, arrays[name])
+        core._index_node_types()
+        return core
+
+    def persisted_arrays(self) -> Dict[str, array]:
+        return {name: getattr(self, name) for name in self.ARRAY_NAMES}
+
+    def _index_node_types(self) -> None:
+        self.nodes_by_type: Dict[Optional[str], Dict[str, Dict[str, Any]]] = {}
+        for node_id, node in self.nodes.items():
+            self.nodes_by_type.setdefault(node_type(node), {})[node_id] = node
+
+    # --- primitives ---
+
+    def type_mask(self, relationship_types: Optional[Iterable[str]]) -> Optional[bytearray]:
+        """Allowed-flag per edge-type code, or None when every type is allowed."""
+        if not relationship_types:
+            return None
+        wanted = set(relationship_types)
+        return bytearray(1 if t in wanted else 0 for t in self.edge_types)
+
+    def out_of(self, i: int) -> array:
+        return self.out_edges[self.out_offsets[i]:self.out_offsets[i + 1]]
+
+    def in_of(self, i: int) -> array:
+        return self.in_edges[self.in_offsets[i]:self.in_offsets[i + 1]]
+
+    def neighbours(self, i: int, mask: Optional[bytearray] = None) -> Iterator[Tuple[int, int]]:
+        """(edge index, neighbour id): outgoing edges first, then incoming."""
+        edge_type, edge_src, edge_dst = self.edge_type, self.edge_src, self.edge_dst
+        for e in self.out_of(i):
+            if mask is None or mask[edge_type[e]]:
+                yield e, edge_dst[e]
+        for e in self.in_of(i):
+            if mask is None or mask[edge_type[e]]:
+                yield e, edge_src[e]
+
+    # --- traversals ---
+
+    def subgraph(self, center_id: str, depth: int, max_nodes: int) -> Tuple[List[str], List[int]]:
+        """
+        BFS neighbourhood of `center_id` as (node ids, edge indexes).
+
+        Incident edges are visited in original edge order (both directions
+        interleaved) and the node budget is checked per dequeued node, matching
+        the original edge-scan implementation.
+        """
+        start = self.index.get(center_id)
+        if start is None:
+            return [center_id], []
+        edge_src, edge_dst = self.edge_src, self.edge_dst
+        visited = {start}
+        selected = [start]
+        selected_edges: List[int] = []
+        queue = deque([(start, 0)])
+        while queue and len(selected) < max_nodes:
+            current, current_depth = queue.popleft()
+            if current_depth >= depth:
+                continue
+            for e in merge(self.out_of(current), self.in_of(current)):
+                other = edge_dst[e] if edge_src[e] == current else edge_src[e]
+                if other not in visited:
+                    visited.add(other)
+                    selected.append(other)
+                    selected_edges.append(e)
+                    queue.append((other, current_depth + 1))
+        return [self.ids[i] for i in selected], selected_edges
+
+    def induced_edges(self, node_indexes: Iterable[int]) -> List[int]:
+        """Edge indexes (in original order) with both endpoints among `node_indexes`."""
+        members = set(node_indexes)
+        edge_dst = self.edge_dst
+        return sorted(e for i in members for e in self.out_of(i) if edge_dst[e] in members)
+
+    def shortest_path(
+        self,
+        source_id: str,
+        target_id: str,
+        max_depth: int,
+        relationship_types: Optional[Iterable[str]] = None,
+    ) -> Optional[List[int]]:
+        """Edge indexes of a shortest undirected path, or None within `max_depth` hops."""
+        start = self.index.get(source_id)
+        goal = self.index.get(target_id)
+        if start is None or goal is None:
+            return None
+        if start == goal:
+            return []
+        mask = self.type_mask(relationship_types)
+        parent_edge: Dict[int, Tuple[int, int]] = {start: (-1, -1)}
+        queue = deque([(start, 0)])
+        while queue:
+            current, hops = queue.popleft()
+            if hops >= max_depth:
+                continue
+            for e, other in self.neighbours(current, mask):
+                if other == goal:
+                    path = [e]
+                    while current != start:
+                        e_prev, current = parent_edge[current]
+                        path.append(e_prev)
+                    path.reverse()
+                    return path
+                if other not in parent_edge:
+                    parent_edge[other] = (e, current)
+                    queue.append((other, hops + 1))
+        return None
+
+    def related(
+        self,
+        node_id: str,
+        depth: int,
+        limit: int,
+        allowed_ids: Dict[str, Any],
+        relationship_types: Optional[Iterable[str]] = None,
+    ) -> List[str]:
+        """Ids in `allowed_ids` reachable within `depth` hops, walking only through allowed ids."""
+        start = self.index.get(node_id)
+        if start is None:
+            return []
+        mask = self.type_mask(relationship_types)
+        ids = self.ids
+        found: List[str] = []
+        visited = {start}
+        queue = deque([(start, 0)])
+        while queue and len(found) < limit:
+            current, current_depth = queue.popleft()
+            if current_depth >= depth:
+                continue
+            for _, other in self.neighbours(current, mask):
+                if other not in visited and ids[other] in allowed_ids:
+                    visited.add(other)
+                    found.append(ids[other])
+                    queue.append((other, current_depth + 1))
+        return found[:limit]
+
+    def connection_counts(self, node_id: str, allowed_ids: Dict[str, Any]) -> Dict[str, int]:
+        """Number of edges (either direction) from `node_id` to each id in `allowed_ids`."""
+        i = self.index.get(node_id)
+        counts: Dict[str, int] = {}
+        if i is None:
+            return counts
+        for _, other in self.neighbours(i):
+            other_id = self.ids[other]
+            if other_id in allowed_ids:
+                counts[other_id] = counts.get(other_id, 0) + 1
+        return counts
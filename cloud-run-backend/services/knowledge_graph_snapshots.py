@@ -0,0 +1,473 @@
+"""
+Knowledge Graph Snapshots
+
+A built knowledge graph (nodes, edges and its GraphCore adjacency) is
+stored as a snapshot keyed by a normalized filter signature and tagged with
+the data version it was built from. Snapshots live in an in-memory LRU and
+are written through to a local directory and/or GCS, so a repeated map view
+-- on this worker, another worker, or after a restart -- is served without
+touching Firestore.
+
+On-disk format (zlib-compressed after the magic):
+
+    MAGIC | u32 header length | header JSON | sections...
+
+The header lists each section's byte offset, length and array typecode.
+Nodes are one JSON blob; edges are columnar (source/target id, type code,
+float32 weight) with only non-empty edge metadata stored; adjacency is the
+GraphCore out/in CSR arrays (see services/knowledge_graph_core.py), so a
+loaded snapshot is queryable without re-indexing. Snapshots of unfiltered
+graphs also carry per-item features (tokens, categories, authors, similarity
+neighbours) and a change-log high-water mark, which is what
+KnowledgeMapService needs to apply ingestion deltas instead of rebuilding.
+
+A snapshot is served only when its data version matches the current one
+(per-collection document counts, re-checked at most every
+KNOWLEDGE_GRAPH_VERSION_TTL_SECONDS) and it is younger than
+KNOWLEDGE_GRAPH_SNAPSHOT_MAX_AGE_SECONDS, which bounds staleness from edits
+that don't change counts.
+
+Copyright (c) 2025 Gary Welz / CopernicusAI
+Licensed under MIT License
+"""
+
+import hashlib
+import json
+import logging
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from services.knowledge_graph_core import GraphCore
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+KNOWLEDGE_GRAPH_SNAPSHOT_DIR = os.getenv("KNOWLEDGE_GRAPH_SNAPSHOT_DIR", "")
+KNOWLEDGE_GRAPH_SNAPSHOT_GCS_URI = os.getenv("KNOWLEDGE_GRAPH_SNAPSHOT_GCS_URI", "")
+KNOWLEDGE_GRAPH_SNAPSHOT_MAX_ENTRIES = int(os.getenv("KNOWLEDGE_GRAPH_SNAPSHOT_MAX_ENTRIES", "8"))
+KNOWLEDGE_GRAPH_SNAPSHOT_MAX_AGE_SECONDS = float(os.getenv("KNOWLEDGE_GRAPH_SNAPSHOT_MAX_AGE_SECONDS", "21600"))
+KNOWLEDGE_GRAPH_VERSION_TTL_SECONDS = float(os.getenv("KNOWLEDGE_GRAPH_VERSION_TTL_SECONDS", "60"))
+
+MAGIC = b"KGSNAP1\n"
+FORMAT_VERSION = 2
+
+
+def _normalize_filter_value(value: Any) -> Any:
+    if isinstance(value, (list, tuple, set)):
+        items = {str(v).strip().lower() for v in value if v is not None and str(v).strip()}
+        return sorted(items) or None
+    if isinstance(value, str):
+        return value.strip().lower() or None
+    return value
+
+
+def graph_filter_signature(**build_kwargs: Any) -> str:
+    """
+    Stable signature for a set of build_graph() arguments.
+
+    Lists are order/case/duplicate-insensitive and unset (None/empty) values are
+    dropped, so "physics,biology" and "Biology, physics" share a snapshot.
+    """
+    normalized = {}
+    for key, value in build_kwargs.items():
+        value = _normalize_filter_value(value)
+        if value is not None:
+            normalized[key] = value
+    canonical = json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+class GraphSnapshot:
+    """A built graph plus its GraphCore (id table, edge columns, CSR adjacency)."""
+
+    def __init__(
+        self,
+        signature: str,
+        data_version: str,
+        nodes: Dict[str, Dict[str, Any]],
+        edges: List[Dict[str, Any]],
+        metadata: Optional[Dict[str, Any]] = None,
+        created_at: Optional[float] = None,
+        features: Optional[Dict[str, Dict[str, Any]]] = None,
+        change_hwm: int = 0,
+    ):
+        self.signature = signature
+        self.data_version = data_version
+        self.nodes = nodes
+        self.edges = edges
+        self.metadata = dict(metadata or {})
+        self.created_at = created_at or time.time()
+        self.features = features
+        self.change_hwm = change_hwm
+        self.core = GraphCore(nodes, edges)
+
+    def to_graph(self) -> Dict[str, Any]:
+        """The build_graph()-shaped dict for this snapshot."""
+        return {
+            "nodes": list(self.nodes.values()),
+            "edges": self.edges,
+            "metadata": {
+                **self.metadata,
+                "cached": True,
+                "snapshot": {
+                    "signature": self.signature,
+                    "data_version": self.data_version,
+                    "created_at": datetime.utcfromtimestamp(self.created_at).isoformat(),
+                },
+            },
+        }
+
+    # --- serialization ---
+
+    def to_bytes(self) -> bytes:
+        core = self.core
+        weights = array("f")
+        edge_meta: Dict[str, Any] = {}
+        for i, edge in enumerate(self.edges):
+            weights.append(float(edge.get("weight", 1.0)))
+            extra = {k: v for k, v in edge.items() if k not in ("type", "source", "target", "weight")}
+            if extra.get("metadata") == {}:
+                extra.pop("metadata")
+            if extra:
+                edge_meta[str(i)] = extra
+
+        node_rows = [
+            [node_id, node.get("type"), node.get("label"), {k: v for k, v in node.items() if k not in ("id", "type", "label")}]
+            for node_id, node in self.nodes.items()
+        ]
+        sections: List[Tuple[str, str, bytes]] = [
+            ("nodes", "json", json.dumps(node_rows, separators=(",", ":"), default=str).encode("utf-8")),
+            ("extra_ids", "json", json.dumps(core.ids[core.node_count:]).encode("utf-8")),
+            ("edge_weight", "f", weights.tobytes()),
+            ("edge_meta", "json", json.dumps(edge_meta, separators=(",", ":"), default=str).encode("utf-8")),
+        ]
+        if self.features is not None:
+            sections.append(
+                ("features", "json", json.dumps(self.features, separators=(",", ":"), default=str).encode("utf-8"))
+            )
+        sections.extend(
+            (name, values.typecode, values.tobytes()) for name, values in core.persisted_arrays().items()
+        )
+        layout = {}
+        offset = 0
+        for name, typecode, blob in sections:
+            layout[name] = [offset, len(blob), typecode]
+            offset += len(blob)
+        header = json.dumps({
+            "format": FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "signature": self.signature,
+            "data_version": self.data_version,
+            "created_at": self.created_at,
+            "change_hwm": self.change_hwm,
+            "metadata": self.metadata,
+            "edge_types": core.edge_types,
+            "sections": layout,
+        }, default=str).encode("utf-8")
+        body = struct.pack("<I", len(header)) + header + b"".join(blob for _, _, blob in sections)
+        return MAGIC + zlib.compress(body, 6)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "GraphSnapshot":
+        if not data.startswith(MAGIC):
+            raise ValueError("Not a knowledge graph snapshot")
+        body = zlib.decompress(data[len(MAGIC):])
+        (header_len,) = struct.unpack_from("<I", body, 0)
+        header = json.loads(body[4:4 + header_len])
+        if header.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format {header.get('format')}")
+        base = 4 + header_len
+        swap = header.get("byteorder") != sys.byteorder
+
+        def section(name: str) -> Any:
+            start, length, typecode = header["sections"][name]
+            blob = body[base + start:base + start + length]
+            if typecode == "json":
+                return json.loads(blob)
+            values = array(typecode)
+            values.frombytes(blob)
+            if swap:
+                values.byteswap()
+            return values
+
+        node_rows = section("nodes")
+        nodes = {row[0]: {"id": row[0], "type": row[1], "label": row[2], **row[3]} for row in node_rows}
+        ids = [row[0] for row in node_rows] + section("extra_ids")
+        edge_types = header["edge_types"]
+        arrays = {name: section(name) for name in GraphCore.ARRAY_NAMES}
+        edge_meta = section("edge_meta")
+        weights = section("edge_weight")
+        src, dst, codes = arrays["edge_src"], arrays["edge_dst"], arrays["edge_type"]
+        edges = []
+        for i in range(len(src)):
+            edge = {
+                "type": edge_types[codes[i]],
+                "source": ids[src[i]],
+                "target": ids[dst[i]],
+                # float32 on disk; round away the representation noise
+                "weight": round(weights[i], 6),
+                "metadata": {},
+            }
+            edge.update(edge_meta.get(str(i), {}))
+            edges.append(edge)
+
+        snapshot = cls.__new__(cls)
+        snapshot.signature = header["signature"]
+        snapshot.data_version = header["data_version"]
+        snapshot.created_at = header["created_at"]
+        snapshot.metadata = header.get("metadata") or {}
+        snapshot.features = section("features") if "features" in header["sections"] else None
+        snapshot.change_hwm = int(header.get("change_hwm") or 0)
+        snapshot.nodes = nodes
+        snapshot.edges = edges
+        snapshot.core = GraphCore.from_arrays(nodes, edges, ids, edge_types, arrays)
+        return snapshot
+
+
+def _split_gcs_uri(uri: str) -> Tuple[str, str]:
+    path = uri[len("gs://"):] if uri.startswith("gs://") else uri
+    bucket, _, prefix = path.partition("/")
+    return bucket, prefix.strip("/")
+
+
+class GraphSnapshotStore:
+    """
+    LRU of graph snapshots with write-through to a local dir and/or GCS.
+
+    One persisted file per filter signature (`<signature>.kgs`); a rebuild for
+    a newer data version overwrites it.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = KNOWLEDGE_GRAPH_SNAPSHOT_MAX_ENTRIES,
+        local_dir: str = "",
+        gcs_uri: str = "",
+        max_age_seconds: float = KNOWLEDGE_GRAPH_SNAPSHOT_MAX_AGE_SECONDS,
+        version_ttl_seconds: float = KNOWLEDGE_GRAPH_VERSION_TTL_SECONDS,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.local_dir = local_dir
+        self.gcs_uri = gcs_uri
+        self.max_age_seconds = max_age_seconds
+        self.version_ttl_seconds = version_ttl_seconds
+        self._snapshots: "OrderedDict[str, GraphSnapshot]" = OrderedDict()
+        # GCS generation or local mtime of the persisted copy each in-memory
+        # snapshot was loaded from / written as, so an unchanged copy isn't re-read
+        self._markers: Dict[str, Optional[int]] = {}
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._version_checked_at = 0.0
+        self._counters = {"memory_hits": 0, "persisted_hits": 0, "misses": 0, "stale": 0, "writes": 0}
+
+    def _filename(self, signature: str) -> str:
+        return f"{signature}.kgs"
+
+    def _gcs_location(self, signature: str):
+        from mcp_server.utils.gcs_client import get_storage_client
+        bucket_name, prefix = _split_gcs_uri(self.gcs_uri)
+        name = f"{prefix}/{self._filename(signature)}" if prefix else self._filename(signature)
+        return get_storage_client().bucket(bucket_name), name
+
+    def _read_persisted(self, signature: str, marker: Optional[int] = None) -> Optional[Tuple[bytes, int]]:
+        """(data, marker) of the persisted snapshot; None when there is none or it is still `marker`."""
+        if self.local_dir:
+            path = os.path.join(self.local_dir, self._filename(signature))
+            if os.path.exists(path):
+                mtime = os.stat(path).st_mtime_ns
+                if mtime == marker:
+                    return None
+                with open(path, "rb") as f:
+                    return f.read(), mtime
+        if self.gcs_uri:
+            bucket, name = self._gcs_location(signature)
+            blob = bucket.get_blob(name)
+            if blob is None or blob.generation == marker:
+                return None
+            data = blob.download_as_bytes(if_generation_match=blob.generation)
+            if self.local_dir:
+                return data, self._write_local(signature, data)
+            return data, blob.generation
+        return None
+
+    def _load_persisted(self, signature: str, marker: Optional[int] = None) -> Optional[Tuple[GraphSnapshot, int]]:
+        loaded = self._read_persisted(signature, marker)
+        if loaded is None:
+            return None
+        data, new_marker = loaded
+        return GraphSnapshot.from_bytes(data), new_marker
+
+    def _write_local(self, signature: str, data: bytes) -> int:
+        os.makedirs(self.local_dir, exist_ok=True)
+        path = os.path.join(self.local_dir, self._filename(signature))
+        tmp = f"{path}.tmp-{os.getpid()}"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        return os.stat(path).st_mtime_ns
+
+    def _expired(self, snapshot: GraphSnapshot) -> bool:
+        return time.time() - snapshot.created_at > self.max_age_seconds
+
+    def _usable(self, snapshot: GraphSnapshot, data_version: str) -> bool:
+        return snapshot.data_version == data_version and not self._expired(snapshot)
+
+    def get(self, signature: str, data_version: str) -> Optional[GraphSnapshot]:
+        """Snapshot for `signature` built from `data_version`, or None."""
+        marker = None
+        with self._lock:
+            snapshot = self._snapshots.get(signature)
+            if snapshot is not None:
+                if self._usable(snapshot, data_version):
+                    self._snapshots.move_to_end(signature)
+                    self._counters["memory_hits"] += 1
+                    return snapshot
+                # Kept while only the data version moved on: it is the base for
+                # an incremental update (see get_base)
+                if self._expired(snapshot):
+                    del self._snapshots[signature]
+                    self._markers.pop(signature, None)
+                else:
+                    # The persisted copy only needs reading if it changed since
+                    marker = self._markers.get(signature)
+                self._counters["stale"] += 1
+        try:
+            loaded = self._load_persisted(signature, marker)
+        except Exception as e:
+            logger.warning(f"Could not load knowledge graph snapshot {signature}: {e}")
+            loaded = None
+        with self._lock:
+            if loaded is None or not self._usable(loaded[0], data_version):
+                self._counters["misses"] += 1
+                return None
+            snapshot, marker = loaded
+            self._counters["persisted_hits"] += 1
+            self._remember(snapshot, marker)
+            return snapshot
+
+    def get_base(self, signature: str) -> Optional[GraphSnapshot]:
+        """
+        Newest snapshot for `signature` whatever its data version, or None.
+
+        Still bounded by max age, so incrementally updated snapshots (which keep
+        their original created_at) are periodically rebuilt from scratch.
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(signature)
+        if snapshot is None:
+            try:
+                loaded = self._load_persisted(signature)
+            except Exception as e:
+                logger.warning(f"Could not load knowledge graph snapshot {signature}: {e}")
+                return None
+            snapshot = loaded[0] if loaded is not None else None
+        if snapshot is None or self._expired(snapshot):
+            return None
+        return snapshot
+
+    def put(self, snapshot: GraphSnapshot) -> None:
+        """Install in memory and write through to the configured persistence."""
+        with self._lock:
+            self._remember(snapshot)
+        if not self.local_dir and not self.gcs_uri:
+            return
+        try:
+            data = snapshot.to_bytes()
+            marker = None
+            if self.local_dir:
+                marker = self._write_local(snapshot.signature, data)
+            if self.gcs_uri:
+                bucket, name = self._gcs_location(snapshot.signature)
+                blob = bucket.blob(name)
+                blob.upload_from_string(data, content_type="application/octet-stream")
+                if not self.local_dir:
+                    marker = blob.generation
+            with self._lock:
+                self._counters["writes"] += 1
+                if self._snapshots.get(snapshot.signature) is snapshot:
+                    self._markers[snapshot.signature] = marker
+        except Exception as e:
+            logger.warning(f"Failed to persist knowledge graph snapshot {snapshot.signature}: {e}")
+
+    def _remember(self, snapshot: GraphSnapshot, marker: Optional[int] = None) -> None:
+        self._snapshots[snapshot.signature] = snapshot
+        self._snapshots.move_to_end(snapshot.signature)
+        self._markers[snapshot.signature] = marker
+        while len(self._snapshots) > self.max_entries:
+            evicted, _ = self._snapshots.popitem(last=False)
+            self._markers.pop(evicted, None)
+
+    def latest(self) -> Optional[GraphSnapshot]:
+        """Most recently used in-memory snapshot, if any (no freshness check)."""
+        with self._lock:
+            return next(reversed(self._snapshots.values()), None)
+
+    def invalidate(self) -> None:
+        """Drop in-memory snapshots and force a data-version re-check."""
+        with self._lock:
+            self._snapshots.clear()
+            self._markers.clear()
+            self._version = None
+            self._version_checked_at = 0.0
+
+    def data_version(self, db: Any, collections: Iterable[str]) -> str:
+        """
+        Current data version: a hash of per-collection document counts.
+
+        Count aggregations are cheap but not free, so the value is memoized for
+        `version_ttl_seconds`. If counting fails, the version falls back to a
+        time bucket of `max_age_seconds`.
+        """
+        now = time.time()
+        with self._lock:
+            if self._version is not None and now - self._version_checked_at < self.version_ttl_seconds:
+                return self._version
+        try:
+            counts = []
+            for collection in sorted(set(collections)):
+                result = db.collection(collection).count().get()
+                counts.append(f"{collection}={int(getattr(result[0][0], 'value', 0) or 0)}")
+            version = hashlib.sha1(";".join(counts).encode("utf-8")).hexdigest()[:12]
+        except Exception as e:
+            logger.warning(f"Knowledge graph data version check failed; using time bucket: {e}")
+            version = f"t{int(now // max(1.0, self.max_age_seconds))}"
+        with self._lock:
+            self._version = version
+            self._version_checked_at = now
+        return version
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._counters,
+                "entries": len(self._snapshots),
+                "max_entries": self.max_entries,
+                "data_version": self._version,
+                "local_dir": self.local_dir or None,
+                "gcs_uri": self.gcs_uri or None,
+            }
+
+
+_store: Optional[GraphSnapshotStore] = None
+_store_lock = threading.Lock()
+
+
+def get_graph_snapshot_store() -> GraphSnapshotStore:
+    """Get or create the process-wide snapshot store (memory-only when no dir/URI is set)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = GraphSnapshotStore(
+                    local_dir=KNOWLEDGE_GRAPH_SNAPSHOT_DIR,
+                    gcs_uri=KNOWLEDGE_GRAPH_SNAPSHOT_GCS_URI,
+                )
+    return _store
@@ -30,31 +30,14 @@ class KnowledgeMapQueryService:
         self.nodes = knowledge_map_service.nodes
         self.edges = knowledge_map_service.edges
         
-        # Build index for faster queries
+        # Shared adjacency index, built once per graph and reused across queries
+        self.core = knowledge_map_service.graph_core
         self._build_indexes()
     
     def _build_indexes(self):
-        """Build indexes for fast querying."""
-        # Paper ID to node index
-        self.paper_index = {}
-        self.concept_index = {}
-        self.edge_index = defaultdict(list)  # source -> [edges]
-        self.reverse_edge_index = defaultdict(list)  # target -> [edges]
-        
-        for node_id, node in self.nodes.items():
-            node_type = node.get('type', node.get('data', {}).get('type'))
-            if node_type == 'paper':
-                self.paper_index[node_id] = node
-            elif node_type == 'concept':
-                self.concept_index[node_id] = node
-        
-        for edge in self.edges:
-            source = edge.get('source') or edge.get('data', {}).get('source')
-            target = edge.get('target') or edge.get('data', {}).get('target')
-            
-            if source and target:
-                self.edge_index[source].append(edge)
-                self.reverse_edge_index[target].append(edge)
+        """Build node-type indexes (edge adjacency lives in the shared GraphCore)."""
+        self.paper_index = self.core.nodes_by_type.get('paper', {})
+        self.concept_index = self.core.nodes_by_type.get('concept', {})
     
     def find_papers_by_concept(self, concept_name: str, limit: int = 20) -> List[Dict[str, Any]]:
         """
@@ -82,18 +65,14 @@ class KnowledgeMapQueryService:
         if not concept_node:
             return []
         
-        # Find papers connected to this concept
+        # Find papers connected to this concept (either direction)
         papers = []
-        for edge in self.edge_index.get(concept_id, []):
-            target = edge.get('target') or edge.get('data', {}).get('target')
-            if target in self.paper_index:
-                papers.append(self.paper_index[target])
-        
-        # Also check reverse edges
-        for edge in self.reverse_edge_index.get(concept_id, []):
-            source = edge.get('source') or edge.get('data', {}).get('source')
-            if source in self.paper_index:
-                papers.append(self.paper_index[source])
+        concept_idx = self.core.index.get(concept_id)
+        if concept_idx is not None:
+            for _, other in self.core.neighbours(concept_idx):
+                other_id = self.core.ids[other]
+                if other_id in self.paper_index:
+                    papers.append(self.paper_index[other_id])
         
         # Remove duplicates and limit
         seen = set()
@@ -130,47 +109,11 @@ class KnowledgeMapQueryService:
         if source_id == target_id:
             return []
         
-        # BFS to find shortest path
-        queue = deque([(source_id, [])])
-        visited = {source_id}
-        
-        while queue:
-            current_id, path = queue.popleft()
-            
-            if len(path) >= max_depth:
-                continue
-            
-            # Check outgoing edges
-            for edge in self.edge_index.get(current_id, []):
-                edge_type = edge.get('type') or edge.get('data', {}).get('type')
-                target = edge.get('target') or edge.get('data', {}).get('target')
-                
-                if relationship_types and edge_type not in relationship_types:
-                    continue
-                
-                if target == target_id:
-                    return path + [edge]
-                
-                if target not in visited:
-                    visited.add(target)
-                    queue.append((target, path + [edge]))
-            
-            # Check incoming edges (for bidirectional relationships)
-            for edge in self.reverse_edge_index.get(current_id, []):
-                edge_type = edge.get('type') or edge.get('data', {}).get('type')
-                source = edge.get('source') or edge.get('data', {}).get('source')
-                
-                if relationship_types and edge_type not in relationship_types:
-                    continue
-                
-                if source == target_id:
-                    return path + [edge]
-                
-                if source not in visited:
-                    visited.add(source)
-                    queue.append((source, path + [edge]))
-        
-        return None
+        # BFS over the shared adjacency (both edge directions)
+        path = self.core.shortest_path(source_id, target_id, max_depth, relationship_types)
+        if path is None:
+            return None
+        return [self.edges[e] for e in path]
     
     def find_related_papers(
         self,
@@ -191,42 +134,14 @@ class KnowledgeMapQueryService:
         Returns:
             List of related paper nodes
         """
-        related = []
-        visited = {paper_id}
-        queue = deque([(paper_id, 0)])
-        
-        while queue and len(related) < max_papers:
-            current_id, current_depth = queue.popleft()
-            
-            if current_depth >= depth:
-                continue
-            
-            # Get connected papers
-            for edge in self.edge_index.get(current_id, []):
-                edge_type = edge.get('type') or edge.get('data', {}).get('type')
-                target = edge.get('target') or edge.get('data', {}).get('target')
-                
-                if relationship_types and edge_type not in relationship_types:
-                    continue
-                
-                if target in self.paper_index and target not in visited:
-                    visited.add(target)
-                    related.append(self.paper_index[target])
-                    queue.append((target, current_depth + 1))
-            
-            for edge in self.reverse_edge_index.get(current_id, []):
-                edge_type = edge.get('type') or edge.get('data', {}).get('type')
-                source = edge.get('source') or edge.get('data', {}).get('source')
-                
-                if relationship_types and edge_type not in relationship_types:
-                    continue
-                
-                if source in self.paper_index and source not in visited:
-                    visited.add(source)
-                    related.append(self.paper_index[source])
-                    queue.append((source, current_depth + 1))
-        
-        return related[:max_papers]
+        related_ids = self.core.related(
+            paper_id,
+            depth=depth,
+            limit=max_papers,
+            allowed_ids=self.paper_index,
+            relationship_types=relationship_types,
+        )
+        return [self.paper_index[pid] for pid in related_ids]
     
     def search_papers(
         self,
@@ -282,17 +197,7 @@ class KnowledgeMapQueryService:
             current_id = queue.popleft()
             
             # Count connections to other papers
-            connections = defaultdict(int)
-            
-            for edge in self.edge_index.get(current_id, []):
-                target = edge.get('target') or edge.get('data', {}).get('target')
-                if target in self.paper_index:
-                    connections[target] += 1
-            
-            for edge in self.reverse_edge_index.get(current_id, []):
-                source = edge.get('source') or edge.get('data', {}).get('source')
-                if source in self.paper_index:
-                    connections[source] += 1
+            connections = self.core.connection_counts(current_id, self.paper_index)
             
             # Add papers with multiple connections
             for connected_id, connection_count in connections.items():
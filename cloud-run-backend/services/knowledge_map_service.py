@@ -7,8 +7,11 @@ Copyright (c) 2025 Gary Welz / CopernicusAI
 Licensed under MIT License
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional, Set, Tuple
+import os
+import threading
+from typing import Dict, Iterable, List, Any, Optional, Set, Tuple
 from datetime import datetime
 from collections import defaultdict
 import re
@@ -18,7 +21,15 @@ from google.cloud.firestore_v1.vector import Vector
 from google.cloud.firestore_v1.base_vector_query import DistanceMeasure
 from google.cloud.firestore_v1.base_query import FieldFilter
 
-from services.embedding_service import get_embedding_service
+from services.embedding_cache import embed_query
+from services.knowledge_graph_changes import latest_graph_change_seq, read_graph_changes
+from services.knowledge_graph_core import GraphCore, edge_field
+from services.knowledge_graph_snapshots import (
+    GraphSnapshot,
+    get_graph_snapshot_store,
+    graph_filter_signature,
+)
+from services.similarity_edges import NUMPY_AVAILABLE, TokenOverlapIndex, cosine_top_k, token_overlap_top_k
 from mcp_server.config import GCP_PROJECT_ID
 from config.database import db
 from utils.logging import structured_logger
@@ -167,6 +178,258 @@ def _keyword_overlap_score(keyword: Optional[str], title: str, body: str) -> int
     return len(tokens & hay)
 
 
+KEYWORD_SIMILARITY_TOP_K = 2
+KEYWORD_SIMILARITY_MIN_JACCARD = 0.12
+KEYWORD_SIMILARITY_MIN_OVERLAP = 2
+
+# Incremental maintenance: graphs built with any of these arguments cover a
+# filtered slice of the corpus and are rebuilt rather than patched from the
+# change log; larger backlogs than the cap are cheaper to rebuild.
+_GRAPH_SCOPE_ARGS = ("disciplines", "sources", "date_start", "date_end", "keyword", "question", "process_family")
+KNOWLEDGE_GRAPH_INCREMENTAL_MAX_CHANGES = int(os.getenv("KNOWLEDGE_GRAPH_INCREMENTAL_MAX_CHANGES", "2000"))
+
+# Source collection -> (content type, process family)
+_GRAPH_SOURCES: Dict[str, Tuple[str, Optional[str]]] = {
+    "research_papers": ("papers", None),
+    "episodes": ("podcasts", None),
+    "science_videos": ("videos", None),
+    **{collection: ("processes", family) for family, collection in PROCESS_FAMILY_COLLECTIONS.items()},
+}
+
+
+def _graph_counts(nodes: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    counts = defaultdict(int)
+    for node in nodes:
+        counts[node['type']] += 1
+    return {
+        'papers': counts['paper'],
+        'concepts': counts['concept'],
+        'processes': counts['process'],
+        'podcasts': counts['podcast'],
+        'videos': counts['video'],
+    }
+
+
+def _similarity_tokens(item: Dict[str, Any]) -> Set[str]:
+    """Keyword-overlap tokens of a similarity item (title, abstract, keywords)."""
+    kws = item.get("keywords") or []
+    if isinstance(kws, list):
+        kw_text = " ".join([str(x) for x in kws if x])
+    else:
+        kw_text = str(kws)
+    return set(_tokenize_text(f"{item.get('title') or ''} {item.get('abstract') or ''} {kw_text}"))
+
+
+def _paper_graph_node(paper: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'id': paper.get('paper_id'),
+        'type': 'paper',
+        'label': (paper.get('title') or 'Untitled')[:100],
+        'data': {
+            'title': paper.get('title'),
+            'categories': paper.get('categories', []),
+            'arxiv_id': paper.get('arxiv_id'),
+            'doi': paper.get('doi'),
+            'pmid': paper.get('pmid'),
+            'url': paper.get('url'),
+        }
+    }
+
+
+def _process_graph_item(process: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], Dict[str, Any], str]]:
+    """(node, similarity item, source ref) for a sampled process chart."""
+    chart_id = process.get("process_id") or process.get("id")
+    family = process.get("process_family") or "glmp"
+    if not chart_id:
+        return None
+    node_id = f"process:{family}:{chart_id}"
+    title = process.get("title") or process.get("name") or chart_id
+    description = process.get("description") or ""
+    node = {
+        "id": node_id,
+        "type": "process",
+        "label": str(title)[:100],
+        "data": {
+            "title": title,
+            "process_family": family,
+            "process_id": chart_id,
+            "subcategory": process.get("subcategory"),
+            "processType": process.get("processType") or process.get("process_type"),
+            "description": description[:200] if description else "",
+        },
+    }
+    item = {
+        "paper_id": node_id,
+        "title": title,
+        "abstract": description,
+        "keywords": process.get("keywords") or [],
+    }
+    return node, item, f"{PROCESS_FAMILY_COLLECTIONS.get(family, family)}/{chart_id}"
+
+
+def _podcast_graph_item(podcast: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], Dict[str, Any], str]]:
+    """(node, similarity item, source ref) for a sampled podcast episode."""
+    slug = podcast.get("slug") or podcast.get("job_id") or podcast.get("id")
+    if not slug:
+        return None
+    node_id = f"podcast:{slug}"
+    title = (
+        podcast.get("title")
+        or (podcast.get("result") or {}).get("title")
+        or slug
+    )
+    description = (
+        podcast.get("description")
+        or (podcast.get("result") or {}).get("description")
+        or ""
+    )
+    episode_link = podcast.get("episode_link")
+    node = {
+        "id": node_id,
+        "type": "podcast",
+        "label": str(title)[:100],
+        "data": {
+            "title": title,
+            "slug": slug,
+            "episode_link": episode_link,
+            "url": episode_link,
+        },
+    }
+    item = {
+        "paper_id": node_id,
+        "title": title,
+        "abstract": description,
+        "keywords": [],
+    }
+    return node, item, f"episodes/{podcast.get('job_id') or slug}"
+
+
+def _video_graph_item(video: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], Dict[str, Any], str]]:
+    """(node, similarity item, source ref) for a sampled science video."""
+    video_id = video.get("video_id") or video.get("id")
+    if not video_id:
+        return None
+    node_id = f"video:{video_id}"
+    title = video.get("title") or video_id
+    description = video.get("description") or ""
+    url = video.get("video_url") or video.get("url")
+    youtube_id = video.get("source_id") if video.get("source") == "youtube" else video.get("youtube_id")
+    node = {
+        "id": node_id,
+        "type": "video",
+        "label": str(title)[:100],
+        "data": {
+            "title": title,
+            "url": url,
+            "youtube_id": youtube_id,
+            "video_id": video_id,
+        },
+    }
+    item = {
+        "paper_id": node_id,
+        "title": title,
+        "abstract": description,
+        "keywords": video.get("tags") or [],
+    }
+    return node, item, f"science_videos/{video.get('doc_id') or video_id}"
+
+
+def _paper_recency(paper: Dict[str, Any]) -> Optional[str]:
+    """updated_at as a sortable string (None when missing: such papers never make a recency-ordered sample)."""
+    value = paper.get("updated_at")
+    if value is None:
+        return None
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _graph_item_features(ref: str, item: Dict[str, Any], is_paper: bool) -> Dict[str, Any]:
+    """What incremental updates need to recompute an item's edges without refetching it."""
+    features: Dict[str, Any] = {"ref": ref, "tokens": sorted(_similarity_tokens(item))}
+    if is_paper:
+        features["categories"] = list(item.get("categories") or [])
+        features["authors"] = [a for a in item.get("authors") or [] if a]
+    features["rank"] = _graph_item_rank(item, is_paper)
+    return features
+
+
+def _graph_item_rank(item: Dict[str, Any], is_paper: bool) -> Optional[str]:
+    """Sort key build_graph() samples an item by (see _graph_sample_order)."""
+    return _paper_recency(item) if is_paper else str(item.get("title") or "").lower()
+
+
+def _graph_sample_caps(max_papers: Optional[int]) -> Dict[Tuple[str, Optional[str]], int]:
+    """Per (content type, process family) sample sizes of an unscoped build_graph()."""
+    per_family = max(1, min(MAX_PROCESSES_PER_FAMILY, MAX_PROCESSES_TOTAL // max(1, len(PROCESS_FAMILY_COLLECTIONS))))
+    return {
+        ("papers", None): max_papers or 10,
+        **{("processes", family): per_family for family in PROCESS_FAMILY_COLLECTIONS},
+        ("podcasts", None): MAX_PODCASTS,
+        ("videos", None): MAX_VIDEOS,
+    }
+
+
+def _graph_sample_key(features: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    return _GRAPH_SOURCES[features["ref"].partition("/")[0]]
+
+
+def _graph_sample_order(kind: str, ranked: Iterable[Tuple[str, Any]]) -> List[str]:
+    """Item ids best first, as build_graph() samples them: newest papers, other items by title."""
+    return [item_id for item_id, _ in sorted(ranked, key=lambda row: row[1], reverse=kind == "papers")]
+
+
+def _category_edges(category: str, paper_ids: List[str]) -> List[Dict[str, Any]]:
+    """Connect papers in the same category (limit to avoid too many edges)."""
+    return [
+        {
+            'type': 'same_category',
+            'source': paper_id1,
+            'target': paper_id2,
+            'weight': 0.5,
+            'metadata': {'category': category}
+        }
+        for i, paper_id1 in enumerate(paper_ids[:50])  # Limit for performance
+        for paper_id2 in paper_ids[i+1:min(i+6, len(paper_ids))]  # Connect to next 5 papers
+    ]
+
+
+def _co_author_edges(author: str, paper_ids: List[str]) -> List[Dict[str, Any]]:
+    """Connect papers by the same author (limit to avoid too many edges)."""
+    return [
+        {
+            'type': 'co_author',
+            'source': paper_id1,
+            'target': paper_id2,
+            'weight': 0.7,
+            'metadata': {'author': author}
+        }
+        for i, paper_id1 in enumerate(paper_ids[:20])  # Limit for performance
+        for paper_id2 in paper_ids[i+1:min(i+6, len(paper_ids))]  # Connect to next 5 papers
+    ]
+
+
+def _keyword_similarity_edges(rows: Iterable[Tuple[str, Iterable[Tuple[float, int, str]]]]) -> List[Dict[str, Any]]:
+    """Undirected keyword-overlap edges from per-item ranked neighbours (first occurrence of a pair wins)."""
+    edges: List[Dict[str, Any]] = []
+    seen_pairs: Set[Tuple[str, str]] = set()
+    for pid, neighbours in rows:
+        for jacc, overlap, oid in neighbours:
+            a, b = (pid, oid) if pid < oid else (oid, pid)
+            if (a, b) in seen_pairs:
+                continue
+            seen_pairs.add((a, b))
+            edges.append({
+                "type": "similar_to",
+                "source": pid,
+                "target": oid,
+                "weight": float(jacc),
+                "metadata": {
+                    "method": "keyword_overlap",
+                    "overlap_tokens": int(overlap),
+                }
+            })
+    return edges
+
+
 class KnowledgeMapService:
     """
     Service for building and querying the mathematics knowledge map.
@@ -194,6 +457,13 @@ class KnowledgeMapService:
         # Graph structure (in-memory for now, can be persisted to Firestore later)
         self.nodes: Dict[str, Dict[str, Any]] = {}
         self.edges: List[Dict[str, Any]] = []
+        self._graph_core: Optional[GraphCore] = None
+        # Per-item features of the current graph (see _graph_item_features) and
+        # the token index incremental updates re-rank similarity with
+        self.graph_features: Optional[Dict[str, Dict[str, Any]]] = None
+        self._token_index: Optional[TokenOverlapIndex] = None
+        self._token_index_features: Optional[Dict[str, Dict[str, Any]]] = None
+        self._update_lock = threading.Lock()
         
         structured_logger.info("Knowledge map service initialized")
     
@@ -201,8 +471,20 @@ class KnowledgeMapService:
         """Clear the cached graph data."""
         self.nodes = {}
         self.edges = []
+        self._graph_core = None
+        self.graph_features = None
+        self._token_index = None
+        self._token_index_features = None
         structured_logger.info("Cleared knowledge map cache")
 
+    @property
+    def graph_core(self) -> GraphCore:
+        """Adjacency index over the current nodes/edges, rebuilt only when they are replaced."""
+        core = self._graph_core
+        if core is None or core.nodes is not self.nodes or core.edges is not self.edges:
+            core = self._graph_core = GraphCore(self.nodes, self.edges)
+        return core
+
     def _paper_passes_date_filters(
         self,
         paper_data: Dict[str, Any],
@@ -322,8 +604,7 @@ class KnowledgeMapService:
     ) -> List[Dict[str, Any]]:
         """Fast path: semantic search seed instead of scanning thousands of Firestore docs."""
         try:
-            embedding_service = get_embedding_service()
-            query_embedding = embedding_service.embed_text(keyword)
+            query_embedding = embed_query(keyword)
             papers_ref = self.db.collection('research_papers')
 
             if question:
@@ -349,7 +630,6 @@ class KnowledgeMapService:
                     if (1.0 - similarity) > 0.85:
                         continue
                     paper_data['paper_id'] = doc.id
-                    paper_data.pop('embedding', None)
                     if self._paper_passes_filters(
                         paper_data,
                         disciplines=disciplines,
@@ -387,7 +667,6 @@ class KnowledgeMapService:
             for doc in vector_query.stream():
                 paper_data = doc.to_dict()
                 paper_data['paper_id'] = doc.id
-                paper_data.pop('embedding', None)
                 if self._paper_passes_filters(
                     paper_data,
                     disciplines=disciplines,
@@ -511,136 +790,153 @@ class KnowledgeMapService:
     def extract_concept_relationships(
         self,
         papers: List[Dict[str, Any]],
-        similarity_threshold: float = 0.7
+        similarity_threshold: float = 0.7,
+        top_k: int = 5,
     ) -> List[Dict[str, Any]]:
         """
         Extract concept-based relationships using vector similarity.
         
-        Papers with similar embeddings are likely related.
+        Papers with similar embeddings are likely related. All embeddings are
+        compared in one batched pass (blocked matrix multiplies) instead of one
+        Firestore vector query per paper, so neighbours come from the papers
+        being mapped. Edges are emitted per category the source paper belongs to.
         """
         relationships = []
         
-        # Group papers by category for efficiency
+        # Group papers by category
         papers_by_category = defaultdict(list)
         for paper in papers:
             categories = paper.get('categories', [])
             for cat in categories:
                 papers_by_category[cat].append(paper)
         
+        ids: List[str] = []
+        vectors: List[List[float]] = []
+        row_of: Dict[str, int] = {}
+        for paper in papers:
+            paper_id = paper.get('paper_id') or paper.get('id')
+            paper_embedding = paper.get('embedding')
+            if not paper_id or not paper_embedding or paper_id in row_of:
+                continue
+            vector = list(paper_embedding.values if hasattr(paper_embedding, 'values') else paper_embedding)
+            if vectors and len(vector) != len(vectors[0]):
+                logger.warning(f"Skipping {paper_id}: embedding dimension {len(vector)} != {len(vectors[0])}")
+                continue
+            row_of[paper_id] = len(ids)
+            ids.append(paper_id)
+            vectors.append(vector)
+        
+        if len(ids) < 2:
+            return relationships
+        if NUMPY_AVAILABLE:
+            neighbours = cosine_top_k(vectors, top_k=top_k, min_similarity=similarity_threshold)
+        else:
+            neighbours = []
+            for i, vector in enumerate(vectors):
+                scored = [
+                    (j, _cosine_similarity(vector, other))
+                    for j, other in enumerate(vectors) if j != i
+                ]
+                scored = [(j, sim) for j, sim in scored if sim >= similarity_threshold]
+                scored.sort(key=lambda x: -x[1])
+                neighbours.append(scored[:top_k])
+        
         # Find similar papers within categories
         for category, category_papers in papers_by_category.items():
             if len(category_papers) < 2:
                 continue
             
-            # Use vector search to find similar papers
             for paper in category_papers[:100]:  # Limit for performance
                 paper_id = paper.get('paper_id') or paper.get('id')
-                paper_embedding = paper.get('embedding')
-                
-                if not paper_embedding:
-                    continue
-                
-                # Find similar papers using Firestore vector search
-                try:
-                    papers_ref = self.db.collection('research_papers')
-                    vector_query = papers_ref.find_nearest(
-                        vector_field='embedding',
-                        query_vector=Vector(paper_embedding.values if hasattr(paper_embedding, 'values') else paper_embedding),
-                        limit=5,
-                        distance_measure=DistanceMeasure.COSINE,
-                        distance_threshold=1.0 - similarity_threshold
-                    )
-                    
-                    for similar_doc in vector_query.stream():
-                        similar_data = similar_doc.to_dict()
-                        similar_id = similar_doc.id
-                        
-                        if similar_id != paper_id:
-                            relationships.append({
-                                'type': 'similar_to',
-                                'source': paper_id,
-                                'target': similar_id,
-                                'weight': 1.0 - similar_data.get('distance', 0.5),
-                                'metadata': {
-                                    'method': 'vector_similarity',
-                                    'category': category
-                                }
-                            })
-                except Exception as e:
-                    logger.warning(f"Failed to find similar papers for {paper_id}: {e}")
+                row = row_of.get(paper_id)
+                if row is None:
                     continue
+                for j, similarity in neighbours[row]:
+                    relationships.append({
+                        'type': 'similar_to',
+                        'source': paper_id,
+                        'target': ids[j],
+                        'weight': float(similarity),
+                        'metadata': {
+                            'method': 'vector_similarity',
+                            'category': category
+                        }
+                    })
         
         return relationships
 
     def extract_keyword_similarity_relationships(
         self,
         papers: List[Dict[str, Any]],
-        top_k: int = 2,
-        min_jaccard: float = 0.12,
-        min_overlap_tokens: int = 2,
+        top_k: int = KEYWORD_SIMILARITY_TOP_K,
+        min_jaccard: float = KEYWORD_SIMILARITY_MIN_JACCARD,
+        min_overlap_tokens: int = KEYWORD_SIMILARITY_MIN_OVERLAP,
     ) -> List[Dict[str, Any]]:
         """
         Fallback similarity edges when embeddings are missing/disabled.
 
         Computes simple Jaccard overlap over tokenized title/abstract/keywords and connects
-        each paper to its top-k neighbors above thresholds.
+        each paper to its top-k neighbors above thresholds. Overlaps come from an
+        inverted index (only pairs sharing a token are counted) when NumPy is available.
         """
+        return _keyword_similarity_edges(
+            self._keyword_similarity_neighbours(papers, top_k, min_jaccard, min_overlap_tokens)
+        )
+
+    def _keyword_similarity_neighbours(
+        self,
+        papers: List[Dict[str, Any]],
+        top_k: int = KEYWORD_SIMILARITY_TOP_K,
+        min_jaccard: float = KEYWORD_SIMILARITY_MIN_JACCARD,
+        min_overlap_tokens: int = KEYWORD_SIMILARITY_MIN_OVERLAP,
+    ) -> List[Tuple[str, List[Tuple[float, int, str]]]]:
+        """Per item with tokens: (id, [(jaccard, overlap, other_id)] best first, at most top_k)."""
         token_sets: List[Tuple[str, Set[str]]] = []
         for p in papers:
             pid = p.get("paper_id") or p.get("id")
             if not pid:
                 continue
-            title = p.get("title") or ""
-            abstract = p.get("abstract") or ""
-            kws = p.get("keywords") or []
-            if isinstance(kws, list):
-                kw_text = " ".join([str(x) for x in kws if x])
-            else:
-                kw_text = str(kws)
-            toks = set(_tokenize_text(f"{title} {abstract} {kw_text}"))
+            toks = _similarity_tokens(p)
             if toks:
                 token_sets.append((pid, toks))
 
         if len(token_sets) < 2:
             return []
 
-        edges: List[Dict[str, Any]] = []
-        seen_pairs: Set[Tuple[str, str]] = set()
-
-        for i, (pid, toks) in enumerate(token_sets):
-            candidates: List[Tuple[float, int, str]] = []  # (jaccard, overlap, other_id)
-            for j, (oid, otoks) in enumerate(token_sets):
-                if i == j:
-                    continue
-                inter = toks.intersection(otoks)
-                overlap = len(inter)
-                if overlap < min_overlap_tokens:
-                    continue
-                union = len(toks.union(otoks)) or 1
-                jacc = overlap / union
-                if jacc < min_jaccard:
-                    continue
-                candidates.append((jacc, overlap, oid))
+        if NUMPY_AVAILABLE:
+            per_row = [
+                [(jacc, overlap, token_sets[j][0]) for jacc, overlap, j in row]
+                for row in token_overlap_top_k(
+                    [toks for _, toks in token_sets],
+                    top_k=max(0, int(top_k)),
+                    min_jaccard=min_jaccard,
+                    min_overlap=min_overlap_tokens,
+                )
+            ]
+        else:
+            per_row = []
+            for i, (pid, toks) in enumerate(token_sets):
+                candidates: List[Tuple[float, int, str]] = []  # (jaccard, overlap, other_id)
+                for j, (oid, otoks) in enumerate(token_sets):
+                    if i == j:
+                        continue
+                    inter = toks.intersection(otoks)
+                    overlap = len(inter)
+                    if overlap < min_overlap_tokens:
+                        continue
+                    union = len(toks.union(otoks)) or 1
+                    jacc = overlap / union
+                    if jacc < min_jaccard:
+                        continue
+                    candidates.append((jacc, overlap, oid))
+                per_row.append(candidates)
 
+        neighbours = []
+        for (pid, _), candidates in zip(token_sets, per_row):
             candidates.sort(reverse=True)
-            for jacc, overlap, oid in candidates[: max(0, int(top_k))]:
-                a, b = (pid, oid) if pid < oid else (oid, pid)
-                if (a, b) in seen_pairs:
-                    continue
-                seen_pairs.add((a, b))
-                edges.append({
-                    "type": "similar_to",
-                    "source": pid,
-                    "target": oid,
-                    "weight": float(jacc),
-                    "metadata": {
-                        "method": "keyword_overlap",
-                        "overlap_tokens": int(overlap),
-                    }
-                })
+            neighbours.append((pid, candidates[: max(0, int(top_k))]))
+        return neighbours
 
-        return edges
-    
     def extract_author_relationships(self, papers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Extract author co-authorship relationships.
@@ -663,17 +959,7 @@ class KnowledgeMapService:
         for author, paper_ids in author_to_papers.items():
             if len(paper_ids) < 2:
                 continue
-            
-            # Connect papers by the same author (limit to avoid too many edges)
-            for i, paper_id1 in enumerate(paper_ids[:20]):  # Limit for performance
-                for paper_id2 in paper_ids[i+1:min(i+6, len(paper_ids))]:  # Connect to next 5 papers
-                    relationships.append({
-                        'type': 'co_author',
-                        'source': paper_id1,
-                        'target': paper_id2,
-                        'weight': 0.7,
-                        'metadata': {'author': author}
-                    })
+            relationships.extend(_co_author_edges(author, paper_ids))
         
         return relationships
     
@@ -698,17 +984,7 @@ class KnowledgeMapService:
         for category, paper_ids in papers_by_category.items():
             if len(paper_ids) < 2:
                 continue
-            
-            # Connect papers in the same category (limit to avoid too many edges)
-            for i, paper_id1 in enumerate(paper_ids[:50]):  # Limit for performance
-                for paper_id2 in paper_ids[i+1:min(i+6, len(paper_ids))]:  # Connect to next 5 papers
-                    relationships.append({
-                        'type': 'same_category',
-                        'source': paper_id1,
-                        'target': paper_id2,
-                        'weight': 0.5,
-                        'metadata': {'category': category}
-                    })
+            relationships.extend(_category_edges(category, paper_ids))
         
         return relationships
     
@@ -994,6 +1270,7 @@ Only return the JSON array, no other text."""
                     scanned += 1
                     continue
                 d["video_id"] = d.get("video_id") or doc.id
+                d["doc_id"] = doc.id
                 scored.append((score, str(title).lower(), d))
                 scanned += 1
                 if scanned >= VIDEO_CANDIDATE_LIMIT:
@@ -1147,7 +1424,6 @@ Only return the JSON array, no other text."""
         for doc in stream_iter:
             paper_data = doc.to_dict()
             paper_data['paper_id'] = doc.id
-            paper_data.pop('embedding', None)
             if paper_data['paper_id'] in seen_ids:
                 continue
             filter_stats['total_fetched'] += 1
@@ -1235,113 +1511,28 @@ Only return the JSON array, no other text."""
             video_items = self._fetch_video_items(keyword=keyword, limit=MAX_VIDEOS)
             structured_logger.info(f"Sampled {len(video_items)} videos for knowledge map")
         
-        # Build nodes
+        # Build nodes (and the per-item features incremental updates work from)
         nodes = []
+        features: Dict[str, Dict[str, Any]] = {}
         for paper in papers:
-            paper_id = paper.get('paper_id')
-            nodes.append({
-                'id': paper_id,
-                'type': 'paper',
-                'label': paper.get('title', 'Untitled')[:100],
-                'data': {
-                    'title': paper.get('title'),
-                    'categories': paper.get('categories', []),
-                    'arxiv_id': paper.get('arxiv_id'),
-                    'doi': paper.get('doi'),
-                    'pmid': paper.get('pmid'),
-                    'url': paper.get('url'),
-                }
-            })
+            node = _paper_graph_node(paper)
+            nodes.append(node)
+            features[node['id']] = _graph_item_features(f"research_papers/{node['id']}", paper, is_paper=True)
 
         similarity_items: List[Dict[str, Any]] = list(papers)
-        for process in process_items:
-            chart_id = process.get("process_id") or process.get("id")
-            family = process.get("process_family") or "glmp"
-            if not chart_id:
-                continue
-            node_id = f"process:{family}:{chart_id}"
-            title = process.get("title") or process.get("name") or chart_id
-            description = process.get("description") or ""
-            nodes.append({
-                "id": node_id,
-                "type": "process",
-                "label": str(title)[:100],
-                "data": {
-                    "title": title,
-                    "process_family": family,
-                    "process_id": chart_id,
-                    "subcategory": process.get("subcategory"),
-                    "processType": process.get("processType") or process.get("process_type"),
-                    "description": description[:200] if description else "",
-                },
-            })
-            similarity_items.append({
-                "paper_id": node_id,
-                "title": title,
-                "abstract": description,
-                "keywords": process.get("keywords") or [],
-            })
-
-        for podcast in podcast_items:
-            slug = podcast.get("slug") or podcast.get("job_id") or podcast.get("id")
-            if not slug:
-                continue
-            node_id = f"podcast:{slug}"
-            title = (
-                podcast.get("title")
-                or (podcast.get("result") or {}).get("title")
-                or slug
-            )
-            description = (
-                podcast.get("description")
-                or (podcast.get("result") or {}).get("description")
-                or ""
-            )
-            episode_link = podcast.get("episode_link")
-            nodes.append({
-                "id": node_id,
-                "type": "podcast",
-                "label": str(title)[:100],
-                "data": {
-                    "title": title,
-                    "slug": slug,
-                    "episode_link": episode_link,
-                    "url": episode_link,
-                },
-            })
-            similarity_items.append({
-                "paper_id": node_id,
-                "title": title,
-                "abstract": description,
-                "keywords": [],
-            })
-
-        for video in video_items:
-            video_id = video.get("video_id") or video.get("id")
-            if not video_id:
-                continue
-            node_id = f"video:{video_id}"
-            title = video.get("title") or video_id
-            description = video.get("description") or ""
-            url = video.get("video_url") or video.get("url")
-            youtube_id = video.get("source_id") if video.get("source") == "youtube" else video.get("youtube_id")
-            nodes.append({
-                "id": node_id,
-                "type": "video",
-                "label": str(title)[:100],
-                "data": {
-                    "title": title,
-                    "url": url,
-                    "youtube_id": youtube_id,
-                    "video_id": video_id,
-                },
-            })
-            similarity_items.append({
-                "paper_id": node_id,
-                "title": title,
-                "abstract": description,
-                "keywords": video.get("tags") or [],
-            })
+        for builder, items in (
+            (_process_graph_item, process_items),
+            (_podcast_graph_item, podcast_items),
+            (_video_graph_item, video_items),
+        ):
+            for raw in items:
+                built = builder(raw)
+                if built is None:
+                    continue
+                node, item, ref = built
+                nodes.append(node)
+                similarity_items.append(item)
+                features[node["id"]] = _graph_item_features(ref, item, is_paper=False)
         
         # Build edges
         edges = []
@@ -1358,10 +1549,21 @@ Only return the JSON array, no other text."""
             structured_logger.info(f"Extracted {len(author_rels)} author co-authorship relationships")
         
         if include_similarity:
-            # Keyword overlap is fast; per-paper vector queries are too slow for interactive maps.
-            kw_sim_rels = self.extract_keyword_similarity_relationships(similarity_items)
+            # Embedding neighbours among the sampled papers come from one batched pass
+            vector_rels = self.extract_concept_relationships(papers)
+            edges.extend(vector_rels)
+            structured_logger.info(f"Extracted {len(vector_rels)} vector similarity relationships")
+
+            neighbours = self._keyword_similarity_neighbours(similarity_items)
+            for item_id, ranked in neighbours:
+                features[item_id]["similar"] = [[oid, jacc, overlap] for jacc, overlap, oid in ranked]
+            kw_sim_rels = _keyword_similarity_edges(neighbours)
             edges.extend(kw_sim_rels)
             structured_logger.info(f"Extracted {len(kw_sim_rels)} keyword-overlap similarity relationships")
+
+        # Embeddings are only needed for the similarity edges
+        for paper in papers:
+            paper.pop('embedding', None)
         
         # Extract citation relationships (including Semantic Scholar if enabled)
         citation_rels = await self.extract_citation_relationships(
@@ -1406,6 +1608,7 @@ Only return the JSON array, no other text."""
         # Store graph
         self.nodes = {node['id']: node for node in nodes}
         self.edges = edges
+        self.graph_features = features
         
         structured_logger.info(
             "Knowledge graph built",
@@ -1417,16 +1620,485 @@ Only return the JSON array, no other text."""
             'nodes': nodes,
             'edges': edges,
             'metadata': {
-                'papers': len([n for n in nodes if n['type'] == 'paper']),
-                'concepts': len([n for n in nodes if n['type'] == 'concept']),
-                'processes': len([n for n in nodes if n['type'] == 'process']),
-                'podcasts': len([n for n in nodes if n['type'] == 'podcast']),
-                'videos': len([n for n in nodes if n['type'] == 'video']),
+                **_graph_counts(nodes),
                 'relationships': len(edges),
                 'built_at': datetime.utcnow().isoformat()
             }
         }
     
+    def _snapshot_collections(self) -> List[str]:
+        """Collections whose document counts make up the graph data version."""
+        return ["research_papers", "episodes", "science_videos", *PROCESS_FAMILY_COLLECTIONS.values()]
+
+    async def get_or_build_graph(self, force_rebuild: bool = False, **build_kwargs: Any) -> Dict[str, Any]:
+        """
+        build_graph() behind the snapshot store.
+
+        Serves a snapshot built from the current data version for the same
+        (normalized) arguments when one exists in memory, on disk or in GCS.
+        Otherwise, for unscoped graphs (no discipline/source/date/keyword/
+        question/family filter), the newest snapshot is brought up to date
+        from the change log; failing that, the graph is rebuilt. Either way the
+        result is written through.
+        """
+        store = get_graph_snapshot_store()
+        signature = graph_filter_signature(**build_kwargs)
+        incremental = not any(build_kwargs.get(arg) for arg in _GRAPH_SCOPE_ARGS)
+        data_version = await asyncio.to_thread(store.data_version, self.db, self._snapshot_collections())
+        if not force_rebuild:
+            snapshot = await asyncio.to_thread(store.get, signature, data_version)
+            if snapshot is not None:
+                structured_logger.info("Using knowledge graph snapshot",
+                                     signature=signature,
+                                     data_version=data_version,
+                                     node_count=len(snapshot.nodes),
+                                     edge_count=len(snapshot.edges))
+                self.nodes = snapshot.nodes
+                self.edges = snapshot.edges
+                self.graph_features = snapshot.features
+                self._graph_core = snapshot.core
+                return snapshot.to_graph()
+            if incremental:
+                graph = await self._update_graph_snapshot(store, signature, data_version, build_kwargs)
+                if graph is not None:
+                    return graph
+
+        # Read the high-water mark first: changes logged during the build are
+        # replayed next time, which is harmless (upserts refetch, removes repeat)
+        change_hwm = await asyncio.to_thread(latest_graph_change_seq, self.db) if incremental else 0
+        graph = await self.build_graph(**build_kwargs)
+        snapshot = GraphSnapshot(
+            signature,
+            data_version,
+            self.nodes,
+            self.edges,
+            graph['metadata'],
+            features=self.graph_features if incremental else None,
+            change_hwm=change_hwm,
+        )
+        self._graph_core = snapshot.core
+        await asyncio.to_thread(store.put, snapshot)
+        graph['metadata'] = {
+            **graph['metadata'],
+            'cached': False,
+            'snapshot': {'signature': signature, 'data_version': data_version},
+        }
+        return graph
+
+    async def _update_graph_snapshot(
+        self,
+        store: Any,
+        signature: str,
+        data_version: str,
+        build_kwargs: Dict[str, Any],
+    ) -> Optional[Dict[str, Any]]:
+        """Newest snapshot for `signature` plus the change log since its high-water mark, or None to rebuild."""
+        base = await asyncio.to_thread(store.get_base, signature)
+        if base is None or base.features is None:
+            return None
+        try:
+            changes = await asyncio.to_thread(
+                read_graph_changes, self.db, base.change_hwm, KNOWLEDGE_GRAPH_INCREMENTAL_MAX_CHANGES + 1
+            )
+        except Exception as e:
+            structured_logger.warning("Could not read knowledge graph change log; rebuilding", error=str(e))
+            return None
+        # An empty log means the data version moved for reasons the log can't
+        # explain (a writer that doesn't record changes), so rebuild
+        if not changes or len(changes) > KNOWLEDGE_GRAPH_INCREMENTAL_MAX_CHANGES:
+            return None
+
+        self.nodes = base.nodes
+        self.edges = base.edges
+        self.graph_features = base.features
+        self._graph_core = base.core
+        summary = await self.apply_graph_changes(
+            changes,
+            max_papers=build_kwargs.get('max_papers'),
+            content_types=build_kwargs.get('content_types'),
+            include_categories=build_kwargs.get('include_categories', True),
+            include_authors=build_kwargs.get('include_authors', False),
+            include_similarity=build_kwargs.get('include_similarity', True),
+        )
+        if summary is None:
+            structured_logger.info("Knowledge graph delta needs a rebuild to backfill a capped sample",
+                                 signature=signature,
+                                 changes=len(changes))
+            return None
+        metadata = {
+            **base.metadata,
+            **_graph_counts(self.nodes.values()),
+            'relationships': len(self.edges),
+            'incremental_update': {**summary, 'applied_at': datetime.utcnow().isoformat()},
+        }
+        # created_at is kept so snapshot max age still forces periodic full rebuilds
+        snapshot = GraphSnapshot(
+            signature,
+            data_version,
+            self.nodes,
+            self.edges,
+            metadata,
+            created_at=base.created_at,
+            features=self.graph_features,
+            change_hwm=int(changes[-1].get('seq') or base.change_hwm),
+        )
+        self._graph_core = snapshot.core
+        await asyncio.to_thread(store.put, snapshot)
+        structured_logger.info("Applied knowledge graph changes to snapshot",
+                             signature=signature,
+                             data_version=data_version,
+                             change_hwm=snapshot.change_hwm,
+                             **summary)
+        graph = snapshot.to_graph()
+        graph['metadata']['cached'] = False
+        return graph
+
+    async def apply_graph_changes(
+        self,
+        changes: List[Dict[str, Any]],
+        max_papers: Optional[int] = None,
+        content_types: Optional[List[str]] = None,
+        include_categories: bool = True,
+        include_authors: bool = False,
+        include_similarity: bool = True,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Apply change-log entries (see services/knowledge_graph_changes.py) to the current graph.
+
+        Upserted documents are fetched with one batched read per collection and
+        their nodes added or replaced; removed (or no longer existing) ones are
+        dropped along with every incident edge. Each content type keeps the
+        sample an unscoped build_graph() would take (the newest `max_papers`
+        papers, the first processes/podcasts/videos by title): items beyond a
+        cap are evicted and changed types are put back in sample order. When a
+        full sample loses members that only documents outside it could
+        replace, nothing is applied and None is returned so the caller
+        rebuilds. Category and co-author edges are
+        regenerated only for the categories/authors the delta touches, and
+        keyword-similarity neighbours are re-ranked only for the changed items
+        and the items sharing tokens with them. When papers change, vector
+        similarity edges are recomputed over the sampled papers' embeddings
+        (one batched read), since any paper can enter another's top-k.
+        Citation and concept edges for new items wait for the next full rebuild.
+
+        Args:
+            changes: Change-log entries, oldest first (the last op per document wins)
+            max_papers: The graph's max_papers build argument
+            content_types: The graph's content types; entries for other types are ignored
+            include_categories: Maintain category edges
+            include_authors: Maintain co-author edges
+            include_similarity: Maintain keyword- and vector-similarity edges
+
+        Returns:
+            Summary counts of the applied delta, or None when it needs a rebuild
+        """
+        if self.graph_features is None:
+            raise ValueError("No knowledge graph with item features is loaded")
+        latest_ops: Dict[str, str] = {}
+        for change in changes:
+            collection = change.get('collection')
+            source = _GRAPH_SOURCES.get(collection)
+            if source is None or not change.get('doc_id') or not _content_wanted(content_types, source[0]):
+                continue
+            ref = f"{collection}/{change['doc_id']}"
+            latest_ops.pop(ref, None)
+            latest_ops[ref] = change.get('op') or 'upsert'
+        fetched = await asyncio.to_thread(
+            self._fetch_graph_items, [ref for ref, op in latest_ops.items() if op == 'upsert']
+        )
+        delta = {ref: fetched.get(ref) for ref in latest_ops}
+        return await asyncio.to_thread(
+            self._apply_graph_delta,
+            delta,
+            _graph_sample_caps(max_papers),
+            include_categories,
+            include_authors,
+            include_similarity,
+        )
+
+    def _fetch_graph_items(self, refs: List[str]) -> Dict[str, Tuple[Dict[str, Any], Dict[str, Any], bool]]:
+        """ref -> (node, similarity item, is_paper) for the documents that still exist."""
+        by_collection: Dict[str, List[str]] = defaultdict(list)
+        for ref in refs:
+            collection, _, doc_id = ref.partition('/')
+            by_collection[collection].append(doc_id)
+        builders = {'processes': _process_graph_item, 'podcasts': _podcast_graph_item, 'videos': _video_graph_item}
+        items: Dict[str, Tuple[Dict[str, Any], Dict[str, Any], bool]] = {}
+        for collection, doc_ids in by_collection.items():
+            kind, family = _GRAPH_SOURCES[collection]
+            doc_refs = [self.db.collection(collection).document(doc_id) for doc_id in doc_ids]
+            for doc in self.db.get_all(doc_refs):
+                if not doc.exists:
+                    continue
+                d = doc.to_dict() or {}
+                d.pop('embedding', None)
+                ref = f"{collection}/{doc.id}"
+                if kind == 'papers':
+                    d['paper_id'] = doc.id
+                    items[ref] = (_paper_graph_node(d), d, True)
+                    continue
+                if kind == 'processes':
+                    d['process_id'] = doc.id
+                    d['process_family'] = family
+                elif kind == 'podcasts':
+                    d['slug'] = d.get('slug') or doc.id
+                    d['job_id'] = doc.id
+                else:
+                    d['video_id'] = d.get('video_id') or doc.id
+                    d['doc_id'] = doc.id
+                built = builders[kind](d)
+                if built is not None:
+                    items[ref] = (built[0], built[1], False)
+        return items
+
+    def _vector_similarity_edges(self, features: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """build_graph()'s vector similarity edges for the papers in `features`, refetching their embeddings."""
+        papers: List[Dict[str, Any]] = []
+        doc_refs = []
+        for item_id, f in features.items():
+            collection, _, doc_id = f['ref'].partition('/')
+            if _GRAPH_SOURCES[collection][0] != 'papers':
+                continue
+            papers.append({'paper_id': item_id, 'categories': f.get('categories', [])})
+            doc_refs.append(self.db.collection(collection).document(doc_id))
+        if len(papers) < 2:
+            return []
+        embeddings = {
+            doc.id: (doc.to_dict() or {}).get('embedding')
+            for doc in self.db.get_all(doc_refs, field_paths=['embedding'])
+            if doc.exists
+        }
+        for paper in papers:
+            paper['embedding'] = embeddings.get(paper['paper_id'])
+        return self.extract_concept_relationships(papers)
+
+    def _similarity_index(self, features: Dict[str, Dict[str, Any]]) -> TokenOverlapIndex:
+        """Token index over `features`, reused across updates while it stays in sync."""
+        if self._token_index is None or self._token_index_features is not features:
+            self._token_index = TokenOverlapIndex(
+                (item_id, f.get('tokens') or ()) for item_id, f in features.items()
+            )
+            self._token_index_features = features
+        return self._token_index
+
+    def _sample_evictions(
+        self,
+        delta: Dict[str, Optional[Tuple[Dict[str, Any], Dict[str, Any], bool]]],
+        caps: Dict[Tuple[str, Optional[str]], int],
+        ref_to_node: Dict[str, str],
+    ) -> Optional[Tuple[Dict[str, Optional[Tuple[Dict[str, Any], Dict[str, Any], bool]]], int]]:
+        """
+        (`delta` plus removals for the items pushed out of their sample, eviction count),
+        or None when a sample needs a rebuild.
+        """
+        features = self.graph_features or {}
+        samples: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = defaultdict(dict)
+        for item_id, f in features.items():
+            if f.get('rank') is None:
+                # Built before items were ranked, or from an unordered fallback sample
+                return None
+            samples[_graph_sample_key(f)][item_id] = f['rank']
+        floors = {
+            key: (min if key[0] == 'papers' else max)(members.values())
+            for key, members in samples.items()
+            if len(members) >= caps[key]
+        }
+
+        delta = dict(delta)
+        evicted = 0
+        id_to_ref = {item_id: f['ref'] for item_id, f in features.items()}
+        touched: Set[Tuple[str, Optional[str]]] = set()
+        for ref, built in delta.items():
+            key = _GRAPH_SOURCES[ref.partition('/')[0]]
+            touched.add(key)
+            old_id = ref_to_node.get(ref)
+            if old_id is not None:
+                samples[key].pop(old_id, None)
+            if built is None:
+                continue
+            rank = _graph_item_rank(built[1], built[2])
+            if rank is None:
+                delta[ref] = None
+                continue
+            samples[key][built[0]['id']] = rank
+            id_to_ref[built[0]['id']] = ref
+
+        for key in touched:
+            cap = caps[key]
+            ordered = _graph_sample_order(key[0], samples[key].items())
+            if key in floors:
+                # Documents outside a full sample rank below its floor, so the
+                # kept items must all rank at or above it
+                if len(ordered) < cap:
+                    return None
+                last = samples[key][ordered[cap - 1]]
+                if (last < floors[key]) if key[0] == 'papers' else (last > floors[key]):
+                    return None
+            evicted += len(ordered[cap:])
+            for item_id in ordered[cap:]:
+                delta[id_to_ref[item_id]] = None
+        return delta, evicted
+
+    @staticmethod
+    def _in_sample_order(
+        features: Dict[str, Dict[str, Any]],
+        nodes: Dict[str, Dict[str, Any]],
+        refs: Iterable[str],
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """features and nodes in build_graph() order, re-sorting only the samples `refs` belong to."""
+        touched = {_GRAPH_SOURCES[ref.partition('/')[0]] for ref in refs}
+        samples: Dict[Tuple[str, Optional[str]], List[str]] = defaultdict(list)
+        for item_id, f in features.items():
+            samples[_graph_sample_key(f)].append(item_id)
+        ordered: List[str] = []
+        for key in sorted(samples, key=list(_graph_sample_caps(None)).index):
+            if key in touched:
+                ordered.extend(_graph_sample_order(key[0], ((i, features[i]['rank']) for i in samples[key])))
+            else:
+                ordered.extend(samples[key])
+        # Concept nodes have no features and stay after the sampled items
+        return (
+            {item_id: features[item_id] for item_id in ordered},
+            {**{item_id: nodes[item_id] for item_id in ordered}, **{k: v for k, v in nodes.items() if k not in features}},
+        )
+
+    def _apply_graph_delta(
+        self,
+        delta: Dict[str, Optional[Tuple[Dict[str, Any], Dict[str, Any], bool]]],
+        caps: Dict[Tuple[str, Optional[str]], int],
+        include_categories: bool,
+        include_authors: bool,
+        include_similarity: bool,
+    ) -> Optional[Dict[str, Any]]:
+        """Apply ref -> built item (None = remove) to nodes, features and edges, within the sample caps."""
+        with self._update_lock:
+            ref_to_node = {f.get('ref'): item_id for item_id, f in (self.graph_features or {}).items()}
+            requested = len(delta)
+            sampled = self._sample_evictions(delta, caps, ref_to_node)
+            if sampled is None:
+                return None
+            delta, evicted = sampled
+            nodes = dict(self.nodes)
+            features = dict(self.graph_features or {})
+            index = self._similarity_index(self.graph_features) if include_similarity else None
+            dirty_categories: Set[Any] = set()
+            dirty_authors: Set[Any] = set()
+            removed: Set[str] = set()
+            rerank: Set[str] = set()
+            upserted = 0
+            papers_changed = include_similarity and any(
+                _GRAPH_SOURCES[ref.partition('/')[0]][0] == 'papers' for ref in delta
+            )
+            try:
+                for ref, built in delta.items():
+                    old_id = ref_to_node.get(ref)
+                    new_id = built[0]['id'] if built is not None else None
+                    if old_id is not None:
+                        old = features[old_id]
+                        dirty_categories.update(old.get('categories', ()))
+                        dirty_authors.update(old.get('authors', ()))
+                        if index is not None:
+                            # Items that had it among their neighbours share its old tokens
+                            rerank.update(index.overlaps(index.remove(old_id)))
+                        if new_id != old_id:
+                            del features[old_id]
+                            nodes.pop(old_id, None)
+                            removed.add(old_id)
+                    if built is None:
+                        continue
+                    node, item, is_paper = built
+                    nodes[new_id] = node
+                    feat = features[new_id] = _graph_item_features(ref, item, is_paper)
+                    removed.discard(new_id)
+                    upserted += 1
+                    dirty_categories.update(feat.get('categories', ()))
+                    dirty_authors.update(feat.get('authors', ()))
+                    if index is not None:
+                        index.add(new_id, feat['tokens'])
+                        rerank.add(new_id)
+                        rerank.update(index.overlaps(feat['tokens'], exclude=new_id))
+
+                features, nodes = self._in_sample_order(features, nodes, delta)
+
+                if index is not None:
+                    for item_id in rerank:
+                        if item_id not in features:
+                            continue
+                        ranked = index.top_k(
+                            item_id,
+                            KEYWORD_SIMILARITY_TOP_K,
+                            KEYWORD_SIMILARITY_MIN_JACCARD,
+                            KEYWORD_SIMILARITY_MIN_OVERLAP,
+                        )
+                        features[item_id] = {
+                            **features[item_id],
+                            'similar': [[oid, jacc, overlap] for jacc, overlap, oid in ranked],
+                        }
+
+                edges: List[Dict[str, Any]] = []
+                for edge in self.edges:
+                    if edge_field(edge, 'source') in removed or edge_field(edge, 'target') in removed:
+                        continue
+                    edge_type = edge_field(edge, 'type')
+                    meta = edge_field(edge, 'metadata') or {}
+                    if include_categories and edge_type == 'same_category' and meta.get('category') in dirty_categories:
+                        continue
+                    if include_authors and edge_type == 'co_author' and meta.get('author') in dirty_authors:
+                        continue
+                    if include_similarity and edge_type == 'similar_to' and meta.get('method') == 'keyword_overlap':
+                        continue
+                    if papers_changed and edge_type == 'similar_to' and meta.get('method') == 'vector_similarity':
+                        continue
+                    edges.append(edge)
+
+                groups: Dict[str, Dict[Any, List[str]]] = {'categories': defaultdict(list), 'authors': defaultdict(list)}
+                wanted = {
+                    'categories': dirty_categories if include_categories else set(),
+                    'authors': dirty_authors if include_authors else set(),
+                }
+                if wanted['categories'] or wanted['authors']:
+                    for item_id, f in features.items():
+                        for field in ('categories', 'authors'):
+                            for value in f.get(field, ()):
+                                if value in wanted[field]:
+                                    groups[field][value].append(item_id)
+                for category, paper_ids in groups['categories'].items():
+                    if len(paper_ids) >= 2:
+                        edges.extend(_category_edges(category, paper_ids))
+                for author, paper_ids in groups['authors'].items():
+                    if len(paper_ids) >= 2:
+                        edges.extend(_co_author_edges(author, paper_ids))
+                if papers_changed:
+                    edges.extend(self._vector_similarity_edges(features))
+                if include_similarity:
+                    edges.extend(_keyword_similarity_edges(
+                        (item_id, [(jacc, overlap, oid) for oid, jacc, overlap in f.get('similar', ())])
+                        for item_id, f in features.items()
+                    ))
+            except Exception:
+                self._token_index = None
+                raise
+
+            self.nodes = nodes
+            self.edges = edges
+            self.graph_features = features
+            self._graph_core = None
+            if index is not None:
+                self._token_index_features = features
+            else:
+                self._token_index = None
+            return {
+                'changes': requested,
+                'upserted': upserted,
+                'removed': len(removed),
+                'evicted': evicted,
+                'categories_recomputed': len(wanted['categories']),
+                'authors_recomputed': len(wanted['authors']),
+                'similarity_reranked': len(rerank),
+                'nodes': len(nodes),
+                'edges': len(edges),
+            }
+
     def get_subgraph(
         self,
         paper_id: str,
@@ -1447,38 +2119,9 @@ Only return the JSON array, no other text."""
         if not self.nodes or not self.edges:
             raise ValueError("Graph not built. Call build_graph() first.")
         
-        # BFS to find connected nodes
-        visited = set([paper_id])
-        queue = [(paper_id, 0)]
-        selected_nodes = set([paper_id])
-        selected_edges = []
-        
-        while queue and len(selected_nodes) < max_nodes:
-            current_id, current_depth = queue.pop(0)
-            
-            if current_depth >= depth:
-                continue
-            
-            # Find edges connected to current node
-            for edge in self.edges:
-                source = edge.get('source')
-                target = edge.get('target')
-                
-                if source == current_id and target not in visited:
-                    visited.add(target)
-                    selected_nodes.add(target)
-                    selected_edges.append(edge)
-                    queue.append((target, current_depth + 1))
-                
-                elif target == current_id and source not in visited:
-                    visited.add(source)
-                    selected_nodes.add(source)
-                    selected_edges.append(edge)
-                    queue.append((source, current_depth + 1))
-        
-        # Filter nodes and edges
+        selected_nodes, edge_indexes = self.graph_core.subgraph(paper_id, depth=depth, max_nodes=max_nodes)
         subgraph_nodes = [self.nodes[nid] for nid in selected_nodes if nid in self.nodes]
-        subgraph_edges = selected_edges
+        subgraph_edges = [self.edges[e] for e in edge_indexes]
         
         return {
             'nodes': subgraph_nodes,
@@ -1487,7 +2130,11 @@ Only return the JSON array, no other text."""
             'depth': depth
         }
     
-    def export_for_visualization(self, format: str = 'cytoscape') -> Dict[str, Any]:
+    def export_for_visualization(
+        self,
+        format: str = 'cytoscape',
+        node_ids: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Any]:
         """
         Export graph in format suitable for visualization libraries.
         
@@ -1495,7 +2142,18 @@ Only return the JSON array, no other text."""
         - 'cytoscape': Cytoscape.js format
         - 'd3': D3.js format
         - 'vis': vis.js format
+
+        When node_ids is given, only those nodes and the edges between them
+        are exported (resolved through the adjacency index, not a full scan).
         """
+        nodes = list(self.nodes.values())
+        edges = self.edges
+        if node_ids is not None:
+            core = self.graph_core
+            members = sorted(core.index[nid] for nid in set(node_ids) if nid in self.nodes)
+            nodes = [self.nodes[core.ids[i]] for i in members]
+            edges = [self.edges[e] for e in core.induced_edges(members)]
+
         if format == 'cytoscape':
             elements = {
                 'nodes': [
@@ -1507,7 +2165,7 @@ Only return the JSON array, no other text."""
                             **node.get('data', {})
                         }
                     }
-                    for node in self.nodes.values()
+                    for node in nodes
                 ],
                 'edges': [
                     {
@@ -1519,14 +2177,14 @@ Only return the JSON array, no other text."""
                             'weight': edge.get('weight', 1.0)
                         }
                     }
-                    for edge in self.edges
+                    for edge in edges
                 ]
             }
             return elements
         
         elif format == 'd3':
             return {
-                'nodes': list(self.nodes.values()),
+                'nodes': nodes,
                 'links': [
                     {
                         'source': edge['source'],
@@ -1534,7 +2192,7 @@ Only return the JSON array, no other text."""
                         'type': edge['type'],
                         'value': edge.get('weight', 1.0)
                     }
-                    for edge in self.edges
+                    for edge in edges
                 ]
             }
         
@@ -0,0 +1,148 @@
+"""
+MP3 Frame Splicing
+
+MPEG audio is a sequence of self-contained frames, so two MP3 streams with
+the same sample rate, channel layout and bitrate can be joined by copying
+their frames back to back: no decode, no re-encode, cost linear in bytes.
+
+`parse_mp3` walks a file's frames, skipping ID3v2/ID3v1 tags and the
+Xing/Info/VBRI header frame (its frame count would be wrong after a splice),
+and reports the stream format. `splice_mp3` joins parsed streams of one
+format and refuses anything else, so callers can fall back to a PCM decode.
+
+Only MPEG Layer III is recognized; anything else parses as "no format".
+
+Copyright (c) 2025 Gary Welz / CopernicusAI
+Licensed under MIT License
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+# Layer III bitrates (kbps) by bitrate index, for MPEG-1 and MPEG-2/2.5
+_BITRATES_V1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_BITRATES_V2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+_SAMPLE_RATES_V1 = (44100, 48000, 32000)
+_VERSIONS = {3: 1.0, 2: 2.0, 0: 2.5}  # header version bits -> MPEG version
+
+
+@dataclass(frozen=True)
+class Mp3Format:
+    """What must match for two MP3 streams to be spliced frame by frame."""
+    mpeg_version: float
+    sample_rate: int
+    channels: int
+    bitrate_kbps: int  # 0 when the stream is VBR (mixed bitrates)
+
+
+@dataclass
+class Mp3Stream:
+    """Audio frames of one MP3 file, tags and VBR header stripped."""
+    format: Optional[Mp3Format]
+    frames: bytes
+    frame_count: int
+
+    @property
+    def duration_seconds(self) -> float:
+        if not self.format:
+            return 0.0
+        samples_per_frame = 1152 if self.format.mpeg_version == 1.0 else 576
+        return self.frame_count * samples_per_frame / self.format.sample_rate
+
+
+def _parse_header(data: bytes, pos: int) -> Optional[Tuple[Mp3Format, int, int]]:
+    """(format with this frame's bitrate, frame length, side-info length) or None."""
+    if pos + 4 > len(data) or data[pos] != 0xFF or (data[pos + 1] & 0xE0) != 0xE0:
+        return None
+    b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+    version = _VERSIONS.get((b1 >> 3) & 0x03)
+    layer = (b1 >> 1) & 0x03
+    bitrate_index = b2 >> 4
+    sample_rate_index = (b2 >> 2) & 0x03
+    if version is None or layer != 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    mono = (b3 >> 6) == 3
+    if version == 1.0:
+        bitrate = _BITRATES_V1[bitrate_index]
+        sample_rate = _SAMPLE_RATES_V1[sample_rate_index]
+        frame_length = 144000 * bitrate // sample_rate
+        side_info = 17 if mono else 32
+    else:
+        bitrate = _BITRATES_V2[bitrate_index]
+        sample_rate = _SAMPLE_RATES_V1[sample_rate_index] // (2 if version == 2.0 else 4)
+        frame_length = 72000 * bitrate // sample_rate
+        side_info = 9 if mono else 17
+    frame_length += (b2 >> 1) & 0x01  # padding slot
+    return Mp3Format(version, sample_rate, 1 if mono else 2, bitrate), frame_length, side_info
+
+
+def _is_vbr_header(data: bytes, pos: int, side_info: int) -> bool:
+    tag_at = pos + 4 + side_info
+    return data[tag_at:tag_at + 4] in (b"Xing", b"Info") or data[pos + 36:pos + 40] == b"VBRI"
+
+
+def parse_mp3(data: bytes) -> Mp3Stream:
+    """Locate the audio frames of an MP3 file and determine its stream format."""
+    end = len(data)
+    if end >= 128 and data[end - 128:end - 125] == b"TAG":
+        end -= 128  # ID3v1
+    view = memoryview(data)[:end]
+
+    pos = 0
+    if data[:3] == b"ID3" and end >= 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        pos = 10 + size + (10 if data[5] & 0x10 else 0)  # header + tag (+ footer)
+
+    spans: List[Tuple[int, int]] = []
+    stream_format: Optional[Mp3Format] = None
+    bitrates = set()
+    frame_count = 0
+    first = True
+    while pos + 4 <= end:
+        header = _parse_header(data, pos)
+        if header is None or pos + header[1] > end:
+            # Lost sync (junk, an embedded tag, a truncated last frame): scan to the next header
+            pos = data.find(b"\xff", pos + 1, end)
+            if pos < 0:
+                break
+            continue
+        frame_format, frame_length, side_info = header
+        if first and _is_vbr_header(data, pos, side_info):
+            first = False
+            pos += frame_length
+            continue
+        first = False
+        base = Mp3Format(frame_format.mpeg_version, frame_format.sample_rate, frame_format.channels, 0)
+        if stream_format is None:
+            stream_format = base
+        elif base != stream_format:
+            return Mp3Stream(format=None, frames=b"", frame_count=0)  # mixed layouts: not spliceable
+        bitrates.add(frame_format.bitrate_kbps)
+        if spans and spans[-1][1] == pos:
+            spans[-1] = (spans[-1][0], pos + frame_length)
+        else:
+            spans.append((pos, pos + frame_length))
+        frame_count += 1
+        pos += frame_length
+
+    if stream_format is None:
+        return Mp3Stream(format=None, frames=b"", frame_count=0)
+    if len(bitrates) == 1:
+        stream_format = Mp3Format(
+            stream_format.mpeg_version, stream_format.sample_rate, stream_format.channels, bitrates.pop()
+        )
+    frames = b"".join(view[start:stop] for start, stop in spans)
+    return Mp3Stream(format=stream_format, frames=frames, frame_count=frame_count)
+
+
+def splice_mp3(streams: Sequence[Mp3Stream]) -> bytes:
+    """
+    Join parsed MP3 streams by frame-level copy.
+
+    Raises:
+        ValueError: if any stream has no recognized format or the formats differ
+    """
+    formats = {stream.format for stream in streams}
+    if None in formats or len(formats) != 1:
+        raise ValueError(f"Cannot splice MP3 streams with formats {sorted(map(str, formats))}")
+    return b"".join(stream.frames for stream in streams)
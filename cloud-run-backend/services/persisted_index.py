@@ -0,0 +1,347 @@
+"""
+Persisted Index
+
+Shared machinery for the in-memory search indexes that are kept as one
+gzipped JSON object per key, locally and/or in GCS (the keyword-fallback
+index, one key per collection, and the episode search index):
+
+- `CopyOnWritePostings`: inverted-index postings that a copy shares with its
+  source until it changes them, so an index handed to searches never changes
+  under them, plus prefix expansion of query tokens over the vocabulary.
+- `PersistedIndexStore`: loads each key lazily, re-checks the persisted copy
+  at most every `refresh_seconds`, swaps in updated copies, and writes the
+  changes from a debounced background flush. GCS writes are conditional on
+  the generation that was loaded; on a conflict the newer copy is reloaded
+  and the unwritten changes are re-applied to it.
+
+Subclasses supply the index format (`_load`, `_apply`) and where each key
+lives (`_locations`).
+
+Copyright (c) 2025 Gary Welz / CopernicusAI
+Licensed under MIT License
+"""
+
+import bisect
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Generic, Iterable, List, Optional, Set, Tuple, TypeVar
+
+from google.api_core.exceptions import PreconditionFailed
+
+from utils.logging import structured_logger
+
+# Query tokens with no exact postings are expanded to vocabulary terms they
+# prefix ("neuro" -> "neuroscience"), approximating the substring matching of
+# the scan paths. Expansions are down-weighted and capped.
+PREFIX_EXPANSION_LIMIT = 50
+PREFIX_EXPANSION_WEIGHT = 0.5
+
+# Conditional writes retried (reloading the winner's copy) before giving up
+_WRITE_ATTEMPTS = 5
+
+I = TypeVar("I")
+C = TypeVar("C")
+
+
+class CopyOnWritePostings:
+    """Postings (term -> doc id -> entry) shared with copies until changed."""
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[str, Any]] = {}
+        self._vocabulary: Optional[List[str]] = None
+        # Terms whose postings this index may mutate in place (None: all of them)
+        self._owned_terms: Optional[Set[str]] = None
+
+    def _share_postings(self, clone: "CopyOnWritePostings") -> None:
+        """Give `clone` this index's postings; either side copies a term's postings before changing them."""
+        clone.postings = dict(self.postings)
+        clone._vocabulary = self._vocabulary
+        clone._owned_terms = set()
+
+    def _own_postings(self, term: str) -> Dict[str, Any]:
+        postings = self.postings.get(term)
+        if postings is None:
+            postings = self.postings[term] = {}
+            self._vocabulary = None
+        elif self._owned_terms is not None and term not in self._owned_terms:
+            postings = self.postings[term] = dict(postings)
+        else:
+            return postings
+        if self._owned_terms is not None:
+            self._owned_terms.add(term)
+        return postings
+
+    def _drop_term(self, term: str) -> None:
+        del self.postings[term]
+        self._vocabulary = None
+
+    def _expand(self, token: str) -> List[Tuple[str, float]]:
+        if token in self.postings:
+            return [(token, 1.0)]
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        start = bisect.bisect_left(self._vocabulary, token)
+        expanded: List[Tuple[str, float]] = []
+        for term in self._vocabulary[start:start + PREFIX_EXPANSION_LIMIT]:
+            if not term.startswith(token):
+                break
+            expanded.append((term, PREFIX_EXPANSION_WEIGHT))
+        return expanded
+
+
+def _split_gcs_uri(uri: str) -> Tuple[str, str]:
+    path = uri[len("gs://"):] if uri.startswith("gs://") else uri
+    bucket, _, name = path.partition("/")
+    return bucket, name
+
+
+class PersistedIndexStore(ABC, Generic[I, C]):
+    """
+    Keyed indexes with local-file and GCS persistence.
+
+    An index returned by `_get()` is never modified: updates are applied to a
+    copy() that is swapped in, so searches need no lock. GCS is authoritative
+    when configured; the local file then mirrors it. Indexes must provide
+    copy(), to_bytes() and a `size`.
+    """
+
+    # Used in log messages
+    label = "index"
+
+    def __init__(self, refresh_seconds: float, flush_seconds: float, client: Any = None):
+        self.refresh_seconds = refresh_seconds
+        self.flush_seconds = flush_seconds
+        self._client = client
+        self._indexes: Dict[str, I] = {}
+        # GCS generation or local mtime of the copy each index was loaded from / written as
+        self._markers: Dict[str, Optional[int]] = {}
+        self._checked_at: Dict[str, float] = {}
+        # key -> changes applied in memory but not yet written
+        self._pending: Dict[str, List[C]] = {}
+        self._replace: Set[str] = set()
+        self._flush_timer: Optional[threading.Timer] = None
+        # Guards the in-memory state; never held during I/O
+        self._lock = threading.RLock()
+        # Serialize reloads and writes (held during I/O)
+        self._reload_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    @property
+    @abstractmethod
+    def persisted(self) -> bool:
+        """Whether any storage location is configured."""
+        pass
+
+    @abstractmethod
+    def _locations(self, key: str) -> Tuple[str, str]:
+        """(local path, gs:// URI) of `key`'s persisted copy; either may be empty."""
+        pass
+
+    @abstractmethod
+    def _load(self, data: bytes) -> I:
+        pass
+
+    @abstractmethod
+    def _apply(self, index: I, changes: Iterable[C]) -> bool:
+        """Apply changes to `index` in place; returns whether anything changed."""
+        pass
+
+    def _storage_client(self) -> Any:
+        from google.cloud import storage
+        return storage.Client()
+
+    # ---------------------------------------------------------------- storage
+
+    def _blob(self, uri: str):
+        if self._client is None:
+            self._client = self._storage_client()
+        bucket_name, name = _split_gcs_uri(uri)
+        return self._client.bucket(bucket_name), name
+
+    def _read_if_changed(self, key: str, marker: Optional[int]) -> Optional[Tuple[bytes, int]]:
+        local_path, gcs_uri = self._locations(key)
+        if gcs_uri:
+            bucket, name = self._blob(gcs_uri)
+            blob = bucket.get_blob(name)
+            if blob is None or blob.generation == marker:
+                return None
+            data = blob.download_as_bytes(if_generation_match=blob.generation)
+            if local_path:
+                self._write_local(local_path, data)
+            return data, blob.generation
+        if local_path and os.path.exists(local_path):
+            mtime = os.stat(local_path).st_mtime_ns
+            if mtime == marker:
+                return None
+            with open(local_path, "rb") as f:
+                return f.read(), mtime
+        return None
+
+    @staticmethod
+    def _write_local(path: str, data: bytes) -> int:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{path}.tmp-{os.getpid()}"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        return os.stat(path).st_mtime_ns
+
+    def _write(self, key: str, data: bytes, if_generation_match: Optional[int]) -> Optional[int]:
+        local_path, gcs_uri = self._locations(key)
+        marker = None
+        if gcs_uri:
+            bucket, name = self._blob(gcs_uri)
+            blob = bucket.blob(name)
+            blob.upload_from_string(data, content_type="application/gzip", if_generation_match=if_generation_match)
+            marker = blob.generation
+        if local_path:
+            local_marker = self._write_local(local_path, data)
+            if not gcs_uri:
+                marker = local_marker
+        return marker
+
+    # ---------------------------------------------------------------- reads
+
+    def _reload(self, key: str) -> None:
+        """Load the persisted copy if it changed, re-applying unwritten changes. Call with _reload_lock held."""
+        with self._lock:
+            self._checked_at[key] = time.time()
+            if key in self._replace:
+                return  # A freshly built index waiting to be written supersedes any persisted copy
+            marker = self._markers.get(key)
+        try:
+            loaded = self._read_if_changed(key, marker)
+        except Exception as e:
+            structured_logger.warning(f"Could not load {self.label}", key=key, error=str(e))
+            return
+        if loaded is None:
+            return
+        data, new_marker = loaded
+        try:
+            index = self._load(data)
+        except Exception as e:
+            structured_logger.warning(f"Corrupt {self.label}", key=key, error=str(e))
+            return
+        with self._lock:
+            if self._markers.get(key) != marker or key in self._replace:
+                return  # Written or rebuilt by this process meanwhile; that copy is newer
+            self._apply(index, self._pending.get(key, ()))
+            self._indexes[key] = index
+            self._markers[key] = new_marker
+        structured_logger.info(f"Loaded {self.label}", key=key, size=index.size)
+
+    def _get(self, key: str) -> Optional[I]:
+        """The index for `key` (treat it as read-only), or None if none has been built."""
+        index = self._indexes.get(key)
+        if index is not None and time.time() - self._checked_at.get(key, 0.0) < self.refresh_seconds:
+            return index
+        # Searches keep using the loaded index while another thread re-checks it
+        if not self._reload_lock.acquire(blocking=index is None):
+            return index
+        try:
+            if (self._indexes.get(key) is None
+                    or time.time() - self._checked_at.get(key, 0.0) >= self.refresh_seconds):
+                self._reload(key)
+        finally:
+            self._reload_lock.release()
+        return self._indexes.get(key)
+
+    # ---------------------------------------------------------------- writes
+
+    def _install(self, key: str, index: I) -> None:
+        """Install a freshly built index; the next flush replaces any persisted copy."""
+        with self._lock:
+            self._indexes[key] = index
+            self._pending.pop(key, None)
+            self._replace.add(key)
+            self._checked_at[key] = time.time()
+            self._schedule_flush()
+
+    def _update(self, key: str, changes: List[C]) -> bool:
+        """
+        Apply changes to a copy of `key`'s index and swap it in; the background flush persists them.
+
+        Only updates an index that already exists -- a partial index would make
+        searches silently miss everything not yet indexed through here. Only
+        the first load reads storage here; staleness checks are left to searches.
+        """
+        if self._indexes.get(key) is None and self._get(key) is None:
+            return False
+        with self._lock:
+            index = self._indexes[key].copy()
+            if not self._apply(index, changes):
+                return False
+            self._indexes[key] = index
+            self._pending.setdefault(key, []).extend(changes)
+            self._schedule_flush()
+        return True
+
+    def _schedule_flush(self) -> None:
+        if self._flush_timer is None and self.persisted:
+            self._flush_timer = threading.Timer(self.flush_seconds, self._background_flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _background_flush(self) -> None:
+        with self._lock:
+            self._flush_timer = None
+        self.flush()
+        with self._lock:
+            if any(self._pending.values()) or self._replace:
+                self._schedule_flush()
+
+    def _flush_key(self, key: str) -> bool:
+        for _ in range(_WRITE_ATTEMPTS):
+            with self._lock:
+                local_path, gcs_uri = self._locations(key)
+                index = self._indexes.get(key)
+                pending = self._pending.get(key, [])
+                replace = key in self._replace
+                if index is None or not (pending or replace):
+                    return False
+                written = len(pending)
+                expected = None if replace or not gcs_uri else (self._markers.get(key) or 0)
+            try:
+                # `index` is never modified once published, so it can be serialized unlocked
+                marker = self._write(key, index.to_bytes(), expected)
+            except PreconditionFailed:
+                # Another writer got there first: pick up its copy, re-apply ours, retry
+                with self._reload_lock:
+                    self._reload(key)
+                continue
+            with self._lock:
+                # Changes applied while writing stay pending for the next flush
+                del self._pending.get(key, [])[:written]
+                self._replace.discard(key)
+                self._markers[key] = marker
+                self._checked_at[key] = time.time()
+            return True
+        raise RuntimeError(f"gave up after {_WRITE_ATTEMPTS} conflicting writes")
+
+    def flush(self) -> List[str]:
+        """Persist pending changes; returns the keys written. Unwritten changes stay pending."""
+        if not self.persisted:
+            return []
+        written: List[str] = []
+        with self._flush_lock:
+            with self._lock:
+                keys = sorted(set(k for k, changes in self._pending.items() if changes) | self._replace)
+            for key in keys:
+                try:
+                    if self._flush_key(key):
+                        written.append(key)
+                except Exception as e:
+                    structured_logger.warning(f"Failed to persist {self.label}", key=key, error=str(e))
+        return written
+
+    def close(self) -> List[str]:
+        """Cancel the scheduled flush and write anything pending now."""
+        with self._lock:
+            timer, self._flush_timer = self._flush_timer, None
+        if timer is not None:
+            timer.cancel()
+        return self.flush()
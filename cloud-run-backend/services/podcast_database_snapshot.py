@@ -0,0 +1,297 @@
+"""
+Podcast Database Snapshot
+
+/api/admin/podcasts/database used to stream every episode and, for each one,
+read its subscriber document, build a new storage.Client() and look up the
+audio blob (exists() plus size) -- two or three round trips per row.
+
+The admin table is now served from an in-memory snapshot built in bulk:
+
+- one `list_blobs` over the audio prefix gives a blob name -> size map,
+- subscriber emails are read with batched `get_all`,
+- episodes and podcast_jobs are each streamed once.
+
+After that the snapshot is refreshed incrementally: at most every
+PODCAST_DATABASE_REFRESH_SECONDS, only episodes and jobs whose `updated_at`
+moved since the last refresh are re-read, and sizes and emails are looked up
+for just those rows. Deleted podcasts are dropped straight away in this
+process (forget_podcast); a full rebuild every
+PODCAST_DATABASE_FULL_REFRESH_SECONDS, or on request, picks up anything
+else -- deletions made elsewhere and documents written without `updated_at`.
+
+Copyright (c) 2025 Gary Welz / CopernicusAI
+Licensed under MIT License
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from config.constants import EPISODE_BASE_URL, EPISODE_COLLECTION_NAME, RSS_BUCKET_NAME
+from utils.logging import structured_logger
+
+# Configuration
+PODCAST_DATABASE_REFRESH_SECONDS = float(os.getenv("PODCAST_DATABASE_REFRESH_SECONDS", "30"))
+PODCAST_DATABASE_FULL_REFRESH_SECONDS = float(os.getenv("PODCAST_DATABASE_FULL_REFRESH_SECONDS", "900"))
+PODCAST_AUDIO_PREFIX = os.getenv("PODCAST_AUDIO_PREFIX", "audio/")
+
+_GET_ALL_BATCH_SIZE = 300
+# Incremental refreshes re-read a little before the last one, so writers
+# whose clocks run slightly behind this instance aren't missed
+_WATERMARK_OVERLAP = timedelta(seconds=60)
+
+_CATEGORY_BY_SLUG = {'bio': 'Biology', 'chem': 'Chemistry', 'compsci': 'Computer Science',
+                     'math': 'Mathematics', 'phys': 'Physics'}
+
+
+def audio_blob_name(audio_url: str, bucket_name: str) -> Optional[str]:
+    """Blob name of an audio URL in `bucket_name`'s public URL form."""
+    if not audio_url:
+        return None
+    blob_name = urlparse(audio_url).path.lstrip('/')
+    if blob_name.startswith(bucket_name + '/'):
+        blob_name = blob_name[len(bucket_name) + 1:]
+    return blob_name or None
+
+
+def format_file_size(size_bytes: Optional[int]) -> str:
+    if not size_bytes:
+        return 'Unknown'
+    return f"{size_bytes / (1024 * 1024):.1f} MB"
+
+
+def episode_row(canonical: str, data: Dict[str, Any], subscriber_email: str, size_bytes: Optional[int]) -> Dict[str, Any]:
+    """Admin table row for an episode document."""
+    # Get category from episode or extract from canonical
+    category = data.get('category', '')
+    if not category and canonical:
+        parts = canonical.split('-')
+        if len(parts) >= 2:
+            category = _CATEGORY_BY_SLUG.get(parts[1], '')
+    return {
+        'canonical_filename': canonical,
+        'podcast_id': canonical,  # For compatibility
+        'id': canonical,  # For compatibility
+        'title': data.get('title', 'Untitled'),
+        'subscriber_email': subscriber_email,
+        'subscriber_id': data.get('subscriber_id', ''),
+        'duration': data.get('duration') or 'Unknown',
+        'file_size_display': format_file_size(size_bytes),
+        'created_at': data.get('created_at') or data.get('generated_at') or '',
+        'submitted_to_rss': data.get('submitted_to_rss', False),
+        'in_rss': data.get('submitted_to_rss', False),  # Alias
+        'category': category,
+        'episode_page_url': f"{EPISODE_BASE_URL}/{canonical}",
+        'episode_json_url': f"{EPISODE_BASE_URL}/{canonical}.json",
+        'source': 'episodes'
+    }
+
+
+def job_row(canonical: str, job_data: Dict[str, Any], subscriber_email: str) -> Dict[str, Any]:
+    """Admin table row for a podcast job that has no episode document."""
+    result = job_data.get('result') or {}
+    request = job_data.get('request') or {}
+    return {
+        'canonical_filename': canonical,
+        'podcast_id': canonical,
+        'id': canonical,
+        'title': result.get('title') or request.get('topic', 'Untitled'),
+        'subscriber_email': subscriber_email,
+        'subscriber_id': job_data.get('subscriber_id', ''),
+        'duration': result.get('duration') or request.get('duration', 'Unknown'),
+        'file_size_display': 'Unknown',
+        'created_at': job_data.get('created_at') or job_data.get('updated_at') or '',
+        'submitted_to_rss': job_data.get('submitted_to_rss', False),
+        'in_rss': job_data.get('submitted_to_rss', False),
+        'category': request.get('category', ''),
+        'episode_page_url': f"{EPISODE_BASE_URL}/{canonical}",
+        'episode_json_url': f"{EPISODE_BASE_URL}/{canonical}.json",
+        'source': 'podcast_jobs'
+    }
+
+
+def podcast_sort_key(podcast: Dict[str, Any]) -> str:
+    """Sort key for newest-first ordering; rows without created_at sort last."""
+    timestamp = podcast.get('created_at') or ''
+    if not timestamp:
+        return ''
+    if isinstance(timestamp, str):
+        return timestamp.replace('+00:00', '').replace('Z', '')
+    if hasattr(timestamp, 'isoformat'):
+        return timestamp.isoformat()
+    return str(timestamp)
+
+
+class PodcastDatabaseSnapshot:
+    """In-memory admin podcast table, built in bulk and refreshed incrementally."""
+
+    def __init__(
+        self,
+        db: Any,
+        bucket_name: str = RSS_BUCKET_NAME,
+        audio_prefix: str = PODCAST_AUDIO_PREFIX,
+        refresh_seconds: float = PODCAST_DATABASE_REFRESH_SECONDS,
+        full_refresh_seconds: float = PODCAST_DATABASE_FULL_REFRESH_SECONDS,
+        storage_client: Any = None,
+    ):
+        self.db = db
+        self.bucket_name = bucket_name
+        self.audio_prefix = audio_prefix
+        self.refresh_seconds = refresh_seconds
+        self.full_refresh_seconds = full_refresh_seconds
+        self._storage_client = storage_client
+        self._episode_rows: Dict[str, Dict[str, Any]] = {}
+        self._job_rows: Dict[str, Dict[str, Any]] = {}
+        self._sizes: Dict[str, int] = {}
+        self._emails: Dict[str, str] = {}
+        self._watermark: Optional[str] = None
+        self._built_at = 0.0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.stats = {"full_builds": 0, "incremental_refreshes": 0}
+
+    def _bucket(self):
+        if self._storage_client is None:
+            from google.cloud import storage
+            self._storage_client = storage.Client()
+        return self._storage_client.bucket(self.bucket_name)
+
+    # ------------------------------------------------------------- lookups
+
+    def _list_audio_sizes(self) -> Dict[str, int]:
+        blobs = self._bucket().list_blobs(prefix=self.audio_prefix, fields="items(name,size),nextPageToken")
+        return {blob.name: blob.size or 0 for blob in blobs}
+
+    def _audio_size(self, audio_url: str, look_up_missing: bool) -> Optional[int]:
+        """
+        Audio file size from the listing. Blobs the listing couldn't have seen
+        (outside the audio prefix, or uploaded since it was taken when
+        `look_up_missing`) are looked up one by one.
+        """
+        blob_name = audio_blob_name(audio_url, self.bucket_name)
+        if not blob_name:
+            return None
+        if blob_name in self._sizes:
+            return self._sizes[blob_name]
+        if blob_name.startswith(self.audio_prefix) and not look_up_missing:
+            return None
+        try:
+            blob = self._bucket().get_blob(blob_name)
+        except Exception:
+            return None  # Keep as Unknown if we can't get size
+        if blob is None:
+            return None
+        self._sizes[blob_name] = blob.size or 0
+        return self._sizes[blob_name]
+
+    def _load_emails(self, subscriber_ids: Iterable[str]) -> None:
+        missing = sorted({sid for sid in subscriber_ids if sid and sid not in self._emails})
+        for start in range(0, len(missing), _GET_ALL_BATCH_SIZE):
+            chunk = missing[start:start + _GET_ALL_BATCH_SIZE]
+            refs = [self.db.collection('subscribers').document(sid) for sid in chunk]
+            for snapshot in self.db.get_all(refs):
+                email = (snapshot.to_dict() or {}).get('email') if snapshot.exists else None
+                self._emails[snapshot.id] = email or 'Unknown'
+
+    # ---------------------------------------------------------------- rows
+
+    def _rows_from_episodes(self, docs: List[Any], look_up_missing: bool) -> Dict[str, Dict[str, Any]]:
+        episodes = [(doc.id, doc.to_dict() or {}) for doc in docs if doc.id]
+        self._load_emails(
+            data.get('subscriber_id') for _, data in episodes
+            if data.get('subscriber_email', 'Unknown') == 'Unknown'
+        )
+        rows = {}
+        for canonical, data in episodes:
+            subscriber_email = data.get('subscriber_email', 'Unknown')
+            if subscriber_email == 'Unknown':
+                subscriber_email = self._emails.get(data.get('subscriber_id', ''), 'Unknown')
+            size_bytes = self._audio_size(data.get('audio_url', ''), look_up_missing)
+            rows[canonical] = episode_row(canonical, data, subscriber_email, size_bytes)
+        return rows
+
+    def _rows_from_jobs(self, docs: List[Any]) -> Dict[str, Dict[str, Any]]:
+        jobs = []
+        for doc in docs:
+            job_data = doc.to_dict() or {}
+            canonical = (job_data.get('result') or {}).get('canonical_filename')
+            if canonical:
+                jobs.append((canonical, job_data))
+        self._load_emails(job_data.get('subscriber_id') for _, job_data in jobs)
+        return {
+            canonical: job_row(canonical, job_data, self._emails.get(job_data.get('subscriber_id', ''), 'Unknown'))
+            for canonical, job_data in jobs
+        }
+
+    # ------------------------------------------------------------- refresh
+
+    def _full_build(self) -> None:
+        started = time.time()
+        watermark = (datetime.utcnow() - _WATERMARK_OVERLAP).isoformat()
+        self._sizes = self._list_audio_sizes()
+        self._emails = {}
+        self._episode_rows = self._rows_from_episodes(
+            list(self.db.collection(EPISODE_COLLECTION_NAME).stream()), look_up_missing=False
+        )
+        self._job_rows = self._rows_from_jobs(list(self.db.collection('podcast_jobs').stream()))
+        self._watermark = watermark
+        self._built_at = self._checked_at = time.time()
+        self.stats["full_builds"] += 1
+        structured_logger.info("Podcast database snapshot built",
+                              episodes=len(self._episode_rows),
+                              jobs=len(self._job_rows),
+                              audio_blobs=len(self._sizes),
+                              duration_seconds=round(time.time() - started, 2))
+
+    def _incremental_refresh(self) -> None:
+        watermark = (datetime.utcnow() - _WATERMARK_OVERLAP).isoformat()
+        episodes = list(
+            self.db.collection(EPISODE_COLLECTION_NAME).where('updated_at', '>=', self._watermark).stream()
+        )
+        jobs = list(self.db.collection('podcast_jobs').where('updated_at', '>=', self._watermark).stream())
+        self._episode_rows.update(self._rows_from_episodes(episodes, look_up_missing=True))
+        self._job_rows.update(self._rows_from_jobs(jobs))
+        self._watermark = watermark
+        self._checked_at = time.time()
+        self.stats["incremental_refreshes"] += 1
+
+    def podcasts(self, full_refresh: bool = False) -> List[Dict[str, Any]]:
+        """All podcasts, newest first (episodes win over jobs with the same canonical filename)."""
+        with self._lock:
+            now = time.time()
+            if full_refresh or not self._built_at or now - self._built_at >= self.full_refresh_seconds:
+                self._full_build()
+            elif now - self._checked_at >= self.refresh_seconds:
+                self._incremental_refresh()
+            rows = {**self._job_rows, **self._episode_rows}
+        return sorted(rows.values(), key=podcast_sort_key, reverse=True)
+
+    def forget(self, canonical: str) -> None:
+        """Drop a deleted podcast without waiting for the next full rebuild."""
+        with self._lock:
+            self._episode_rows.pop(canonical, None)
+            self._job_rows.pop(canonical, None)
+
+
+_snapshot: Optional[PodcastDatabaseSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+def get_podcast_database_snapshot() -> Optional[PodcastDatabaseSnapshot]:
+    """Process-wide snapshot (None if Firestore is unavailable)."""
+    global _snapshot
+    if _snapshot is None:
+        with _snapshot_lock:
+            if _snapshot is None:
+                from config.database import db
+                if db:
+                    _snapshot = PodcastDatabaseSnapshot(db)
+    return _snapshot
+
+
+def forget_podcast(canonical: str) -> None:
+    if _snapshot is not None and canonical:
+        _snapshot.forget(canonical)
@@ -54,6 +54,7 @@ except ImportError:
 from models.podcast import PodcastRequest
 from utils.logging import structured_logger
 from utils.step_tracking import with_step
+from utils.profiling import JobProfile, profile_phase, save_job_profile
 
 
 _CITATION_GROUNDING = """
@@ -87,7 +88,14 @@ from config.constants import (
 )
 from config.database import db
 from services.episode_service import episode_service
+from services.episode_search_index import index_episode_transcript
 from services.canonical_service import canonical_service
+from services.podcast_phase_executor import PhaseExecutor
+from services.podcast_job_checkpoints import (
+    PodcastJobCheckpoints,
+    research_context_from_dict,
+    research_context_to_dict,
+)
 from utils.script_validation import validate_script_length, calculate_minimum_words_for_duration
 
 # Retry decorator for upload operations
@@ -1609,8 +1617,8 @@ In this comprehensive exploration, we'll examine the latest research development
             blob = bucket.blob(f"descriptions/{description_filename}")
             
             # Upload enhanced description as markdown
-            blob.upload_from_string(enhanced_description, content_type="text/markdown")
-            blob.make_public()
+            await asyncio.to_thread(blob.upload_from_string, enhanced_description, content_type="text/markdown")
+            await asyncio.to_thread(blob.make_public)
             
             # Return public URL
             public_url = f"https://storage.googleapis.com/regal-scholar-453620-r7-podcast-storage/descriptions/{description_filename}"
@@ -1675,14 +1683,21 @@ In this comprehensive exploration, we'll examine the latest research development
             blob = bucket.blob(f"transcripts/{transcript_filename}")
             
             # Upload transcript as markdown
-            blob.upload_from_string(transcript_content, content_type="text/markdown")
-            blob.make_public()
+            await asyncio.to_thread(blob.upload_from_string, transcript_content, content_type="text/markdown")
+            await asyncio.to_thread(blob.make_public)
             
             # Return public URL
             public_url = f"https://storage.googleapis.com/regal-scholar-453620-r7-podcast-storage/transcripts/{transcript_filename}"
             structured_logger.info("Transcript uploaded to GCS",
                                   canonical_filename=canonical_filename,
                                   public_url=public_url)
+            try:
+                # The episode id is the canonical filename (see EpisodeService)
+                await asyncio.to_thread(index_episode_transcript, canonical_filename, transcript_content)
+            except Exception as e:
+                structured_logger.warning("Failed to update episode search index with transcript",
+                                         canonical_filename=canonical_filename,
+                                         error=str(e))
             return public_url
             
         except Exception as e:
@@ -1707,6 +1722,10 @@ In this comprehensive exploration, we'll examine the latest research development
     
     async def generate_fallback_thumbnail(self, canonical_filename: str, topic: str) -> str:
         """Generate fallback thumbnail when DALL-E is not available"""
+        # Rendering and the GCS upload are blocking; keep them off the event loop
+        return await asyncio.to_thread(self._generate_fallback_thumbnail_sync, canonical_filename, topic)
+
+    def _generate_fallback_thumbnail_sync(self, canonical_filename: str, topic: str) -> str:
         try:
             from PIL import Image, ImageDraw, ImageFilter
             from google.cloud import storage
@@ -1805,7 +1824,7 @@ In this comprehensive exploration, we'll examine the latest research development
             import re
             
             # Initialize GCS client
-            storage_client = storage.Client()
+            storage_client = await asyncio.to_thread(storage.Client)
             bucket = storage_client.bucket(self.bucket_name)
             
             # Get OpenAI API key from Secret Manager for DALL-E
@@ -1837,7 +1856,8 @@ In this comprehensive exploration, we'll examine the latest research development
                     "quality": attempt["quality"],
                 }
                 try:
-                    response = requests.post(
+                    response = await asyncio.to_thread(
+                        requests.post,
                         "https://api.openai.com/v1/images/generations",
                         headers=headers,
                         json=payload,
@@ -1863,7 +1883,7 @@ In this comprehensive exploration, we'll examine the latest research development
                 item = (response.json().get("data") or [{}])[0]
                 image_bytes = None
                 if item.get("url"):
-                    img_response = requests.get(item["url"], timeout=30)
+                    img_response = await asyncio.to_thread(requests.get, item["url"], timeout=30)
                     if img_response.status_code == 200:
                         image_bytes = img_response.content
                     else:
@@ -1876,8 +1896,8 @@ In this comprehensive exploration, we'll examine the latest research development
                     continue
                 thumbnail_filename = f"{canonical_filename}-thumb.jpg"
                 blob = bucket.blob(f"thumbnails/{thumbnail_filename}")
-                blob.upload_from_string(image_bytes, content_type="image/jpeg")
-                blob.make_public()
+                await asyncio.to_thread(blob.upload_from_string, image_bytes, content_type="image/jpeg")
+                await asyncio.to_thread(blob.make_public)
                 public_url = f"https://storage.googleapis.com/{self.bucket_name}/thumbnails/{thumbnail_filename}"
                 structured_logger.info(
                     "DALL-E thumbnail uploaded",
@@ -1932,7 +1952,7 @@ In this comprehensive exploration, we'll examine the latest research development
             num_images = max(1, min(2, num_images))
             
             # Initialize GCS client
-            storage_client = storage.Client()
+            storage_client = await asyncio.to_thread(storage.Client)
             bucket = storage_client.bucket(self.bucket_name)
             
             # Get OpenAI API key
@@ -2026,7 +2046,8 @@ Technical Quality: Ultra-high resolution. No text, words, or labels. Pure visual
                         "quality": "medium",
                     }
                     
-                    response = requests.post(
+                    response = await asyncio.to_thread(
+                        requests.post,
                         "https://api.openai.com/v1/images/generations",
                         headers=headers,
                         json=payload,
@@ -2038,7 +2059,7 @@ Technical Quality: Ultra-high resolution. No text, words, or labels. Pure visual
                         item = (response.json().get("data") or [{}])[0]
                         image_bytes = None
                         if item.get("url"):
-                            img_response = requests.get(item["url"], timeout=30)
+                            img_response = await asyncio.to_thread(requests.get, item["url"], timeout=30)
                             if img_response.status_code == 200:
                                 image_bytes = img_response.content
                         elif item.get("b64_json"):
@@ -2046,8 +2067,8 @@ Technical Quality: Ultra-high resolution. No text, words, or labels. Pure visual
                         if image_bytes:
                             image_filename = f"{canonical_filename}-image-{i+1}.jpg"
                             blob = bucket.blob(f"episode-images/{image_filename}")
-                            blob.upload_from_string(image_bytes, content_type="image/jpeg")
-                            blob.make_public()
+                            await asyncio.to_thread(blob.upload_from_string, image_bytes, content_type="image/jpeg")
+                            await asyncio.to_thread(blob.make_public)
                             
                             public_url = f"https://storage.googleapis.com/{self.bucket_name}/episode-images/{image_filename}"
                             image_urls.append(public_url)
@@ -2149,418 +2170,466 @@ Technical Quality: Ultra-high resolution. No text, words, or labels. Pure visual
         
         job_ref = db.collection('podcast_jobs').document(job_id)
         request_snapshot = request.model_dump()
+        checkpoints = PodcastJobCheckpoints(job_ref)
+        if checkpoints.completed():
+            structured_logger.info("Resuming podcast job from checkpoints",
+                                  job_id=job_id,
+                                  completed_phases=checkpoints.completed(),
+                                  resume_phase=checkpoints.resume_phase())
+            job_ref.update({
+                'status': 'resuming',
+                'resume_phase': checkpoints.resume_phase(),
+                'updated_at': datetime.utcnow().isoformat()
+            })
+        
+        profile = JobProfile(job_id)
+        profile_token = profile.activate()
         
         try:
-            # ═════════════════════════════════════════════════════════════════
-            # 🔬 PHASE 1: COMPREHENSIVE RESEARCH (NEW - Copernicus Spirit!)
-            # ═════════════════════════════════════════════════════════════════
-            structured_logger.info("PHASE 1: Starting comprehensive research discovery", job_id=job_id)
-            
-            job_ref.update({'status': 'researching', 'updated_at': datetime.utcnow().isoformat()})
-            
-            # Initialize research integrator
             google_key = get_google_api_key()
             if not google_key:
                 raise Exception("Google API key not available for research")
             
-            research_integrator = PodcastResearchIntegrator(google_key)
+            if checkpoints.has("research"):
+                research_context = research_context_from_dict(checkpoints.get("research"))
+                structured_logger.info("PHASE 1: Reusing checkpointed research",
+                                      job_id=job_id,
+                                      sources_count=len(research_context.research_sources))
+            else:
+                # ═════════════════════════════════════════════════════════════════
+                # 🔬 PHASE 1: COMPREHENSIVE RESEARCH (NEW - Copernicus Spirit!)
+                # ═════════════════════════════════════════════════════════════════
+                structured_logger.info("PHASE 1: Starting comprehensive research discovery", job_id=job_id)
             
-            try:
-                # Perform comprehensive research
-                research_context = await asyncio.wait_for(
-                    research_integrator.comprehensive_research_for_podcast(
-                        topic=request.topic,
-                        additional_context=request.additional_instructions or "",
-                        source_links=request.source_links or [],
-                        expertise_level=request.expertise_level,
-                        require_minimum_sources=3  # FAIL FAST if insufficient research
-                    ),
-                    timeout=300  # 5 minute timeout for research
-                )
+                job_ref.update({'status': 'researching', 'updated_at': datetime.utcnow().isoformat()})
+            
+                # Initialize research integrator
+                research_integrator = PodcastResearchIntegrator(google_key)
+            
+                try:
+                    # Perform comprehensive research
+                    async with profile_phase("research"):
+                        research_context = await asyncio.wait_for(
+                            research_integrator.comprehensive_research_for_podcast(
+                                topic=request.topic,
+                                additional_context=request.additional_instructions or "",
+                                source_links=request.source_links or [],
+                                expertise_level=request.expertise_level,
+                                require_minimum_sources=3  # FAIL FAST if insufficient research
+                            ),
+                            timeout=300  # 5 minute timeout for research
+                        )
                 
-                structured_logger.info("Research completed successfully",
-                                      job_id=job_id,
-                                      quality_score=round(research_context.research_quality_score, 1),
-                                      sources_count=len(research_context.research_sources),
-                                      paradigm_shifts_count=len(research_context.paradigm_shifts))
+                    structured_logger.info("Research completed successfully",
+                                          job_id=job_id,
+                                          quality_score=round(research_context.research_quality_score, 1),
+                                          sources_count=len(research_context.research_sources),
+                                          paradigm_shifts_count=len(research_context.paradigm_shifts))
+                
+                    # Store research metadata in job (including sources for references)
+                    research_sources_summary = []
+                    for source in research_context.research_sources[:10]:
+                        research_sources_summary.append({
+                            'title': source.title,
+                            'source': source.source,
+                            'journal': getattr(source, 'journal', None),
+                            'doi': source.doi,
+                            'url': source.url,
+                            'publication_date': source.publication_date,
+                            'authors': source.authors[:3]  # Store first 3 authors
+                        })
                 
-                # Store research metadata in job (including sources for references)
-                research_sources_summary = []
-                for source in research_context.research_sources[:10]:
-                    research_sources_summary.append({
-                        'title': source.title,
-                        'source': source.source,
-                        'journal': getattr(source, 'journal', None),
-                        'doi': source.doi,
-                        'url': source.url,
-                        'publication_date': source.publication_date,
-                        'authors': source.authors[:3]  # Store first 3 authors
+                    job_ref.update({
+                        'research_sources_count': len(research_context.research_sources),
+                        'research_quality_score': research_context.research_quality_score,
+                        'paradigm_shifts_count': len(research_context.paradigm_shifts),
+                        'research_sources_summary': research_sources_summary,
+                        'real_citations': research_context.real_citations[:10],  # Store citations for references
+                        'updated_at': datetime.utcnow().isoformat()
                     })
                 
-                job_ref.update({
-                    'research_sources_count': len(research_context.research_sources),
-                    'research_quality_score': research_context.research_quality_score,
-                    'paradigm_shifts_count': len(research_context.paradigm_shifts),
-                    'research_sources_summary': research_sources_summary,
-                    'real_citations': research_context.real_citations[:10],  # Store citations for references
-                    'updated_at': datetime.utcnow().isoformat()
-                })
+                except Exception as e:
+                    error_msg = str(e)
+                    structured_logger.error("Research phase failed",
+                                          job_id=job_id,
+                                          error=error_msg)
                 
-            except Exception as e:
-                error_msg = str(e)
-                structured_logger.error("Research phase failed",
-                                      job_id=job_id,
-                                      error=error_msg)
+                    # Update job with failure
+                    job_ref.update({
+                        'status': 'failed',
+                        'error': f"Research failed: {error_msg}",
+                        'error_type': 'insufficient_research',
+                        'updated_at': datetime.utcnow().isoformat()
+                    })
                 
-                # Update job with failure
-                job_ref.update({
-                    'status': 'failed',
-                    'error': f"Research failed: {error_msg}",
-                    'error_type': 'insufficient_research',
-                    'updated_at': datetime.utcnow().isoformat()
-                })
+                    # Send failure email
+                    if self.email_service:
+                        await self.email_service.send_podcast_ready_email(
+                            to_email=subscriber_email,
+                            podcast_title=f"Research Failed: {request.topic}",
+                            description=f"Unable to find sufficient research sources for '{request.topic}'. {error_msg}",
+                            audio_url="",
+                            error_message=error_msg
+                        )
                 
-                # Send failure email
-                if self.email_service:
-                    await self.email_service.send_podcast_ready_email(
-                        to_email=subscriber_email,
-                        podcast_title=f"Research Failed: {request.topic}",
-                        description=f"Unable to find sufficient research sources for '{request.topic}'. {error_msg}",
-                        audio_url="",
-                        error_message=error_msg
-                    )
+                    return  # EXIT - Cannot proceed without research
                 
-                return  # EXIT - Cannot proceed without research
+                checkpoints.save("research", research_context_to_dict(research_context))
             
-            # ═════════════════════════════════════════════════════════════════
-            # 🎙️ PHASE 2: RESEARCH-DRIVEN CONTENT GENERATION (2-Speaker Format)
-            # ═════════════════════════════════════════════════════════════════
-            structured_logger.info("PHASE 2: Generating 2-speaker podcast from research", job_id=job_id)
+            if checkpoints.has("content"):
+                content = checkpoints.get("content")
+                structured_logger.info("Reusing checkpointed script and description",
+                                      job_id=job_id,
+                                      title=content.get('title', 'N/A')[:60])
+            else:
+                # ═════════════════════════════════════════════════════════════════
+                # 🎙️ PHASE 2: RESEARCH-DRIVEN CONTENT GENERATION (2-Speaker Format)
+                # ═════════════════════════════════════════════════════════════════
+                structured_logger.info("PHASE 2: Generating 2-speaker podcast from research", job_id=job_id)
             
-            job_ref.update({'status': 'generating_content', 'updated_at': datetime.utcnow().isoformat()})
+                job_ref.update({'status': 'generating_content', 'updated_at': datetime.utcnow().isoformat()})
             
-            async with with_step("content_generation", job_id, 
-                               topic=request.topic, 
-                               category=request.category,
-                               duration=request.duration):
+                async with with_step("content_generation", job_id, 
+                                   topic=request.topic, 
+                                   category=request.category,
+                                   duration=request.duration):
                 
-                content_memory_before = psutil.virtual_memory().percent
-                structured_logger.info("Starting research-driven content generation", 
-                                      job_id=job_id,
-                                      topic=request.topic,
-                                      research_quality=research_context.research_quality_score,
-                                      memory_before=content_memory_before)
+                    content_memory_before = psutil.virtual_memory().percent
+                    structured_logger.info("Starting research-driven content generation", 
+                                          job_id=job_id,
+                                          topic=request.topic,
+                                          research_quality=research_context.research_quality_score,
+                                          memory_before=content_memory_before)
                 
-                # Retry loop for content generation - regenerate if script is too short
-                max_retries = 2
-                content = None
-                min_words = calculate_minimum_words_for_duration(request.duration)
+                    # Retry loop for content generation - regenerate if script is too short
+                    max_retries = 2
+                    content = None
+                    min_words = calculate_minimum_words_for_duration(request.duration)
                 
-                for attempt in range(max_retries + 1):
-                    try:
-                        # Generate 2-speaker podcast from research
-                        generated_content = await asyncio.wait_for(
-                            self.generate_content_from_research_context(request, research_context, google_key, retry_attempt=attempt),
-                            timeout=600  # 10 minute timeout for content generation
-                        )
+                    for attempt in range(max_retries + 1):
+                        try:
+                            # Generate 2-speaker podcast from research
+                            generated_content = await asyncio.wait_for(
+                                self.generate_content_from_research_context(request, research_context, google_key, retry_attempt=attempt),
+                                timeout=600  # 10 minute timeout for content generation
+                            )
                         
-                        # Check if script is long enough
-                        script = generated_content.get('script', '') if isinstance(generated_content, dict) else ''
-                        word_count = len(script.split()) if script else 0
+                            # Check if script is long enough
+                            script = generated_content.get('script', '') if isinstance(generated_content, dict) else ''
+                            word_count = len(script.split()) if script else 0
                         
-                        if word_count >= min_words:
-                            content = generated_content
-                            structured_logger.info(f"Content generation succeeded on attempt {attempt + 1}",
-                                                  job_id=job_id,
-                                                  word_count=word_count,
-                                                  min_required=min_words)
-                            break
-                        else:
+                            if word_count >= min_words:
+                                content = generated_content
+                                structured_logger.info(f"Content generation succeeded on attempt {attempt + 1}",
+                                                      job_id=job_id,
+                                                      word_count=word_count,
+                                                      min_required=min_words)
+                                break
+                            else:
+                                if attempt < max_retries:
+                                    structured_logger.warning(f"Script too short on attempt {attempt + 1}, retrying with stronger prompt",
+                                                             job_id=job_id,
+                                                             word_count=word_count,
+                                                             min_required=min_words,
+                                                             attempt=attempt + 1,
+                                                             max_retries=max_retries + 1)
+                                    await asyncio.sleep(2)  # Brief delay before retry
+                                else:
+                                    # Last attempt - use what we have and let validation catch it
+                                    content = generated_content
+                                    structured_logger.warning("Script too short after all retries, proceeding to validation",
+                                                             job_id=job_id,
+                                                             word_count=word_count,
+                                                             min_required=min_words)
+                    
+                        except asyncio.TimeoutError:
                             if attempt < max_retries:
-                                structured_logger.warning(f"Script too short on attempt {attempt + 1}, retrying with stronger prompt",
+                                structured_logger.warning(f"Content generation timed out on attempt {attempt + 1}, retrying",
                                                          job_id=job_id,
-                                                         word_count=word_count,
-                                                         min_required=min_words,
-                                                         attempt=attempt + 1,
-                                                         max_retries=max_retries + 1)
-                                await asyncio.sleep(2)  # Brief delay before retry
+                                                         attempt=attempt + 1)
+                                await asyncio.sleep(2)
+                                continue
                             else:
-                                # Last attempt - use what we have and let validation catch it
-                                content = generated_content
-                                structured_logger.warning("Script too short after all retries, proceeding to validation",
+                                structured_logger.error("Content generation timed out after all retries", 
+                                                       job_id=job_id,
+                                                       timeout_seconds=600)
+                                raise Exception("Content generation timed out after 10 minutes")
+                        except Exception as e:
+                            if attempt < max_retries:
+                                structured_logger.warning(f"Content generation failed on attempt {attempt + 1}, retrying",
                                                          job_id=job_id,
-                                                         word_count=word_count,
-                                                         min_required=min_words)
-                    
-                    except asyncio.TimeoutError:
-                        if attempt < max_retries:
-                            structured_logger.warning(f"Content generation timed out on attempt {attempt + 1}, retrying",
-                                                     job_id=job_id,
-                                                     attempt=attempt + 1)
-                            await asyncio.sleep(2)
-                            continue
-                        else:
-                            structured_logger.error("Content generation timed out after all retries", 
-                                                   job_id=job_id,
-                                                   timeout_seconds=600)
-                            raise Exception("Content generation timed out after 10 minutes")
-                    except Exception as e:
-                        if attempt < max_retries:
-                            structured_logger.warning(f"Content generation failed on attempt {attempt + 1}, retrying",
-                                                     job_id=job_id,
-                                                     error=str(e),
-                                                     attempt=attempt + 1)
-                            await asyncio.sleep(2)
-                            continue
-                        else:
-                            structured_logger.error("Content generation failed after all retries", 
-                                                   job_id=job_id,
-                                                   error=str(e),
-                                                   error_type=type(e).__name__)
-                            raise
+                                                         error=str(e),
+                                                         attempt=attempt + 1)
+                                await asyncio.sleep(2)
+                                continue
+                            else:
+                                structured_logger.error("Content generation failed after all retries", 
+                                                       job_id=job_id,
+                                                       error=str(e),
+                                                       error_type=type(e).__name__)
+                                raise
                 
-                if not content:
-                    raise Exception("Failed to generate content after all retry attempts")
+                    if not content:
+                        raise Exception("Failed to generate content after all retry attempts")
                 
-                content_memory_after = psutil.virtual_memory().percent
+                    content_memory_after = psutil.virtual_memory().percent
                 
-                # CRITICAL: Ensure title exists - use topic as fallback if missing
-                if isinstance(content, dict):
-                    if not content.get('title') or not content.get('title', '').strip():
-                        structured_logger.warning("LLM did not generate valid title, using topic as fallback",
-                                                 topic=request.topic)
-                        content['title'] = request.topic
+                    # CRITICAL: Ensure title exists - use topic as fallback if missing
+                    if isinstance(content, dict):
+                        if not content.get('title') or not content.get('title', '').strip():
+                            structured_logger.warning("LLM did not generate valid title, using topic as fallback",
+                                                     topic=request.topic)
+                            content['title'] = request.topic
                 
-                structured_logger.info("Content generation completed successfully", 
-                                      job_id=job_id,
-                                      memory_before=content_memory_before,
-                                      memory_after=content_memory_after,
-                                      memory_delta=content_memory_after - content_memory_before,
-                                      content_type=type(content).__name__,
-                                      content_keys=list(content.keys()) if isinstance(content, dict) else None,
-                                      title=content.get('title', 'N/A')[:60] if isinstance(content, dict) else 'N/A',
-                                      script_word_count=len(content.get('script', '').split()) if isinstance(content, dict) else 0)
-            
-            # ═════════════════════════════════════════════════════════════════
-            # ✅ PHASE 3: VALIDATE CONTENT (NO FAKE FALLBACKS!)
-            # ═════════════════════════════════════════════════════════════════
-            structured_logger.info("PHASE 3: Validating content quality", job_id=job_id)
-            
-            # CRITICAL: Validate that content was actually generated
-            if not content or not isinstance(content, dict):
-                raise Exception("Content generation returned invalid data structure")
-            
-            if 'description' not in content or not content.get('description'):
-                raise Exception("Content generation failed - no description produced. Cannot use fake template.")
-            
-            if 'script' not in content or not content.get('script'):
-                raise Exception("Content generation failed - no script produced. Cannot use fake template.")
-            
-            if 'title' not in content or not content.get('title'):
-                raise Exception("Content generation failed - no title produced. Cannot use fake template.")
-            
-            # Generate relevant hashtags
-            content['hashtags'] = generate_relevant_hashtags(
-                request.topic, 
-                request.category, 
-                content.get('title', ''), 
-                ""
-            )
+                    structured_logger.info("Content generation completed successfully", 
+                                          job_id=job_id,
+                                          memory_before=content_memory_before,
+                                          memory_after=content_memory_after,
+                                          memory_delta=content_memory_after - content_memory_before,
+                                          content_type=type(content).__name__,
+                                          content_keys=list(content.keys()) if isinstance(content, dict) else None,
+                                          title=content.get('title', 'N/A')[:60] if isinstance(content, dict) else 'N/A',
+                                          script_word_count=len(content.get('script', '').split()) if isinstance(content, dict) else 0)
+            
+                # ═════════════════════════════════════════════════════════════════
+                # ✅ PHASE 3: VALIDATE CONTENT (NO FAKE FALLBACKS!)
+                # ═════════════════════════════════════════════════════════════════
+                structured_logger.info("PHASE 3: Validating content quality", job_id=job_id)
+            
+                # CRITICAL: Validate that content was actually generated
+                if not content or not isinstance(content, dict):
+                    raise Exception("Content generation returned invalid data structure")
+            
+                if 'description' not in content or not content.get('description'):
+                    raise Exception("Content generation failed - no description produced. Cannot use fake template.")
+            
+                if 'script' not in content or not content.get('script'):
+                    raise Exception("Content generation failed - no script produced. Cannot use fake template.")
+            
+                if 'title' not in content or not content.get('title'):
+                    raise Exception("Content generation failed - no title produced. Cannot use fake template.")
+            
+                # Generate relevant hashtags
+                content['hashtags'] = generate_relevant_hashtags(
+                    request.topic, 
+                    request.category, 
+                    content.get('title', ''), 
+                    ""
+                )
             
-            # Check if description already has hashtags and references, if not add them
-            if '## Hashtags' not in content['description'] and '---' not in content['description']:
-                # Add hashtags and closing message
-                content['description'] += f"""
+                # Check if description already has hashtags and references, if not add them
+                if '## Hashtags' not in content['description'] and '---' not in content['description']:
+                    # Add hashtags and closing message
+                    content['description'] += f"""
 
 ## Hashtags
 {content['hashtags']}
 
 """
             
-            # CRITICAL: Ensure references section exists - add from research_context if missing
-            if '## References' not in content['description']:
-                # References are missing - add them from research_context
-                structured_logger.warning("LLM did not include References section, adding from research context",
-                                         job_id=job_id,
-                                         topic=request.topic)
-                
-                # Build references from research_context (available from research phase)
-                references_text = "\n\n## References\n\n"
-                references_added = False
-                
-                # Try to use research_context directly (it should be in scope)
-                try:
-                    # research_context is defined in the outer scope above
-                    if research_context:
-                        # Use real_citations first (already formatted)
-                        if research_context.real_citations:
-                            for citation in research_context.real_citations[:5]:
-                                references_text += f"- {citation}\n"
-                            references_added = True
-                        elif research_context.research_sources:
-                            # Build from research_sources
-                            for source in research_context.research_sources[:5]:
-                                references_text += format_research_source_line(source) + "\n"
-                            references_added = True
-                except NameError:
-                    # research_context not in scope, use fallback
-                    structured_logger.warning("research_context not in scope, using job metadata",
-                                             job_id=job_id)
-                    pass
-                except Exception as e:
-                    structured_logger.warning("Error accessing research_context, using job metadata",
+                # CRITICAL: Ensure references section exists - add from research_context if missing
+                if '## References' not in content['description']:
+                    # References are missing - add them from research_context
+                    structured_logger.warning("LLM did not include References section, adding from research context",
                                              job_id=job_id,
-                                             error=str(e))
-                    pass
+                                             topic=request.topic)
+                
+                    # Build references from research_context (available from research phase)
+                    references_text = "\n\n## References\n\n"
+                    references_added = False
                 
-                # Fallback: get from job metadata if research_context wasn't accessible
-                if not references_added:
+                    # Try to use research_context directly (it should be in scope)
                     try:
-                        job_doc = db.collection('podcast_jobs').document(job_id).get()
-                        if job_doc.exists:
-                            job_data = job_doc.to_dict()
-                            # Try real_citations first
-                            real_citations = job_data.get('real_citations', [])
-                            if real_citations:
-                                for citation in real_citations[:5]:
+                        # research_context is defined in the outer scope above
+                        if research_context:
+                            # Use real_citations first (already formatted)
+                            if research_context.real_citations:
+                                for citation in research_context.real_citations[:5]:
                                     references_text += f"- {citation}\n"
                                 references_added = True
-                            else:
-                                # Fall back to research_sources_summary
-                                research_summary = job_data.get('research_sources_summary', [])
-                                if research_summary:
-                                    for source_info in research_summary[:5]:
-                                        references_text += format_research_source_line(source_info) + "\n"
-                                    references_added = True
+                            elif research_context.research_sources:
+                                # Build from research_sources
+                                for source in research_context.research_sources[:5]:
+                                    references_text += format_research_source_line(source) + "\n"
+                                references_added = True
+                    except NameError:
+                        # research_context not in scope, use fallback
+                        structured_logger.warning("research_context not in scope, using job metadata",
+                                                 job_id=job_id)
+                        pass
                     except Exception as e:
-                        structured_logger.error("Could not retrieve research sources from job metadata",
-                                               job_id=job_id,
-                                               error=str(e))
+                        structured_logger.warning("Error accessing research_context, using job metadata",
+                                                 job_id=job_id,
+                                                 error=str(e))
+                        pass
                 
-                # Last resort: add warning message
-                if not references_added:
-                    structured_logger.error("CRITICAL: Could not add references - no research data available",
-                                           job_id=job_id)
-                    references_text += "Research references from the sources used for this episode.\n"
+                    # Fallback: get from job metadata if research_context wasn't accessible
+                    if not references_added:
+                        try:
+                            job_doc = db.collection('podcast_jobs').document(job_id).get()
+                            if job_doc.exists:
+                                job_data = job_doc.to_dict()
+                                # Try real_citations first
+                                real_citations = job_data.get('real_citations', [])
+                                if real_citations:
+                                    for citation in real_citations[:5]:
+                                        references_text += f"- {citation}\n"
+                                    references_added = True
+                                else:
+                                    # Fall back to research_sources_summary
+                                    research_summary = job_data.get('research_sources_summary', [])
+                                    if research_summary:
+                                        for source_info in research_summary[:5]:
+                                            references_text += format_research_source_line(source_info) + "\n"
+                                        references_added = True
+                        except Exception as e:
+                            structured_logger.error("Could not retrieve research sources from job metadata",
+                                                   job_id=job_id,
+                                                   error=str(e))
                 
-                # Insert references before hashtags if they exist, otherwise at the end
-                if '## Hashtags' in content['description']:
-                    desc_parts = content['description'].split('## Hashtags')
-                    content['description'] = desc_parts[0].rstrip() + references_text.rstrip() + '\n\n## Hashtags' + ('## Hashtags'.join(desc_parts[1:]) if len(desc_parts) > 1 else '')
-                else:
-                    content['description'] = content['description'].rstrip() + references_text.rstrip()
-            
-            # Validate academic references in description if they exist
-            if '## References' in content['description']:
-                # Extract references section
-                desc_parts = content['description'].split('## References')
-                if len(desc_parts) > 1:
-                    ref_section = desc_parts[1].split('##')[0]  # Get content until next section
-                    validated_refs = validate_academic_references(ref_section)
-                    content['description'] = desc_parts[0] + '## References\n' + validated_refs + '\n' + '##'.join(desc_parts[1].split('##')[1:])
-            
-            # Clean placeholder text and limit description length
-            content['description'] = clean_placeholder_text_from_description(content['description'])
-            content['description'] = limit_description_length(content['description'], 4000)
-            content['description'] = sanitize_reference_placeholders(
-                content['description'], known_year=request.paper_year
-            )
-            content['script'] = rewrite_index_venues(
-                content.get('script') or "", request.paper_journal
-            )
-            content['description'] = rewrite_index_venues(
-                content['description'], request.paper_journal
-            )
-            if request.paper_title:
-                content['description'] = ensure_source_paper_reference(
-                    content['description'],
-                    format_citation(_research_paper_from_request(request)),
+                    # Last resort: add warning message
+                    if not references_added:
+                        structured_logger.error("CRITICAL: Could not add references - no research data available",
+                                               job_id=job_id)
+                        references_text += "Research references from the sources used for this episode.\n"
+                
+                    # Insert references before hashtags if they exist, otherwise at the end
+                    if '## Hashtags' in content['description']:
+                        desc_parts = content['description'].split('## Hashtags')
+                        content['description'] = desc_parts[0].rstrip() + references_text.rstrip() + '\n\n## Hashtags' + ('## Hashtags'.join(desc_parts[1:]) if len(desc_parts) > 1 else '')
+                    else:
+                        content['description'] = content['description'].rstrip() + references_text.rstrip()
+            
+                # Validate academic references in description if they exist
+                if '## References' in content['description']:
+                    # Extract references section
+                    desc_parts = content['description'].split('## References')
+                    if len(desc_parts) > 1:
+                        ref_section = desc_parts[1].split('##')[0]  # Get content until next section
+                        validated_refs = validate_academic_references(ref_section)
+                        content['description'] = desc_parts[0] + '## References\n' + validated_refs + '\n' + '##'.join(desc_parts[1].split('##')[1:])
+            
+                # Clean placeholder text and limit description length
+                content['description'] = clean_placeholder_text_from_description(content['description'])
+                content['description'] = limit_description_length(content['description'], 4000)
+                content['description'] = sanitize_reference_placeholders(
+                    content['description'], known_year=request.paper_year
+                )
+                content['script'] = rewrite_index_venues(
+                    content.get('script') or "", request.paper_journal
                 )
-            content['itunes_summary'] = extract_itunes_summary(content['description'])
-            
-            # Robust validation added here:
-            if (not content or 
-                not isinstance(content, dict) or
-                not all(k in content for k in ['title', 'script', 'description']) or
-                not content.get('title') or len(str(content.get('title', '')).strip()) < 5 or
-                not content.get('script') or len(str(content.get('script', '')).strip()) < 50 or
-                not content.get('description') or len(str(content.get('description', '')).strip()) < 20):
+                content['description'] = rewrite_index_venues(
+                    content['description'], request.paper_journal
+                )
+                if request.paper_title:
+                    content['description'] = ensure_source_paper_reference(
+                        content['description'],
+                        format_citation(_research_paper_from_request(request)),
+                    )
+                content['itunes_summary'] = extract_itunes_summary(content['description'])
+            
+                # Robust validation added here:
+                if (not content or 
+                    not isinstance(content, dict) or
+                    not all(k in content for k in ['title', 'script', 'description']) or
+                    not content.get('title') or len(str(content.get('title', '')).strip()) < 5 or
+                    not content.get('script') or len(str(content.get('script', '')).strip()) < 50 or
+                    not content.get('description') or len(str(content.get('description', '')).strip()) < 20):
                 
-                error_detail = f"Invalid content received: {str(content)[:200]}..."
-                raise ValueError(f"Content generation returned empty, incomplete, or placeholder data. Details: {error_detail}")
-            
-            # Validate script length matches duration requirement (with auto-extension)
-            script = content.get('script', '')
-            is_valid, error_msg, final_script = validate_script_length(script, request.duration, auto_extend=True)
-            if not is_valid:
-                word_count = len(script.split())
-                structured_logger.error("Script length validation failed",
-                                       job_id=job_id,
-                                       duration=request.duration,
-                                       script_word_count=word_count,
-                                       error=error_msg)
-                raise ValueError(f"Script does not meet duration requirement. {error_msg}")
-            
-            # Update content with potentially extended script
-            if final_script != script:
-                word_count_before = len(script.split())
-                word_count_after = len(final_script.split())
-                structured_logger.info("Script automatically extended to meet minimum length",
-                                      job_id=job_id,
-                                      words_before=word_count_before,
-                                      words_after=word_count_after,
-                                      words_added=word_count_after - word_count_before)
-                content['script'] = final_script
-            
-            structured_logger.info("Content validation passed",
-                                  job_id=job_id,
-                                  script_word_count=len(content['script'].split()),
-                                  duration=request.duration)
-            # --- End of Robust Content Validation ---       
-            # Determine canonical filename based on topic category, format type, and next available episode number
-            canonical_filename = await self.determine_canonical_filename(request.topic, content["title"], request.category, request.format_type)
-            
-            # Generate multi-voice audio with ElevenLabs and bumpers
-            audio_start_time = time.time()
-            audio_memory_before = psutil.virtual_memory().percent
-            structured_logger.info("Starting multi-voice ElevenLabs audio generation",
-                                  job_id=job_id,
-                                  memory_before_percent=round(audio_memory_before, 1),
-                                  script_length=len(content['script']),
-                                  canonical_filename=canonical_filename,
-                                  host_voice_id=request.host_voice_id or "XrExE9yKIg1WjnnlVkGX (Matilda - default)",
-                                  expert_voice_id=request.expert_voice_id or "pNInz6obpgDQGcFmaJgB (Adam - default)")
-            
-            audio_url = await self.elevenlabs_voice_service.generate_multi_voice_audio_with_bumpers(
-                content["script"], 
-                job_id, 
-                canonical_filename,
-                intro_path="bumpers/copernicus-intro.mp3",
-                outro_path="bumpers/copernicus-outro.mp3",
-                host_voice_id=request.host_voice_id,
-                expert_voice_id=request.expert_voice_id
-            )
+                    error_detail = f"Invalid content received: {str(content)[:200]}..."
+                    raise ValueError(f"Content generation returned empty, incomplete, or placeholder data. Details: {error_detail}")
+            
+                # Validate script length matches duration requirement (with auto-extension)
+                script = content.get('script', '')
+                is_valid, error_msg, final_script = validate_script_length(script, request.duration, auto_extend=True)
+                if not is_valid:
+                    word_count = len(script.split())
+                    structured_logger.error("Script length validation failed",
+                                           job_id=job_id,
+                                           duration=request.duration,
+                                           script_word_count=word_count,
+                                           error=error_msg)
+                    raise ValueError(f"Script does not meet duration requirement. {error_msg}")
+            
+                # Update content with potentially extended script
+                if final_script != script:
+                    word_count_before = len(script.split())
+                    word_count_after = len(final_script.split())
+                    structured_logger.info("Script automatically extended to meet minimum length",
+                                          job_id=job_id,
+                                          words_before=word_count_before,
+                                          words_after=word_count_after,
+                                          words_added=word_count_after - word_count_before)
+                    content['script'] = final_script
             
-            audio_generation_time = time.time() - audio_start_time
-            audio_memory_after = psutil.virtual_memory().percent
-            structured_logger.info("Audio generation completed",
-                                  job_id=job_id,
-                                  generation_time_seconds=round(audio_generation_time, 2),
-                                  memory_after_percent=round(audio_memory_after, 1),
-                                  memory_delta=round(audio_memory_after - audio_memory_before, 1),
-                                  audio_url=audio_url)
-            
-            # Force garbage collection after audio generation
-            gc.collect()
-            gc_memory_after = psutil.virtual_memory().percent
-            structured_logger.debug("Garbage collection completed",
-                                   job_id=job_id,
-                                   memory_after_gc_percent=round(gc_memory_after, 1))
+                structured_logger.info("Content validation passed",
+                                      job_id=job_id,
+                                      script_word_count=len(content['script'].split()),
+                                      duration=request.duration)
+                # --- End of Robust Content Validation ---       
+                checkpoints.save("content", content)
             
             # ═════════════════════════════════════════════════════════════════
-            # 🎬 PHASE 4: OPTIONAL VIDEO GENERATION (Future Enhancement)
+            # 🎧 PHASE 4: AUDIO AND ASSETS (overlapping stages)
             # ═════════════════════════════════════════════════════════════════
-            # VIDEO EXTENSION POINT: Future video generation can be inserted here
+            # Audio synthesis, the transcript/description uploads, the thumbnail
+            # and the episode images only need the validated script and title, so
+            # they run concurrently once the canonical filename is allocated.
+            
+            async def canonical_filename_stage(results):
+                # Canonical filename based on topic category, format type, and next available episode number
+                return await checkpoints.run("canonical_filename", lambda: self.determine_canonical_filename(request.topic, content["title"], request.category, request.format_type))
+            
+            async def audio_stage(results):
+                canonical_filename = results["canonical_filename"]
+                if checkpoints.has("audio_url"):
+                    audio_url = checkpoints.get("audio_url")
+                    structured_logger.info("Reusing checkpointed episode audio",
+                                          job_id=job_id,
+                                          audio_url=audio_url)
+                    return audio_url
+                
+                # Generate multi-voice audio with ElevenLabs and bumpers
+                audio_start_time = time.time()
+                audio_memory_before = psutil.virtual_memory().percent
+                structured_logger.info("Starting multi-voice ElevenLabs audio generation",
+                                      job_id=job_id,
+                                      memory_before_percent=round(audio_memory_before, 1),
+                                      script_length=len(content['script']),
+                                      canonical_filename=canonical_filename,
+                                      host_voice_id=request.host_voice_id or "XrExE9yKIg1WjnnlVkGX (Matilda - default)",
+                                      expert_voice_id=request.expert_voice_id or "pNInz6obpgDQGcFmaJgB (Adam - default)")
+                
+                audio_url = await self.elevenlabs_voice_service.generate_multi_voice_audio_with_bumpers(
+                    content["script"], 
+                    job_id, 
+                    canonical_filename,
+                    intro_path="bumpers/copernicus-intro.mp3",
+                    outro_path="bumpers/copernicus-outro.mp3",
+                    host_voice_id=request.host_voice_id,
+                    expert_voice_id=request.expert_voice_id
+                )
+                
+                audio_generation_time = time.time() - audio_start_time
+                audio_memory_after = psutil.virtual_memory().percent
+                structured_logger.info("Audio generation completed",
+                                      job_id=job_id,
+                                      generation_time_seconds=round(audio_generation_time, 2),
+                                      memory_after_percent=round(audio_memory_after, 1),
+                                      memory_delta=round(audio_memory_after - audio_memory_before, 1),
+                                      audio_url=audio_url)
+                
+                # Force garbage collection after audio generation
+                gc.collect()
+                gc_memory_after = psutil.virtual_memory().percent
+                structured_logger.debug("Garbage collection completed",
+                                       job_id=job_id,
+                                       memory_after_gc_percent=round(gc_memory_after, 1))
+                checkpoints.save("audio_url", audio_url)
+                return audio_url
+            
+            # VIDEO EXTENSION POINT: Future video generation can be added as a stage
+            # depending on "audio" (and "episode_images" for stills)
             # if request.format_type == "video" or request.include_video:
             #     video_url = await video_service.generate_video_podcast(
             #         audio_url=audio_url,
@@ -2571,84 +2640,96 @@ Technical Quality: Ultra-high resolution. No text, words, or labels. Pure visual
             #         subtitles=...  # Subtitle tracks
             #     )
             
-            # Generate and upload transcript to GCS
-            transcript_start_time = time.time()
-            transcript_memory_before = psutil.virtual_memory().percent
-            structured_logger.info("Generating and uploading transcript",
-                                  job_id=job_id,
-                                  memory_before_percent=round(transcript_memory_before, 1))
-            transcript_url = await self.generate_and_upload_transcript(content["script"], canonical_filename)
-            transcript_time = time.time() - transcript_start_time
-            structured_logger.info("Transcript completed",
-                                  job_id=job_id,
-                                  transcript_time_seconds=round(transcript_time, 2),
-                                  transcript_url=transcript_url)
-            
-            # Upload description to GCS
-            description_start_time = time.time()
-            description_memory_before = psutil.virtual_memory().percent
-            structured_logger.info("Uploading episode description to GCS",
-                                  job_id=job_id,
-                                  memory_before_percent=round(description_memory_before, 1))
-            description_url = await self.upload_description_to_gcs(
-                content["description"], 
-                canonical_filename,
-                title=content.get("title", ""),
-                topic=request.topic,
-                job_id=job_id
-            )
-            description_time = time.time() - description_start_time
-            structured_logger.info("Description completed",
-                                  job_id=job_id,
-                                  description_time_seconds=round(description_time, 2),
-                                  description_url=description_url)
-            
-            # Generate and upload thumbnail
-            thumbnail_start_time = time.time()
-            thumbnail_memory_before = psutil.virtual_memory().percent
-            structured_logger.info("Generating AI thumbnail",
-                                  job_id=job_id,
-                                  memory_before_percent=round(thumbnail_memory_before, 1))
-            
-            async with with_step("thumbnail_generation", job_id):
-                thumbnail_url = await self.generate_and_upload_thumbnail(
-                    content["title"], 
-                    request.topic, 
-                    canonical_filename
-                )
-            
-            thumbnail_time = time.time() - thumbnail_start_time
-            structured_logger.info("Thumbnail completed",
-                                  job_id=job_id,
-                                  thumbnail_time_seconds=round(thumbnail_time, 2),
-                                  thumbnail_url=thumbnail_url)
+            async def transcript_stage(results):
+                # Generate and upload transcript to GCS
+                structured_logger.info("Generating and uploading transcript", job_id=job_id)
+                transcript_url = await checkpoints.run("transcript_url", lambda: self.generate_and_upload_transcript(content["script"], results["canonical_filename"]))
+                structured_logger.info("Transcript completed",
+                                      job_id=job_id,
+                                      transcript_url=transcript_url)
+                return transcript_url
+            
+            async def description_stage(results):
+                # Upload description to GCS
+                structured_logger.info("Uploading episode description to GCS", job_id=job_id)
+                description_url = await checkpoints.run("description_url", lambda: self.upload_description_to_gcs(
+                    content["description"], 
+                    results["canonical_filename"],
+                    title=content.get("title", ""),
+                    topic=request.topic,
+                    job_id=job_id
+                ))
+                structured_logger.info("Description completed",
+                                      job_id=job_id,
+                                      description_url=description_url)
+                return description_url
+            
+            async def thumbnail_stage(results):
+                # Generate and upload thumbnail
+                structured_logger.info("Generating AI thumbnail", job_id=job_id)
+                async with with_step("thumbnail_generation", job_id):
+                    thumbnail_url = await checkpoints.run("thumbnail_url", lambda: self.generate_and_upload_thumbnail(
+                        content["title"], 
+                        request.topic, 
+                        results["canonical_filename"]
+                    ))
+                structured_logger.info("Thumbnail completed",
+                                      job_id=job_id,
+                                      thumbnail_url=thumbnail_url)
+                return thumbnail_url
             
-            # Generate episode images (1-2 still images for display during audio playback)
-            episode_images = []
+            async def episode_images_stage(results):
+                # Generate episode images (1-2 still images for display during audio playback)
+                if checkpoints.has("episode_images"):
+                    return checkpoints.get("episode_images")
+                try:
+                    structured_logger.info("Generating episode images", job_id=job_id)
+                    episode_images = await self.generate_episode_images(
+                        content["title"],
+                        request.topic,
+                        results["canonical_filename"],
+                        description=content.get("description", ""),
+                        num_images=2  # Generate 2 images by default
+                    )
+                    structured_logger.info("Episode images completed",
+                                         job_id=job_id,
+                                         images_generated=len(episode_images))
+                except Exception as e:
+                    structured_logger.warning("Failed to generate episode images, continuing without them",
+                                           job_id=job_id,
+                                           error=str(e))
+                    return []
+                if episode_images:
+                    checkpoints.save("episode_images", episode_images)
+                return episode_images
+            
+            stages = PhaseExecutor(job_id)
+            stages.add("canonical_filename", canonical_filename_stage)
+            stages.add("audio", audio_stage, depends_on=["canonical_filename"])
+            stages.add("transcript", transcript_stage, depends_on=["canonical_filename"])
+            stages.add("description", description_stage, depends_on=["canonical_filename"])
+            # Artwork is best-effort: its failure must never cancel audio synthesis
+            stages.add("thumbnail", thumbnail_stage, depends_on=["canonical_filename"], optional=True)
+            stages.add("episode_images", episode_images_stage, depends_on=["canonical_filename"], optional=True)
             try:
-                images_start_time = time.time()
-                structured_logger.info("Generating episode images",
-                                     job_id=job_id,
-                                     memory_before_percent=round(psutil.virtual_memory().percent, 1))
-                
-                episode_images = await self.generate_episode_images(
-                    content["title"],
-                    request.topic,
-                    canonical_filename,
-                    description=content.get("description", ""),
-                    num_images=2  # Generate 2 images by default
-                )
-                
-                images_time = time.time() - images_start_time
-                structured_logger.info("Episode images completed",
-                                     job_id=job_id,
-                                     images_time_seconds=round(images_time, 2),
-                                     images_generated=len(episode_images))
-            except Exception as e:
-                structured_logger.warning("Failed to generate episode images, continuing without them",
-                                       job_id=job_id,
-                                       error=str(e))
-                episode_images = []
+                stage_results = await stages.run()
+            finally:
+                try:
+                    job_ref.update({'stage_timings': stages.summary(), 'updated_at': datetime.utcnow().isoformat()})
+                except Exception as e:
+                    structured_logger.warning("Could not record stage timings", job_id=job_id, error=str(e))
+            
+            canonical_filename = stage_results["canonical_filename"]
+            audio_url = stage_results["audio"]
+            transcript_url = stage_results["transcript"]
+            description_url = stage_results["description"]
+            thumbnail_url = stage_results["thumbnail"] or await self.generate_fallback_thumbnail(
+                canonical_filename, request.topic)
+            episode_images = stage_results["episode_images"] or []
+            structured_logger.info("Audio and asset stages completed",
+                                  job_id=job_id,
+                                  wall_seconds=stages.wall_seconds,
+                                  serial_seconds=stages.summary()["serial_seconds"])
             
             # Extract keywords from content for search/discovery
             keywords_indexed = []
@@ -2741,72 +2822,78 @@ Technical Quality: Ultra-high resolution. No text, words, or labels. Pure visual
             # Admin can still unpromote/remove if needed (moderation after the fact).
             # - podcast_jobs: Complete generation history (all podcasts ever created)
             # - episodes: Public catalog (auto-promoted, can be unpromoted if needed)
-            try:
-                # Carry the embedding already computed onto update_data forward into
-                # the episode doc -- it would otherwise land only on podcast_jobs.
-                # Empty dict if missing or wrong-dimension; never blocks promote.
-                from utils.auto_embedding import extract_valid_embedding_fields
-                episode_embedding_fields = extract_valid_embedding_fields(update_data)
-
-                episode_service.upsert_episode_document(
-                    job_id,
-                    subscriber_id,
-                    request_snapshot,
-                    {
-                        **content,
-                        "audio_url": audio_url,
-                        "thumbnail_url": thumbnail_url,
-                        "episode_images": episode_images,  # Array of 1-2 image URLs
-                        "transcript_url": transcript_url,
-                        "description_url": description_url,
-                        "duration": request.duration,
-                        "canonical_filename": canonical_filename,
-                        "generated_at": generated_timestamp,
-                        **episode_embedding_fields,
-                    },
-                    metadata_extended,
-                    engagement_metrics,
-                    submitted_to_rss=False,  # Not in RSS by default - user can add to RSS themselves
-                )
+            if not checkpoints.has("catalog"):
+                try:
+                    # Carry the embedding already computed onto update_data forward into
+                    # the episode doc -- it would otherwise land only on podcast_jobs.
+                    # Empty dict if missing or wrong-dimension; never blocks promote.
+                    from utils.auto_embedding import extract_valid_embedding_fields
+                    episode_embedding_fields = extract_valid_embedding_fields(update_data)
+
+                    with profile_phase("catalog"):
+                        episode_service.upsert_episode_document(
+                            job_id,
+                            subscriber_id,
+                            request_snapshot,
+                            {
+                                **content,
+                                "audio_url": audio_url,
+                                "thumbnail_url": thumbnail_url,
+                                "episode_images": episode_images,  # Array of 1-2 image URLs
+                                "transcript_url": transcript_url,
+                                "description_url": description_url,
+                                "duration": request.duration,
+                                "canonical_filename": canonical_filename,
+                                "generated_at": generated_timestamp,
+                                **episode_embedding_fields,
+                            },
+                            metadata_extended,
+                            engagement_metrics,
+                            submitted_to_rss=False,  # Not in RSS by default - user can add to RSS themselves
+                        )
                 
-                # Mark as promoted in podcast_jobs
-                db.collection('podcast_jobs').document(job_id).update({
-                    'promoted_to_episodes': True,
-                    'promoted_at': generated_timestamp,
-                    'auto_promoted': True
-                })
+                    # Mark as promoted in podcast_jobs
+                    db.collection('podcast_jobs').document(job_id).update({
+                        'promoted_to_episodes': True,
+                        'promoted_at': generated_timestamp,
+                        'auto_promoted': True
+                    })
                 
-                structured_logger.info("Podcast auto-promoted to episodes collection",
-                                      job_id=job_id,
-                                      message="ready for RSS")
-            except Exception as catalog_error:
-                structured_logger.warning("Failed to auto-promote episode",
-                                         job_id=job_id,
-                                         error=str(catalog_error))
-                # Continue anyway - podcast is still in podcast_jobs
+                    structured_logger.info("Podcast auto-promoted to episodes collection",
+                                          job_id=job_id,
+                                          message="ready for RSS")
+                    checkpoints.save("catalog", True)
+                except Exception as catalog_error:
+                    structured_logger.warning("Failed to auto-promote episode",
+                                             job_id=job_id,
+                                             error=str(catalog_error))
+                    # Continue anyway - podcast is still in podcast_jobs
             
             # Send email notification
-            email_start_time = time.time()
-            email_memory_before = psutil.virtual_memory().percent
-            structured_logger.info("Sending completion email notification",
-                                  job_id=job_id,
-                                  recipient_email=subscriber_email,
-                                  memory_before_percent=round(email_memory_before, 1))
-            
-            await self.email_service.send_podcast_completion_email(
-                recipient_email=subscriber_email,
-                job_id=job_id,
-                podcast_title=content.get('title', 'Untitled Podcast'),
-                topic=request.topic,
-                audio_url=audio_url,
-                duration=request.duration,
-                canonical_filename=canonical_filename
-            )
+            if not checkpoints.has("notified"):
+                email_start_time = time.time()
+                email_memory_before = psutil.virtual_memory().percent
+                structured_logger.info("Sending completion email notification",
+                                      job_id=job_id,
+                                      recipient_email=subscriber_email,
+                                      memory_before_percent=round(email_memory_before, 1))
+            
+                async with profile_phase("notification"):
+                    await self.email_service.send_podcast_completion_email(
+                        recipient_email=subscriber_email,
+                        job_id=job_id,
+                        podcast_title=content.get('title', 'Untitled Podcast'),
+                        topic=request.topic,
+                        audio_url=audio_url,
+                        duration=request.duration,
+                        canonical_filename=canonical_filename
+                    )
             
-            email_time = time.time() - email_start_time
-            structured_logger.info("Email notification sent",
-                                  job_id=job_id,
-                                  email_time_seconds=round(email_time, 2))
+                email_time = time.time() - email_start_time
+                structured_logger.info("Email notification sent",
+                                      job_id=job_id,
+                                      email_time_seconds=round(email_time, 2))
+                checkpoints.save("notified", True)
             
             # Final pipeline summary
             total_time = time.time() - start_time
@@ -2846,6 +2933,9 @@ Technical Quality: Ultra-high resolution. No text, words, or labels. Pure visual
                 structured_logger.error("Failed to send failure email notification",
                                        job_id=job_id,
                                        email_error=str(email_error))
+        finally:
+            profile.deactivate(profile_token)
+            save_job_profile(db, profile, job_ref)
 
 
 # Create singleton instance
@@ -0,0 +1,122 @@
+"""
+Podcast Job Checkpoints
+
+run_podcast_generation_job persists the output of each completed phase under
+the job, one document per phase in `podcast_jobs/{job_id}/checkpoints`:
+
+    research            serialized PodcastResearchContext
+    content             validated title/script/description/... dict
+    canonical_filename  allocated episode filename (re-allocating would skip a number)
+    audio_url           final episode audio in GCS
+    transcript_url, description_url, thumbnail_url, episode_images
+    catalog             episode promoted to the public catalog
+    notified            completion email sent
+
+A retry (the job queue reclaiming a lapsed lease, or POST /retry-podcast)
+loads them and starts at the first phase without a checkpoint, so paid LLM
+and TTS calls are not repeated. Within the audio phase, segments already
+synthesized are served by the content-addressed TTS segment cache.
+
+Copyright (c) 2025 Gary Welz / CopernicusAI
+Licensed under MIT License
+"""
+
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from utils.logging import structured_logger
+
+CHECKPOINTS_SUBCOLLECTION = "checkpoints"
+
+# Pipeline order, used to report where a resumed job starts
+CHECKPOINT_PHASES = (
+    "research",
+    "content",
+    "canonical_filename",
+    "audio_url",
+    "transcript_url",
+    "description_url",
+    "thumbnail_url",
+    "episode_images",
+    "catalog",
+    "notified",
+)
+
+
+def research_context_to_dict(context: Any) -> Dict[str, Any]:
+    return asdict(context)
+
+
+def research_context_from_dict(data: Dict[str, Any]) -> Any:
+    from enhanced_research_service import PaperAnalysis
+    from podcast_research_integrator import PodcastResearchContext
+    from research_pipeline import ResearchSource
+
+    return PodcastResearchContext(**{
+        **data,
+        "research_sources": [ResearchSource(**s) for s in data.get("research_sources") or []],
+        "paper_analyses": [PaperAnalysis(**a) for a in data.get("paper_analyses") or []],
+    })
+
+
+class PodcastJobCheckpoints:
+    """Phase outputs of one podcast job, loaded once and written through."""
+
+    def __init__(self, job_ref: Any):
+        self.job_id = job_ref.id
+        self._collection = job_ref.collection(CHECKPOINTS_SUBCOLLECTION)
+        self._values: Dict[str, Any] = {}
+        try:
+            for doc in self._collection.stream():
+                self._values[doc.id] = (doc.to_dict() or {}).get("value")
+        except Exception as e:
+            structured_logger.warning("Could not load job checkpoints, starting from scratch",
+                                      job_id=self.job_id,
+                                      error=str(e))
+
+    def completed(self) -> List[str]:
+        return [phase for phase in CHECKPOINT_PHASES if phase in self._values]
+
+    def resume_phase(self) -> Optional[str]:
+        """First phase without a checkpoint (None when every phase is done)."""
+        return next((phase for phase in CHECKPOINT_PHASES if phase not in self._values), None)
+
+    def has(self, phase: str) -> bool:
+        return phase in self._values
+
+    def get(self, phase: str, default: Any = None) -> Any:
+        return self._values.get(phase, default)
+
+    def save(self, phase: str, value: Any) -> None:
+        """Record a phase's output; a failed write only costs redoing the phase on retry."""
+        self._values[phase] = value
+        try:
+            self._collection.document(phase).set({
+                "value": value,
+                "saved_at": datetime.utcnow().isoformat(),
+            })
+        except Exception as e:
+            structured_logger.warning("Could not save job checkpoint",
+                                      job_id=self.job_id,
+                                      phase=phase,
+                                      error=str(e))
+
+    async def run(self, phase: str, produce: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Checkpointed value of `phase`, producing and saving it if missing.
+
+        An empty result (uploads return None when they fail) is returned but not
+        saved, so a retry runs the phase again.
+        """
+        if phase in self._values:
+            structured_logger.info("Reusing checkpointed phase", job_id=self.job_id, phase=phase)
+            return self._values[phase]
+        value = await produce()
+        if not value:
+            structured_logger.warning("Phase produced no result, not checkpointing it",
+                                      job_id=self.job_id,
+                                      phase=phase)
+            return value
+        self.save(phase, value)
+        return value
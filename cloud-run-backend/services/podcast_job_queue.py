@@ -0,0 +1,607 @@
+"""
+Podcast Job Queue
+
+The generation endpoints used to run the whole 5-15 minute pipeline inside
+the HTTP request. They now enqueue the job and return its id; a pool of
+in-process workers claims queued jobs and runs them.
+
+A claim is a lease: the worker owns the job until `lease_expires_at` and
+extends it with a heartbeat while the pipeline runs. Heartbeats are sent from
+a thread, so blocking pipeline calls can't starve them, and a run that finds
+its lease taken over is cancelled instead of running alongside the new owner.
+A job whose lease lapses (the instance died or was scaled in mid-job) is
+claimed again by any worker, which is what the /debug/watchdog polling used to
+approximate. Each claim counts an attempt; after PODCAST_JOB_MAX_ATTEMPTS the
+job is marked failed.
+
+Backends (PODCAST_JOB_QUEUE_BACKEND):
+- "firestore" (default): queue fields live on the `podcast_jobs` documents
+  themselves (queue_state, queue_attempts, lease_owner, lease_expires_at,
+  enqueued_at); claims are Firestore transactions. Needs composite indexes on
+  (queue_state, enqueued_at) and (queue_state, lease_expires_at).
+- "sqlite": a local file (PODCAST_JOB_QUEUE_SQLITE_PATH) for development and
+  single-instance deployments. Job status is still reported on `podcast_jobs`.
+
+On Cloud Run the service needs CPU allocated outside requests
+(--no-cpu-throttling) for workers to make progress between requests.
+
+Copyright (c) 2025 Gary Welz / CopernicusAI
+Licensed under MIT License
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from utils.logging import structured_logger
+
+# Configuration
+PODCAST_JOB_QUEUE_BACKEND = os.getenv("PODCAST_JOB_QUEUE_BACKEND", "firestore").lower()
+PODCAST_JOB_QUEUE_SQLITE_PATH = os.getenv("PODCAST_JOB_QUEUE_SQLITE_PATH", "/tmp/podcast_job_queue.sqlite3")
+PODCAST_JOB_WORKERS = int(os.getenv("PODCAST_JOB_WORKERS", "2"))
+# Well above the longest blocking pipeline call; heartbeats come from a thread,
+# so the lease only lapses when the instance (or its heartbeat thread) is gone
+PODCAST_JOB_LEASE_SECONDS = float(os.getenv("PODCAST_JOB_LEASE_SECONDS", "600"))
+PODCAST_JOB_HEARTBEAT_SECONDS = float(os.getenv("PODCAST_JOB_HEARTBEAT_SECONDS", "30"))
+PODCAST_JOB_POLL_SECONDS = float(os.getenv("PODCAST_JOB_POLL_SECONDS", "5"))
+PODCAST_JOB_MAX_ATTEMPTS = int(os.getenv("PODCAST_JOB_MAX_ATTEMPTS", "3"))
+
+PODCAST_JOBS_COLLECTION = "podcast_jobs"
+
+# queue_state values
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+DEAD = "dead"
+
+_CLAIM_SCAN_LIMIT = 10
+
+
+class PodcastJobQueue(ABC):
+    """Durable queue of podcast jobs with leased claims."""
+
+    def __init__(self, max_attempts: int = PODCAST_JOB_MAX_ATTEMPTS):
+        self.max_attempts = max_attempts
+
+    @property
+    @abstractmethod
+    def backend(self) -> str:
+        """Name of the backend ('firestore', 'sqlite')."""
+        pass
+
+    @abstractmethod
+    def enqueue(self, job_id: str, job_data: Dict[str, Any]) -> None:
+        """Make a job (its podcast_jobs payload: request, subscriber_id, ...) claimable."""
+        pass
+
+    @abstractmethod
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        """Lease the oldest queued (or lease-expired) job to `worker_id`, or None."""
+        pass
+
+    @abstractmethod
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        """Extend the lease; False when `worker_id` no longer holds it."""
+        pass
+
+    @abstractmethod
+    def complete(self, job_id: str, worker_id: str) -> None:
+        """Release a finished job (whatever its pipeline status)."""
+        pass
+
+    @abstractmethod
+    def release(self, job_id: str, worker_id: str, error: str, retry: bool) -> None:
+        """Give a job back after an unexpected error: requeue it, or mark it failed."""
+        pass
+
+    @abstractmethod
+    def recover_expired(self) -> List[str]:
+        """Requeue (or fail, when out of attempts) jobs whose lease lapsed; returns their ids."""
+        pass
+
+    @abstractmethod
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per queue_state."""
+        pass
+
+    def _out_of_attempts(self, attempts: int) -> bool:
+        return attempts >= self.max_attempts
+
+
+class FirestorePodcastJobQueue(PodcastJobQueue):
+    """Queue state stored on the podcast_jobs documents."""
+
+    backend = "firestore"
+
+    def __init__(self, db: Any, max_attempts: int = PODCAST_JOB_MAX_ATTEMPTS):
+        super().__init__(max_attempts)
+        self.db = db
+        self.collection = db.collection(PODCAST_JOBS_COLLECTION)
+
+    def enqueue(self, job_id: str, job_data: Dict[str, Any]) -> None:
+        self.collection.document(job_id).set({
+            "queue_state": QUEUED,
+            "queue_attempts": 0,
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "enqueued_at": time.time(),
+        }, merge=True)
+
+    def _candidates(self, now: float) -> List[Any]:
+        from google.cloud.firestore_v1.base_query import FieldFilter
+
+        queued = (
+            self.collection.where(filter=FieldFilter("queue_state", "==", QUEUED))
+            .order_by("enqueued_at")
+            .limit(_CLAIM_SCAN_LIMIT)
+            .stream()
+        )
+        expired = (
+            self.collection.where(filter=FieldFilter("queue_state", "==", LEASED))
+            .where(filter=FieldFilter("lease_expires_at", "<", now))
+            .limit(_CLAIM_SCAN_LIMIT)
+            .stream()
+        )
+        return [snap.reference for snap in list(queued) + list(expired)]
+
+    def _transition(self, ref: Any, decide: Callable[[Dict[str, Any], float], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """Apply `decide(data, now) -> updates or None` to one document atomically."""
+        from google.cloud import firestore
+
+        @firestore.transactional
+        def run(transaction):
+            snap = ref.get(transaction=transaction)
+            if not snap.exists:
+                return None
+            data = snap.to_dict() or {}
+            updates = decide(data, time.time())
+            if updates:
+                transaction.update(ref, updates)
+                data.update(updates)
+                return data
+            return None
+
+        return run(self.db.transaction())
+
+    def _claim_updates(self, worker_id: str, lease_seconds: float):
+        def decide(data: Dict[str, Any], now: float) -> Optional[Dict[str, Any]]:
+            state = data.get("queue_state")
+            expired = state == LEASED and (data.get("lease_expires_at") or 0) < now
+            if state != QUEUED and not expired:
+                return None  # claimed by another worker since the query ran
+            attempts = int(data.get("queue_attempts") or 0)
+            if self._out_of_attempts(attempts):
+                return _dead_updates(f"Job lease lost {attempts} times - giving up")
+            return {
+                "queue_state": LEASED,
+                "queue_attempts": attempts + 1,
+                "lease_owner": worker_id,
+                "lease_expires_at": now + lease_seconds,
+                "updated_at": datetime.utcnow().isoformat(),
+            }
+        return decide
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        for ref in self._candidates(time.time()):
+            data = self._transition(ref, self._claim_updates(worker_id, lease_seconds))
+            if data and data.get("queue_state") == LEASED:
+                data.setdefault("job_id", ref.id)
+                return data
+        return None
+
+    def _owned(self, worker_id: str, updates: Dict[str, Any]):
+        def decide(data: Dict[str, Any], now: float) -> Optional[Dict[str, Any]]:
+            if data.get("queue_state") != LEASED or data.get("lease_owner") != worker_id:
+                return None
+            return updates
+        return decide
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        ref = self.collection.document(job_id)
+        return self._transition(ref, self._owned(worker_id, {"lease_expires_at": time.time() + lease_seconds})) is not None
+
+    def complete(self, job_id: str, worker_id: str) -> None:
+        ref = self.collection.document(job_id)
+        self._transition(ref, self._owned(worker_id, {"queue_state": DONE, "lease_owner": None, "lease_expires_at": None}))
+
+    def release(self, job_id: str, worker_id: str, error: str, retry: bool) -> None:
+        ref = self.collection.document(job_id)
+
+        def decide(data: Dict[str, Any], now: float) -> Optional[Dict[str, Any]]:
+            if data.get("lease_owner") != worker_id:
+                return None
+            if retry and not self._out_of_attempts(int(data.get("queue_attempts") or 0)):
+                return {"queue_state": QUEUED, "lease_owner": None, "lease_expires_at": None, "queue_last_error": error}
+            return _dead_updates(error)
+
+        self._transition(ref, decide)
+
+    def recover_expired(self) -> List[str]:
+        from google.cloud.firestore_v1.base_query import FieldFilter
+
+        recovered = []
+        now = time.time()
+        expired = (
+            self.collection.where(filter=FieldFilter("queue_state", "==", LEASED))
+            .where(filter=FieldFilter("lease_expires_at", "<", now))
+            .stream()
+        )
+        for snap in expired:
+            def decide(data: Dict[str, Any], now: float) -> Optional[Dict[str, Any]]:
+                if data.get("queue_state") != LEASED or (data.get("lease_expires_at") or 0) >= now:
+                    return None
+                if self._out_of_attempts(int(data.get("queue_attempts") or 0)):
+                    return _dead_updates("Job lease expired and attempts are exhausted")
+                return {"queue_state": QUEUED, "lease_owner": None, "lease_expires_at": None}
+            if self._transition(snap.reference, decide):
+                recovered.append(snap.id)
+        return recovered
+
+    def counts(self) -> Dict[str, int]:
+        from google.cloud.firestore_v1.base_query import FieldFilter
+
+        counts = {}
+        for state in (QUEUED, LEASED, DEAD):
+            query = self.collection.where(filter=FieldFilter("queue_state", "==", state))
+            counts[state] = int(query.count().get()[0][0].value)
+        return counts
+
+
+class SQLitePodcastJobQueue(PodcastJobQueue):
+    """Queue in a local SQLite file; claims are serialized by the database lock."""
+
+    backend = "sqlite"
+
+    def __init__(self, path: str = PODCAST_JOB_QUEUE_SQLITE_PATH, max_attempts: int = PODCAST_JOB_MAX_ATTEMPTS):
+        super().__init__(max_attempts)
+        self.path = path
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS podcast_job_queue (
+                job_id TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                queue_state TEXT NOT NULL,
+                queue_attempts INTEGER NOT NULL DEFAULT 0,
+                lease_owner TEXT,
+                lease_expires_at REAL,
+                enqueued_at REAL NOT NULL,
+                last_error TEXT
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS podcast_job_queue_claim ON podcast_job_queue (queue_state, enqueued_at)"
+        )
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def enqueue(self, job_id: str, job_data: Dict[str, Any]) -> None:
+        self._execute(
+            "INSERT OR REPLACE INTO podcast_job_queue (job_id, payload, queue_state, queue_attempts, enqueued_at) "
+            "VALUES (?, ?, ?, 0, ?)",
+            (job_id, json.dumps({**job_data, "job_id": job_id}, default=str), QUEUED, time.time()),
+        )
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            now = time.time()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT job_id, payload, queue_attempts FROM podcast_job_queue "
+                    "WHERE queue_state = ? OR (queue_state = ? AND lease_expires_at < ?) "
+                    "ORDER BY enqueued_at LIMIT ?",
+                    (QUEUED, LEASED, now, _CLAIM_SCAN_LIMIT),
+                ).fetchall()
+                claimed = None
+                dead = []
+                for job_id, payload, attempts in rows:
+                    if self._out_of_attempts(attempts):
+                        self._conn.execute(
+                            "UPDATE podcast_job_queue SET queue_state = ?, lease_owner = NULL, last_error = ? WHERE job_id = ?",
+                            (DEAD, f"Job lease lost {attempts} times - giving up", job_id),
+                        )
+                        dead.append(job_id)
+                        continue
+                    self._conn.execute(
+                        "UPDATE podcast_job_queue SET queue_state = ?, queue_attempts = ?, lease_owner = ?, "
+                        "lease_expires_at = ? WHERE job_id = ?",
+                        (LEASED, attempts + 1, worker_id, now + lease_seconds, job_id),
+                    )
+                    claimed = {**json.loads(payload), "queue_attempts": attempts + 1, "lease_owner": worker_id}
+                    break
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        for job_id in dead:
+            _mark_job_failed(job_id, "Job lease lost too many times - giving up")
+        return claimed
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        cursor = self._execute(
+            "UPDATE podcast_job_queue SET lease_expires_at = ? WHERE job_id = ? AND queue_state = ? AND lease_owner = ?",
+            (time.time() + lease_seconds, job_id, LEASED, worker_id),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str) -> None:
+        self._execute(
+            "UPDATE podcast_job_queue SET queue_state = ?, lease_owner = NULL, lease_expires_at = NULL "
+            "WHERE job_id = ? AND lease_owner = ?",
+            (DONE, job_id, worker_id),
+        )
+
+    def release(self, job_id: str, worker_id: str, error: str, retry: bool) -> None:
+        row = self._execute(
+            "SELECT queue_attempts FROM podcast_job_queue WHERE job_id = ? AND lease_owner = ?", (job_id, worker_id)
+        ).fetchone()
+        if row is None:
+            return
+        state = QUEUED if retry and not self._out_of_attempts(row[0]) else DEAD
+        self._execute(
+            "UPDATE podcast_job_queue SET queue_state = ?, lease_owner = NULL, lease_expires_at = NULL, last_error = ? "
+            "WHERE job_id = ? AND lease_owner = ?",
+            (state, error, job_id, worker_id),
+        )
+        if state == DEAD:
+            _mark_job_failed(job_id, error)
+
+    def recover_expired(self) -> List[str]:
+        now = time.time()
+        rows = self._execute(
+            "SELECT job_id, queue_attempts FROM podcast_job_queue WHERE queue_state = ? AND lease_expires_at < ?",
+            (LEASED, now),
+        ).fetchall()
+        recovered = []
+        for job_id, attempts in rows:
+            state = DEAD if self._out_of_attempts(attempts) else QUEUED
+            cursor = self._execute(
+                "UPDATE podcast_job_queue SET queue_state = ?, lease_owner = NULL, lease_expires_at = NULL "
+                "WHERE job_id = ? AND queue_state = ? AND lease_expires_at < ?",
+                (state, job_id, LEASED, now),
+            )
+            if cursor.rowcount:
+                recovered.append(job_id)
+                if state == DEAD:
+                    _mark_job_failed(job_id, "Job lease expired and attempts are exhausted")
+        return recovered
+
+    def counts(self) -> Dict[str, int]:
+        rows = self._execute("SELECT queue_state, COUNT(*) FROM podcast_job_queue GROUP BY queue_state").fetchall()
+        counts = {QUEUED: 0, LEASED: 0, DEAD: 0}
+        counts.update({state: count for state, count in rows if state != DONE})
+        return counts
+
+
+def _dead_updates(error: str) -> Dict[str, Any]:
+    return {
+        "queue_state": DEAD,
+        "lease_owner": None,
+        "lease_expires_at": None,
+        "status": "failed",
+        "error": error,
+        "error_code": "JOB_QUEUE_GAVE_UP",
+        "updated_at": datetime.utcnow().isoformat(),
+    }
+
+
+def _mark_job_failed(job_id: str, error: str) -> None:
+    """Report a job the SQLite queue gave up on in podcast_jobs, where clients poll it."""
+    from config.database import db
+
+    if not db:
+        return
+    try:
+        updates = _dead_updates(error)
+        for key in ("queue_state", "lease_owner", "lease_expires_at"):
+            updates.pop(key)
+        db.collection(PODCAST_JOBS_COLLECTION).document(job_id).update(updates)
+    except Exception as e:
+        structured_logger.warning("Could not mark abandoned podcast job failed", job_id=job_id, error=str(e))
+
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class PodcastJobWorkerPool:
+    """
+    Workers that claim jobs from a PodcastJobQueue and run them with `handler`.
+
+    The handler receives the claimed job payload. Returning releases the job as
+    done (the pipeline records its own success or failure on podcast_jobs);
+    raising requeues it while attempts remain.
+    """
+
+    def __init__(
+        self,
+        queue: PodcastJobQueue,
+        handler: JobHandler,
+        concurrency: int = PODCAST_JOB_WORKERS,
+        lease_seconds: float = PODCAST_JOB_LEASE_SECONDS,
+        heartbeat_seconds: float = PODCAST_JOB_HEARTBEAT_SECONDS,
+        poll_seconds: float = PODCAST_JOB_POLL_SECONDS,
+    ):
+        self.queue = queue
+        self.handler = handler
+        self.concurrency = max(0, concurrency)
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.poll_seconds = poll_seconds
+        self.instance_id = f"{socket.gethostname()}-{uuid.uuid4().hex[:6]}"
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._active: Dict[str, str] = {}  # worker_id -> job_id
+        self._processed = 0
+        self._failed = 0
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(f"{self.instance_id}-w{n}"))
+            for n in range(self.concurrency)
+        ]
+        structured_logger.info("Podcast job workers started",
+                               backend=self.queue.backend,
+                               workers=self.concurrency,
+                               instance_id=self.instance_id)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Wake idle workers now instead of at their next poll (call after enqueue)."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _worker(self, worker_id: str) -> None:
+        while True:
+            try:
+                job = await asyncio.to_thread(self.queue.claim, worker_id, self.lease_seconds)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                structured_logger.warning("Podcast job claim failed", worker_id=worker_id, error=str(e))
+                job = None
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(worker_id, job)
+
+    def _heartbeat(self, job_id: str, worker_id: str, stopped: threading.Event, lease_lost: Callable[[], None]) -> None:
+        """
+        Extend the lease until `stopped` is set (runs in its own thread).
+
+        The pipeline still makes blocking calls on the event loop, so a
+        coroutine heartbeat could stall past the lease and let another
+        worker reclaim a job that is still running.
+        """
+        while not stopped.wait(self.heartbeat_seconds):
+            try:
+                held = self.queue.heartbeat(job_id, worker_id, self.lease_seconds)
+            except Exception as e:
+                structured_logger.warning("Podcast job heartbeat failed", job_id=job_id, error=str(e))
+                continue
+            if not held:
+                structured_logger.warning("Podcast job lease lost to another worker", job_id=job_id, worker_id=worker_id)
+                lease_lost()
+                return
+
+    async def _run(self, worker_id: str, job: Dict[str, Any]) -> None:
+        job_id = job["job_id"]
+        structured_logger.info("Podcast job claimed",
+                               job_id=job_id,
+                               worker_id=worker_id,
+                               attempt=job.get("queue_attempts"))
+        self._active[worker_id] = job_id
+        loop = asyncio.get_running_loop()
+        handler_task = asyncio.ensure_future(self.handler(job))
+        lost = threading.Event()
+
+        def lease_lost() -> None:
+            # Another worker owns the job now: stop this run rather than both running it
+            lost.set()
+            loop.call_soon_threadsafe(handler_task.cancel)
+
+        stopped = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat,
+            args=(job_id, worker_id, stopped, lease_lost),
+            name=f"podcast-job-heartbeat-{job_id}",
+            daemon=True,
+        )
+        heartbeat.start()
+        try:
+            await handler_task
+        except asyncio.CancelledError:
+            if not lost.is_set():
+                # Shutting down: leave the lease to expire so another instance resumes the job
+                raise
+            self._failed += 1
+            structured_logger.warning("Podcast job run abandoned after losing its lease",
+                                      job_id=job_id,
+                                      worker_id=worker_id)
+        except Exception as e:
+            self._failed += 1
+            structured_logger.error("Podcast job handler raised", job_id=job_id, error=str(e))
+            await asyncio.to_thread(self.queue.release, job_id, worker_id, str(e), True)
+        else:
+            self._processed += 1
+            await asyncio.to_thread(self.queue.complete, job_id, worker_id)
+        finally:
+            stopped.set()
+            self._active.pop(worker_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.queue.backend,
+            "instance_id": self.instance_id,
+            "workers": self.concurrency,
+            "running": len(self._tasks),
+            "active_jobs": sorted(self._active.values()),
+            "processed": self._processed,
+            "handler_errors": self._failed,
+        }
+
+
+_job_queue: Optional[PodcastJobQueue] = None
+_job_queue_lock = threading.Lock()
+_worker_pool: Optional[PodcastJobWorkerPool] = None
+
+
+def get_podcast_job_queue() -> Optional[PodcastJobQueue]:
+    """Process-wide job queue for the configured backend (None if Firestore is unavailable)."""
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                if PODCAST_JOB_QUEUE_BACKEND == "sqlite":
+                    _job_queue = SQLitePodcastJobQueue()
+                else:
+                    from config.database import db
+                    if db:
+                        _job_queue = FirestorePodcastJobQueue(db)
+    return _job_queue
+
+
+def start_podcast_job_workers(handler: JobHandler) -> Optional[PodcastJobWorkerPool]:
+    """Start this instance's worker pool (call from the app's startup)."""
+    global _worker_pool
+    queue = get_podcast_job_queue()
+    if queue is None or PODCAST_JOB_WORKERS <= 0:
+        structured_logger.warning("Podcast job workers not started",
+                                  backend=PODCAST_JOB_QUEUE_BACKEND,
+                                  workers=PODCAST_JOB_WORKERS)
+        return None
+    if _worker_pool is None:
+        _worker_pool = PodcastJobWorkerPool(queue, handler)
+        _worker_pool.start()
+    return _worker_pool
+
+
+def get_podcast_job_worker_pool() -> Optional[PodcastJobWorkerPool]:
+    return _worker_pool
@@ -0,0 +1,131 @@
+"""
+Podcast Phase Executor
+
+Runs the stages of a podcast job as a dependency graph: each stage starts as
+soon as every stage it depends on has finished, so independent work (audio
+synthesis, transcript/description uploads, thumbnail and episode images, which
+only need the script and title) overlaps instead of running back to back.
+
+Stage results are passed to dependents by name; each stage is a profiled
+phase (utils/profiling.py) and per-stage timings are kept for the job document:
+
+    {"audio": {"start_offset_seconds": 0.0, "duration_seconds": 212.4, "status": "completed"}, ...}
+
+The first required stage to raise cancels everything still running and its
+exception propagates to the caller. Stages added with `optional=True`
+(thumbnail, episode images) are best-effort: a failure is logged, recorded as
+"failed" and yields None, and never cancels the stages running beside it.
+
+Copyright (c) 2025 Gary Welz / CopernicusAI
+Licensed under MIT License
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Tuple
+
+from utils.logging import structured_logger
+from utils.profiling import profile_phase
+
+StageFn = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+class PhaseExecutor:
+    """A small DAG scheduler for the stages of one job."""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self._stages: Dict[str, Tuple[StageFn, Tuple[str, ...], bool]] = {}
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, Dict[str, Any]] = {}
+        self.wall_seconds = 0.0
+
+    def add(self, name: str, fn: StageFn, depends_on: Iterable[str] = (),
+            optional: bool = False) -> None:
+        """Register a stage; `fn` receives the results of finished stages by name.
+
+        An optional stage that raises yields None instead of failing the job.
+        """
+        if name in self._stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        self._stages[name] = (fn, tuple(depends_on), optional)
+
+    def _check_graph(self) -> None:
+        for name, (_, deps, _) in self._stages.items():
+            missing = [d for d in deps if d not in self._stages]
+            if missing:
+                raise ValueError(f"Stage {name} depends on unknown stages {missing}")
+        # Kahn's algorithm: every stage must be reachable without a cycle
+        remaining = {name: set(deps) for name, (_, deps, _) in self._stages.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Stage dependencies contain a cycle: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    async def _run_stage(self, name: str, started: float) -> Any:
+        fn, _, optional = self._stages[name]
+        stage_start = time.perf_counter()
+        self.timings[name] = {"start_offset_seconds": round(stage_start - started, 3), "status": "running"}
+        try:
+            async with profile_phase(name):
+                result = await fn(self.results)
+        except asyncio.CancelledError:
+            self.timings[name]["status"] = "cancelled"
+            raise
+        except Exception as e:
+            self.timings[name]["status"] = "failed"
+            if not optional:
+                raise
+            structured_logger.warning("Optional pipeline stage failed",
+                                      job_id=self.job_id,
+                                      stage=name,
+                                      error=str(e))
+            return None
+        finally:
+            self.timings[name]["duration_seconds"] = round(time.perf_counter() - stage_start, 3)
+        self.timings[name]["status"] = "completed"
+        structured_logger.info("Pipeline stage completed",
+                               job_id=self.job_id,
+                               stage=name,
+                               duration_seconds=self.timings[name]["duration_seconds"])
+        return result
+
+    async def run(self) -> Dict[str, Any]:
+        """Run every stage respecting dependencies; returns results by stage name."""
+        self._check_graph()
+        started = time.perf_counter()
+        pending = dict(self._stages)
+        running: Dict[asyncio.Task, str] = {}
+        try:
+            while pending or running:
+                ready: List[str] = [
+                    name for name, (_, deps, _) in pending.items()
+                    if all(d in self.results for d in deps)
+                ]
+                for name in ready:
+                    del pending[name]
+                    running[asyncio.create_task(self._run_stage(name, started))] = name
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    self.results[name] = task.result()  # re-raises a stage failure
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            self.wall_seconds = round(time.perf_counter() - started, 3)
+        return self.results
+
+    def summary(self) -> Dict[str, Any]:
+        """Timings plus how much the overlap saved versus running stages back to back."""
+        serial = sum(t.get("duration_seconds", 0.0) for t in self.timings.values())
+        return {
+            "stages": self.timings,
+            "wall_seconds": self.wall_seconds,
+            "serial_seconds": round(serial, 3),
+        }
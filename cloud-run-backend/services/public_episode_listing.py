@@ -0,0 +1,266 @@
+"""
+Public Episode Listing
+
+/api/public/podcasts used to stream up to 2x limit full episode documents
+from two queries (submitted_to_rss, visible_on_web), then parse each
+created_at with a loop of strptime attempts inside the sort key, on every
+page load.
+
+Public episodes are now also kept as a materialized listing: one compact
+record per public episode holding the response payload and a precomputed
+epoch sort key, plus a version record:
+
+    listing: {"version": 42, "updated_at": "..."}
+    items:   {episode_id: {"episode_id": ..., "sort_ts": 1718000000.0, "payload": {...}}}
+
+EpisodeService.upsert_episode_document, RSS submission state changes and
+podcast deletion keep it current (an episode that stops being public is
+removed). `PublicEpisodeListing` holds the records sorted newest first in
+memory and reloads them only when the stored version moves; the version is
+checked at most every PUBLIC_LISTING_CHECK_SECONDS. Pages are cut with an
+opaque cursor (sort key + episode id) and the version doubles as the ETag.
+
+On first use the listing is bootstrapped from the episodes collection.
+
+Backends (PUBLIC_LISTING_BACKEND), see services/versioned_record_store.py:
+- "firestore" (default): `public_episode_listing` (version document) and
+  `public_episode_listing_items`.
+- "local": a JSON file (PUBLIC_LISTING_PATH) for development and tests.
+
+Copyright (c) 2025 Gary Welz / CopernicusAI
+Licensed under MIT License
+"""
+
+import base64
+import bisect
+import json
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from services.versioned_record_store import (
+    FirestoreVersionedRecords,
+    LocalVersionedRecords,
+    VersionedRecordCache,
+    VersionedRecords,
+)
+
+# Configuration
+PUBLIC_LISTING_BACKEND = os.getenv("PUBLIC_LISTING_BACKEND", "firestore").lower()
+PUBLIC_LISTING_PATH = os.getenv("PUBLIC_LISTING_PATH", "/tmp/public_episode_listing.json")
+PUBLIC_LISTING_COLLECTION = os.getenv("PUBLIC_LISTING_COLLECTION", "public_episode_listing")
+PUBLIC_LISTING_ITEMS_COLLECTION = os.getenv("PUBLIC_LISTING_ITEMS_COLLECTION", "public_episode_listing_items")
+PUBLIC_LISTING_CHECK_SECONDS = float(os.getenv("PUBLIC_LISTING_CHECK_SECONDS", "5"))
+
+_VERSION_DOCUMENT = "listing"
+
+
+@dataclass
+class ListingEntry:
+    episode_id: str
+    sort_ts: float
+    payload: Dict[str, Any]
+
+
+def is_public_episode(data: Dict[str, Any]) -> bool:
+    """RSS-published episodes and website-only (visible_on_web) episodes."""
+    return bool(data.get('submitted_to_rss') or data.get('visible_on_web'))
+
+
+def public_podcast_payload(episode_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """The fields /api/public/podcasts returns for one episode."""
+    return {
+        'episode_id': episode_id,
+        'title': data.get('title', 'Untitled'),
+        'category': data.get('category', 'Unknown'),
+        'category_slug': data.get('category_slug'),
+        'expertise_level': (data.get('request') or {}).get('expertise_level', 'intermediate'),
+        'duration': data.get('duration', '5-10 minutes'),
+        'created_at': data.get('generated_at', data.get('created_at', '')),
+        'status': 'published',
+        'creator_attribution': data.get('creator_attribution'),
+        'summary': data.get('summary'),
+        'audio_url': data.get('audio_url'),
+        'thumbnail_url': data.get('thumbnail_url'),
+        'episode_link': data.get('episode_link'),
+        'submitted_to_rss': bool(data.get('submitted_to_rss')),
+        'visible_on_web': bool(data.get('visible_on_web') or data.get('submitted_to_rss')),
+        'animation_player_url': data.get('animation_player_url'),
+    }
+
+
+def episode_sort_ts(value: Any) -> float:
+    """Epoch seconds (UTC) of a generated_at/created_at value; 0.0 when unparseable."""
+    parsed = None
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, str) and value:
+        try:
+            if ',' in value:
+                parsed = parsedate_to_datetime(value)
+            elif 'T' in value:
+                # Seconds precision, offset ignored: the catalog stores naive UTC ISO strings
+                parsed = datetime.fromisoformat(value.replace('Z', '+00:00')[:19])
+            else:
+                parsed = datetime.strptime(value[:10], '%Y-%m-%d')
+        except (TypeError, ValueError):
+            parsed = None
+    if parsed is None:
+        return 0.0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def listing_entry(episode_id: str, data: Dict[str, Any]) -> Optional[ListingEntry]:
+    """Listing record for an episode document, or None if it is not public."""
+    if not is_public_episode(data):
+        return None
+    payload = public_podcast_payload(episode_id, data)
+    return ListingEntry(episode_id=episode_id, sort_ts=episode_sort_ts(payload['created_at']), payload=payload)
+
+
+def _encode_cursor(entry: ListingEntry) -> str:
+    raw = json.dumps([entry.sort_ts, entry.episode_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_ts, episode_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return float(sort_ts), str(episode_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+# --- record storage ---
+
+def _listing_entry_from_dict(data: Dict[str, Any]) -> ListingEntry:
+    return ListingEntry(episode_id=data["episode_id"], sort_ts=float(data["sort_ts"]), payload=data["payload"])
+
+
+# Version record and one entry per public episode
+PublicListingRecords = VersionedRecords[ListingEntry]
+
+
+class FirestorePublicListingRecords(FirestoreVersionedRecords[ListingEntry]):
+    """Version document in `public_episode_listing`, one document per entry in `public_episode_listing_items`."""
+
+    def __init__(self, db: Any):
+        super().__init__(
+            db,
+            PUBLIC_LISTING_COLLECTION,
+            _VERSION_DOCUMENT,
+            PUBLIC_LISTING_ITEMS_COLLECTION,
+            name="Public episode listing",
+            key_field="episode_id",
+            row_from_dict=_listing_entry_from_dict,
+        )
+
+
+class LocalPublicListingRecords(LocalVersionedRecords[ListingEntry]):
+    """The whole listing in one JSON file."""
+
+    def __init__(self, path: str = PUBLIC_LISTING_PATH):
+        super().__init__(path, name="Public episode listing", key_field="episode_id",
+                         row_from_dict=_listing_entry_from_dict)
+
+
+# --- cached listing ---
+
+class PublicEpisodeListing(VersionedRecordCache[ListingEntry]):
+    """In-process, sorted copy of the listing records."""
+
+    def __init__(self, records: PublicListingRecords, check_seconds: float = PUBLIC_LISTING_CHECK_SECONDS):
+        super().__init__(records, check_seconds)
+        # category slug ("" = all) -> (entries newest first, their sort keys)
+        self._ordered: Dict[str, Tuple[List[ListingEntry], List[Tuple[float, str]]]] = {}
+
+    def _changed(self, keys: Optional[List[str]]) -> None:
+        self._ordered = {}
+
+    def bootstrap(self, entries: Iterable[ListingEntry]) -> int:
+        """Replace the listing with `entries` (built from the episode catalog)."""
+        with self._lock:
+            return self._replace_all({}, list(entries))
+
+    def _ordered_for(self, category_slug: Optional[str]) -> Tuple[List[ListingEntry], List[Tuple[float, str]]]:
+        key = category_slug or ""
+        ordered = self._ordered.get(key)
+        if ordered is None:
+            entries = [
+                entry for entry in self._rows.values()
+                if not category_slug or entry.payload.get('category_slug') == category_slug
+            ]
+            entries.sort(key=lambda entry: (-entry.sort_ts, entry.episode_id))
+            ordered = self._ordered[key] = (entries, [(-entry.sort_ts, entry.episode_id) for entry in entries])
+        return ordered
+
+    def page(
+        self,
+        category_slug: Optional[str] = None,
+        limit: int = 500,
+        cursor: Optional[str] = None,
+    ) -> Tuple[int, List[Dict[str, Any]], Optional[str]]:
+        """(version, payloads newest first, cursor for the next page or None)."""
+        with self._lock:
+            self._sync()
+            entries, keys = self._ordered_for(category_slug)
+            start = 0
+            if cursor:
+                sort_ts, episode_id = _decode_cursor(cursor)
+                start = bisect.bisect_right(keys, (-sort_ts, episode_id))
+            selected = entries[start:start + limit]
+            next_cursor = _encode_cursor(selected[-1]) if selected and start + limit < len(entries) else None
+            return self._version, [entry.payload for entry in selected], next_cursor
+
+
+def build_listing_entries(db: Any, collection: str) -> List[ListingEntry]:
+    """Listing entries for every public episode in the episode catalog."""
+    entries: Dict[str, ListingEntry] = {}
+    for field in ('submitted_to_rss', 'visible_on_web'):
+        for doc in db.collection(collection).where(field, '==', True).stream():
+            if doc.id not in entries:
+                entry = listing_entry(doc.id, doc.to_dict() or {})
+                if entry is not None:
+                    entries[doc.id] = entry
+    return list(entries.values())
+
+
+_public_listing: Optional[PublicEpisodeListing] = None
+_public_listing_lock = threading.Lock()
+
+
+def get_public_episode_listing() -> Optional[PublicEpisodeListing]:
+    """Process-wide listing for the configured backend (None if Firestore is unavailable)."""
+    global _public_listing
+    if _public_listing is None:
+        with _public_listing_lock:
+            if _public_listing is None:
+                if PUBLIC_LISTING_BACKEND == "local":
+                    _public_listing = PublicEpisodeListing(LocalPublicListingRecords())
+                else:
+                    from config.database import db
+                    if db:
+                        _public_listing = PublicEpisodeListing(FirestorePublicListingRecords(db))
+    return _public_listing
+
+
+def sync_episode_listing(episode_id: str, data: Optional[Dict[str, Any]]) -> None:
+    """
+    Bring one episode's listing entry in line with its document (None = deleted).
+
+    A no-op until the listing is bootstrapped: the bootstrap reads the catalog.
+    """
+    listing = get_public_episode_listing()
+    if listing is None or not episode_id or not listing.is_bootstrapped():
+        return
+    entry = listing_entry(episode_id, data) if data else None
+    if entry is not None:
+        listing.apply(upserts=[entry])
+    else:
+        listing.apply(removals=[episode_id])
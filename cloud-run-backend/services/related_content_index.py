@@ -0,0 +1,214 @@
+"""
+Related Content Reverse Index
+
+Maintained reverse lookups for cross-component queries, so find_related_content
+reads a handful of index documents instead of scanning every episode and every
+GLMP process file:
+
+    doi-<sha1(doi)>       {"kind": "doi", "key": "10.1038/...", "podcasts": {job_id: {...}}}
+    entity-<sha1(name)>   {"kind": "entity", "key": "p53", "processes": {process_id: {...}}}
+
+Each map entry carries the few fields the related-content response shows, so a
+lookup never has to fetch the podcast or process itself. Episode writes
+(EpisodeService.upsert_episode_document) and deletes add/remove the episode
+under every DOI in its request (paper_doi plus DOIs found in source_links);
+the GLMP sync adds each process under its entities. Papers need no entry of
+their own: a paper lookup reads the paper first and uses its DOI and entities
+as keys.
+
+`_meta` is written by scripts/build_related_content_index.py after a full
+backfill. Until it exists, lookup_related returns None and callers keep their
+scanning fallback. Entity keys are exact (case- and whitespace-normalised)
+names, where the scan matched substrings.
+
+Like knowledge_graph_changes, this module only needs a Firestore client.
+
+Copyright (c) 2025 Gary Welz / CopernicusAI
+Licensed under MIT License
+"""
+
+import hashlib
+import logging
+import os
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from google.cloud import firestore
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+RELATED_CONTENT_INDEX_COLLECTION = os.getenv("RELATED_CONTENT_INDEX_COLLECTION", "related_content_index")
+
+INDEX_META_DOC = "_meta"
+_MAX_BATCH_WRITES = 500
+_DOI_RE = re.compile(r"10\.\d{4,9}/[^\s\"'<>]+")
+_DOI_PREFIX_RE = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)", re.IGNORECASE)
+
+
+def normalize_doi(value: Any) -> Optional[str]:
+    """Lower-cased bare DOI ("10.x/y"), or None when `value` holds no DOI."""
+    if not value:
+        return None
+    text = _DOI_PREFIX_RE.sub("", str(value).strip())
+    match = _DOI_RE.search(text)
+    if not match:
+        return None
+    return match.group(0).rstrip(".,;)").lower()
+
+
+def normalize_entity(value: Any) -> Optional[str]:
+    if not isinstance(value, str):
+        return None
+    key = " ".join(value.lower().split())
+    return key or None
+
+
+def _doc_id(kind: str, key: str) -> str:
+    # DOIs contain "/", which Firestore document ids cannot
+    return f"{kind}-{hashlib.sha1(key.encode('utf-8')).hexdigest()}"
+
+
+def episode_paper_dois(request_data: Optional[Dict[str, Any]]) -> List[str]:
+    """Distinct DOIs an episode request cites: paper_doi first, then source_links."""
+    request_data = request_data or {}
+    candidates = [request_data.get("paper_doi")]
+    candidates.extend(link for link in (request_data.get("source_links") or []) if isinstance(link, str))
+    dois: List[str] = []
+    for candidate in candidates:
+        doi = normalize_doi(candidate)
+        if doi and doi not in dois:
+            dois.append(doi)
+    return dois
+
+
+def _commit(db: Any, writes: List[Tuple[Any, Dict[str, Any]]]) -> int:
+    for start in range(0, len(writes), _MAX_BATCH_WRITES):
+        batch = db.batch()
+        for ref, data in writes[start:start + _MAX_BATCH_WRITES]:
+            batch.set(ref, data, merge=True)
+        batch.commit()
+    return len(writes)
+
+
+def index_episode(
+    db: Any,
+    podcast_id: str,
+    request_data: Optional[Dict[str, Any]],
+    title: Optional[str] = None,
+    category: Optional[str] = None,
+) -> int:
+    """Record `podcast_id` under every DOI its request cites; returns docs written."""
+    if not podcast_id:
+        return 0
+    col = db.collection(RELATED_CONTENT_INDEX_COLLECTION)
+    entry = {"job_id": podcast_id, "title": title, "category": category}
+    updated_at = datetime.utcnow().isoformat()
+    writes = [
+        (col.document(_doc_id("doi", doi)),
+         {"kind": "doi", "key": doi, "podcasts": {podcast_id: entry}, "updated_at": updated_at})
+        for doi in episode_paper_dois(request_data)
+    ]
+    return _commit(db, writes)
+
+
+def unindex_episode(db: Any, podcast_id: str, request_data: Optional[Dict[str, Any]]) -> int:
+    """Drop `podcast_id` from the DOI entries its request put it under."""
+    if not podcast_id:
+        return 0
+    col = db.collection(RELATED_CONTENT_INDEX_COLLECTION)
+    writes = [
+        (col.document(_doc_id("doi", doi)), {"podcasts": {podcast_id: firestore.DELETE_FIELD}})
+        for doi in episode_paper_dois(request_data)
+    ]
+    return _commit(db, writes)
+
+
+def _process_writes(db: Any, process: Dict[str, Any]) -> List[Tuple[Any, Dict[str, Any]]]:
+    process_id = process.get("id")
+    if not process_id:
+        return []
+    col = db.collection(RELATED_CONTENT_INDEX_COLLECTION)
+    entry = {
+        "id": process_id,
+        "title": process.get("title"),
+        "category": process.get("category"),
+        "description": process.get("description"),
+    }
+    updated_at = datetime.utcnow().isoformat()
+    writes = []
+    seen = set()
+    entities = process.get("entities")
+    for entity in entities if isinstance(entities, list) else []:
+        key = normalize_entity(entity)
+        if key and key not in seen:
+            seen.add(key)
+            writes.append((
+                col.document(_doc_id("entity", key)),
+                {"kind": "entity", "key": key, "processes": {process_id: entry}, "updated_at": updated_at},
+            ))
+    return writes
+
+
+def index_process(db: Any, process: Dict[str, Any]) -> int:
+    """Record a GLMP process (its JSON as stored in GCS) under each of its entities."""
+    return _commit(db, _process_writes(db, process))
+
+
+def index_processes(db: Any, processes: Iterable[Dict[str, Any]]) -> int:
+    writes: List[Tuple[Any, Dict[str, Any]]] = []
+    for process in processes:
+        writes.extend(_process_writes(db, process))
+    return _commit(db, writes)
+
+
+def mark_index_built(db: Any, stats: Optional[Dict[str, Any]] = None) -> None:
+    """Flag the index as complete so lookups stop falling back to scans."""
+    ref = db.collection(RELATED_CONTENT_INDEX_COLLECTION).document(INDEX_META_DOC)
+    _commit(db, [(ref, {"built_at": datetime.utcnow().isoformat(), **(stats or {})})])
+
+
+def lookup_related(
+    db: Any,
+    dois: Iterable[Any] = (),
+    entities: Iterable[Any] = (),
+) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """
+    Podcasts citing any of `dois` and GLMP processes involving any of `entities`.
+
+    One batched read covers the meta doc and every key. Returns None when the
+    index has not been built yet, otherwise {"podcasts": [...], "glmp_processes": [...]}
+    in key order; processes carry the entity they matched as "matching_entity".
+    """
+    col = db.collection(RELATED_CONTENT_INDEX_COLLECTION)
+    keyed: List[Tuple[str, Any, str]] = []  # (doc id, original value, kind)
+    for value in dois:
+        doi = normalize_doi(value)
+        if doi:
+            keyed.append((_doc_id("doi", doi), value, "doi"))
+    for value in entities:
+        key = normalize_entity(value)
+        if key:
+            keyed.append((_doc_id("entity", key), value, "entity"))
+
+    doc_ids = dict.fromkeys([INDEX_META_DOC] + [doc_id for doc_id, _, _ in keyed])
+    refs = [col.document(doc_id) for doc_id in doc_ids]
+    snapshots = {snap.id: snap for snap in db.get_all(refs)}
+    meta = snapshots.get(INDEX_META_DOC)
+    if meta is None or not meta.exists:
+        return None
+
+    related: Dict[str, List[Dict[str, Any]]] = {"podcasts": [], "glmp_processes": []}
+    for doc_id, value, kind in keyed:
+        snap = snapshots.get(doc_id)
+        if snap is None or not snap.exists:
+            continue
+        data = snap.to_dict() or {}
+        if kind == "doi":
+            related["podcasts"].extend((data.get("podcasts") or {}).values())
+        else:
+            related["glmp_processes"].extend(
+                {**entry, "matching_entity": value} for entry in (data.get("processes") or {}).values()
+            )
+    return related
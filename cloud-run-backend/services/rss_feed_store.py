@@ -0,0 +1,228 @@
+"""
+RSS Feed Store
+
+The public feed XML on GCS used to be the only copy of the feed: every
+submission downloaded it, parsed it, filtered all items by GUID, re-sorted
+them, serialized and re-uploaded it, and every membership check downloaded
+and parsed it again.
+
+The feed is now kept as structured records, one per item, each holding the
+item's pre-rendered <item> XML fragment and its publication timestamp, plus
+a channel record holding the XML before and after the items:
+
+    channel: {"version": 42, "head": "<?xml ...><rss ...><channel>...", "tail": "</channel></rss>"}
+    items:   {guid: {"guid": ..., "pub_ts": 1718000000.0, "xml": "<item>...</item>"}}
+
+Every change bumps `version`. `RSSFeed` keeps an in-process GUID index of
+the fragments and reloads it only when the stored version moves, so a
+membership check is one small read and publishing joins cached fragments
+between head and tail instead of re-serializing the feed. The uploaded blob
+carries the version in its metadata, so an instance holding an older
+rendering never overwrites a newer one.
+
+On first use the store is bootstrapped from the existing feed on GCS; after
+that the store, not the XML, is authoritative (hand edits to the XML are
+overwritten by the next publish - delete the channel record to re-import).
+
+Backends (RSS_FEED_STORE_BACKEND), see services/versioned_record_store.py:
+- "firestore" (default): `rss_feed` (channel document) and `rss_feed_items`.
+- "local": a JSON file (RSS_FEED_STORE_PATH) for development and tests.
+
+Copyright (c) 2025 Gary Welz / CopernicusAI
+Licensed under MIT License
+"""
+
+import os
+import threading
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.constants import RSS_NAMESPACES
+from services.versioned_record_store import (
+    FirestoreVersionedRecords,
+    LocalVersionedRecords,
+    VersionedRecordCache,
+    VersionedRecords,
+)
+
+# Configuration
+RSS_FEED_STORE_BACKEND = os.getenv("RSS_FEED_STORE_BACKEND", "firestore").lower()
+RSS_FEED_STORE_PATH = os.getenv("RSS_FEED_STORE_PATH", "/tmp/rss_feed_store.json")
+RSS_FEED_COLLECTION = os.getenv("RSS_FEED_COLLECTION", "rss_feed")
+RSS_FEED_ITEMS_COLLECTION = os.getenv("RSS_FEED_ITEMS_COLLECTION", "rss_feed_items")
+
+_CHANNEL_DOCUMENT = "channel"
+_ITEMS_PLACEHOLDER = "copernicus-feed-items"
+
+
+@dataclass
+class FeedItem:
+    """One pre-rendered <item> of the feed."""
+    guid: str
+    pub_ts: float
+    xml: str
+
+
+# --- XML fragments ---
+
+def _restore_cdata(xml_text: str) -> str:
+    """ElementTree escapes the CDATA markers we put in element text; undo that."""
+    return xml_text.replace("&lt;![CDATA[", "<![CDATA[").replace("]]&gt;", "]]>")
+
+
+def render_item_fragment(item_el: ET.Element) -> str:
+    """Serialize an <item> for splicing into the channel (namespaces are declared on <rss>)."""
+    xml_text = _restore_cdata(ET.tostring(item_el, encoding="unicode"))
+    open_tag, sep, rest = xml_text.partition(">")
+    for prefix, uri in RSS_NAMESPACES.items():
+        open_tag = open_tag.replace(f' xmlns:{prefix}="{uri}"', "")
+    return open_tag + sep + rest
+
+
+def item_pub_ts(item_el: ET.Element) -> float:
+    pub_el = item_el.find("pubDate")
+    if pub_el is not None and pub_el.text:
+        try:
+            return parsedate_to_datetime(pub_el.text.strip()).timestamp()
+        except Exception:
+            pass
+    return 0.0
+
+
+def split_feed_xml(xml_bytes: bytes) -> Tuple[str, str, List[FeedItem]]:
+    """Split a feed document into (head, tail, items)."""
+    root = ET.fromstring(xml_bytes)
+    channel = root.find("channel")
+    if channel is None:
+        raise ValueError("RSS feed missing channel element")
+
+    children = list(channel)
+    item_els = [child for child in children if child.tag == "item"]
+    insert_at = children.index(item_els[0]) if item_els else len(children)
+
+    items: List[FeedItem] = []
+    for item_el in item_els:
+        guid_el = item_el.find("guid")
+        guid = (guid_el.text or "").strip() if guid_el is not None else ""
+        if guid:
+            items.append(FeedItem(guid=guid, pub_ts=item_pub_ts(item_el), xml=render_item_fragment(item_el)))
+        channel.remove(item_el)
+
+    channel.insert(insert_at, ET.Element(_ITEMS_PLACEHOLDER))
+    document = _restore_cdata(ET.tostring(root, encoding="utf-8", xml_declaration=True).decode("utf-8"))
+    head, _, tail = document.partition(f"<{_ITEMS_PLACEHOLDER} />")
+    # ElementTree only declares prefixes used in what it serialized; items need all of them
+    rss_at = head.index("<rss")
+    rss_end = head.index(">", rss_at)
+    missing = "".join(
+        f' xmlns:{prefix}="{uri}"'
+        for prefix, uri in RSS_NAMESPACES.items()
+        if f'xmlns:{prefix}="' not in head[rss_at:rss_end]
+    )
+    head = head[:rss_end] + missing + head[rss_end:]
+    return head, tail, items
+
+
+# --- record storage ---
+
+def _feed_item(data: Dict[str, Any]) -> FeedItem:
+    return FeedItem(guid=data["guid"], pub_ts=float(data["pub_ts"]), xml=data["xml"])
+
+
+# Channel record ("head"/"tail") and one item record per GUID
+RSSFeedRecords = VersionedRecords[FeedItem]
+
+
+class FirestoreRSSFeedRecords(FirestoreVersionedRecords[FeedItem]):
+    """Channel document in `rss_feed`, one document per item in `rss_feed_items`."""
+
+    def __init__(self, db: Any):
+        super().__init__(
+            db,
+            RSS_FEED_COLLECTION,
+            _CHANNEL_DOCUMENT,
+            RSS_FEED_ITEMS_COLLECTION,
+            name="RSS feed store",
+            key_field="guid",
+            row_from_dict=_feed_item,
+            doc_id=lambda guid: guid.replace("/", "%2F"),
+        )
+
+
+class LocalRSSFeedRecords(LocalVersionedRecords[FeedItem]):
+    """The whole feed in one JSON file."""
+
+    def __init__(self, path: str = RSS_FEED_STORE_PATH):
+        super().__init__(path, name="RSS feed store", key_field="guid", row_from_dict=_feed_item)
+
+
+# --- cached feed ---
+
+class RSSFeed(VersionedRecordCache[FeedItem]):
+    """In-process GUID index and renderer over the feed records."""
+
+    def __init__(self, records: RSSFeedRecords):
+        super().__init__(records)
+        self._fragments: Dict[str, bytes] = {}
+        self._rendered: Optional[Tuple[int, bytes]] = None
+
+    def _changed(self, keys: Optional[List[str]]) -> None:
+        if keys is None:
+            self._fragments = {}
+        else:
+            for guid in keys:
+                self._fragments.pop(guid, None)
+        self._rendered = None
+
+    def bootstrap(self, xml_bytes: bytes) -> int:
+        """Import a feed document, replacing whatever the store held."""
+        head, tail, items = split_feed_xml(xml_bytes)
+        with self._lock:
+            return self._replace_all({"head": head, "tail": tail}, items)
+
+    def contains(self, guid: str) -> bool:
+        with self._lock:
+            self._sync()
+            return guid in self._rows
+
+    def guids(self) -> List[str]:
+        with self._lock:
+            self._sync()
+            return list(self._rows)
+
+    def render(self) -> Tuple[int, bytes]:
+        """(version, feed XML) built from cached item fragments, newest first."""
+        with self._lock:
+            self._sync()
+            if self._rendered is None or self._rendered[0] != self._version:
+                ordered = sorted(self._rows.values(), key=lambda item: item.pub_ts, reverse=True)
+                parts = [self._header.get("head", "").encode("utf-8")]
+                for item in ordered:
+                    fragment = self._fragments.get(item.guid)
+                    if fragment is None:
+                        fragment = self._fragments[item.guid] = item.xml.encode("utf-8")
+                    parts.append(fragment)
+                parts.append(self._header.get("tail", "").encode("utf-8"))
+                self._rendered = (self._version, b"".join(parts))
+            return self._rendered
+
+
+_rss_feed: Optional[RSSFeed] = None
+_rss_feed_lock = threading.Lock()
+
+
+def get_rss_feed() -> Optional[RSSFeed]:
+    """Process-wide feed for the configured backend (None if Firestore is unavailable)."""
+    global _rss_feed
+    if _rss_feed is None:
+        with _rss_feed_lock:
+            if _rss_feed is None:
+                if RSS_FEED_STORE_BACKEND == "local":
+                    _rss_feed = RSSFeed(LocalRSSFeedRecords())
+                else:
+                    from config.database import db
+                    if db:
+                        _rss_feed = RSSFeed(FirestoreRSSFeedRecords(db))
+    return _rss_feed
@@ -1,9 +1,11 @@
 """RSS Feed Management Service for Copernicus Podcast API"""
 
 import asyncio
+import os
+import time
 import xml.etree.ElementTree as ET
 from xml.etree.ElementTree import Element, SubElement
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone
 from email.utils import format_datetime, parsedate_to_datetime
 
@@ -21,9 +23,16 @@ from config.constants import (
     CATEGORY_SLUG_TO_LABEL,
 )
 from config.database import db
+from services.rss_feed_store import FeedItem, RSSFeed, get_rss_feed, item_pub_ts, render_item_fragment
+from services.public_episode_listing import sync_episode_listing
 from utils.logging import structured_logger
 from content_fixes import extract_itunes_summary
 
+RSS_PUBLISH_ATTEMPTS = 3
+RSS_PUBLISH_FLUSH_SECONDS = float(os.getenv("RSS_PUBLISH_FLUSH_SECONDS", "0.5"))
+RSS_PUBLISH_MAX_DELAY_SECONDS = float(os.getenv("RSS_PUBLISH_MAX_DELAY_SECONDS", "5"))
+RSS_PUBLISH_MAX_WRITES = 400
+
 
 class RSSService:
     """Service for managing RSS feed operations"""
@@ -465,15 +474,112 @@ class RSSService:
 
         return item_el
     
+    @staticmethod
+    def _podcast_guid(podcast_data: Dict[str, Any]) -> str:
+        result = podcast_data.get("result", {})
+        guid = result.get("canonical_filename") or result.get("topic") or podcast_data.get("job_id")
+        if not guid:
+            raise HTTPException(status_code=400, detail="Unable to determine canonical identifier for podcast.")
+        return guid
+
     @classmethod
-    async def update_rss_feed(cls, podcast_data: Dict[str, Any], subscriber_data: Optional[Dict[str, Any]], submit_to_rss: bool, attribution_initials: Optional[str]) -> None:
-        """Insert or remove an episode entry in the shared RSS feed on GCS."""
+    def _build_rss_item(cls, bucket, podcast_data: Dict[str, Any], subscriber_data: Optional[Dict[str, Any]], attribution_initials: Optional[str]) -> Element:
+        item_data = cls._build_rss_item_data(podcast_data, subscriber_data, attribution_initials)
+        audio_blob_name = cls._extract_blob_name_from_url(item_data["audio_url"])
+        audio_size = 1
+        if audio_blob_name:
+            audio_blob = bucket.blob(audio_blob_name)
+            if audio_blob.exists():
+                audio_blob.reload()
+                audio_size = audio_blob.size or 1
+        return cls._create_rss_item_element(item_data, audio_size)
 
-        def _sync_update():
-            storage_client = storage.Client()
-            bucket = storage_client.bucket(RSS_BUCKET_NAME)
+    @staticmethod
+    def _get_feed_store(bucket) -> Optional[RSSFeed]:
+        """The structured feed, imported from the GCS feed on first use (None without a store)."""
+        feed = get_rss_feed()
+        if feed is None:
+            return None
+        if not feed.is_bootstrapped():
             blob = bucket.blob(RSS_FEED_BLOB_NAME)
+            if not blob.exists():
+                raise HTTPException(status_code=500, detail="RSS feed file not found in storage.")
+            try:
+                feed.bootstrap(blob.download_as_bytes())
+            except ValueError as e:
+                raise HTTPException(status_code=500, detail=str(e))
+        return feed
+
+    @staticmethod
+    def _publish_feed(feed: RSSFeed, bucket) -> int:
+        """Upload the rendered feed unless the blob already holds this version or a newer one."""
+        blob = bucket.blob(RSS_FEED_BLOB_NAME)
+        for _ in range(RSS_PUBLISH_ATTEMPTS):
+            version, xml_bytes = feed.render()
+            generation = 0
+            if blob.exists():
+                blob.reload()
+                generation = blob.generation
+                published = int((blob.metadata or {}).get("feed_version", -1))
+                if published >= version:
+                    return published
+            blob.metadata = {"feed_version": str(version)}
+            try:
+                blob.upload_from_string(
+                    xml_bytes,
+                    content_type="application/rss+xml",
+                    if_generation_match=generation,
+                )
+                return version
+            except PreconditionFailed:
+                continue  # another instance published meanwhile; compare versions again
+        raise HTTPException(status_code=409, detail="RSS feed was updated concurrently. Please retry.")
+
+    @classmethod
+    async def update_rss_feed(cls, podcast_data: Dict[str, Any], subscriber_data: Optional[Dict[str, Any]], submit_to_rss: bool, attribution_initials: Optional[str]) -> None:
+        """Insert or remove an episode entry in the shared RSS feed on GCS.
+
+        The change is queued on the publish coalescer and applied together
+        with whatever else arrives in the same flush window; this returns
+        once the feed containing it has been published.
+        """
+        guid = cls._podcast_guid(podcast_data)
+        item_el = None
+        if submit_to_rss:
+            def _build_item():
+                bucket = storage.Client().bucket(RSS_BUCKET_NAME)
+                return cls._build_rss_item(bucket, podcast_data, subscriber_data, attribution_initials)
+            item_el = await asyncio.to_thread(_build_item)
+        await get_rss_publish_coalescer().submit(guid, item_el)
 
+    @classmethod
+    def _apply_feed_changes(cls, changes: Dict[str, Optional[Element]]) -> None:
+        """Apply {guid: item (None to remove)} in one store write and one feed upload."""
+        bucket = storage.Client().bucket(RSS_BUCKET_NAME)
+        feed = cls._get_feed_store(bucket)
+        if feed is None:
+            cls._rewrite_feed_xml(bucket, changes)
+            return
+
+        upserts = [
+            FeedItem(guid=guid, pub_ts=item_pub_ts(item_el), xml=render_item_fragment(item_el))
+            for guid, item_el in changes.items()
+            if item_el is not None
+        ]
+        removals = [guid for guid, item_el in changes.items() if item_el is None]
+        # Firestore caps a transaction at 500 writes
+        for start in range(0, len(upserts), RSS_PUBLISH_MAX_WRITES):
+            feed.apply(upserts=upserts[start:start + RSS_PUBLISH_MAX_WRITES])
+        for start in range(0, len(removals), RSS_PUBLISH_MAX_WRITES):
+            feed.apply(removals=removals[start:start + RSS_PUBLISH_MAX_WRITES])
+        cls._publish_feed(feed, bucket)
+
+    @classmethod
+    def _rewrite_feed_xml(cls, bucket, changes: Dict[str, Optional[Element]]) -> None:
+        """Edit the feed XML in place; used when no feed store is available."""
+        blob = bucket.blob(RSS_FEED_BLOB_NAME)
+
+        for _ in range(RSS_PUBLISH_ATTEMPTS):
             if not blob.exists():
                 raise HTTPException(status_code=500, detail="RSS feed file not found in storage.")
 
@@ -486,31 +592,15 @@ class RSSService:
             if channel is None:
                 raise HTTPException(status_code=500, detail="RSS feed missing channel element.")
 
-            result = podcast_data.get("result", {})
-            canonical = result.get("canonical_filename")
-            guid = canonical or result.get("topic") or podcast_data.get("job_id")
-            if not guid:
-                raise HTTPException(status_code=400, detail="Unable to determine canonical identifier for podcast.")
-
             existing_items: list[Element] = []
             for item in channel.findall("item"):
                 guid_el = item.find("guid")
                 guid_text = guid_el.text if guid_el is not None else None
-                if guid_text == guid:
+                if guid_text in changes:
                     continue
                 existing_items.append(item)
 
-            if submit_to_rss:
-                item_data = cls._build_rss_item_data(podcast_data, subscriber_data, attribution_initials)
-                audio_blob_name = cls._extract_blob_name_from_url(item_data["audio_url"])
-                audio_size = 1
-                if audio_blob_name:
-                    audio_blob = bucket.blob(audio_blob_name)
-                    if audio_blob.exists():
-                        audio_blob.reload()
-                        audio_size = audio_blob.size or 1
-                new_item = cls._create_rss_item_element(item_data, audio_size)
-                existing_items.append(new_item)
+            existing_items.extend(item_el for item_el in changes.values() if item_el is not None)
 
             def item_sort_key(item: Element):
                 pub_el = item.find("pubDate")
@@ -539,10 +629,10 @@ class RSSService:
                     content_type="application/rss+xml",
                     if_generation_match=current_generation,
                 )
+                return
             except PreconditionFailed:
-                raise HTTPException(status_code=409, detail="RSS feed was updated concurrently. Please retry.")
-
-        await asyncio.to_thread(_sync_update)
+                continue  # someone else rewrote the feed; redo the edit on their version
+        raise HTTPException(status_code=409, detail="RSS feed was updated concurrently. Please retry.")
     
     @staticmethod
     def is_episode_in_rss_feed(canonical: Optional[str]) -> bool:
@@ -553,6 +643,10 @@ class RSSService:
         try:
             storage_client = storage.Client()
             bucket = storage_client.bucket(RSS_BUCKET_NAME)
+            feed = RSSService._get_feed_store(bucket)
+            if feed is not None:
+                return feed.contains(canonical)
+
             blob = bucket.blob(RSS_FEED_BLOB_NAME)
             
             if not blob.exists():
@@ -600,7 +694,89 @@ class RSSService:
             update_payload["creator_attribution"] = creator_attribution
         timestamp_field = "rss_submitted_at" if submitted else "rss_removed_at"
         update_payload[timestamp_field] = datetime.utcnow().isoformat()
-        db.collection(EPISODE_COLLECTION_NAME).document(canonical).set(update_payload, merge=True)
+        episode_ref = db.collection(EPISODE_COLLECTION_NAME).document(canonical)
+        episode_ref.set(update_payload, merge=True)
+        try:
+            snapshot = episode_ref.get()
+            sync_episode_listing(canonical, snapshot.to_dict() if snapshot.exists else None)
+        except Exception as e:
+            structured_logger.warning("Failed to update public episode listing",
+                                     canonical=canonical,
+                                     error=str(e))
+
+
+class RSSPublishCoalescer:
+    """Collects feed changes for a short window and publishes them together.
+
+    Concurrent submissions used to each rewrite the feed and race on the
+    blob generation. Now changes are held until none has arrived for
+    RSS_PUBLISH_FLUSH_SECONDS (at most RSS_PUBLISH_MAX_DELAY_SECONDS after
+    the first) and go out as one store write and one upload; changes queued
+    during a flush form the next one. The last change queued for a GUID wins.
+    """
+
+    def __init__(
+        self,
+        flush_seconds: float = RSS_PUBLISH_FLUSH_SECONDS,
+        max_delay_seconds: float = RSS_PUBLISH_MAX_DELAY_SECONDS,
+        apply_changes=None,
+    ):
+        self.flush_seconds = flush_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self._last_queued = 0.0
+        self._apply_changes = apply_changes or RSSService._apply_feed_changes
+        self._pending: List[Tuple[str, Optional[Element], asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self.flushes = 0
+        self.changes = 0
+
+    async def submit(self, guid: str, item_el: Optional[Element]) -> None:
+        """Queue an upsert (item_el) or removal (None) and wait until it is published."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((guid, item_el, future))
+        self._last_queued = time.monotonic()
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+        await future
+
+    async def _flush_loop(self) -> None:
+        while self._pending:
+            # Wait for a quiet window so a burst (or a bulk request) goes out as one publish
+            window_start = time.monotonic()
+            while True:
+                await asyncio.sleep(self.flush_seconds)
+                now = time.monotonic()
+                if now - self._last_queued >= self.flush_seconds or now - window_start >= self.max_delay_seconds:
+                    break
+            batch, self._pending = self._pending, []
+            changes: Dict[str, Optional[Element]] = {}
+            for guid, item_el, _ in batch:
+                changes.pop(guid, None)
+                changes[guid] = item_el
+            try:
+                await asyncio.to_thread(self._apply_changes, changes)
+            except Exception as e:
+                structured_logger.error("RSS feed publish failed", changes=len(changes), error=str(e))
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.flushes += 1
+            self.changes += len(changes)
+            structured_logger.info("Published RSS feed changes", changes=len(changes), requests=len(batch))
+            for *_, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+
+_rss_publish_coalescer: Optional[RSSPublishCoalescer] = None
+
+
+def get_rss_publish_coalescer() -> RSSPublishCoalescer:
+    global _rss_publish_coalescer
+    if _rss_publish_coalescer is None:
+        _rss_publish_coalescer = RSSPublishCoalescer()
+    return _rss_publish_coalescer
 
 
 # Create singleton instance
@@ -0,0 +1,279 @@
+"""
+TTS Segment Cache
+
+Regenerating or re-running a podcast job re-synthesizes every line through
+ElevenLabs, including unchanged lines and boilerplate intros. This cache
+stores each synthesized segment under a content address:
+
+    sha256(text as sent, voice_id, model_id, voice_settings)
+
+so any line already spoken with the same voice and settings is served
+without an API call. Two tiers, each bounded by total size:
+
+1. a local directory (TTS_SEGMENT_CACHE_DIR), evicted least-recently-used
+   (hits refresh the file's mtime), shared by every worker in the container;
+2. a GCS prefix (TTS_SEGMENT_CACHE_GCS_URI) shared across instances. GCS has
+   no access time, so it is pruned oldest-written first, at most once per
+   TTS_SEGMENT_CACHE_GCS_PRUNE_INTERVAL_SECONDS.
+
+A GCS hit is copied into the local tier. Both tiers are off unless their
+setting is present; `get_tts_segment_cache()` returns None then.
+
+Copyright (c) 2025 Gary Welz / CopernicusAI
+Licensed under MIT License
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+TTS_SEGMENT_CACHE_DIR = os.getenv("TTS_SEGMENT_CACHE_DIR", "")
+TTS_SEGMENT_CACHE_MAX_BYTES = int(os.getenv("TTS_SEGMENT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+TTS_SEGMENT_CACHE_GCS_URI = os.getenv("TTS_SEGMENT_CACHE_GCS_URI", "")
+TTS_SEGMENT_CACHE_GCS_MAX_BYTES = int(os.getenv("TTS_SEGMENT_CACHE_GCS_MAX_BYTES", str(20 * 1024 * 1024 * 1024)))
+TTS_SEGMENT_CACHE_GCS_PRUNE_INTERVAL_SECONDS = float(os.getenv("TTS_SEGMENT_CACHE_GCS_PRUNE_INTERVAL_SECONDS", "3600"))
+
+
+def tts_segment_key(text: str, voice_id: str, model_id: str, voice_settings: Dict[str, Any]) -> str:
+    """Content address of one synthesized segment."""
+    canonical = json.dumps(
+        {"text": text, "voice_id": voice_id, "model_id": model_id, "voice_settings": voice_settings},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _split_gcs_uri(uri: str) -> Tuple[str, str]:
+    path = uri[len("gs://"):] if uri.startswith("gs://") else uri
+    bucket, _, prefix = path.partition("/")
+    return bucket, prefix.strip("/")
+
+
+class TTSSegmentCache:
+    """Size-bounded local-disk + GCS cache of synthesized audio segments."""
+
+    def __init__(
+        self,
+        local_dir: str = "",
+        max_bytes: int = TTS_SEGMENT_CACHE_MAX_BYTES,
+        gcs_uri: str = "",
+        gcs_max_bytes: int = TTS_SEGMENT_CACHE_GCS_MAX_BYTES,
+        gcs_prune_interval_seconds: float = TTS_SEGMENT_CACHE_GCS_PRUNE_INTERVAL_SECONDS,
+    ):
+        self.local_dir = local_dir
+        self.max_bytes = max(0, max_bytes)
+        self.gcs_uri = gcs_uri
+        self.gcs_max_bytes = max(0, gcs_max_bytes)
+        self.gcs_prune_interval_seconds = gcs_prune_interval_seconds
+        self._lock = threading.Lock()
+        self._local_bytes: Optional[int] = None  # scanned lazily
+        self._gcs_pruned_at = 0.0
+        self._counters = {
+            "local_hits": 0,
+            "gcs_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "local_evictions": 0,
+            "gcs_evictions": 0,
+            "errors": 0,
+        }
+
+    # --- local tier ---
+
+    def _local_path(self, key: str) -> str:
+        return os.path.join(self.local_dir, key[:2], f"{key}.mp3")
+
+    def _local_files(self) -> List[Tuple[float, int, str]]:
+        """(mtime, size, path) of every cached segment."""
+        files = []
+        for root, _, names in os.walk(self.local_dir):
+            for name in names:
+                if not name.endswith(".mp3"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((st.st_mtime, st.st_size, path))
+        return files
+
+    def _local_get(self, key: str) -> Optional[bytes]:
+        path = self._local_path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # LRU: a hit makes the entry the most recently used
+            return data
+        except FileNotFoundError:
+            return None
+
+    def _local_put(self, key: str, data: bytes) -> None:
+        path = self._local_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        existed = os.path.exists(path)
+        tmp = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            if self._local_bytes is None:
+                self._local_bytes = sum(size for _, size, _ in self._local_files())
+            elif not existed:
+                self._local_bytes += len(data)
+            if self._local_bytes > self.max_bytes:
+                self._evict_local()
+
+    def _evict_local(self) -> None:
+        """Delete least-recently-used files down to 90% of the budget (caller holds the lock)."""
+        files = sorted(self._local_files())
+        total = sum(size for _, size, _ in files)
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                self._counters["local_evictions"] += 1
+            except FileNotFoundError:
+                total -= size
+        self._local_bytes = total
+
+    # --- GCS tier ---
+
+    def _gcs_bucket_and_prefix(self):
+        from mcp_server.utils.gcs_client import get_storage_client
+        bucket_name, prefix = _split_gcs_uri(self.gcs_uri)
+        return get_storage_client().bucket(bucket_name), prefix
+
+    def _gcs_blob(self, key: str):
+        bucket, prefix = self._gcs_bucket_and_prefix()
+        return bucket.blob(f"{prefix}/{key}.mp3" if prefix else f"{key}.mp3")
+
+    def _gcs_get(self, key: str) -> Optional[bytes]:
+        from google.api_core.exceptions import NotFound
+        try:
+            return self._gcs_blob(key).download_as_bytes()
+        except NotFound:
+            return None
+
+    def prune_gcs(self, force: bool = False) -> int:
+        """Delete oldest-written GCS entries beyond gcs_max_bytes; returns the number deleted."""
+        if not self.gcs_uri:
+            return 0
+        now = time.time()
+        with self._lock:
+            if not force and now - self._gcs_pruned_at < self.gcs_prune_interval_seconds:
+                return 0
+            self._gcs_pruned_at = now
+        bucket, prefix = self._gcs_bucket_and_prefix()
+        blobs = [b for b in bucket.list_blobs(prefix=f"{prefix}/" if prefix else None) if b.name.endswith(".mp3")]
+        total = sum(b.size or 0 for b in blobs)
+        deleted = 0
+        for blob in sorted(blobs, key=lambda b: b.updated or b.time_created):
+            if total <= self.gcs_max_bytes:
+                break
+            try:
+                blob.delete()
+                deleted += 1
+            except Exception as e:
+                logger.debug(f"TTS segment cache: could not delete {blob.name}: {e}")
+            total -= blob.size or 0
+        with self._lock:
+            self._counters["gcs_evictions"] += deleted
+        return deleted
+
+    # --- public API ---
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached audio for `key`, or None (counts a miss)."""
+        if self.local_dir:
+            try:
+                data = self._local_get(key)
+                if data is not None:
+                    with self._lock:
+                        self._counters["local_hits"] += 1
+                    return data
+            except Exception as e:
+                self._count_error(f"local read failed: {e}")
+        if self.gcs_uri:
+            try:
+                data = self._gcs_get(key)
+                if data is not None:
+                    with self._lock:
+                        self._counters["gcs_hits"] += 1
+                    if self.local_dir:
+                        self._local_put(key, data)
+                    return data
+            except Exception as e:
+                self._count_error(f"GCS read failed: {e}")
+        with self._lock:
+            self._counters["misses"] += 1
+        return None
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store synthesized audio in every configured tier (best effort)."""
+        if not data:
+            return
+        if self.local_dir:
+            try:
+                self._local_put(key, data)
+            except Exception as e:
+                self._count_error(f"local write failed: {e}")
+        if self.gcs_uri:
+            try:
+                self._gcs_blob(key).upload_from_string(data, content_type="audio/mpeg")
+                self.prune_gcs()
+            except Exception as e:
+                self._count_error(f"GCS write failed: {e}")
+        with self._lock:
+            self._counters["writes"] += 1
+
+    def _count_error(self, message: str) -> None:
+        with self._lock:
+            self._counters["errors"] += 1
+        logger.warning(f"TTS segment cache {message}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            hits = counters["local_hits"] + counters["gcs_hits"]
+            lookups = hits + counters["misses"]
+            return {
+                **counters,
+                "hits": hits,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "local_dir": self.local_dir or None,
+                "local_bytes": self._local_bytes,
+                "max_bytes": self.max_bytes,
+                "gcs_uri": self.gcs_uri or None,
+                "gcs_max_bytes": self.gcs_max_bytes,
+            }
+
+
+_tts_segment_cache: Optional[TTSSegmentCache] = None
+_tts_segment_cache_lock = threading.Lock()
+
+
+def get_tts_segment_cache() -> Optional[TTSSegmentCache]:
+    """Process-wide segment cache, or None when neither tier is configured."""
+    global _tts_segment_cache
+    if not TTS_SEGMENT_CACHE_DIR and not TTS_SEGMENT_CACHE_GCS_URI:
+        return None
+    if _tts_segment_cache is None:
+        with _tts_segment_cache_lock:
+            if _tts_segment_cache is None:
+                _tts_segment_cache = TTSSegmentCache(
+                    local_dir=TTS_SEGMENT_CACHE_DIR,
+                    gcs_uri=TTS_SEGMENT_CACHE_GCS_URI,
+                )
+    return _tts_segment_cache
@@ -0,0 +1,287 @@
+"""
+Versioned Record Store
+
+Shared storage for data kept as one small record per row plus a header
+record carrying a version that every change bumps (the RSS feed store and
+the public episode listing):
+
+    header: {"version": 42, "updated_at": "...", ...extra header fields}
+    rows:   {key: {...dataclass fields...}}
+
+`VersionedRecordCache` keeps an in-process copy of the rows and reloads it
+only when the stored version moves, so readers pay one small read (or none,
+within `check_seconds`) instead of re-reading every row.
+
+Backends:
+- `FirestoreVersionedRecords`: a header document plus one document per row
+  in a collection of its own; changes commit in a transaction with the
+  version bump.
+- `LocalVersionedRecords`: a JSON file for development and tests.
+
+Copyright (c) 2025 Gary Welz / CopernicusAI
+Licensed under MIT License
+"""
+
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+from utils.logging import structured_logger
+
+_FIRESTORE_BATCH_SIZE = 400
+
+R = TypeVar("R")
+
+
+class VersionedRecords(ABC, Generic[R]):
+    """Persistent header and rows (dataclass instances keyed by `key_field`)."""
+
+    def __init__(self, name: str, key_field: str, row_from_dict: Callable[[Dict[str, Any]], R]):
+        self.name = name
+        self.key_field = key_field
+        self.row_from_dict = row_from_dict
+
+    @property
+    @abstractmethod
+    def backend(self) -> str:
+        """Name of the backend ('firestore', 'local')."""
+        pass
+
+    @abstractmethod
+    def version(self) -> Optional[int]:
+        """Current version, or None before the store is bootstrapped."""
+        pass
+
+    @abstractmethod
+    def load(self) -> Tuple[Dict[str, Any], Dict[str, R]]:
+        """Header record and every row by key."""
+        pass
+
+    @abstractmethod
+    def apply(self, upserts: List[R], removals: List[str]) -> int:
+        """Write and delete rows and bump the version atomically; returns the new version."""
+        pass
+
+    @abstractmethod
+    def replace_all(self, header: Dict[str, Any], rows: List[R]) -> int:
+        """Replace every row and the header fields (bootstrap); returns the new version."""
+        pass
+
+    def key(self, row: R) -> str:
+        return getattr(row, self.key_field)
+
+    def _not_bootstrapped(self) -> RuntimeError:
+        return RuntimeError(f"{self.name} is not bootstrapped")
+
+
+class FirestoreVersionedRecords(VersionedRecords[R]):
+    """Header document `header_collection/header_document`, one document per row in `rows_collection`."""
+
+    backend = "firestore"
+
+    def __init__(
+        self,
+        db: Any,
+        header_collection: str,
+        header_document: str,
+        rows_collection: str,
+        name: str,
+        key_field: str,
+        row_from_dict: Callable[[Dict[str, Any]], R],
+        doc_id: Callable[[str], str] = lambda key: key,
+    ):
+        super().__init__(name, key_field, row_from_dict)
+        self.db = db
+        self._header_ref = db.collection(header_collection).document(header_document)
+        self._rows = db.collection(rows_collection)
+        self._doc_id = doc_id
+
+    def version(self) -> Optional[int]:
+        snap = self._header_ref.get()
+        if not snap.exists:
+            return None
+        return int((snap.to_dict() or {}).get("version", 0))
+
+    def load(self) -> Tuple[Dict[str, Any], Dict[str, R]]:
+        snap = self._header_ref.get()
+        header = (snap.to_dict() or {}) if snap.exists else {}
+        rows = {}
+        for doc in self._rows.stream():
+            row = self.row_from_dict(doc.to_dict() or {})
+            rows[self.key(row)] = row
+        return header, rows
+
+    def apply(self, upserts: List[R], removals: List[str]) -> int:
+        from google.cloud import firestore
+
+        @firestore.transactional
+        def run(transaction):
+            snap = self._header_ref.get(transaction=transaction)
+            if not snap.exists:
+                raise self._not_bootstrapped()
+            version = int((snap.to_dict() or {}).get("version", 0)) + 1
+            for row in upserts:
+                transaction.set(self._rows.document(self._doc_id(self.key(row))), asdict(row))
+            for key in removals:
+                transaction.delete(self._rows.document(self._doc_id(key)))
+            transaction.update(self._header_ref, {"version": version, "updated_at": datetime.utcnow().isoformat()})
+            return version
+
+        return run(self.db.transaction())
+
+    def replace_all(self, header: Dict[str, Any], rows: List[R]) -> int:
+        keep = {self._doc_id(self.key(row)) for row in rows}
+        stale = [doc.reference for doc in self._rows.select([self.key_field]).stream() if doc.id not in keep]
+        for start in range(0, len(rows), _FIRESTORE_BATCH_SIZE):
+            batch = self.db.batch()
+            for row in rows[start:start + _FIRESTORE_BATCH_SIZE]:
+                batch.set(self._rows.document(self._doc_id(self.key(row))), asdict(row))
+            batch.commit()
+        for start in range(0, len(stale), _FIRESTORE_BATCH_SIZE):
+            batch = self.db.batch()
+            for ref in stale[start:start + _FIRESTORE_BATCH_SIZE]:
+                batch.delete(ref)
+            batch.commit()
+        # The header goes last: until it exists the store counts as not bootstrapped
+        version = (self.version() or 0) + 1
+        self._header_ref.set({**header, "version": version, "updated_at": datetime.utcnow().isoformat()})
+        return version
+
+
+class LocalVersionedRecords(VersionedRecords[R]):
+    """Header and rows in one JSON file, rewritten atomically on each change."""
+
+    backend = "local"
+
+    def __init__(self, path: str, name: str, key_field: str, row_from_dict: Callable[[Dict[str, Any]], R]):
+        super().__init__(name, key_field, row_from_dict)
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write(self, data: Dict[str, Any]) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def version(self) -> Optional[int]:
+        with self._lock:
+            data = self._read()
+        return None if data is None else int(data["header"]["version"])
+
+    def load(self) -> Tuple[Dict[str, Any], Dict[str, R]]:
+        with self._lock:
+            data = self._read() or {"header": {}, "rows": {}}
+        return data["header"], {key: self.row_from_dict(row) for key, row in data["rows"].items()}
+
+    def apply(self, upserts: List[R], removals: List[str]) -> int:
+        with self._lock:
+            data = self._read()
+            if data is None:
+                raise self._not_bootstrapped()
+            for row in upserts:
+                data["rows"][self.key(row)] = asdict(row)
+            for key in removals:
+                data["rows"].pop(key, None)
+            data["header"]["version"] += 1
+            self._write(data)
+            return data["header"]["version"]
+
+    def replace_all(self, header: Dict[str, Any], rows: List[R]) -> int:
+        with self._lock:
+            data = self._read()
+            version = (data["header"]["version"] if data else 0) + 1
+            self._write({
+                "header": {**header, "version": version},
+                "rows": {self.key(row): asdict(row) for row in rows},
+            })
+            return version
+
+
+class VersionedRecordCache(Generic[R]):
+    """
+    In-process copy of a store's rows, reloaded when the stored version moves.
+
+    The version is checked at most every `check_seconds` (0: on every read).
+    Subclasses derive their caches from `_header`/`_rows` and drop them in
+    `_changed()`. Methods starting with an underscore expect `_lock` held.
+    """
+
+    def __init__(self, records: VersionedRecords[R], check_seconds: float = 0.0):
+        self.records = records
+        self.check_seconds = check_seconds
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._header: Dict[str, Any] = {}
+        self._rows: Dict[str, R] = {}
+
+    def _changed(self, keys: Optional[List[str]]) -> None:
+        """Rows under `keys` changed (None: everything was reloaded)."""
+
+    def _reload(self) -> None:
+        self._header, self._rows = self.records.load()
+        self._version = int(self._header.get("version", 0))
+        self._changed(None)
+        structured_logger.info(f"Loaded {self.records.name}", version=self._version, rows=len(self._rows))
+
+    def _sync(self, force: bool = False) -> None:
+        """Reload if another writer moved the version."""
+        now = time.monotonic()
+        if not force and self._version is not None and now - self._checked_at < self.check_seconds:
+            return
+        version = self.records.version()
+        if version is None:
+            raise RuntimeError(f"{self.records.name} is not bootstrapped")
+        self._checked_at = now
+        if version != self._version:
+            self._reload()
+
+    def _replace_all(self, header: Dict[str, Any], rows: List[R]) -> int:
+        version = self.records.replace_all(header, rows)
+        self._reload()
+        self._checked_at = time.monotonic()
+        structured_logger.info(f"Bootstrapped {self.records.name}", version=version, rows=len(rows))
+        return version
+
+    def is_bootstrapped(self) -> bool:
+        return self._version is not None or self.records.version() is not None
+
+    @property
+    def version(self) -> Optional[int]:
+        return self._version
+
+    def apply(self, upserts: Iterable[R] = (), removals: Iterable[str] = ()) -> int:
+        """Record row changes; returns the version that includes them."""
+        upserts = list(upserts)
+        upsert_keys = {self.records.key(row) for row in upserts}
+        with self._lock:
+            self._sync(force=True)
+            removals = [key for key in removals if key in self._rows and key not in upsert_keys]
+            upserts = [row for row in upserts if self._rows.get(self.records.key(row)) != row]
+            if not upserts and not removals:
+                return self._version
+            previous = self._version
+            version = self.records.apply(upserts, removals)
+            if version != previous + 1:
+                self._reload()  # someone else wrote in between
+                return version
+            for row in upserts:
+                self._rows[self.records.key(row)] = row
+            for key in removals:
+                self._rows.pop(key, None)
+            self._version = version
+            self._changed([self.records.key(row) for row in upserts] + removals)
+            return version
@@ -0,0 +1,204 @@
+"""In-memory stand-ins for the Firestore and Cloud Storage clients used by the unit tests.
+
+Just enough of each API for the services under test; anything else raises
+AttributeError, the way an unexpected call on the real client would fail.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.api_core.exceptions import PreconditionFailed
+from google.cloud import firestore
+
+_MISSING = object()
+
+
+def _field(data: Dict[str, Any], path: str) -> Any:
+    for part in path.split("."):
+        if not isinstance(data, dict) or part not in data:
+            return _MISSING
+        data = data[part]
+    return data
+
+
+_OPS = {
+    "==": lambda value, operand: value == operand,
+    ">": lambda value, operand: value > operand,
+    ">=": lambda value, operand: value >= operand,
+    "<": lambda value, operand: value < operand,
+    "<=": lambda value, operand: value <= operand,
+    "array_contains": lambda value, operand: isinstance(value, list) and operand in value,
+}
+
+
+class FakeSnapshot:
+    def __init__(self, doc_id: str, data: Optional[Dict[str, Any]]):
+        self.id = doc_id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeDocument:
+    def __init__(self, db: "FakeFirestore", path: str, doc_id: str):
+        self._db, self._path, self.id = db, path, doc_id
+
+    @property
+    def _docs(self) -> Dict[str, Dict[str, Any]]:
+        return self._db.docs(self._path)
+
+    def get(self, transaction=None) -> FakeSnapshot:
+        return FakeSnapshot(self.id, self._docs.get(self.id))
+
+    def set(self, data: Dict[str, Any], merge: bool = False) -> None:
+        self._docs[self.id] = _merged(self._docs.get(self.id), data) if merge else dict(data)
+
+    def update(self, data: Dict[str, Any]) -> None:
+        self._docs[self.id] = _merged(self._docs[self.id], data)
+
+    def delete(self) -> None:
+        self._docs.pop(self.id, None)
+
+    def collection(self, name: str) -> "FakeQuery":
+        return FakeQuery(self._db, f"{self._path}/{self.id}/{name}")
+
+
+def _merged(current: Optional[Dict[str, Any]], data: Dict[str, Any]) -> Dict[str, Any]:
+    """`data` merged into `current` (nested maps too), honouring DELETE_FIELD."""
+    merged = dict(current or {})
+    for field, value in data.items():
+        if value is firestore.DELETE_FIELD:
+            merged.pop(field, None)
+        elif isinstance(value, dict):
+            merged[field] = _merged(merged.get(field) if isinstance(merged.get(field), dict) else None, value)
+        else:
+            merged[field] = value
+    return merged
+
+
+class FakeQuery:
+    """A collection and the queries on it (order_by skips documents without the field, as Firestore does)."""
+
+    def __init__(self, db: "FakeFirestore", path: str, filters=(), order=None, descending=False, limit=None):
+        self._db, self._path = db, path
+        self._filters, self._order, self._descending, self._limit = filters, order, descending, limit
+
+    def _with(self, **changes: Any) -> "FakeQuery":
+        state = dict(filters=self._filters, order=self._order, descending=self._descending, limit=self._limit)
+        state.update(changes)
+        return FakeQuery(self._db, self._path, **state)
+
+    def document(self, doc_id: str) -> FakeDocument:
+        return FakeDocument(self._db, self._path, doc_id)
+
+    def where(self, field_path: Optional[str] = None, op_string: Optional[str] = None, value: Any = None,
+              filter: Any = None) -> "FakeQuery":
+        if filter is not None:
+            field_path, op_string, value = filter.field_path, filter.op_string, filter.value
+        return self._with(filters=self._filters + ((field_path, op_string, value),))
+
+    def order_by(self, field_path: str, direction: Optional[str] = None) -> "FakeQuery":
+        return self._with(order=field_path, descending=direction == firestore.Query.DESCENDING)
+
+    def limit(self, count: int) -> "FakeQuery":
+        return self._with(limit=count)
+
+    def stream(self) -> List[FakeSnapshot]:
+        self._db.streams.append((self._path, self._filters[0][0] if self._filters else None))
+        rows = list(self._db.docs(self._path).items())
+        for field_path, op_string, operand in self._filters:
+            rows = [
+                (doc_id, data) for doc_id, data in rows
+                if _field(data, field_path) is not _MISSING and _OPS[op_string](_field(data, field_path), operand)
+            ]
+        if self._order:
+            rows = [(doc_id, data) for doc_id, data in rows if _field(data, self._order) is not _MISSING]
+            rows.sort(key=lambda row: _field(row[1], self._order), reverse=self._descending)
+        return [FakeSnapshot(doc_id, data) for doc_id, data in rows[:self._limit]]
+
+
+class FakeBatch:
+    def __init__(self):
+        self._writes: List[Tuple[FakeDocument, Dict[str, Any], bool]] = []
+
+    def set(self, ref: FakeDocument, data: Dict[str, Any], merge: bool = False) -> None:
+        self._writes.append((ref, data, merge))
+
+    def commit(self) -> None:
+        for ref, data, merge in self._writes:
+            ref.set(data, merge=merge)
+
+
+class FakeFirestore:
+    """
+    Documents live in `data`: collection path -> doc id -> fields (subcollections
+    are keyed by their full path, e.g. "podcast_jobs/job-1/checkpoints").
+
+    `streams` records each query run as (collection path, first filtered field)
+    and `get_all_calls` the refs of each batched read.
+    """
+
+    def __init__(self, data: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None):
+        self.data: Dict[str, Dict[str, Dict[str, Any]]] = data if data is not None else {}
+        self.streams: List[Tuple[str, Optional[str]]] = []
+        self.get_all_calls: List[List[FakeDocument]] = []
+
+    def docs(self, path: str) -> Dict[str, Dict[str, Any]]:
+        return self.data.setdefault(path, {})
+
+    def collection(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def batch(self) -> FakeBatch:
+        return FakeBatch()
+
+    def get_all(self, refs, field_paths=None) -> List[FakeSnapshot]:
+        refs = list(refs)
+        self.get_all_calls.append(refs)
+        return [ref.get() for ref in refs]
+
+
+class FakeBlob:
+    def __init__(self, bucket: "FakeBucket", name: str):
+        self._bucket = bucket
+        self.name = name
+        self.generation = bucket.objects.get(name, (None, None))[0]
+
+    def download_as_bytes(self, if_generation_match: Optional[int] = None) -> bytes:
+        generation, data = self._bucket.objects[self.name]
+        if if_generation_match is not None and generation != if_generation_match:
+            raise PreconditionFailed("generation changed")
+        return data
+
+    def upload_from_string(self, data: bytes, content_type: Optional[str] = None,
+                           if_generation_match: Optional[int] = None) -> None:
+        current = self._bucket.objects.get(self.name, (0, None))[0]
+        if if_generation_match is not None and current != if_generation_match:
+            raise PreconditionFailed("generation changed")
+        self._bucket.generation += 1
+        self._bucket.objects[self.name] = (self._bucket.generation, data)
+        self.generation = self._bucket.generation
+
+
+class FakeBucket:
+    """Objects are name -> (generation, bytes); generations increase across the bucket."""
+
+    def __init__(self):
+        self.objects: Dict[str, Tuple[int, bytes]] = {}
+        self.generation = 0
+
+    def blob(self, name: str) -> FakeBlob:
+        return FakeBlob(self, name)
+
+    def get_blob(self, name: str) -> Optional[FakeBlob]:
+        return FakeBlob(self, name) if name in self.objects else None
+
+
+class FakeStorageClient:
+    """Every bucket name maps to the same FakeBucket."""
+
+    def __init__(self):
+        self._bucket = FakeBucket()
+
+    def bucket(self, name: str) -> FakeBucket:
+        return self._bucket
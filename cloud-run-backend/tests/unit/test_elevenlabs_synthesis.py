@@ -0,0 +1,123 @@
+"""Unit tests for concurrent ElevenLabs segment synthesis."""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+import elevenlabs_voice_service as evs
+from elevenlabs_voice_service import ElevenLabsAPIError, ElevenLabsVoiceService
+
+
+def _service():
+    with patch.object(ElevenLabsVoiceService, "_get_api_key", return_value="test-key"):
+        return ElevenLabsVoiceService()
+
+
+@pytest.mark.asyncio
+async def test_segments_run_concurrently_in_order_with_per_segment_retry():
+    service = _service()
+    active = 0
+    peak = 0
+    calls = {}
+
+    async def fake_synthesize(text, voice_config):
+        nonlocal active, peak
+        calls[text] = calls.get(text, 0) + 1
+        active += 1
+        peak = max(peak, active)
+        try:
+            # Later segments finish first; order must still follow the script
+            await asyncio.sleep(0.001 * (20 - int(text.split()[1])))
+            if text == "line 7" and calls[text] == 1:
+                raise ElevenLabsAPIError(429, "rate limited", retry_after=0)
+            if text == "line 9":
+                raise ElevenLabsAPIError(400, "bad request")
+            return text.encode(), 1.0
+        finally:
+            active -= 1
+
+    requests = [(f"line {i}", service.voice_configs["host"]) for i in range(12)]
+    with patch.object(evs, "ELEVENLABS_MAX_CONCURRENCY", 3), \
+            patch.object(evs, "ELEVENLABS_REQUESTS_PER_SECOND", 0), \
+            patch.object(service, "_synthesize_segment", side_effect=fake_synthesize):
+        results = await service._synthesize_segments_concurrently(requests)
+    await service.close()
+
+    assert [r[0].decode() if r else None for r in results] == [
+        f"line {i}" if i != 9 else None for i in range(12)
+    ]
+    assert 1 < peak <= 3
+    assert calls["line 7"] == 2  # retried alone, nothing else re-run
+    assert calls["line 9"] == 1  # non-retryable errors are not retried
+    assert all(calls[f"line {i}"] == 1 for i in range(12) if i != 7)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_request_starts():
+    limiter = evs._RequestRateLimiter(requests_per_second=50)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await asyncio.gather(*(limiter.wait() for _ in range(5)))
+    assert loop.time() - started >= 4 / 50 * 0.9
+
+
+@pytest.mark.asyncio
+async def test_local_concat_lists_segments_in_order_and_cleans_up(tmp_path):
+    service = _service()
+    seen = {}
+
+    async def fake_ffmpeg(*args, **kwargs):
+        # Stand-in for `ffmpeg -f concat -c copy`: join the listed files byte for byte
+        list_path, output_path = args[args.index("-i") + 1], args[-1]
+        seen["args"] = args
+        lines = open(list_path).read().splitlines()
+        assert lines[0] == "ffconcat version 1.0"
+        with open(output_path, "wb") as out:
+            for line in lines[1:]:
+                out.write(open(line[len("file '"):-1], "rb").read())
+
+        class _Process:
+            returncode = 0
+
+            async def communicate(self):
+                return b"", b""
+        return _Process()
+
+    segments = [f"seg{i};".encode() for i in range(25)]
+    with patch.object(evs, "AUDIO_CONCAT_SPOOL_DIR", str(tmp_path)), \
+            patch.object(evs.asyncio, "create_subprocess_exec", side_effect=fake_ffmpeg):
+        combined = await service._combine_audio_segments(segments)
+
+    assert combined == b"".join(segments)
+    assert seen["args"][seen["args"].index("-c") + 1] == "copy"
+    assert list(tmp_path.iterdir()) == []  # spool directory removed
+
+
+@pytest.mark.asyncio
+async def test_one_session_per_event_loop_and_close_reaches_them_all():
+    import threading
+
+    service = _service()
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        here = await service._get_session()
+        assert await service._get_session() is here
+        there = asyncio.run_coroutine_threadsafe(service._get_session(), other_loop).result(timeout=5)
+        assert there is not here
+        # Using the service from another loop leaves this loop's session alone
+        assert await service._get_session() is here and not here.closed
+
+        await service.close()
+        assert here.closed and there.closed
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join(timeout=5)
+        other_loop.close()
+
+    # Sessions of loops that have since closed are forgotten, not reused
+    stale = await asyncio.to_thread(asyncio.run, service._get_session())
+    assert await service._get_session() is not stale
+    assert list(service._loop_states) == [asyncio.get_running_loop()]
+    await service.close()
@@ -0,0 +1,92 @@
+"""Unit tests for the query embedding cache."""
+from unittest.mock import MagicMock, patch
+
+from services import embedding_cache
+from services.embedding_cache import EmbeddingCache, embed_query
+
+
+def _service(provider="openai", model="text-embedding-3-small"):
+    service = MagicMock()
+    service.provider = provider
+    service.model_name = model
+    service.embed_text.side_effect = lambda text: [float(len(text)), 0.5]
+    return service
+
+
+def test_lru_evicts_least_recently_used():
+    cache = EmbeddingCache(max_entries=2)
+    cache.put("openai", "m", "a", [1.0])
+    cache.put("openai", "m", "b", [2.0])
+    assert cache.get("openai", "m", "a") == [1.0]
+    cache.put("openai", "m", "c", [3.0])
+
+    assert cache.get("openai", "m", "b") is None
+    assert cache.get("openai", "m", "a") == [1.0]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expires_entries():
+    cache = EmbeddingCache(ttl_seconds=60)
+    with patch.object(embedding_cache.time, "time", return_value=1000.0):
+        cache.put("openai", "m", "q", [1.0])
+    with patch.object(embedding_cache.time, "time", return_value=1030.0):
+        assert cache.get("openai", "m", "q") == [1.0]
+    with patch.object(embedding_cache.time, "time", return_value=1061.0):
+        assert cache.get("openai", "m", "q") is None
+
+
+def test_key_includes_provider_model_and_normalized_text():
+    cache = EmbeddingCache()
+    cache.put("openai", "small", "  black   holes\n", [1.0])
+
+    assert cache.get("openai", "small", "black holes") == [1.0]
+    assert cache.get("openai", "large", "black holes") is None
+    assert cache.get("voyage", "small", "black holes") is None
+
+
+def test_sqlite_tier_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite3")
+    EmbeddingCache(sqlite_path=path).put("openai", "m", "crispr", [0.25, -1.5])
+
+    other_worker = EmbeddingCache(sqlite_path=path)
+    assert other_worker.get("openai", "m", "crispr") == [0.25, -1.5]
+    stats = other_worker.stats()
+    assert stats["sqlite_hits"] == 1
+    # Promoted into memory: the next lookup doesn't touch SQLite
+    assert other_worker.get("openai", "m", "crispr") == [0.25, -1.5]
+    assert other_worker.stats()["memory_hits"] == 1
+
+
+def test_embed_query_calls_provider_once_per_query():
+    service = _service()
+    with patch.object(embedding_cache, "_embedding_cache", EmbeddingCache()):
+        first = embed_query("quantum  error correction", service)
+        second = embed_query("quantum error correction", service)
+        stats = embedding_cache.get_embedding_cache().stats()
+
+    assert first == second
+    service.embed_text.assert_called_once_with("quantum error correction")
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_callers_cannot_modify_cached_vectors(tmp_path):
+    cache = EmbeddingCache(sqlite_path=str(tmp_path / "cache.sqlite3"))
+    stored = [1.0, 2.0]
+    cache.put("openai", "m", "q", stored)
+    stored.append(3.0)
+    cache.get("openai", "m", "q").append(4.0)
+
+    assert cache.get("openai", "m", "q") == [1.0, 2.0]
+    cache.clear()
+    cache.get("openai", "m", "q")[0] = 9.0  # served from the SQLite tier
+    assert cache.get("openai", "m", "q") == [1.0, 2.0]
+
+
+def test_memory_hits_do_not_wait_for_sqlite_io(tmp_path):
+    cache = EmbeddingCache(sqlite_path=str(tmp_path / "cache.sqlite3"))
+    cache.put("openai", "m", "q", [1.0])
+
+    # Another thread is mid-way through a SQLite read or write
+    with cache._sqlite_lock:
+        assert cache.get("openai", "m", "q") == [1.0]
+        assert cache.stats()["memory_hits"] == 1
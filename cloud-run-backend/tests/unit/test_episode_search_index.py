@@ -0,0 +1,184 @@
+"""Unit tests for the episode search index."""
+import threading
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from config.constants import EPISODE_COLLECTION_NAME
+from endpoints.public import routes as public_routes
+from services.episode_search_index import (
+    EpisodeSearchIndex,
+    EpisodeSearchIndexStore,
+    episode_text_fields,
+    parse_query,
+)
+from tests.unit.fakes import FakeFirestore, FakeStorageClient
+
+TRANSCRIPT = (
+    "# EVER-PHYS-250101 - Transcript\n"
+    "**HOST:** Welcome back. Today we ask where the origin of life began.\n\n"
+    "**EXPERT:** Hydrothermal vents are a leading candidate for the origin of life.\n\n"
+)
+
+
+def _index():
+    index = EpisodeSearchIndex()
+    index.update_fields("ep-vents", episode_text_fields({
+        "title": "Hydrothermal Vents",
+        "description_markdown": "**Deep sea** chemistry and [early cells](https://example.org)",
+        "summary": "Where did life start?",
+    }))
+    index.update_fields("ep-vents", {"transcript": TRANSCRIPT})
+    index.update_fields("ep-neuro", episode_text_fields({
+        "title": "Neuroscience of Memory",
+        "description_html": "<p>How the <b>life</b> of a memory ends</p>",
+    }))
+    index.update_fields("ep-quantum", episode_text_fields({"title": "Quantum Origin Stories"}))
+    return index
+
+
+def _ids(hits):
+    return [hit.episode_id for hit in hits]
+
+
+def test_clauses_phrases_and_prefixes():
+    index = _index()
+    assert parse_query('x-ray "origin of life" the') == [(("x", 0), ("ray", 1)), (("origin", 0), ("life", 2))]
+
+    assert set(_ids(index.search(parse_query("life")))) == {"ep-vents", "ep-neuro"}
+    assert _ids(index.search(parse_query("deep chemistry"))) == ["ep-vents"]
+    assert _ids(index.search(parse_query("neuro"))) == ["ep-neuro"]
+    # Transcript text is only searched when asked for
+    assert index.search(parse_query('"origin of life"')) == []
+    hits = index.search(parse_query('"origin of life"'), include_transcript=True)
+    assert _ids(hits) == ["ep-vents"]
+    assert hits[0].transcript_position is not None
+    assert set(_ids(index.search(parse_query("origin"), include_transcript=True))) == {"ep-quantum", "ep-vents"}
+
+
+def test_transcript_excerpt_comes_from_the_index():
+    index = _index()
+    hit = index.search(parse_query('vents "origin of life"'), include_transcript=True)[0]
+    timestamp, snippet = index.transcript_excerpt(hit.episode_id, hit.transcript_position)
+    assert "HOST" not in snippet and "**" not in snippet
+    assert "where the origin of life began" in snippet
+    assert timestamp == int(hit.transcript_position / 2.5)
+
+
+def test_incremental_updates_and_round_trip():
+    index = _index()
+    index.update_fields("ep-neuro", {"title": "Sleep and Memory"})
+    assert index.search(parse_query("neuroscience")) == []
+    assert _ids(index.search(parse_query("sleep"))) == ["ep-neuro"]
+    assert not index.update_fields("ep-neuro", {"title": "Sleep and Memory"})
+
+    assert index.remove("ep-quantum")
+    assert "ep-quantum" not in index and "quantum" not in index.postings
+
+    restored = EpisodeSearchIndex.from_bytes(index.to_bytes())
+    assert restored.postings == index.postings
+    assert restored.lengths == index.lengths
+    assert _ids(restored.search(parse_query('"origin of life"'), include_transcript=True)) == ["ep-vents"]
+
+
+def _store(client, uri, **kwargs):
+    return EpisodeSearchIndexStore(gcs_uri=uri, client=client, flush_seconds=3600, **kwargs)
+
+
+def test_concurrent_writers_merge_through_conditional_writes():
+    client = FakeStorageClient()
+    uri = "gs://bucket/search/episodes.json.gz"
+    first = _store(client, uri, refresh_seconds=3600)
+    second = _store(client, uri, refresh_seconds=3600)
+
+    # No index yet: incremental updates don't start a partial one
+    assert not first.update("ep-1", {"title": "Black Holes"})
+    assert first.put(_index())
+    assert second.get().size == 3
+
+    # Updates are visible straight away but only written by the (debounced) flush
+    generation = client._bucket.generation
+    assert first.update("ep-1", {"title": "Black Holes"})
+    assert first.get().search(parse_query("black"))
+    assert client._bucket.generation == generation
+    assert first.flush()
+
+    # `second` still holds the older copy; its write conflicts, reloads and re-applies
+    assert second.update("ep-2", {"title": "Dark Matter"})
+    assert second.flush()
+    assert second.get().search(parse_query("black"))
+
+    merged = _store(client, uri).get()
+    assert {"ep-1", "ep-2"} <= set(merged.texts)
+    assert second.remove("ep-1")
+    second.close()
+    assert "ep-1" not in _store(client, uri).get()
+
+
+def test_updates_never_change_an_index_being_searched():
+    store = _store(FakeStorageClient(), "gs://bucket/episodes.json.gz")
+    store.put(_index())
+    before = store.get()
+    snapshot = before.to_bytes()
+
+    store.update("ep-vents", {"title": "Black Smokers", "transcript": "Deep vents and black smokers."})
+    store.update("ep-new", {"title": "Origin of Life in Vents"})
+    store.remove("ep-neuro")
+
+    # The index handed out earlier is untouched; the store serves the new one
+    assert before.to_bytes() == snapshot
+    assert _ids(before.search(parse_query("neuroscience"))) == ["ep-neuro"]
+    after = store.get()
+    assert after.search(parse_query("neuroscience")) == []
+    assert set(_ids(after.search(parse_query("vents"), include_transcript=True))) == {"ep-new", "ep-vents"}
+    assert EpisodeSearchIndex.from_bytes(after.to_bytes()).postings == after.postings
+
+
+def test_searches_run_while_updates_land():
+    store = _store(FakeStorageClient(), "gs://bucket/episodes.json.gz")
+    store.put(_index())
+    errors = []
+
+    def search():
+        try:
+            for _ in range(200):
+                store.get().search(parse_query("life origin"), include_transcript=True)
+        except Exception as e:  # pragma: no cover - the failure being guarded against
+            errors.append(e)
+
+    threads = [threading.Thread(target=search) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for i in range(200):
+        store.update(f"ep-{i}", {"title": f"Origin of life {i}", "transcript": "life " * 50})
+        store.remove(f"ep-{i - 1}")
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+def test_endpoint_serves_ranked_hits_from_the_index(tmp_path):
+    store = EpisodeSearchIndexStore(local_path=str(tmp_path / "episodes.json.gz"))
+    store.put(_index())
+
+    db = FakeFirestore()
+    for doc_id in ("ep-vents", "ep-neuro"):  # ep-quantum's episode document is gone
+        db.docs(EPISODE_COLLECTION_NAME)[doc_id] = {"title": doc_id, "slug": doc_id}
+
+    app = FastAPI()
+    app.include_router(public_routes.router)
+    client = TestClient(app)
+    with patch.object(public_routes, "db", db), \
+            patch.object(public_routes, "get_episode_search_store", lambda: store):
+        body = client.get("/api/episodes/search",
+                          params={"q": '"origin of life"', "search_transcripts": True}).json()
+        assert [e["episode_id"] for e in body["episodes"]] == ["ep-vents"]
+        episode = body["episodes"][0]
+        assert episode["transcript_match"] is True
+        assert "origin of life" in episode["transcript_snippet"]
+        assert episode["episode_link"].endswith("/ep-vents")
+
+        # Hits whose episode document is gone are dropped
+        body = client.get("/api/episodes/search", params={"q": "origin"}).json()
+        assert [e["episode_id"] for e in body["episodes"]] == []
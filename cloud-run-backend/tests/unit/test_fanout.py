@@ -0,0 +1,136 @@
+"""Unit tests for the concurrent search fan-out helper."""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from mcp_server.utils import fanout
+from mcp_server.utils.fanout import fan_out
+
+
+def _boom():
+    raise RuntimeError("index unavailable")
+
+
+@pytest.mark.asyncio
+async def test_fan_out_reports_ok_timeout_and_error():
+    results, report = await fan_out(
+        {
+            "fast": lambda: [1, 2],
+            "slow": lambda: time.sleep(0.5) or ["late"],
+            "broken": _boom,
+        },
+        timeout=0.1,
+        default=[],
+    )
+
+    assert results == {"fast": [1, 2], "slow": [], "broken": []}
+    assert report["fast"]["status"] == "ok"
+    assert report["slow"]["status"] == "timeout"
+    assert report["broken"] == {
+        "status": "error",
+        "error": "index unavailable",
+        "latency_ms": report["broken"]["latency_ms"],
+        "queue_ms": report["broken"]["queue_ms"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_fan_out_runs_tasks_concurrently():
+    started = time.perf_counter()
+    results, _ = await fan_out({str(i): (lambda i=i: time.sleep(0.2) or i) for i in range(4)}, timeout=2)
+
+    assert results == {"0": 0, "1": 1, "2": 2, "3": 3}
+    assert time.perf_counter() - started < 0.6
+
+
+@pytest.mark.asyncio
+async def test_timeout_runs_from_when_a_task_starts_not_while_it_is_queued():
+    ran = []
+
+    def task(i, seconds):
+        def run():
+            ran.append(i)
+            time.sleep(seconds)
+            return i
+        return run
+
+    with ThreadPoolExecutor(max_workers=1) as pool, patch.object(fanout, "get_fanout_executor", lambda: pool):
+        # Each task fits its timeout, though the second one finishes 0.6s after submission
+        results, report = await fan_out({str(i): task(i, 0.3) for i in range(2)}, timeout=0.5)
+        assert results == {"0": 0, "1": 1}
+        assert all(entry["status"] == "ok" for entry in report.values())
+        assert report["1"]["queue_ms"] >= 250 and report["1"]["latency_ms"] < 500
+
+        # A task still waiting for a worker when its queue time runs out is dropped unrun
+        ran.clear()
+        results, report = await fan_out({"hog": task("hog", 0.5), "starved": task("starved", 0)},
+                                        timeout=0.1, default=None)
+        assert report["hog"]["status"] == "timeout"
+        assert report["starved"] == {"status": "timeout", "queued": True,
+                                     "queue_ms": report["starved"]["queue_ms"], "latency_ms": 0}
+    assert ran == ["hog"]
+
+
+@pytest.mark.asyncio
+async def test_search_semantic_embeds_the_query_off_the_event_loop_with_a_timeout():
+    import json
+    import threading
+    from unittest.mock import AsyncMock, MagicMock
+
+    from mcp_server.tools import vector_search
+
+    embed_threads = []
+
+    def slow_embed(query):
+        embed_threads.append(threading.current_thread())
+        time.sleep(0.5)
+        return [0.1]
+
+    with patch("mcp_server.config.SEARCH_FANOUT_TIMEOUT_SECONDS", 0.1), \
+            patch.object(vector_search, "embed_query", slow_embed), \
+            patch.object(vector_search, "get_firestore_client", MagicMock()), \
+            patch.object(vector_search, "_keyword_fallback_search", AsyncMock(return_value={})):
+        started = time.perf_counter()
+        results = json.loads(await vector_search.search_semantic("black holes", content_types=["papers"]))
+
+    assert time.perf_counter() - started < 0.4
+    assert embed_threads and embed_threads[0] is not threading.main_thread()
+    assert results["search_method"] == "keyword_only"
+    assert results["embedding_report"]["status"] == "timeout"
+
+
+@pytest.mark.asyncio
+async def test_find_similar_content_loads_its_source_off_the_event_loop_with_a_timeout():
+    import json
+    import threading
+    from unittest.mock import MagicMock
+
+    from mcp_server.tools import vector_search
+
+    embed_threads = []
+
+    def slow_embed(text):
+        embed_threads.append(threading.current_thread())
+        time.sleep(0.5)
+        return [0.1]
+
+    db = MagicMock()
+    db.collection.return_value.document.return_value.get.return_value.to_dict.return_value = {"title": "No embedding"}
+    embedding_service = MagicMock()
+    embedding_service.embed_text.side_effect = slow_embed
+    with patch("mcp_server.config.SEARCH_FANOUT_TIMEOUT_SECONDS", 0.1), \
+            patch.object(vector_search, "get_firestore_client", return_value=db), \
+            patch.object(vector_search, "get_embedding_service", return_value=embedding_service):
+        started = time.perf_counter()
+        results = json.loads(await vector_search.find_similar_content("p1", "paper"))
+
+    assert time.perf_counter() - started < 0.4
+    assert embed_threads and embed_threads[0] is not threading.main_thread()
+    assert results["error"].startswith("Could not load source content") and "timeout" in results["error"]
+
+    db.collection.return_value.document.return_value.get.return_value.exists = False
+    with patch.object(vector_search, "get_firestore_client", return_value=db):
+        results = json.loads(await vector_search.find_similar_content("p1", "glmp"))
+    assert results == {"error": "GLMP process not found: p1", "similar_content": []}
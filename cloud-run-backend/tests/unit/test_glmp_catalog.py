@@ -0,0 +1,132 @@
+"""Unit tests for the in-memory GLMP process catalog."""
+import json
+from datetime import datetime
+
+from google.api_core.exceptions import NotModified, PreconditionFailed
+
+from mcp_server.utils.glmp_catalog import GLMPCatalog
+
+PREFIX = "glmp-v2/processes/"
+
+
+class _Blob:
+    def __init__(self, bucket, name):
+        self._bucket = bucket
+        self.name = name
+        self.generation, self.raw = bucket.objects[name]
+        self.etag = f"etag-{self.generation}"
+        self.size = len(self.raw)
+        self.updated = datetime(2026, 1, 1)
+
+    def download_as_bytes(self, if_generation_match=None):
+        generation, raw = self._bucket.objects[self.name]
+        if if_generation_match is not None and generation != if_generation_match:
+            raise PreconditionFailed("generation changed")
+        self._bucket.downloads.append(self.name)
+        return raw
+
+
+class _Bucket:
+    def __init__(self):
+        self.objects = {}
+        self.downloads = []
+        self.listings = 0
+        self._generation = 0
+
+    def put(self, name, data):
+        self._generation += 1
+        raw = data if isinstance(data, bytes) else json.dumps(data).encode()
+        self.objects[name] = (self._generation, raw)
+
+    def list_blobs(self, prefix, fields=None):
+        self.listings += 1
+        return [_Blob(self, name) for name in sorted(self.objects) if name.startswith(prefix)]
+
+    def get_blob(self, name, if_generation_not_match=None):
+        if name not in self.objects:
+            return None
+        if if_generation_not_match is not None and self.objects[name][0] == if_generation_not_match:
+            raise NotModified("not modified")
+        return _Blob(self, name)
+
+
+class _Client:
+    def __init__(self, bucket):
+        self._bucket = bucket
+
+    def bucket(self, name):
+        return self._bucket
+
+
+def _catalog(bucket, **kwargs):
+    return GLMPCatalog("bucket", client=_Client(bucket), fetch_workers=1, **kwargs)
+
+
+def test_refresh_downloads_only_new_or_changed_blobs():
+    bucket = _Bucket()
+    bucket.put(f"{PREFIX}a.json", {"id": "a", "title": "A", "mermaid": "flowchart TD"})
+    bucket.put(f"{PREFIX}b.json", {"id": "b", "title": "B"})
+    bucket.put(f"{PREFIX}notes.txt", b"ignored")
+    catalog = _catalog(bucket, refresh_seconds=0)
+
+    assert catalog.names(PREFIX) == [f"{PREFIX}a.json", f"{PREFIX}b.json"]
+    assert catalog.entry(f"{PREFIX}a.json").mermaid == "flowchart TD"
+    assert sorted(bucket.downloads) == [f"{PREFIX}a.json", f"{PREFIX}b.json"]
+
+    bucket.downloads.clear()
+    bucket.put(f"{PREFIX}b.json", {"id": "b", "title": "B2"})
+    del bucket.objects[f"{PREFIX}a.json"]
+    assert catalog.refresh(PREFIX) == {"listed": 1, "fetched": 1, "removed": 1}
+    assert bucket.downloads == [f"{PREFIX}b.json"]
+    assert catalog.names(PREFIX) == [f"{PREFIX}b.json"]
+    assert catalog.entry(f"{PREFIX}b.json").data["title"] == "B2"
+
+
+def test_fresh_listing_serves_from_memory_and_stale_entries_revalidate():
+    bucket = _Bucket()
+    bucket.put(f"{PREFIX}a.json", {"id": "a"})
+    catalog = _catalog(bucket, refresh_seconds=3600)
+
+    catalog.names(PREFIX)
+    catalog.names(PREFIX)
+    catalog.entry(f"{PREFIX}a.json")
+    assert bucket.listings == 1
+    assert len(bucket.downloads) == 1
+
+    # Once stale, an unchanged blob is revalidated with a conditional GET, not re-downloaded
+    catalog.refresh_seconds = 0
+    catalog._listed_at.clear()
+    assert catalog.entry(f"{PREFIX}a.json").data == {"id": "a"}
+    assert catalog.stats["not_modified"] == 1
+    assert len(bucket.downloads) == 1
+
+    bucket.put(f"{PREFIX}new.json", {"id": "new"})
+    assert catalog.entry(f"{PREFIX}new.json").data == {"id": "new"}
+    assert catalog.entry(f"{PREFIX}missing.json") is None
+
+
+def test_invalid_json_is_kept_as_an_error_entry():
+    bucket = _Bucket()
+    bucket.put(f"{PREFIX}broken.json", b"{not json")
+    catalog = _catalog(bucket)
+
+    entry = catalog.entry(f"{PREFIX}broken.json")
+    assert entry.data is None
+    assert entry.error
+
+
+def test_mirror_lets_a_new_instance_start_warm(tmp_path):
+    bucket = _Bucket()
+    bucket.put(f"{PREFIX}a.json", {"id": "a"})
+    bucket.put(f"{PREFIX}b.json", {"id": "b"})
+    _catalog(bucket, mirror_dir=str(tmp_path)).names(PREFIX)
+
+    bucket.downloads.clear()
+    bucket.put(f"{PREFIX}b.json", {"id": "b", "v": 2})
+    restarted = _catalog(bucket, mirror_dir=str(tmp_path))
+    assert restarted.entry(f"{PREFIX}a.json").data == {"id": "a"}
+    assert bucket.downloads == []
+
+    restarted.names(PREFIX)
+    assert bucket.downloads == [f"{PREFIX}b.json"]
+    assert restarted.entry(f"{PREFIX}b.json").data == {"id": "b", "v": 2}
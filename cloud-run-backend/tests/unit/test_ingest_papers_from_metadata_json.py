@@ -0,0 +1,195 @@
+"""Unit tests for the paper ingestion pipeline (scripts/ingest_papers_from_metadata_json.py)."""
+import queue
+import threading
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import scripts.ingest_papers_from_metadata_json as ingest
+from tests.unit.fakes import FakeFirestore
+
+
+class _Operation:
+    def __init__(self, ref):
+        self.reference = ref
+
+
+class _Failure:
+    def __init__(self, ref, code, attempts):
+        self.code = code
+        self.attempts = attempts
+        self.message = f"status {code}"
+        self.operation = _Operation(ref)
+
+
+class _BulkWriter:
+    """Buffers operations until flush(); `codes[doc_id]` are the error codes of successive attempts."""
+
+    def __init__(self, codes):
+        self.codes = codes
+        self.ops = []
+        self.docs = {}
+        self.flushes = []
+        self.attempts = {}
+        self.closed = False
+
+    def on_write_result(self, callback):
+        self._on_result = callback
+
+    def on_write_error(self, callback):
+        self._on_error = callback
+
+    def create(self, ref, doc):
+        self.ops.append(("create", ref, doc))
+
+    def set(self, ref, doc, merge=False):
+        self.ops.append(("set", ref, doc))
+
+    def flush(self):
+        self.flushes.append([ref.id for _, ref, _ in self.ops])
+        for _, ref, doc in self.ops:
+            codes = self.codes.get(ref.id, [])
+            attempt = 1
+            while True:
+                self.attempts[ref.id] = attempt
+                code = codes[attempt - 1] if attempt <= len(codes) else 0
+                if not code:
+                    self.docs[ref.id] = doc
+                    self._on_result(ref, None, self)
+                    break
+                if not self._on_error(_Failure(ref, code, attempt), self):
+                    break
+                attempt += 1
+        self.ops = []
+
+    def close(self):
+        self.closed = True
+
+
+class _Db(FakeFirestore):
+    def __init__(self, writer, existing=()):
+        super().__init__({"research_papers": {doc_id: {} for doc_id in existing}})
+        self.writer = writer
+
+    def bulk_writer(self):
+        return self.writer
+
+
+def _run_writer(db, batches, tmp_path, skip_existing=True, max_pending=2):
+    write_q = queue.Queue()
+    for batch in batches:
+        write_q.put(batch)
+    write_q.put(None)
+    stats = ingest._PipelineStats()
+    graph_ids = []
+    checkpoint = tmp_path / "checkpoint.txt"
+    with patch.object(ingest, "record_graph_changes", lambda _db, _col, ids: graph_ids.extend(ids)):
+        ingest._writer_stage(
+            db, db.collection("research_papers"), write_q, skip_existing, False, True, checkpoint, max_pending, stats, threading.Event()
+        )
+    return stats, graph_ids, checkpoint
+
+
+def test_doc_ids_prefer_source_ids_and_fall_back_to_a_stable_hash():
+    assert ingest._doc_id_for_paper({"pmid": "123", "arxiv_id": "2401.1"}) == "pubmed_123"
+    assert ingest._doc_id_for_paper({"arxiv_id": "hep-th/9901001"}) == "arxiv_hep-th_9901001"
+    assert ingest._doc_id_for_paper({"bibcode": "2024ApJ...1A"}) == "nasa_ads_2024ApJ...1A"
+    assert ingest._doc_id_for_paper({"id": "openalex_W1"}) == "openalex_W1"
+
+    paper = {"id": "paper_123", "title": "Dark Matter Halos", "authors": ["Vera Rubin"], "year": 1970}
+    doc_id = ingest._doc_id_for_paper(paper)
+    assert doc_id.startswith("paper_") and len(doc_id) == len("paper_") + 32
+    # Enrichment must not change the id
+    assert ingest._doc_id_for_paper({**paper, "abstract": "Added later"}) == doc_id
+
+
+def test_firestore_document_carries_iso_timestamps():
+    doc = ingest._to_firestore_paper(
+        {"title": "T", "authors": "A. Author", "doi": "https://doi.org/10.1/X", "arxivId": "2401.1"},
+        Path("papers/physics/recent/x.json"),
+    )
+    assert doc["authors"] == ["A. Author"]
+    assert doc["arxiv_id"] == "2401.1"
+    for field in ("created_at", "updated_at"):
+        assert datetime.fromisoformat(doc[field].replace("Z", "+00:00"))
+
+
+def test_writer_flushes_every_max_pending_and_checkpoints_the_last_path(tmp_path):
+    writer = _BulkWriter({})
+    batches = [
+        [("a", {"n": 1}, "f1"), ("b", {"n": 2}, "f2")],
+        [("c", {"n": 3}, "f3")],
+        [(None, None, "f4")],  # everything in this batch already existed
+        [("d", {"n": 4}, "f5"), ("e", {"n": 5}, "f6")],
+    ]
+    stats, graph_ids, checkpoint = _run_writer(_Db(writer), batches, tmp_path)
+
+    # Flushed once max_pending is reached, then once more at the end of the input
+    assert writer.flushes == [["a", "b"], ["c", "d", "e"], []]
+    assert set(writer.docs) == {"a", "b", "c", "d", "e"}
+    assert stats.written == 5 and stats.failed == 0
+    assert graph_ids == ["a", "b", "c", "d", "e"]
+    assert checkpoint.read_text().strip() == "f6"
+    assert writer.closed
+
+
+def test_writer_retries_transient_failures_and_counts_existing_and_exhausted(tmp_path):
+    unavailable = 14
+    writer = _BulkWriter({
+        "flaky": [unavailable, unavailable],
+        "exists": [ingest._GRPC_ALREADY_EXISTS],
+        "broken": [unavailable] * ingest._WRITE_MAX_ATTEMPTS,
+    })
+    batches = [[("flaky", {}, "f1"), ("exists", {}, "f2"), ("broken", {}, "f3"), ("ok", {}, "f4")]]
+    stats, graph_ids, _ = _run_writer(_Db(writer), batches, tmp_path, max_pending=100)
+
+    assert writer.attempts == {"flaky": 3, "exists": 1, "broken": ingest._WRITE_MAX_ATTEMPTS, "ok": 1}
+    assert (stats.written, stats.skipped, stats.failed) == (2, 1, 1)
+    assert sorted(graph_ids) == ["flaky", "ok"]
+
+
+def test_checkpoint_never_moves_past_a_failed_write(tmp_path):
+    writer = _BulkWriter({"broken": [14] * ingest._WRITE_MAX_ATTEMPTS})
+    batches = [
+        [("a", {}, "f1")],
+        [("broken", {}, "f2")],
+        [("c", {}, "f3")],
+    ]
+    stats, _, checkpoint = _run_writer(_Db(writer), batches, tmp_path, skip_existing=False, max_pending=1)
+
+    assert writer.flushes == [["a"], ["broken"], ["c"], []]
+    assert (stats.written, stats.failed) == (2, 1)
+    # Resuming starts after f1, so "broken" is retried
+    assert checkpoint.read_text().strip() == "f1"
+
+
+def test_existence_stage_drops_existing_and_repeated_ids():
+    db = _Db(_BulkWriter({}), existing={"old"})
+    check_q, write_q = queue.Queue(), queue.Queue()
+    check_q.put([("old", {}, "f1"), ("new", {}, "f2"), ("new", {}, "f3")])
+    check_q.put([("old", {}, "f4")])
+    check_q.put(None)
+    stats = ingest._PipelineStats()
+    stage_failed = threading.Event()
+    ingest._existence_stage(db, db.collection("research_papers"), check_q, write_q, True, stats, stage_failed)
+
+    assert not stage_failed.is_set()
+    assert write_q.get() == [("new", {}, "f2")]
+    # A batch with nothing left still carries its checkpoint position
+    assert write_q.get() == [(None, None, "f4")]
+    assert write_q.get() is None
+    assert (stats.attempted, stats.skipped) == (4, 3)
+
+
+def test_a_dead_stage_stops_the_main_thread_instead_of_blocking_it():
+    db = _Db(_BulkWriter({}))
+    check_q, write_q = queue.Queue(maxsize=1), queue.Queue()
+    check_q.put([("malformed",)])
+    stage_failed = threading.Event()
+    ingest._existence_stage(db, db.collection("research_papers"), check_q, write_q, True, ingest._PipelineStats(), stage_failed)
+
+    assert stage_failed.is_set()
+    assert write_q.get() is None
+    # Nobody reads check_q any more: the main thread's hand-off gives up instead of waiting
+    check_q.put([("x", {}, "f1")])
+    assert not ingest._stage_put(check_q, [("y", {}, "f2")], stage_failed)
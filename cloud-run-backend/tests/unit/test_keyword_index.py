@@ -0,0 +1,164 @@
+"""Unit tests for the BM25 keyword index behind the keyword fallback search."""
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mcp_server.utils.keyword_index import (
+    KeywordIndex,
+    KeywordIndexStore,
+    extract_keyword_fields,
+)
+from tests.unit.fakes import FakeStorageClient
+
+
+def _index():
+    index = KeywordIndex("research_papers")
+    index.add_document("p1", "Quantum error correction", "Surface codes for fault tolerant qubits")
+    index.add_document("p2", "Protein folding", "Deep learning predicts protein structure from sequence")
+    index.add_document("p3", "Neuroscience of memory", "Hippocampal replay during sleep and quantum myths")
+    return index
+
+
+def test_title_hits_outrank_body_hits():
+    hits = _index().search(["quantum"], limit=10)
+
+    assert [doc_id for doc_id, _, _ in hits] == ["p1", "p3"]
+    # Same pseudo-similarity formula as the scan path: 2*title + body over 2*tokens
+    assert hits[0][2] == 0.95
+    assert hits[1][2] == 0.5
+
+
+def test_prefix_expansion_matches_longer_terms():
+    hits = _index().search(["neuro"], limit=10)
+
+    assert [doc_id for doc_id, _, _ in hits] == ["p3"]
+
+
+def test_incremental_update_and_remove():
+    index = _index()
+    index.add_document("p2", "Quantum protein dynamics", "")
+    assert {doc_id for doc_id, _, _ in index.search(["quantum"], 10)} == {"p1", "p2", "p3"}
+    assert index.search(["sequence"], 10) == []
+
+    assert index.remove_document("p1") is True
+    assert index.remove_document("p1") is False
+    assert "surface" not in index.postings
+    assert {doc_id for doc_id, _, _ in index.search(["quantum"], 10)} == {"p2", "p3"}
+
+
+def test_serialization_roundtrip_supports_updates():
+    restored = KeywordIndex.from_bytes(_index().to_bytes())
+
+    assert restored.search(["protein"], 5) == _index().search(["protein"], 5)
+    restored.remove_document("p2")
+    assert restored.search(["protein"], 5) == []
+
+
+def test_store_persists_locally_and_only_updates_existing_indexes(tmp_path):
+    store = KeywordIndexStore(local_dir=str(tmp_path))
+    assert store.index_documents("research_papers", [("x", {"title": "Orphan"})]) == 0
+
+    store.put(_index())
+    assert store.flush() == ["research_papers"]
+    assert (tmp_path / "research_papers.json.gz").exists()
+
+    reloaded = KeywordIndexStore(local_dir=str(tmp_path))
+    assert reloaded.index_documents("research_papers", [("p4", {"title": "Topological quantum matter"})]) == 1
+    assert "p4" in reloaded.get("research_papers")
+
+
+def test_extract_keyword_fields_for_processes_and_podcasts():
+    title, body = extract_keyword_fields(
+        "glmp_processes",
+        {"name": "Glycolysis", "description": "Glucose breakdown", "subcategory": "ignored", "entities": ["ATP", "NADH"]},
+    )
+    assert title == "Glycolysis"
+    assert body == "Glucose breakdown ATP NADH"
+
+    title, body = extract_keyword_fields("episodes", {"result": {"title": "Black holes", "script": "HOST: hi"}})
+    assert title == "Black holes"
+    assert "HOST: hi" in body
+
+
+@pytest.mark.asyncio
+async def test_keyword_fallback_uses_index_and_batched_read():
+    from mcp_server.tools import vector_search
+
+    snap = MagicMock()
+    snap.id = "p1"
+    snap.exists = True
+    snap.to_dict.return_value = {"title": "Quantum error correction", "embedding": [0.1]}
+    db = MagicMock()
+    db.get_all.return_value = [snap]
+
+    store = KeywordIndexStore()
+    store.put(_index())
+    with patch.object(vector_search, "get_keyword_index_store", return_value=store):
+        results = await vector_search._keyword_fallback_search(db, "quantum error", ["papers"], limit=1)
+
+    assert results["keyword_engines"] == {"papers": "bm25_index"}
+    assert results["keyword_fanout_report"]["papers"]["status"] == "ok"
+    assert [p["paper_id"] for p in results["papers"]] == ["p1"]
+    assert "embedding" not in results["papers"][0]
+    db.get_all.assert_called_once()
+    db.collection.return_value.order_by.assert_not_called()
+
+
+def test_updates_never_change_an_index_being_searched(tmp_path):
+    store = KeywordIndexStore(local_dir=str(tmp_path), flush_seconds=3600)
+    store.put(_index())
+    before = store.get("research_papers")
+    snapshot = before.to_bytes()
+
+    store.index_documents("research_papers", [("p4", {"title": "Quantum sensing"})])
+    store.index_documents("research_papers", [("p1", {"title": "Classical codes"})])
+    store.remove_documents("research_papers", ["p3"])
+
+    # The index handed out earlier is untouched; the store serves the new one
+    assert before.to_bytes() == snapshot
+    assert {doc_id for doc_id, _, _ in before.search(["quantum"], 10)} == {"p1", "p3"}
+    after = store.get("research_papers")
+    assert {doc_id for doc_id, _, _ in after.search(["quantum"], 10)} == {"p4"}
+    # Nothing is written until the (debounced) flush
+    assert not (tmp_path / "research_papers.json.gz").exists()
+    assert store.close() == ["research_papers"]
+    assert "p4" in KeywordIndexStore(local_dir=str(tmp_path)).get("research_papers")
+
+
+def test_concurrent_writers_merge_through_conditional_writes():
+    client = FakeStorageClient()
+    uri = "gs://bucket/search/keyword-index"
+    first = KeywordIndexStore(gcs_uri=uri, client=client, refresh_seconds=3600, flush_seconds=3600)
+    second = KeywordIndexStore(gcs_uri=uri, client=client, refresh_seconds=3600, flush_seconds=3600)
+    first.put(_index())
+    assert first.flush() == ["research_papers"]
+    assert second.get("research_papers").size == 3
+
+    assert first.index_documents("research_papers", [("p4", {"title": "Black holes"})]) == 1
+    assert first.flush() == ["research_papers"]
+
+    # `second` still holds the older copy: its write conflicts, reloads and re-applies
+    assert second.index_documents("research_papers", [("p5", {"title": "Dark matter"})]) == 1
+    assert second.flush() == ["research_papers"]
+    assert {"p4", "p5"} <= set(second.get("research_papers").doc_lengths)
+
+    merged = KeywordIndexStore(gcs_uri=uri, client=client).get("research_papers")
+    assert {"p1", "p4", "p5"} <= set(merged.doc_lengths)
+
+
+def test_installed_index_survives_a_refresh_and_is_flushed_in_the_background(tmp_path):
+    old = KeywordIndexStore(local_dir=str(tmp_path))
+    old.put(KeywordIndex("research_papers"))
+    assert old.close() == ["research_papers"]
+
+    store = KeywordIndexStore(local_dir=str(tmp_path), refresh_seconds=0, flush_seconds=0.05)
+    store.put(_index())
+    # The refresh finds the older persisted copy but keeps the rebuilt index
+    assert store.get("research_papers").size == 3
+
+    deadline = time.time() + 5
+    while store._replace and time.time() < deadline:
+        time.sleep(0.02)
+    assert not store._replace
+    assert KeywordIndexStore(local_dir=str(tmp_path)).get("research_papers").size == 3
@@ -0,0 +1,100 @@
+"""Unit tests for the adjacency-indexed knowledge graph core and its users."""
+import time
+from unittest.mock import patch
+
+from services.knowledge_graph_core import GraphCore
+from services.knowledge_map_queries import KnowledgeMapQueryService
+from services.knowledge_map_service import KnowledgeMapService
+
+
+def _paper(pid):
+    return {"id": pid, "type": "paper", "label": f"Paper {pid}", "data": {}}
+
+
+def _edge(source, target, edge_type="similar"):
+    return {"type": edge_type, "source": source, "target": target, "weight": 1.0, "metadata": {}}
+
+
+def _service(nodes, edges):
+    with patch("services.knowledge_map_service.db", object()):
+        service = KnowledgeMapService()
+    service.nodes = nodes
+    service.edges = edges
+    return service
+
+
+def _chain_graph():
+    nodes = {pid: _paper(pid) for pid in ("a", "b", "c", "d")}
+    nodes["concept:x"] = {"id": "concept:x", "type": "concept", "label": "x", "data": {}}
+    edges = [
+        _edge("a", "b", "cites"),
+        _edge("c", "b", "similar"),
+        _edge("c", "d", "cites"),
+        _edge("a", "concept:x", "mentions"),
+        _edge("d", "concept:x", "mentions"),
+    ]
+    return nodes, edges
+
+
+def test_csr_rows_preserve_edge_order_in_both_directions():
+    nodes, edges = _chain_graph()
+    core = GraphCore(nodes, edges)
+    b = core.index["b"]
+    x = core.index["concept:x"]
+
+    assert list(core.in_of(b)) == [0, 1]
+    assert list(core.out_of(core.index["a"])) == [0, 3]
+    assert [(e, core.ids[n]) for e, n in core.neighbours(x)] == [(3, "a"), (4, "d")]
+
+
+def test_shortest_path_respects_type_mask_and_depth():
+    nodes, edges = _chain_graph()
+    core = GraphCore(nodes, edges)
+
+    assert core.shortest_path("a", "d", max_depth=5) == [3, 4]
+    assert core.shortest_path("a", "d", max_depth=5, relationship_types=["cites", "similar"]) == [0, 1, 2]
+    assert core.shortest_path("a", "d", max_depth=2, relationship_types=["cites", "similar"]) is None
+    assert core.shortest_path("a", "missing", max_depth=5) is None
+
+
+def test_subgraph_matches_edge_scan_semantics():
+    nodes, edges = _chain_graph()
+    service = _service(nodes, edges)
+
+    subgraph = service.get_subgraph("b", depth=1, max_nodes=50)
+    assert [n["id"] for n in subgraph["nodes"]] == ["b", "a", "c"]
+    assert subgraph["edges"] == [edges[0], edges[1]]
+
+    export = service.export_for_visualization(node_ids=["c", "b", "d"])
+    assert [n["data"]["id"] for n in export["nodes"]] == ["b", "c", "d"]
+    assert [e["data"]["id"] for e in export["edges"]] == ["c-b", "c-d"]
+
+
+def test_query_service_reuses_service_core():
+    nodes, edges = _chain_graph()
+    service = _service(nodes, edges)
+    first = KnowledgeMapQueryService(service)
+    second = KnowledgeMapQueryService(service)
+
+    assert first.core is second.core
+    assert [p["id"] for p in first.find_papers_by_concept("x")] == ["a", "d"]
+    assert [e["type"] for e in first.find_path("a", "d", relationship_types=["cites", "similar"])] == [
+        "cites", "similar", "cites",
+    ]
+    assert [p["id"] for p in first.find_related_papers("a", depth=2)] == ["b", "c"]
+
+    service.edges = edges + [_edge("b", "d")]
+    assert KnowledgeMapQueryService(service).core is not first.core
+
+
+def test_subgraph_on_large_graph_is_fast():
+    n = 12000
+    nodes = {str(i): _paper(str(i)) for i in range(n)}
+    edges = [_edge(str(i), str((i * 7 + k) % n)) for i in range(n) for k in (1, 2, 3)]
+    core = GraphCore(nodes, edges)
+
+    started = time.perf_counter()
+    for i in range(100):
+        core.subgraph(str(i), depth=2, max_nodes=50)
+    per_call = (time.perf_counter() - started) / 100
+    assert per_call < 0.005
@@ -0,0 +1,111 @@
+"""Unit tests for persisted knowledge-graph snapshots."""
+from unittest.mock import MagicMock, patch
+
+from services.knowledge_graph_snapshots import (
+    GraphSnapshot,
+    GraphSnapshotStore,
+    graph_filter_signature,
+)
+
+
+def _graph():
+    nodes = {
+        "p1": {"id": "p1", "type": "paper", "label": "Paper 1", "data": {"year": 2024}},
+        "p2": {"id": "p2", "type": "paper", "label": "Paper 2", "data": {}},
+        "concept:qubits": {"id": "concept:qubits", "type": "concept", "label": "qubits", "data": {"paper_count": 2}},
+    }
+    edges = [
+        {"type": "similar", "source": "p1", "target": "p2", "weight": 0.75, "metadata": {"method": "embedding_cosine"}},
+        {"type": "mentions", "source": "p1", "target": "concept:qubits", "weight": 1.0, "metadata": {}},
+        {"type": "cites", "source": "p2", "target": "external-paper", "weight": 1.0, "metadata": {}},
+    ]
+    return nodes, edges
+
+
+def test_signature_normalizes_filter_lists_and_drops_unset_values():
+    a = graph_filter_signature(disciplines=["physics", "Biology"], keyword=None, max_papers=100)
+    b = graph_filter_signature(disciplines=[" biology", "physics", "physics"], max_papers=100, sources=[])
+
+    assert a == b
+    assert a != graph_filter_signature(disciplines=["physics"], max_papers=100)
+
+
+def test_roundtrip_preserves_graph_and_adjacency():
+    nodes, edges = _graph()
+    snapshot = GraphSnapshot("sig", "v1", nodes, edges, {"papers": 2})
+    restored = GraphSnapshot.from_bytes(snapshot.to_bytes())
+
+    assert restored.nodes == nodes
+    assert restored.edges == edges
+    assert restored.metadata == {"papers": 2}
+    # The adjacency index comes back ready to query, identical to a fresh build
+    assert restored.core.persisted_arrays() == snapshot.core.persisted_arrays()
+    assert restored.core.ids == ["p1", "p2", "concept:qubits", "external-paper"]
+    assert restored.core.shortest_path("concept:qubits", "external-paper", max_depth=5) == [1, 0, 2]
+
+
+def test_store_serves_matching_version_and_writes_through(tmp_path):
+    nodes, edges = _graph()
+    store = GraphSnapshotStore(local_dir=str(tmp_path))
+    store.put(GraphSnapshot("sig", "v1", nodes, edges))
+    assert (tmp_path / "sig.kgs").exists()
+
+    assert store.get("sig", "v1") is not None
+    assert store.get("sig", "v2") is None
+
+    # A different worker / restart picks the snapshot up from disk
+    other = GraphSnapshotStore(local_dir=str(tmp_path))
+    assert other.get("sig", "v1").edges == edges
+    assert other.stats()["persisted_hits"] == 1
+
+
+def test_stale_snapshot_rereads_the_persisted_copy_only_once_it_changes(tmp_path):
+    nodes, edges = _graph()
+    store = GraphSnapshotStore(local_dir=str(tmp_path))
+    store.put(GraphSnapshot("sig", "v1", nodes, edges))
+
+    with patch.object(GraphSnapshot, "from_bytes", wraps=GraphSnapshot.from_bytes) as parsed:
+        # The persisted copy is the one already in memory: nothing to download or parse
+        assert store.get("sig", "v2") is None
+        assert store.get("sig", "v2") is None
+        assert parsed.call_count == 0
+
+        # Another worker writes the newer version
+        GraphSnapshotStore(local_dir=str(tmp_path)).put(GraphSnapshot("sig", "v2", nodes, edges))
+        assert store.get("sig", "v2").data_version == "v2"
+        assert store.get("sig", "v2") is not None
+        assert parsed.call_count == 1
+    assert store.stats()["persisted_hits"] == 1
+
+def test_store_lru_eviction():
+    nodes, edges = _graph()
+    store = GraphSnapshotStore(max_entries=2)
+    for sig in ("a", "b", "c"):
+        store.put(GraphSnapshot(sig, "v1", nodes, edges))
+
+    assert store.get("a", "v1") is None
+    assert store.get("c", "v1") is not None
+
+
+def test_data_version_tracks_counts_and_is_memoized():
+    counts = {"research_papers": 10}
+
+    def _collection(name):
+        agg = MagicMock()
+        agg.value = counts.get(name, 0)
+        ref = MagicMock()
+        ref.count.return_value.get.side_effect = lambda: [[agg]]
+        return ref
+
+    db = MagicMock()
+    db.collection.side_effect = _collection
+    store = GraphSnapshotStore(version_ttl_seconds=0)
+    v1 = store.data_version(db, ["research_papers", "episodes"])
+    counts["research_papers"] = 11
+    v2 = store.data_version(db, ["research_papers", "episodes"])
+    assert v1 != v2
+
+    memo = GraphSnapshotStore(version_ttl_seconds=60)
+    memo.data_version(db, ["research_papers"])
+    memo.data_version(db, ["research_papers"])
+    assert db.collection.call_count == 5
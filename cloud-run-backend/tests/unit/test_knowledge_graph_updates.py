@@ -0,0 +1,184 @@
+"""Unit tests for change-log driven incremental knowledge-graph updates."""
+import random
+from unittest.mock import patch
+
+import pytest
+
+from services import knowledge_map_service as kms
+from services.knowledge_graph_changes import KNOWLEDGE_GRAPH_CHANGE_LOG_COLLECTION, record_graph_changes
+from services.knowledge_graph_snapshots import GraphSnapshotStore
+from services.knowledge_map_service import KnowledgeMapService
+from tests.unit.fakes import FakeFirestore
+
+_WORDS = [f"term{i}" for i in range(200)]
+_BUILD_ARGS = dict(max_papers=500, include_concepts=False, include_authors=True)
+
+
+def _paper(rng, i, stamp=None):
+    topic = rng.randrange(12)
+    words = [_WORDS[(topic * 10 + rng.randrange(14)) % 200] for _ in range(10)] + rng.sample(_WORDS, 3)
+    return {
+        "title": " ".join(words[:4]),
+        "abstract": " ".join(words[4:]),
+        "categories": [f"cat{topic % 5}", f"cat{rng.randrange(5, 9)}"],
+        "authors": [f"author{rng.randrange(30)}" for _ in range(2)],
+        "updated_at": f"2026-01-01T{i if stamp is None else stamp:06d}",
+        # Papers on one topic embed close together
+        "embedding": [1.0 if k == topic else 0.0 for k in range(12)] + [i / 1000, (i % 7) / 20],
+    }
+
+
+def _service(fake_db):
+    with patch.object(kms, "db", fake_db):
+        return KnowledgeMapService()
+
+
+def _edge_keys(edges, types=("same_category", "co_author", "similar_to")):
+    return sorted(
+        (e["type"], e["source"], e["target"], round(e["weight"], 6), tuple(sorted(e["metadata"].items())))
+        for e in edges
+        if e["type"] in types
+    )
+
+
+@pytest.mark.asyncio
+async def test_applied_delta_matches_full_rebuild():
+    rng = random.Random(11)
+    fake_db = FakeFirestore()
+    papers = fake_db.docs("research_papers")
+    for i in range(150):
+        papers[f"p{i:03d}"] = _paper(rng, i)
+
+    service = _service(fake_db)
+    await service.build_graph(**_BUILD_ARGS)
+
+    # Add three papers, edit one, delete one
+    for i in range(150, 153):
+        papers[f"p{i:03d}"] = _paper(rng, i)
+    papers["p010"] = _paper(rng, 10, stamp=153)
+    del papers["p020"]
+    changed = ["p150", "p151", "p152", "p010"]
+    changes = [{"collection": "research_papers", "doc_id": d, "op": "upsert"} for d in changed]
+    changes.append({"collection": "research_papers", "doc_id": "p020", "op": "remove"})
+
+    summary = await service.apply_graph_changes(changes, max_papers=500, include_authors=True)
+    rebuilt = _service(fake_db)
+    await rebuilt.build_graph(**_BUILD_ARGS)
+
+    assert summary["upserted"] == 4 and summary["removed"] == 1
+    assert list(service.nodes) == list(rebuilt.nodes)
+    assert service.nodes == rebuilt.nodes
+    assert _edge_keys(service.edges) == _edge_keys(rebuilt.edges)
+    assert any(e["metadata"].get("method") == "vector_similarity" for e in rebuilt.edges)
+    # Only the items the delta can affect were re-ranked
+    assert summary["similarity_reranked"] < len(papers)
+
+
+@pytest.mark.asyncio
+async def test_applied_delta_keeps_capped_samples_like_a_rebuild():
+    rng = random.Random(17)
+    fake_db = FakeFirestore()
+    papers = fake_db.docs("research_papers")
+    episodes = fake_db.docs("episodes")
+    for i in range(120):
+        papers[f"p{i:03d}"] = _paper(rng, i)
+    for i in range(kms.MAX_PODCASTS + 5):
+        episodes[f"e{i:02d}"] = {"title": f"Episode {i:02d} {' '.join(rng.sample(_WORDS, 6))}"}
+    build_args = dict(_BUILD_ARGS, max_papers=60, content_types=["papers", "podcasts"])
+
+    service = _service(fake_db)
+    await service.build_graph(**build_args)
+    assert sum(n["type"] == "paper" for n in service.nodes.values()) == 60
+    assert sum(n["type"] == "podcast" for n in service.nodes.values()) == kms.MAX_PODCASTS
+
+    # New papers push the oldest ones out of the sample; an edited paper from
+    # outside the sample (p010) comes back in as the newest one; a sampled
+    # paper (p100) is deleted; a podcast sorting first joins, evicting the last
+    for i in range(120, 124):
+        papers[f"p{i:03d}"] = _paper(rng, i)
+    papers["p010"] = _paper(rng, 10, stamp=130)
+    del papers["p100"]
+    episodes["a-first"] = {"title": "Aardvark episode"}
+    changed = [f"p{i:03d}" for i in range(120, 124)] + ["p010"]
+    changes = [{"collection": "research_papers", "doc_id": d, "op": "upsert"} for d in changed]
+    changes.append({"collection": "research_papers", "doc_id": "p100", "op": "remove"})
+    changes.append({"collection": "episodes", "doc_id": "a-first", "op": "upsert"})
+
+    summary = await service.apply_graph_changes(
+        changes, max_papers=60, content_types=["papers", "podcasts"], include_authors=True
+    )
+    rebuilt = _service(fake_db)
+    await rebuilt.build_graph(**build_args)
+
+    assert summary["evicted"] == 5
+    assert list(service.nodes) == list(rebuilt.nodes)
+    assert service.nodes == rebuilt.nodes
+    assert _edge_keys(service.edges) == _edge_keys(rebuilt.edges)
+
+
+@pytest.mark.asyncio
+async def test_delta_that_shrinks_a_full_sample_needs_a_rebuild():
+    rng = random.Random(23)
+    fake_db = FakeFirestore()
+    papers = fake_db.docs("research_papers")
+    for i in range(30):
+        papers[f"p{i:03d}"] = _paper(rng, i)
+    service = _service(fake_db)
+    await service.build_graph(**dict(_BUILD_ARGS, max_papers=20))
+    nodes, edges = service.nodes, service.edges
+
+    # p025 was sampled; its replacement (p009) is outside the graph
+    del papers["p025"]
+    summary = await service.apply_graph_changes(
+        [{"collection": "research_papers", "doc_id": "p025", "op": "remove"}], max_papers=20
+    )
+
+    assert summary is None
+    assert service.nodes is nodes and service.edges is edges
+
+
+@pytest.mark.asyncio
+async def test_get_or_build_graph_replays_change_log_from_high_water_mark(tmp_path):
+    rng = random.Random(5)
+    fake_db = FakeFirestore()
+    papers = fake_db.docs("research_papers")
+    for i in range(40):
+        papers[f"p{i:03d}"] = _paper(rng, i)
+    store = GraphSnapshotStore(local_dir=str(tmp_path))
+    versions = iter(["v1", "v2", "v3"])
+
+    with patch.object(kms, "get_graph_snapshot_store", return_value=store), \
+            patch.object(store, "data_version", side_effect=lambda *a: next(versions)):
+        first = await _service(fake_db).get_or_build_graph(**_BUILD_ARGS)
+        assert "incremental_update" not in first["metadata"]
+
+        papers["p040"] = _paper(rng, 40)
+        record_graph_changes(fake_db, "research_papers", ["p040"])
+        # A fresh worker: the base snapshot comes from disk
+        store.invalidate()
+        second = await _service(fake_db).get_or_build_graph(**_BUILD_ARGS)
+
+        assert second["metadata"]["incremental_update"]["upserted"] == 1
+        assert second["metadata"]["papers"] == 41
+        assert second["metadata"]["snapshot"]["data_version"] == "v2"
+        assert "p040" in {n["id"] for n in second["nodes"]}
+
+        # Nothing logged since the high-water mark: the version bump is unexplained, so rebuild
+        third = await _service(fake_db).get_or_build_graph(**_BUILD_ARGS)
+        assert "incremental_update" not in third["metadata"]
+
+    log = fake_db.docs(KNOWLEDGE_GRAPH_CHANGE_LOG_COLLECTION)
+    assert [c["doc_id"] for c in log.values()] == ["p040"]
+
+
+def test_token_overlap_index_matches_batch_ranking():
+    pytest.importorskip("numpy")
+    rng = random.Random(3)
+    items = [(f"i{n}", kms._similarity_tokens(_paper(rng, n))) for n in range(120)]
+    index = kms.TokenOverlapIndex(items)
+    service = _service(FakeFirestore())
+    batch = dict(service._keyword_similarity_neighbours(
+        [{"paper_id": item_id, "title": " ".join(toks)} for item_id, toks in items]
+    ))
+    for item_id, _ in items:
+        assert index.top_k(item_id, 2, 0.12, 2) == batch[item_id]
@@ -0,0 +1,64 @@
+"""Unit tests for frame-level MP3 splicing and bumper splicing."""
+from unittest.mock import patch
+
+import pytest
+
+import elevenlabs_voice_service as evs
+from elevenlabs_voice_service import ElevenLabsVoiceService
+from services.mp3_frames import Mp3Format, parse_mp3, splice_mp3
+
+_ID3 = b"ID3\x03\x00\x00\x00\x00\x00\x05" + b"\x00" * 5
+
+
+def _frame(fill: int, mono: bool = True, bitrate_index: int = 9) -> bytes:
+    """One MPEG-1 Layer III 44.1 kHz frame; 128 kbps = 417 bytes."""
+    header = bytes([0xFF, 0xFB, bitrate_index << 4, 0xC4 if mono else 0x04])
+    length = 144000 * (128, 160)[bitrate_index - 9] // 44100
+    return header + bytes([fill]) * (length - 4)
+
+
+def _info_frame(mono: bool = True) -> bytes:
+    frame = bytearray(_frame(0, mono))
+    side_info = 17 if mono else 32
+    frame[4 + side_info:8 + side_info] = b"Info"
+    return bytes(frame)
+
+
+def _mp3(*frames: bytes) -> bytes:
+    return _ID3 + _info_frame() + b"".join(frames) + b"TAG" + b"\x00" * 125
+
+
+def test_parse_strips_tags_and_vbr_header_and_splices_frames():
+    intro = parse_mp3(_mp3(_frame(1), _frame(2)))
+    main = parse_mp3(_mp3(*[_frame(3)] * 5))
+
+    assert intro.format == Mp3Format(1.0, 44100, 1, 128)
+    assert intro.frame_count == 2 and intro.frames == _frame(1) + _frame(2)
+    assert main.duration_seconds == pytest.approx(5 * 1152 / 44100)
+    assert splice_mp3([intro, main]) == _frame(1) + _frame(2) + _frame(3) * 5
+
+    stereo = parse_mp3(_mp3(_frame(4, mono=False)))
+    vbr = parse_mp3(_mp3(_frame(5), _frame(5, bitrate_index=10)))
+    assert stereo.format.channels == 2
+    assert vbr.format.bitrate_kbps == 0
+    for other in (stereo, vbr):
+        with pytest.raises(ValueError):
+            splice_mp3([main, other])
+
+
+@pytest.mark.asyncio
+async def test_bumpers_spliced_without_reencoding_and_cached(tmp_path):
+    intro_path, outro_path = tmp_path / "intro.mp3", tmp_path / "outro.mp3"
+    intro_path.write_bytes(_mp3(_frame(1)))
+    outro_path.write_bytes(_mp3(_frame(2), _frame(2)))
+    with patch.object(ElevenLabsVoiceService, "_get_api_key", return_value="test-key"):
+        service = ElevenLabsVoiceService()
+    main_audio = _mp3(*[_frame(3)] * 10)
+
+    with patch.dict(evs._normalized_bumpers, clear=True), \
+            patch.object(evs, "parse_mp3", wraps=evs.parse_mp3) as parse:
+        first = await service.add_audio_bumpers(main_audio, str(intro_path), str(outro_path))
+        second = await service.add_audio_bumpers(main_audio, str(intro_path), str(outro_path))
+
+    assert first == second == _frame(1) + _frame(3) * 10 + _frame(2) * 2
+    assert parse.call_count == 3 + 1  # both bumpers read once, the episode parsed per call
@@ -0,0 +1,99 @@
+"""Unit tests for the admin podcast database snapshot."""
+from types import SimpleNamespace
+
+from services.podcast_database_snapshot import PodcastDatabaseSnapshot
+from tests.unit.fakes import FakeFirestore
+
+BUCKET = "podcast-bucket"
+
+
+def _audio(name):
+    return f"https://storage.googleapis.com/{BUCKET}/audio/{name}.mp3"
+
+
+class _Bucket:
+    def __init__(self, sizes):
+        self.sizes = sizes
+        self.listings = 0
+        self.lookups = []
+
+    def list_blobs(self, prefix, fields=None):
+        self.listings += 1
+        return [SimpleNamespace(name=n, size=s) for n, s in self.sizes.items() if n.startswith(prefix)]
+
+    def get_blob(self, name):
+        self.lookups.append(name)
+        size = self.sizes.get(name)
+        return SimpleNamespace(name=name, size=size) if size is not None else None
+
+
+def _snapshot(db, bucket, **kwargs):
+    client = SimpleNamespace(bucket=lambda name: bucket)
+    return PodcastDatabaseSnapshot(db, bucket_name=BUCKET, storage_client=client, **kwargs)
+
+
+def _seed():
+    db = FakeFirestore()
+    db.data["subscribers"] = {"sub-1": {"email": "one@example.org"}, "sub-2": {"email": "two@example.org"}}
+    for i in range(1, 4):
+        db.docs("episodes")[f"ever-phys-{i}"] = {
+            "title": f"Episode {i}",
+            "subscriber_id": "sub-1" if i % 2 else "sub-2",
+            "audio_url": _audio(f"ever-phys-{i}"),
+            "created_at": f"2026-01-0{i}T10:00:00",
+            "updated_at": "2026-01-01T00:00:00",
+        }
+    db.docs("podcast_jobs")["job-4"] = {
+        "subscriber_id": "sub-2",
+        "result": {"canonical_filename": "ever-bio-4", "title": "Job only"},
+        "created_at": "2026-01-04T10:00:00",
+        "updated_at": "2026-01-01T00:00:00",
+    }
+    bucket = _Bucket({f"audio/ever-phys-{i}.mp3": i * 1024 * 1024 for i in range(1, 4)})
+    return db, bucket
+
+
+def test_full_build_uses_one_listing_and_batched_subscriber_reads():
+    db, bucket = _seed()
+    podcasts = _snapshot(db, bucket).podcasts()
+
+    assert [p["id"] for p in podcasts] == ["ever-bio-4", "ever-phys-3", "ever-phys-2", "ever-phys-1"]
+    assert podcasts[0]["source"] == "podcast_jobs" and podcasts[0]["subscriber_email"] == "two@example.org"
+    assert podcasts[1]["file_size_display"] == "3.0 MB"
+    assert podcasts[2]["subscriber_email"] == "two@example.org"
+    assert podcasts[3]["category"] == "Physics"
+    assert bucket.listings == 1 and bucket.lookups == []
+    assert len(db.get_all_calls) == 1
+
+
+def test_incremental_refresh_reads_only_updated_documents():
+    db, bucket = _seed()
+    snapshot = _snapshot(db, bucket, refresh_seconds=0)
+    snapshot.podcasts()
+    db.streams.clear()
+    db.get_all_calls.clear()
+
+    db.data["episodes"]["ever-phys-3"]["title"] = "Renamed"
+    db.data["episodes"]["ever-phys-3"]["updated_at"] = "2099-01-01T00:00:00"
+    db.data["episodes"]["ever-bio-4"] = {
+        "title": "Promoted",
+        "subscriber_id": "sub-2",
+        "audio_url": _audio("ever-bio-4"),
+        "created_at": "2026-01-04T10:00:00",
+        "updated_at": "2099-01-01T00:00:00",
+    }
+    bucket.sizes["audio/ever-bio-4.mp3"] = 2 * 1024 * 1024
+
+    podcasts = {p["id"]: p for p in snapshot.podcasts()}
+    assert db.streams == [("episodes", "updated_at"), ("podcast_jobs", "updated_at")]
+    assert bucket.listings == 1 and bucket.lookups == ["audio/ever-bio-4.mp3"]
+    assert db.get_all_calls == []  # emails are cached
+    assert podcasts["ever-phys-3"]["title"] == "Renamed"
+    assert podcasts["ever-bio-4"]["source"] == "episodes"
+    assert podcasts["ever-bio-4"]["file_size_display"] == "2.0 MB"
+
+    snapshot.forget("ever-phys-1")
+    assert "ever-phys-1" not in {p["id"] for p in snapshot.podcasts()}
+    # A forced rebuild re-reads everything
+    assert "ever-phys-1" in {p["id"] for p in snapshot.podcasts(full_refresh=True)}
+    assert bucket.listings == 2
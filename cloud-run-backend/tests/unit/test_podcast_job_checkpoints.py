@@ -0,0 +1,81 @@
+"""Unit tests for podcast job phase checkpoints."""
+import pytest
+
+from services.podcast_job_checkpoints import (
+    PodcastJobCheckpoints,
+    research_context_from_dict,
+    research_context_to_dict,
+)
+from tests.unit.fakes import FakeFirestore
+
+
+def _job(db, job_id):
+    return db.collection("podcast_jobs").document(job_id)
+
+
+@pytest.mark.asyncio
+async def test_retry_resumes_after_last_checkpointed_phase():
+    db = FakeFirestore()
+    first = PodcastJobCheckpoints(_job(db, "job-1"))
+    assert first.resume_phase() == "research"
+    calls = []
+
+    async def produce(name):
+        calls.append(name)
+        return f"gs://bucket/{name}"
+
+    assert await first.run("audio_url", lambda: produce("audio")) == "gs://bucket/audio"
+    first.save("research", {"topic": "t"})
+    first.save("content", {"title": "T", "script": "S"})
+
+    # A new attempt (another worker) sees the stored phases
+    retry = PodcastJobCheckpoints(_job(db, "job-1"))
+    assert retry.completed() == ["research", "content", "audio_url"]
+    assert retry.resume_phase() == "canonical_filename"
+    assert await retry.run("audio_url", lambda: produce("audio-again")) == "gs://bucket/audio"
+    assert await retry.run("transcript_url", lambda: produce("transcript")) == "gs://bucket/transcript"
+    assert calls == ["audio", "transcript"]
+
+
+@pytest.mark.asyncio
+async def test_failed_phase_is_rerun_on_retry():
+    db = FakeFirestore()
+    first = PodcastJobCheckpoints(_job(db, "job-2"))
+
+    async def failed_upload():
+        return None
+
+    async def upload():
+        return "gs://bucket/transcript"
+
+    assert await first.run("transcript_url", failed_upload) is None
+    assert not first.has("transcript_url") and "transcript_url" not in db.docs("podcast_jobs/job-2/checkpoints")
+
+    retry = PodcastJobCheckpoints(_job(db, "job-2"))
+    assert retry.resume_phase() == "research"
+    assert await retry.run("transcript_url", upload) == "gs://bucket/transcript"
+    assert PodcastJobCheckpoints(_job(db, "job-2")).get("transcript_url") == "gs://bucket/transcript"
+
+
+def test_research_context_round_trips():
+    pytest.importorskip("enhanced_research_service")
+    from enhanced_research_service import PaperAnalysis
+    from podcast_research_integrator import PodcastResearchContext
+    from research_pipeline import ResearchSource
+
+    source = ResearchSource(
+        title="A paper", authors=["A. Author"], abstract="Abstract", url="https://example.org/p",
+        publication_date="2024", source="arxiv", doi="10.1/x", keywords=["k"],
+    )
+    analysis = PaperAnalysis(
+        title="A paper", summary="s", key_findings=["f"], methodology="m", implications="i",
+        related_work="r", technical_complexity="low", suggested_questions=["q"], keywords=["k"],
+        paradigm_shift_potential="high", interdisciplinary_connections=["c"],
+        practical_applications=["a"], future_research_directions=["d"],
+    )
+    context = PodcastResearchContext(
+        topic="t", research_sources=[source], paper_analyses=[analysis], paradigm_shifts=["p"],
+        interdisciplinary_connections=["c"], key_findings=["f"], real_citations=["cite"],
+        research_quality_score=7.5, recommended_expertise_level="intermediate",
+    )
+    assert research_context_from_dict(research_context_to_dict(context)) == context
@@ -0,0 +1,122 @@
+"""Unit tests for the podcast job queue (SQLite backend) and worker pool."""
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from services import podcast_job_queue as pjq
+from services.podcast_job_queue import PodcastJobWorkerPool, SQLitePodcastJobQueue
+
+
+def _queue(tmp_path, **kwargs):
+    return SQLitePodcastJobQueue(str(tmp_path / "queue.sqlite3"), **kwargs)
+
+
+def test_claims_are_exclusive_and_expired_leases_are_reclaimed(tmp_path):
+    queue = _queue(tmp_path, max_attempts=2)
+    queue.enqueue("job-a", {"request": {"topic": "a"}, "subscriber_id": "s1"})
+    queue.enqueue("job-b", {"request": {"topic": "b"}})
+
+    first = queue.claim("w1", lease_seconds=60)
+    second = queue.claim("w2", lease_seconds=60)
+    assert (first["job_id"], second["job_id"]) == ("job-a", "job-b")
+    assert first["request"] == {"topic": "a"} and first["subscriber_id"] == "s1"
+    assert queue.claim("w3", lease_seconds=60) is None
+    assert queue.heartbeat("job-a", "w1", 60) and not queue.heartbeat("job-a", "w2", 60)
+
+    # w2 dies: its lease lapses and another worker takes over the job
+    queue.heartbeat("job-b", "w2", -1)
+    retaken = queue.claim("w3", lease_seconds=60)
+    assert retaken["job_id"] == "job-b" and retaken["queue_attempts"] == 2
+    assert not queue.heartbeat("job-b", "w2", 60)
+
+    # Out of attempts: a lapsed lease is not retried again
+    queue.heartbeat("job-b", "w3", -1)
+    with patch.object(pjq, "_mark_job_failed") as mark_failed:
+        assert queue.claim("w4", lease_seconds=60) is None
+    mark_failed.assert_called_once()
+    queue.complete("job-a", "w1")
+    assert queue.counts() == {"queued": 0, "leased": 0, "dead": 1}
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_runs_jobs_concurrently_and_retries_handler_errors(tmp_path):
+    queue = _queue(tmp_path, max_attempts=3)
+    for i in range(4):
+        queue.enqueue(f"job-{i}", {"request": {"topic": str(i)}})
+    calls = []
+    active = peak = 0
+    done = asyncio.Event()
+
+    async def handler(job):
+        nonlocal active, peak
+        calls.append(job["job_id"])
+        active += 1
+        peak = max(peak, active)
+        try:
+            await asyncio.sleep(0.05)
+            if job["job_id"] == "job-2" and calls.count("job-2") == 1:
+                raise RuntimeError("transient")
+        finally:
+            active -= 1
+            if len(calls) == 5:
+                done.set()
+
+    pool = PodcastJobWorkerPool(queue, handler, concurrency=2, heartbeat_seconds=0.01, poll_seconds=0.01)
+    pool.start()
+    await asyncio.wait_for(done.wait(), timeout=5)
+    await asyncio.sleep(0.05)
+    await pool.stop()
+
+    assert sorted(calls) == ["job-0", "job-1", "job-2", "job-2", "job-3"]
+    assert peak == 2
+    assert queue.counts() == {"queued": 0, "leased": 0, "dead": 0}
+    assert pool.stats()["handler_errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_keeps_the_lease_while_the_loop_is_blocked(tmp_path):
+    queue = _queue(tmp_path)
+    queue.enqueue("job-a", {"request": {}})
+    job = queue.claim("w1", lease_seconds=0.2)
+    finished = []
+
+    async def handler(job):
+        # A blocking call holding the event loop past the lease
+        time.sleep(0.5)
+        await asyncio.sleep(0)
+        finished.append(job["job_id"])
+
+    pool = PodcastJobWorkerPool(queue, handler, lease_seconds=0.2, heartbeat_seconds=0.02)
+    await pool._run("w1", job)
+
+    assert finished == ["job-a"]
+    assert queue.claim("w2", lease_seconds=60) is None
+    assert queue.counts() == {"queued": 0, "leased": 0, "dead": 0}
+
+
+@pytest.mark.asyncio
+async def test_losing_the_lease_cancels_the_running_handler(tmp_path):
+    queue = _queue(tmp_path)
+    queue.enqueue("job-a", {"request": {}})
+    job = queue.claim("w1", lease_seconds=60)
+    cancelled = asyncio.Event()
+
+    async def handler(job):
+        # Another worker takes the job over (e.g. after this one stalled)
+        queue.heartbeat("job-a", "w1", -1)
+        assert queue.claim("w2", lease_seconds=60)["job_id"] == "job-a"
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    pool = PodcastJobWorkerPool(queue, handler, heartbeat_seconds=0.02)
+    await asyncio.wait_for(pool._run("w1", job), timeout=2)
+
+    assert cancelled.is_set()
+    assert pool.stats()["handler_errors"] == 1
+    # The job stays with its new owner
+    assert not queue.heartbeat("job-a", "w1", 60) and queue.heartbeat("job-a", "w2", 60)
@@ -0,0 +1,93 @@
+"""Unit tests for the podcast phase DAG executor."""
+import asyncio
+
+import pytest
+
+from services.podcast_phase_executor import PhaseExecutor
+
+
+@pytest.mark.asyncio
+async def test_independent_stages_overlap_after_their_inputs():
+    order = []
+
+    def stage(name, delay, value):
+        async def run(results):
+            order.append(("start", name, sorted(results)))
+            await asyncio.sleep(delay)
+            return value(results)
+        return run
+
+    executor = PhaseExecutor("job-1")
+    executor.add("filename", stage("filename", 0.01, lambda r: "ever-phys-250001"))
+    for name in ("audio", "transcript", "thumbnail"):
+        executor.add(name, stage(name, 0.1, lambda r, n=name: f"{n}:{r['filename']}"), depends_on=["filename"])
+    executor.add("catalog", stage("catalog", 0.01, lambda r: (r["audio"], r["thumbnail"])), depends_on=["audio", "thumbnail"])
+
+    results = await executor.run()
+
+    assert results["audio"] == "audio:ever-phys-250001"
+    assert results["catalog"] == ("audio:ever-phys-250001", "thumbnail:ever-phys-250001")
+    assert order[0] == ("start", "filename", [])
+    assert {o[1] for o in order[1:4]} == {"audio", "transcript", "thumbnail"}
+    summary = executor.summary()
+    assert summary["serial_seconds"] > 0.3 and summary["wall_seconds"] < 0.25
+    assert all(t["status"] == "completed" for t in summary["stages"].values())
+
+
+@pytest.mark.asyncio
+async def test_failure_cancels_running_stages_and_propagates():
+    cancelled = asyncio.Event()
+
+    async def slow(results):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def broken(results):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upload failed")
+
+    executor = PhaseExecutor("job-2")
+    executor.add("audio", slow)
+    executor.add("transcript", broken)
+    with pytest.raises(RuntimeError, match="upload failed"):
+        await executor.run()
+    assert cancelled.is_set()
+    assert executor.timings["transcript"]["status"] == "failed"
+    assert executor.timings["audio"]["status"] == "cancelled"
+
+
+@pytest.mark.asyncio
+async def test_optional_stage_failure_does_not_cancel_audio():
+    async def audio(results):
+        await asyncio.sleep(0.05)
+        return "audio.mp3"
+
+    async def thumbnail(results):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("DALL-E timed out")
+
+    executor = PhaseExecutor("job-5")
+    executor.add("audio", audio)
+    executor.add("thumbnail", thumbnail, optional=True)
+    executor.add("catalog", lambda r: asyncio.sleep(0, (r["audio"], r["thumbnail"])),
+                 depends_on=["audio", "thumbnail"])
+    results = await executor.run()
+
+    assert results["catalog"] == ("audio.mp3", None)
+    assert executor.timings["audio"]["status"] == "completed"
+    assert executor.timings["thumbnail"]["status"] == "failed"
+
+
+def test_cycles_and_unknown_dependencies_are_rejected():
+    executor = PhaseExecutor("job-3")
+    executor.add("a", None, depends_on=["b"])
+    executor.add("b", None, depends_on=["a"])
+    with pytest.raises(ValueError, match="cycle"):
+        asyncio.run(executor.run())
+    other = PhaseExecutor("job-4")
+    other.add("a", None, depends_on=["missing"])
+    with pytest.raises(ValueError, match="unknown"):
+        asyncio.run(other.run())
@@ -0,0 +1,81 @@
+"""Unit tests for per-phase job profiling."""
+import asyncio
+
+import pytest
+
+from utils.profiling import JobProfile, api_call, profile_phase, record_transfer, summarize_profiles
+
+
+@pytest.mark.asyncio
+async def test_nested_phases_share_transfers_and_api_calls():
+    @profile_phase("tts_synthesis")
+    async def synthesize():
+        async with api_call("elevenlabs"):
+            await asyncio.sleep(0.01)
+        record_transfer(up=100, down=2000)
+
+    profile = JobProfile("job-1")
+    token = profile.activate()
+    try:
+        async with profile_phase("audio"):
+            await synthesize()
+            await synthesize()
+        with profile_phase("catalog"):
+            pass
+    finally:
+        profile.deactivate(token)
+
+    phases = profile.to_dict()["phases"]
+    assert set(phases) == {"audio", "audio/tts_synthesis", "catalog"}
+    assert phases["audio/tts_synthesis"]["calls"] == 2
+    for key in ("audio", "audio/tts_synthesis"):
+        assert phases[key]["bytes_up"] == 200
+        assert phases[key]["bytes_down"] == 4000
+        assert phases[key]["api"]["elevenlabs"]["calls"] == 2
+    assert phases["audio"]["wall_seconds"] >= phases["audio/tts_synthesis"]["wall_seconds"]
+    assert phases["catalog"]["bytes_up"] == 0
+
+
+@pytest.mark.asyncio
+async def test_phase_errors_are_counted_and_tasks_inherit_the_stack():
+    profile = JobProfile("job-2")
+    token = profile.activate()
+    try:
+        async def stage():
+            with profile_phase("upload"):
+                record_transfer(up=5)
+
+        async with profile_phase("assets"):
+            await asyncio.gather(asyncio.create_task(stage()), asyncio.create_task(stage()))
+        with pytest.raises(RuntimeError):
+            with profile_phase("notification"):
+                raise RuntimeError("smtp down")
+    finally:
+        profile.deactivate(token)
+
+    phases = profile.to_dict()["phases"]
+    assert phases["assets/upload"]["calls"] == 2
+    assert phases["assets"]["bytes_up"] == 10
+    assert phases["notification"]["errors"] == 1
+
+
+def test_helpers_are_noops_without_an_active_profile():
+    with profile_phase("research"), api_call("gemini"):
+        record_transfer(up=1, down=1)
+
+
+def test_summarize_profiles_reports_percentiles_per_phase():
+    profiles = [
+        {"phases": {"audio": {"wall_seconds": float(i), "api": {"elevenlabs": {"calls": 2, "total_seconds": 2.0 * i, "max_seconds": 1.5 * i}}}}}
+        for i in range(1, 21)
+    ]
+    profiles.append({"phases": {"research": {"wall_seconds": 3.0}}})
+
+    summary = summarize_profiles(profiles)
+
+    assert summary["jobs"] == 21
+    audio = summary["phases"]["audio"]
+    assert audio["jobs"] == 20
+    assert audio["wall_seconds"] == {"p50": 10.0, "p95": 19.0, "max": 20.0}
+    assert summary["phases"]["research"]["wall_seconds"]["p95"] == 3.0
+    assert summary["apis"]["audio:elevenlabs"]["mean_seconds"]["p50"] == 10.0
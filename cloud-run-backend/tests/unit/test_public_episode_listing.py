@@ -0,0 +1,98 @@
+"""Unit tests for the materialized public episode listing."""
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from endpoints.public import routes as public_routes
+from services.public_episode_listing import (
+    LocalPublicListingRecords,
+    PublicEpisodeListing,
+    episode_sort_ts,
+    listing_entry,
+)
+
+
+def _episode(i, category_slug="phys", **extra):
+    return {
+        "title": f"Episode {i}",
+        "category": "Physics" if category_slug == "phys" else "Biology",
+        "category_slug": category_slug,
+        "generated_at": f"2025-01-{i:02d}T10:00:00",
+        "submitted_to_rss": True,
+        "request": {"expertise_level": "expert"},
+        **extra,
+    }
+
+
+def _listing(path, count=5):
+    listing = PublicEpisodeListing(LocalPublicListingRecords(str(path)), check_seconds=0)
+    listing.bootstrap(
+        listing_entry(f"ep-{i}", _episode(i, "bio" if i % 2 else "phys")) for i in range(1, count + 1)
+    )
+    return listing
+
+
+def test_sort_keys_are_normalised_epoch_seconds():
+    assert episode_sort_ts("2025-01-02T10:00:00Z") == episode_sort_ts("2025-01-02T10:00:00.123456")
+    assert episode_sort_ts("Thu, 02 Jan 2025 10:00:00 +0000") == episode_sort_ts("2025-01-02T10:00:00")
+    assert episode_sort_ts("2025-01-02") < episode_sort_ts("2025-01-02T10:00:00")
+    assert episode_sort_ts("not a date") == 0.0
+    assert listing_entry("draft", {"title": "Draft", "submitted_to_rss": False}) is None
+    assert listing_entry("web", {"visible_on_web": True}).payload["visible_on_web"] is True
+
+
+def test_pages_follow_the_cursor_newest_first(tmp_path):
+    listing = _listing(tmp_path / "listing.json")
+
+    version, first, cursor = listing.page(limit=2)
+    assert [p["episode_id"] for p in first] == ["ep-5", "ep-4"]
+    assert first[0]["expertise_level"] == "expert"
+    _, second, cursor = listing.page(limit=2, cursor=cursor)
+    assert [p["episode_id"] for p in second] == ["ep-3", "ep-2"]
+    _, last, cursor = listing.page(limit=2, cursor=cursor)
+    assert [p["episode_id"] for p in last] == ["ep-1"]
+    assert cursor is None
+
+    _, bio, _ = listing.page(category_slug="bio")
+    assert [p["episode_id"] for p in bio] == ["ep-5", "ep-3", "ep-1"]
+    with pytest.raises(ValueError):
+        listing.page(cursor="not-a-cursor")
+
+
+def test_changes_bump_the_version_and_other_instances_resync(tmp_path):
+    path = tmp_path / "listing.json"
+    writer = _listing(path)
+    reader = PublicEpisodeListing(LocalPublicListingRecords(str(path)), check_seconds=0)
+    version, _, _ = reader.page()
+
+    # Re-writing an unchanged entry is not a change
+    assert writer.apply(upserts=[listing_entry("ep-2", _episode(2))]) == version
+    writer.apply(upserts=[listing_entry("ep-9", _episode(9))], removals=["ep-5"])
+
+    new_version, pages, _ = reader.page()
+    assert new_version == version + 1
+    assert [p["episode_id"] for p in pages] == ["ep-9", "ep-4", "ep-3", "ep-2", "ep-1"]
+
+
+def test_endpoint_serves_the_listing_with_etag_revalidation(tmp_path):
+    listing = _listing(tmp_path / "listing.json")
+    app = FastAPI()
+    app.include_router(public_routes.router)
+    client = TestClient(app)
+
+    with patch.object(public_routes, "db", object()), \
+            patch.object(public_routes, "get_public_episode_listing", lambda: listing):
+        response = client.get("/api/public/podcasts", params={"limit": 3})
+        body = response.json()
+        assert [p["episode_id"] for p in body["podcasts"]] == ["ep-5", "ep-4", "ep-3"]
+        assert body["next_cursor"]
+
+        etag = response.headers["etag"]
+        assert client.get("/api/public/podcasts", headers={"If-None-Match": etag}).status_code == 304
+
+        listing.apply(removals=["ep-5"])
+        refreshed = client.get("/api/public/podcasts", headers={"If-None-Match": etag})
+        assert refreshed.status_code == 200
+        assert refreshed.json()["podcasts"][0]["episode_id"] == "ep-4"
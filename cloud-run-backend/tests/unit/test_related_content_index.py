@@ -0,0 +1,83 @@
+"""Unit tests for the related-content reverse index."""
+import json
+from unittest.mock import patch
+
+import pytest
+
+from mcp_server.tools import cross_component
+from services.related_content_index import (
+    RELATED_CONTENT_INDEX_COLLECTION,
+    episode_paper_dois,
+    index_episode,
+    index_processes,
+    lookup_related,
+    mark_index_built,
+    normalize_doi,
+    unindex_episode,
+)
+from tests.unit.fakes import FakeFirestore
+
+
+def test_dois_are_normalised_from_request_fields_and_links():
+    assert normalize_doi("https://doi.org/10.1038/NATURE12373") == "10.1038/nature12373"
+    assert normalize_doi("doi: 10.1126/science.abc123.") == "10.1126/science.abc123"
+    assert normalize_doi("https://arxiv.org/abs/2401.00001") is None
+    assert episode_paper_dois({
+        "paper_doi": "10.1038/nature12373",
+        "source_links": ["https://doi.org/10.1038/nature12373", "https://dx.doi.org/10.1000/xyz", None],
+    }) == ["10.1038/nature12373", "10.1000/xyz"]
+
+
+def test_lookup_is_one_batched_read_and_waits_for_the_backfill():
+    db = FakeFirestore()
+    index_episode(db, "job-1", {"paper_doi": "10.1038/nature12373"}, title="Ep 1", category="Biology")
+    index_episode(db, "job-2", {"source_links": ["https://doi.org/10.1038/NATURE12373"]}, title="Ep 2")
+    index_processes(db, [
+        {"id": "p53-pathway", "title": "p53 pathway", "entities": ["p53", "MDM2", "p53"]},
+        {"id": "apoptosis", "title": "Apoptosis", "entities": ["P53 "]},
+        {"title": "no id", "entities": ["p53"]},
+    ])
+
+    assert lookup_related(db, dois=["10.1038/nature12373"]) is None
+    mark_index_built(db, {"episodes": 2})
+
+    related = lookup_related(db, dois=["10.1038/Nature12373", None], entities=["p53", "unknown"])
+    assert len(db.get_all_calls) == 2
+    assert [p["job_id"] for p in related["podcasts"]] == ["job-1", "job-2"]
+    assert related["podcasts"][0] == {"job_id": "job-1", "title": "Ep 1", "category": "Biology"}
+    assert sorted(p["id"] for p in related["glmp_processes"]) == ["apoptosis", "p53-pathway"]
+    assert all(p["matching_entity"] == "p53" for p in related["glmp_processes"])
+
+    unindex_episode(db, "job-1", {"paper_doi": "10.1038/nature12373"})
+    related = lookup_related(db, dois=["10.1038/nature12373"])
+    assert [p["job_id"] for p in related["podcasts"]] == ["job-2"]
+
+
+@pytest.mark.asyncio
+async def test_find_related_content_uses_the_index_instead_of_scanning():
+    db = FakeFirestore()
+    index_episode(db, "job-1", {"paper_doi": "10.1000/xyz"}, title="Ep 1", category="Physics")
+    index_processes(db, [{"id": "proc-1", "title": "Proc", "entities": ["ATP"]}])
+    mark_index_built(db)
+    paper = {
+        "paper_id": "paper-1",
+        "doi": "10.1000/XYZ",
+        "preprocessing": {"entities_extracted": {"molecules": ["ATP", "ADP"]}},
+    }
+
+    async def fake_get_paper_by_id(paper_id=None, doi=None):
+        return json.dumps({"paper": paper})
+
+    async def fail_scan(*args, **kwargs):
+        raise AssertionError("scanned despite a built index")
+
+    with patch.object(cross_component, "get_paper_by_id", fake_get_paper_by_id), \
+            patch.object(cross_component, "get_firestore_client", lambda: db), \
+            patch.object(cross_component, "list_podcasts", fail_scan), \
+            patch.object(cross_component, "search_glmp_by_entity", fail_scan):
+        result = json.loads(await cross_component.find_related_content(paper_id="paper-1"))
+
+    assert [p["job_id"] for p in result["podcasts"]] == ["job-1"]
+    assert [p["id"] for p in result["glmp_processes"]] == ["proc-1"]
+    assert result["counts"] == {"papers": 0, "podcasts": 1, "glmp_processes": 1}
+    assert RELATED_CONTENT_INDEX_COLLECTION in db.data
@@ -0,0 +1,119 @@
+"""Unit tests for the structured RSS feed store."""
+import asyncio
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from config.constants import RSS_NAMESPACES
+from services.rss_feed_store import (
+    FeedItem,
+    LocalRSSFeedRecords,
+    RSSFeed,
+    item_pub_ts,
+    render_item_fragment,
+)
+from services.rss_service import RSSPublishCoalescer, RSSService
+
+FEED_XML = f"""<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0" xmlns:itunes="{RSS_NAMESPACES['itunes']}" xmlns:content="{RSS_NAMESPACES['content']}">
+<channel>
+<title>CopernicusAI</title>
+<item><title>Old</title><guid isPermaLink="false">ever-phys-250001</guid><pubDate>Mon, 06 Jan 2025 10:00:00 +0000</pubDate></item>
+<item><title>Newer</title><guid isPermaLink="false">ever-bio-250002</guid><pubDate>Tue, 07 Jan 2025 10:00:00 +0000</pubDate></item>
+<itunes:author>CopernicusAI</itunes:author>
+</channel>
+</rss>""".encode("utf-8")
+
+
+def _item(guid, title, pub_date):
+    item_data = {
+        "title": title,
+        "episode_link": f"https://example.org/{guid}",
+        "description_plain": "Plain text summary",
+        "description_html": "<p>HTML</p>",
+        "summary": "Summary",
+        "audio_url": f"https://storage.googleapis.com/bucket/audio/{guid}.mp3",
+        "guid": guid,
+        "pub_date": RSSService._parse_iso_datetime(pub_date),
+        "thumbnail_url": "https://example.org/thumb.jpg",
+        "duration_display": "10:00",
+        "canonical": guid,
+        "category_label": "Physics",
+        "attribution": None,
+    }
+    item_el = RSSService._create_rss_item_element(item_data, 1234)
+    return FeedItem(guid=guid, pub_ts=item_pub_ts(item_el), xml=render_item_fragment(item_el))
+
+
+def _guids(xml_bytes):
+    channel = ET.fromstring(xml_bytes).find("channel")
+    return [item.find("guid").text for item in channel.findall("item")]
+
+
+def test_bootstrap_apply_and_render_keep_the_feed_sorted(tmp_path):
+    feed = RSSFeed(LocalRSSFeedRecords(str(tmp_path / "feed.json")))
+    assert not feed.is_bootstrapped()
+    feed.bootstrap(FEED_XML)
+
+    assert feed.contains("ever-phys-250001")
+    version, xml_bytes = feed.render()
+    assert _guids(xml_bytes) == ["ever-bio-250002", "ever-phys-250001"]
+
+    new_version = feed.apply(
+        upserts=[_item("ever-chem-250003", "Newest", "2025-01-08T10:00:00Z")],
+        removals=["ever-phys-250001"],
+    )
+    assert new_version == version + 1
+    _, xml_bytes = feed.render()
+    assert _guids(xml_bytes) == ["ever-chem-250003", "ever-bio-250002"]
+
+    root = ET.fromstring(xml_bytes)
+    item = root.find("channel").find("item")
+    assert item.find("description").text == "Plain text summary"
+    assert item.find(f"{{{RSS_NAMESPACES['itunes']}}}duration").text == "10:00"
+    # Namespaces are declared once on <rss>, not repeated on every item
+    assert xml_bytes.count(f'xmlns:itunes="{RSS_NAMESPACES["itunes"]}"'.encode()) == 1
+    assert root.find("channel").find(f"{{{RSS_NAMESPACES['itunes']}}}author") is not None
+
+
+def test_noop_changes_keep_the_version_and_other_instances_resync(tmp_path):
+    path = str(tmp_path / "feed.json")
+    writer = RSSFeed(LocalRSSFeedRecords(path))
+    version = writer.bootstrap(FEED_XML)
+    reader = RSSFeed(LocalRSSFeedRecords(path))
+    assert reader.contains("ever-bio-250002")
+
+    assert writer.apply(removals=["not-in-feed"]) == version
+    writer.apply(removals=["ever-bio-250002"])
+
+    assert not reader.contains("ever-bio-250002")
+    assert _guids(reader.render()[1]) == ["ever-phys-250001"]
+
+
+@pytest.mark.asyncio
+async def test_coalescer_publishes_a_burst_once_and_last_change_wins():
+    published = []
+    coalescer = RSSPublishCoalescer(flush_seconds=0.02, apply_changes=lambda changes: published.append(dict(changes)))
+    item = ET.Element("item")
+
+    await asyncio.gather(
+        coalescer.submit("ever-phys-250001", item),
+        coalescer.submit("ever-bio-250002", item),
+        coalescer.submit("ever-phys-250001", None),
+    )
+
+    assert published == [{"ever-bio-250002": item, "ever-phys-250001": None}]
+    await coalescer.submit("ever-chem-250003", item)
+    assert len(published) == 2
+
+
+@pytest.mark.asyncio
+async def test_coalescer_fails_every_waiter_of_a_failed_flush():
+    def fail(changes):
+        raise RuntimeError("gcs down")
+
+    coalescer = RSSPublishCoalescer(flush_seconds=0.01, apply_changes=fail)
+    outcomes = await asyncio.gather(
+        coalescer.submit("a", None), coalescer.submit("b", None), return_exceptions=True
+    )
+    assert [str(o) for o in outcomes] == ["gcs down", "gcs down"]
@@ -0,0 +1,80 @@
+"""Unit tests for the batched knowledge-map similarity edge builders."""
+import random
+import time
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from services import knowledge_map_service as kms
+from services.knowledge_map_service import KnowledgeMapService
+
+_WORDS = [f"term{i}" for i in range(400)]
+
+
+def _service():
+    with patch.object(kms, "db", object()):
+        return KnowledgeMapService()
+
+
+def _papers(n, seed=7):
+    rng = random.Random(seed)
+    papers = []
+    for i in range(n):
+        topic = rng.randrange(40)
+        words = [_WORDS[(topic * 10 + rng.randrange(15)) % 400] for _ in range(12)]
+        words += rng.sample(_WORDS, 4)
+        papers.append({"paper_id": f"p{i:05d}", "title": " ".join(words[:4]), "abstract": " ".join(words[4:])})
+    return papers
+
+
+def test_keyword_edges_match_pure_python_path():
+    service = _service()
+    papers = _papers(300)
+
+    vectorized = service.extract_keyword_similarity_relationships(papers)
+    with patch.object(kms, "NUMPY_AVAILABLE", False):
+        reference = service.extract_keyword_similarity_relationships(papers)
+
+    assert vectorized == reference
+    assert vectorized and vectorized[0]["metadata"]["method"] == "keyword_overlap"
+
+
+def test_vector_edges_use_batched_similarity_without_firestore():
+    service = _service()
+    service.db = None  # any Firestore access would raise
+    papers = [
+        {"paper_id": "a", "categories": ["q"], "embedding": [1.0, 0.0, 0.0]},
+        {"paper_id": "b", "categories": ["q"], "embedding": [0.9, 0.1, 0.0]},
+        {"paper_id": "c", "categories": ["q"], "embedding": [0.0, 0.0, 1.0]},
+    ]
+
+    edges = service.extract_concept_relationships(papers, similarity_threshold=0.7)
+    with patch.object(kms, "NUMPY_AVAILABLE", False):
+        reference = service.extract_concept_relationships(papers, similarity_threshold=0.7)
+
+    assert [(e["source"], e["target"]) for e in edges] == [("a", "b"), ("b", "a")]
+    assert edges[0]["metadata"] == {"method": "vector_similarity", "category": "q"}
+    assert [e["weight"] for e in edges] == pytest.approx([e["weight"] for e in reference])
+
+
+
+def test_vector_edges_come_from_at_most_100_papers_per_category():
+    service = _service()
+    papers = [{"paper_id": f"p{i:03d}", "categories": ["q"], "embedding": [1.0, i / 1000]} for i in range(105)]
+
+    edges = service.extract_concept_relationships(papers, similarity_threshold=0.7, top_k=2)
+
+    assert {e["source"] for e in edges} == {f"p{i:03d}" for i in range(100)}
+    assert len(edges) == 200
+
+
+def test_keyword_edges_for_5k_papers_build_in_seconds():
+    service = _service()
+    papers = _papers(5000)
+
+    started = time.perf_counter()
+    edges = service.extract_keyword_similarity_relationships(papers)
+    assert time.perf_counter() - started < 10
+    assert len(edges) > 1000
@@ -0,0 +1,51 @@
+"""Unit tests for bulk RSS submission (endpoints/subscriber/routes.py)."""
+import threading
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from endpoints.subscriber import routes as subscriber_routes
+from models.subscriber import BulkPodcastSubmission, PodcastSubmission
+
+
+@pytest.mark.asyncio
+async def test_bulk_submission_runs_firestore_work_off_the_loop_with_bounded_concurrency():
+    lock = threading.Lock()
+    running = {"now": 0, "max": 0}
+    threads = set()
+
+    def blocking(result):
+        with lock:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+            threads.add(threading.current_thread())
+        time.sleep(0.02)
+        with lock:
+            running["now"] -= 1
+        return result
+
+    def prepare(submission):
+        if submission.podcast_id == "missing":
+            raise HTTPException(status_code=404, detail="Podcast not found: missing")
+        return blocking({
+            "podcast_data": {}, "job_id": submission.podcast_id, "subscriber_id": "s1",
+            "subscriber_payload": {}, "canonical": submission.podcast_id, "creator_attribution": None,
+        })
+
+    ids = [f"job{i}" for i in range(20)] + ["missing"]
+    bulk = BulkPodcastSubmission(submissions=[PodcastSubmission(podcast_id=i, submit_to_rss=True) for i in ids])
+    feed = AsyncMock()
+    with patch.object(subscriber_routes, "db", object()), \
+            patch.object(subscriber_routes, "RSS_BULK_FIRESTORE_CONCURRENCY", 4), \
+            patch.object(subscriber_routes, "_prepare_rss_submission", prepare), \
+            patch.object(subscriber_routes, "_record_rss_submission", lambda submission, prepared: blocking(None)), \
+            patch.object(subscriber_routes.rss_service, "update_rss_feed", feed):
+        response = await subscriber_routes.submit_podcasts_to_rss_bulk(bulk)
+
+    assert (response["succeeded"], response["failed"]) == (20, 1)
+    assert response["results"][-1] == {"podcast_id": "missing", "error": "Podcast not found: missing", "status_code": 404}
+    assert feed.await_count == 20
+    assert threading.main_thread() not in threads
+    assert 1 < running["max"] <= 4
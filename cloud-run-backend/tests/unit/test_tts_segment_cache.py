@@ -0,0 +1,66 @@
+"""Unit tests for the content-addressed TTS segment cache."""
+import os
+from unittest.mock import patch
+
+import pytest
+
+import elevenlabs_voice_service as evs
+from elevenlabs_voice_service import ElevenLabsVoiceService
+from services import tts_segment_cache as tsc
+from services.tts_segment_cache import TTSSegmentCache, tts_segment_key
+
+
+def test_key_covers_text_voice_model_and_settings():
+    base = tts_segment_key("Hello there.", "voice-a", "model-1", {"stability": 0.5, "style": 0.4})
+    assert base == tts_segment_key("Hello there.", "voice-a", "model-1", {"style": 0.4, "stability": 0.5})
+    assert base != tts_segment_key("Hello there!", "voice-a", "model-1", {"stability": 0.5, "style": 0.4})
+    assert base != tts_segment_key("Hello there.", "voice-b", "model-1", {"stability": 0.5, "style": 0.4})
+    assert base != tts_segment_key("Hello there.", "voice-a", "model-2", {"stability": 0.5, "style": 0.4})
+    assert base != tts_segment_key("Hello there.", "voice-a", "model-1", {"stability": 0.6, "style": 0.4})
+
+
+def test_local_tier_evicts_least_recently_used(tmp_path):
+    cache = TTSSegmentCache(local_dir=str(tmp_path), max_bytes=3500)
+    for i, key in enumerate(["a" * 64, "b" * 64, "c" * 64]):
+        cache.put(key, bytes([i]) * 1000)
+        path = cache._local_path(key)
+        os.utime(path, (1000 + i, 1000 + i))
+    assert cache.get("a" * 64) is not None  # refreshes 'a'
+
+    cache.put("d" * 64, b"\x03" * 1000)
+
+    assert cache.get("b" * 64) is None
+    assert cache.get("a" * 64) == b"\x00" * 1000
+    assert cache.get("d" * 64) == b"\x03" * 1000
+    stats = cache.stats()
+    assert stats["local_evictions"] >= 1 and stats["local_bytes"] <= 3500
+
+
+@pytest.mark.asyncio
+async def test_only_cache_misses_call_the_api(tmp_path):
+    with patch.object(ElevenLabsVoiceService, "_get_api_key", return_value="test-key"):
+        service = ElevenLabsVoiceService()
+    cache = TTSSegmentCache(local_dir=str(tmp_path))
+    calls = []
+
+    async def fake_synthesize(text, voice_config):
+        calls.append(text)
+        return f"{voice_config.voice_id}:{text}".encode(), 1.0
+
+    host, expert = service.voice_configs["host"], service.voice_configs["expert"]
+    requests = [("Welcome to the show.", host), ("Today: qubits.", expert)]
+    with patch.object(tsc, "TTS_SEGMENT_CACHE_DIR", str(tmp_path)), \
+            patch.object(tsc, "_tts_segment_cache", cache), \
+            patch.object(evs, "ELEVENLABS_REQUESTS_PER_SECOND", 0), \
+            patch.object(service, "_synthesize_segment", side_effect=fake_synthesize):
+        first = await service._synthesize_segments_concurrently(requests)
+        # Regeneration with one changed line: the intro comes from the cache
+        second = await service._synthesize_segments_concurrently(
+            [requests[0], ("Today: superconductors.", expert), ("Welcome to the show.", expert)]
+        )
+    await service.close()
+
+    assert calls == ["Welcome to the show.", "Today: qubits.", "Today: superconductors.", "Welcome to the show."]
+    assert second[0][0] == first[0][0]
+    assert second[2][0] == f"{expert.voice_id}:Welcome to the show.".encode()
+    assert cache.stats()["local_hits"] == 1
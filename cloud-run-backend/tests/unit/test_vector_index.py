@@ -0,0 +1,107 @@
+"""Unit tests for the local ANN vector index used by semantic search.
+
+These build small indexes in memory / tmp_path and never touch Firestore.
+"""
+import os
+from datetime import datetime
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from mcp_server.utils.vector_index import (
+    VectorIndex,
+    VectorIndexRegistry,
+    build_index_from_documents,
+)
+
+
+def _random_docs(n, dim=16, seed=1):
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(n, dim)).astype(np.float32)
+    return [
+        (f"doc-{i}", {"title": f"Doc {i}", "embedding": vectors[i].tolist(), "created_at": datetime(2025, 1, 1)})
+        for i in range(n)
+    ], vectors
+
+
+def _exact_top(vectors, query, k):
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    sims = normed @ (query / np.linalg.norm(query))
+    return [f"doc-{i}" for i in np.argsort(-sims)[:k]]
+
+
+def test_flat_search_matches_exact_cosine():
+    docs, vectors = _random_docs(200)
+    index = build_index_from_documents("papers", docs)
+    query = vectors[7] + 0.01
+
+    hits = index.search(query.tolist(), limit=5)
+
+    assert [doc_id for doc_id, _, _ in hits] == _exact_top(vectors, query, 5)
+    assert hits[0][0] == "doc-7"
+    assert hits[0][1] == pytest.approx(0.0, abs=1e-3)
+    assert "embedding" not in hits[0][2]
+    assert hits[0][2]["created_at"] == "2025-01-01T00:00:00"
+
+
+def test_distance_threshold_drops_far_results():
+    docs, vectors = _random_docs(50)
+    index = build_index_from_documents("papers", docs)
+
+    hits = index.search(vectors[3].tolist(), limit=50, distance_threshold=0.01)
+
+    assert [doc_id for doc_id, _, _ in hits] == ["doc-3"]
+
+
+def test_ivf_search_recalls_nearest_neighbour():
+    docs, vectors = _random_docs(600, dim=8)
+    ids = [d for d, _ in docs]
+    payloads = [{"title": d["title"]} for _, d in docs]
+    index = VectorIndex.build("papers", ids, vectors, payloads, nlist=16)
+
+    assert index.nlist == 16
+    found = 0
+    for row in range(0, 600, 37):
+        hits = index.search(vectors[row].tolist(), limit=1, nprobe=4)
+        found += hits and hits[0][0] == f"doc-{row}"
+    assert found >= 14  # 17 probes; allow a miss or two from approximate lists
+
+
+def test_snapshot_roundtrip_is_memory_mapped(tmp_path):
+    docs, vectors = _random_docs(100)
+    index = build_index_from_documents("episodes", docs)
+    version_dir = index.save(str(tmp_path))
+
+    loaded = VectorIndex.load(version_dir)
+
+    assert isinstance(loaded.vectors, np.memmap)
+    assert loaded.ids == index.ids
+    assert loaded.search(vectors[42].tolist(), limit=3) == index.search(vectors[42].tolist(), limit=3)
+    assert open(os.path.join(tmp_path, "episodes", "CURRENT")).read() == os.path.basename(version_dir)
+
+
+def test_registry_skips_missing_and_stale_snapshots(tmp_path):
+    docs, _ = _random_docs(20)
+    index = build_index_from_documents("episodes", docs)
+    index.save(str(tmp_path))
+
+    assert VectorIndexRegistry(str(tmp_path), max_age_seconds=3600).get("episodes") is not None
+    assert VectorIndexRegistry(str(tmp_path), max_age_seconds=3600).get("research_papers") is None
+
+    index.meta["built_at"] -= 7200
+    index.save(str(tmp_path))
+    assert VectorIndexRegistry(str(tmp_path), max_age_seconds=3600).get("episodes") is None
+
+
+def test_mixed_dimensions_are_skipped():
+    docs = [
+        ("a", {"embedding": [1.0, 0.0, 0.0]}),
+        ("b", {"embedding": [0.0, 1.0]}),
+        ("c", {"embedding": [0.0, 0.0, 1.0]}),
+        ("d", {"title": "no embedding"}),
+    ]
+    index = build_index_from_documents("papers", docs)
+
+    assert index.ids == ["a", "c"]
+    assert index.dimension == 3
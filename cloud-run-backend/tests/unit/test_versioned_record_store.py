@@ -0,0 +1,52 @@
+"""Unit tests for the versioned record store shared by the RSS feed and public listing."""
+from dataclasses import dataclass
+
+import pytest
+
+from services.versioned_record_store import LocalVersionedRecords, VersionedRecordCache
+
+
+@dataclass
+class _Row:
+    key: str
+    value: int
+
+
+def _records(path):
+    return LocalVersionedRecords(str(path), name="Test store", key_field="key", row_from_dict=lambda d: _Row(**d))
+
+
+class _Cache(VersionedRecordCache):
+    def __init__(self, records):
+        super().__init__(records)
+        self.changes = []
+
+    def _changed(self, keys):
+        self.changes.append(keys)
+
+
+def test_cache_tracks_versions_and_reports_changed_keys(tmp_path):
+    path = tmp_path / "store.json"
+    cache = _Cache(_records(path))
+    with pytest.raises(RuntimeError, match="Test store is not bootstrapped"):
+        cache.apply(upserts=[_Row("a", 1)])
+
+    with cache._lock:
+        version = cache._replace_all({"label": "x"}, [_Row("a", 1), _Row("b", 2)])
+    assert cache.changes == [None]
+
+    # Unchanged upserts and unknown removals are not changes
+    assert cache.apply(upserts=[_Row("a", 1)], removals=["missing"]) == version
+    assert cache.apply(upserts=[_Row("a", 5)], removals=["b"]) == version + 1
+    assert cache.changes[-1] == ["a", "b"]
+
+    header, rows = _records(path).load()
+    assert header["label"] == "x" and header["version"] == version + 1
+    assert rows == {"a": _Row("a", 5)}
+
+    # Another writer's change is picked up by the version check
+    other = _Cache(_records(path))
+    other.apply(upserts=[_Row("c", 3)])
+    with cache._lock:
+        cache._sync()
+        assert set(cache._rows) == {"a", "c"}
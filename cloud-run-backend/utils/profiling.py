@@ -0,0 +1,324 @@
+"""
+Per-phase resource profiling for podcast jobs
+
+A job activates a JobProfile; code anywhere below it (in the same task, or in
+tasks and threads it starts) marks phases with `profile_phase`, usable as a
+sync or async context manager or as a decorator:
+
+    async with profile_phase("research"):
+        ...
+
+    @profile_phase("audio_concat")
+    async def _combine_audio_segments(self, segments): ...
+
+Phases nest: a phase opened inside "audio" is recorded as "audio/tts_synthesis".
+Each phase records wall time, process CPU time, peak RSS (sampled in the
+background), bytes sent/received (`record_transfer`) and per-API call latency
+(`api_call("elevenlabs")`). Transfers and API calls count toward every phase
+on the current stack. Outside an active job profile all of these are no-ops.
+
+CPU time and RSS are process-wide: stages that overlap, or jobs sharing an
+instance, are charged for each other's usage.
+
+Finished profiles are written to the job document (`profile`) and to
+`podcast_job_profiles`, from which `summarize_profiles` computes p50/p95 per
+phase across jobs for the admin endpoint.
+
+Copyright (c) 2025 Gary Welz / CopernicusAI
+Licensed under MIT License
+"""
+
+import functools
+import inspect
+import math
+import os
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import psutil
+
+from utils.logging import structured_logger
+
+# Configuration
+PROFILE_RSS_SAMPLE_SECONDS = float(os.getenv("PROFILE_RSS_SAMPLE_SECONDS", "0.5"))
+JOB_PROFILES_COLLECTION = os.getenv("JOB_PROFILES_COLLECTION", "podcast_job_profiles")
+
+_MB = 1024 * 1024
+
+_job_profile: ContextVar[Optional["JobProfile"]] = ContextVar("job_profile", default=None)
+_phase_stack: ContextVar[Tuple[str, ...]] = ContextVar("phase_stack", default=())
+
+
+def _rss_bytes() -> int:
+    return psutil.Process().memory_info().rss
+
+
+class JobProfile:
+    """Phase statistics for one job, filled in by profile_phase/record_transfer/api_call."""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self._active: Dict[str, int] = {}  # phase key -> open entries
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self.started_at = datetime.utcnow().isoformat()
+
+    # --- lifecycle ---
+
+    def activate(self):
+        """Make this the current job profile; returns a token for deactivate()."""
+        self._sampler = threading.Thread(target=self._sample_rss, name=f"profile-{self.job_id}", daemon=True)
+        self._sampler.start()
+        return _job_profile.set(self)
+
+    def deactivate(self, token) -> None:
+        self._stop.set()
+        _job_profile.reset(token)
+
+    def _sample_rss(self) -> None:
+        while not self._stop.wait(PROFILE_RSS_SAMPLE_SECONDS):
+            try:
+                rss = _rss_bytes()
+            except Exception:
+                continue
+            with self._lock:
+                for key in self._active:
+                    stats = self.phases[key]
+                    stats["peak_rss_mb"] = max(stats["peak_rss_mb"], round(rss / _MB, 1))
+
+    # --- recording ---
+
+    def _stats(self, key: str) -> Dict[str, Any]:
+        stats = self.phases.get(key)
+        if stats is None:
+            stats = self.phases[key] = {
+                "calls": 0,
+                "wall_seconds": 0.0,
+                "cpu_seconds": 0.0,
+                "peak_rss_mb": 0.0,
+                "bytes_up": 0,
+                "bytes_down": 0,
+                "errors": 0,
+                "api": {},
+            }
+        return stats
+
+    def begin(self, key: str, rss: int) -> None:
+        with self._lock:
+            stats = self._stats(key)
+            stats["calls"] += 1
+            stats["peak_rss_mb"] = max(stats["peak_rss_mb"], round(rss / _MB, 1))
+            self._active[key] = self._active.get(key, 0) + 1
+
+    def end(self, key: str, wall: float, cpu: float, rss: int, failed: bool) -> None:
+        with self._lock:
+            stats = self._stats(key)
+            stats["wall_seconds"] = round(stats["wall_seconds"] + wall, 3)
+            stats["cpu_seconds"] = round(stats["cpu_seconds"] + cpu, 3)
+            stats["peak_rss_mb"] = max(stats["peak_rss_mb"], round(rss / _MB, 1))
+            if failed:
+                stats["errors"] += 1
+            self._active[key] -= 1
+            if not self._active[key]:
+                del self._active[key]
+
+    def add_transfer(self, keys: List[str], up: int, down: int) -> None:
+        with self._lock:
+            for key in keys:
+                stats = self._stats(key)
+                stats["bytes_up"] += up
+                stats["bytes_down"] += down
+
+    def add_api_call(self, keys: List[str], api: str, seconds: float, failed: bool) -> None:
+        with self._lock:
+            for key in keys:
+                calls = self._stats(key)["api"].setdefault(
+                    api, {"calls": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+                )
+                calls["calls"] += 1
+                calls["errors"] += int(failed)
+                calls["total_seconds"] = round(calls["total_seconds"] + seconds, 3)
+                calls["max_seconds"] = round(max(calls["max_seconds"], seconds), 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "job_id": self.job_id,
+                "started_at": self.started_at,
+                "phases": {key: {**stats, "api": dict(stats["api"])} for key, stats in self.phases.items()},
+            }
+
+
+def _stack_keys() -> List[str]:
+    """Keys of every open phase on the current stack, outermost first."""
+    stack = _phase_stack.get()
+    return ["/".join(stack[:i]) for i in range(1, len(stack) + 1)]
+
+
+class profile_phase:
+    """Record a phase of the current job (context manager, async context manager or decorator)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._profile: Optional[JobProfile] = None
+
+    def _enter(self) -> None:
+        self._profile = _job_profile.get()
+        if self._profile is None:
+            return
+        stack = _phase_stack.get() + (self.name,)
+        self._key = "/".join(stack)
+        self._token = _phase_stack.set(stack)
+        self._profile.begin(self._key, _rss_bytes())
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+
+    def _exit(self, failed: bool) -> None:
+        if self._profile is None:
+            return
+        self._profile.end(
+            self._key,
+            time.perf_counter() - self._wall,
+            time.process_time() - self._cpu,
+            _rss_bytes(),
+            failed,
+        )
+        _phase_stack.reset(self._token)
+
+    def __enter__(self):
+        self._enter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._exit(exc_type is not None)
+        return False
+
+    async def __aenter__(self):
+        self._enter()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._exit(exc_type is not None)
+        return False
+
+    def __call__(self, fn):
+        name = self.name
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                async with profile_phase(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with profile_phase(name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+class api_call:
+    """Time one external API call against the open phases (sync or async context manager)."""
+
+    def __init__(self, api: str):
+        self.api = api
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        profile = _job_profile.get()
+        if profile is not None:
+            profile.add_api_call(_stack_keys(), self.api, time.perf_counter() - self._start, exc_type is not None)
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+
+def record_transfer(up: int = 0, down: int = 0) -> None:
+    """Count bytes sent to / received from external services in the open phases."""
+    profile = _job_profile.get()
+    if profile is not None and (up or down):
+        profile.add_transfer(_stack_keys(), up, down)
+
+
+# --- persistence and aggregation ---
+
+def save_job_profile(db: Any, profile: JobProfile, job_ref: Any = None) -> Dict[str, Any]:
+    """Write a finished profile to the job document and the profiles collection."""
+    data = profile.to_dict()
+    data["recorded_at"] = datetime.utcnow().isoformat()
+    try:
+        if job_ref is not None:
+            job_ref.update({"profile": data["phases"]})
+        db.collection(JOB_PROFILES_COLLECTION).document(profile.job_id).set(data)
+    except Exception as e:
+        structured_logger.warning("Could not save job profile", job_id=profile.job_id, error=str(e))
+    return data
+
+
+def load_job_profiles(db: Any, limit: int = 200) -> List[Dict[str, Any]]:
+    """Most recent job profiles, newest first."""
+    query = (
+        db.collection(JOB_PROFILES_COLLECTION)
+        .order_by("recorded_at", direction="DESCENDING")
+        .limit(limit)
+    )
+    return [doc.to_dict() or {} for doc in query.stream()]
+
+
+_METRICS = ("wall_seconds", "cpu_seconds", "peak_rss_mb", "bytes_up", "bytes_down")
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    rank = max(1, math.ceil(q * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _distribution(values: List[float]) -> Dict[str, float]:
+    values = sorted(values)
+    return {
+        "p50": round(_percentile(values, 0.50), 3),
+        "p95": round(_percentile(values, 0.95), 3),
+        "max": round(values[-1], 3),
+    }
+
+
+def summarize_profiles(profiles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """p50/p95/max of each phase metric, and of per-call API latency, across jobs."""
+    per_phase: Dict[str, Dict[str, List[float]]] = {}
+    per_api: Dict[str, Dict[str, List[float]]] = {}
+    for profile in profiles:
+        for key, stats in (profile.get("phases") or {}).items():
+            series = per_phase.setdefault(key, {metric: [] for metric in _METRICS})
+            for metric in _METRICS:
+                series[metric].append(float(stats.get(metric) or 0))
+            for api, calls in (stats.get("api") or {}).items():
+                if not calls.get("calls"):
+                    continue
+                api_series = per_api.setdefault(f"{key}:{api}", {"mean_seconds": [], "max_seconds": [], "total_seconds": []})
+                api_series["mean_seconds"].append(calls["total_seconds"] / calls["calls"])
+                api_series["max_seconds"].append(calls["max_seconds"])
+                api_series["total_seconds"].append(calls["total_seconds"])
+    return {
+        "jobs": len(profiles),
+        "phases": {
+            key: {"jobs": len(series["wall_seconds"]), **{m: _distribution(v) for m, v in series.items()}}
+            for key, series in sorted(per_phase.items())
+        },
+        "apis": {
+            key: {"jobs": len(series["total_seconds"]), **{m: _distribution(v) for m, v in series.items()}}
+            for key, series in sorted(per_api.items())
+        },
+    }
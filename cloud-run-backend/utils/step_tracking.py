@@ -4,11 +4,12 @@ import time
 from contextlib import asynccontextmanager
 from typing import Optional
 from utils.logging import structured_logger
+from utils.profiling import profile_phase
 
 
 @asynccontextmanager
 async def with_step(step_name: str, job_id: str = None, **context):
-    """Context manager for tracking execution steps with timing"""
+    """Context manager for tracking execution steps with timing (also a profiled phase)"""
     start_time = time.time()
     step_id = f"{step_name}_{int(start_time * 1000)}"
     
@@ -19,7 +20,8 @@ async def with_step(step_name: str, job_id: str = None, **context):
                           **context)
     
     try:
-        yield step_id
+        async with profile_phase(step_name):
+            yield step_id
     except Exception as e:
         duration_ms = int((time.time() - start_time) * 1000)
         structured_logger.error(f"Step failed: {step_name}", 
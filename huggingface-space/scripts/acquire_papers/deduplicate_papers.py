@@ -4,13 +4,19 @@ Paper Deduplication Script
 
 Performs cross-database deduplication of papers from multiple sources.
 Handles DOI matching, title similarity, and author matching for comprehensive deduplication.
+
+Candidate pairs are found by blocking (identifier hash maps, title MinHash LSH,
+sorted neighbourhood) so only plausible pairs are scored; --pairwise runs the
+exhaustive comparison instead.
 """
 
+import hashlib
 import json
 import os
+import random
 import re
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from datetime import datetime
 from collections import defaultdict
 import sys
@@ -27,6 +33,10 @@ PAPERS_DIR = BASE_DIR / "metadata-database" / "papers"
 OUTPUT_DIR = BASE_DIR / "metadata-database" / "papers_deduplicated"
 TITLE_SIMILARITY_THRESHOLD = 0.85  # 85% similarity for title matching
 AUTHOR_OVERLAP_THRESHOLD = 0.5  # 50% author overlap for matching
+TITLE_SHINGLE_SIZE = 4  # character n-grams hashed for title LSH
+LSH_BANDS = 16  # 16 bands x 4 rows: ~99% of titles at 0.85 similarity share a bucket
+LSH_ROWS = 4
+SORTED_NEIGHBOURHOOD_WINDOW = 8  # neighbours compared after sorting normalized titles
 
 def load_paper(filepath: Path) -> Optional[Dict]:
     """Load a paper from JSON file."""
@@ -230,9 +240,9 @@ def load_all_papers(source_dirs: List[Path]) -> Dict[str, Dict]:
     print(f"  ✅ Loaded {len(all_papers)} unique papers (by primary ID)")
     return all_papers
 
-def find_duplicates(papers: Dict[str, Dict]) -> Dict[str, List[Tuple[str, str, float]]]:
+def find_duplicates_pairwise(papers: Dict[str, Dict]) -> Dict[str, List[Tuple[str, str, float]]]:
     """
-    Find duplicate papers.
+    Find duplicate papers by comparing every pair (O(n^2); reference for find_duplicates).
     Returns: Dictionary mapping paper_id -> list of (duplicate_id, reason, confidence)
     """
     print("\nFinding duplicates...")
@@ -259,6 +269,139 @@ def find_duplicates(papers: Dict[str, Dict]) -> Dict[str, List[Tuple[str, str, f
     print(f"  ✅ Found {len(duplicates)} papers with potential duplicates")
     return duplicates
 
+def _exact_id_keys(paper: Dict) -> List[Tuple[str, str]]:
+    """The identifier values are_duplicates compares exactly, as (kind, value)."""
+    keys = []
+    doi = normalize_doi(paper.get("doi") or paper.get("DOI"))
+    if doi:
+        keys.append(("doi", doi))
+    arxiv = (paper.get("arxiv_id") or "").lower()
+    if arxiv:
+        keys.append(("arxiv", arxiv))
+    pmid = str(paper.get("pmid") or paper.get("pubmed") or "")
+    if pmid:
+        keys.append(("pmid", pmid))
+    bibcode = paper.get("bibcode")
+    if bibcode:
+        keys.append(("bibcode", bibcode))
+    return keys
+
+def _title_shingles(title: str) -> Set[str]:
+    """Character 4-grams of the normalized title (spaces dropped, so re-spacing doesn't matter)."""
+    text = normalize_text(title).replace(" ", "")
+    if len(text) <= TITLE_SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + TITLE_SHINGLE_SIZE] for i in range(len(text) - TITLE_SHINGLE_SIZE + 1)}
+
+class _TitleMinHash:
+    """MinHash signatures over title shingles, banded for LSH bucketing."""
+
+    _PRIME = (1 << 61) - 1
+
+    def __init__(self, bands: int = LSH_BANDS, rows: int = LSH_ROWS, seed: int = 1):
+        rng = random.Random(seed)
+        count = bands * rows
+        self.bands = bands
+        self.rows = rows
+        self._a = [rng.randrange(1, self._PRIME) for _ in range(count)]
+        self._b = [rng.randrange(0, self._PRIME) for _ in range(count)]
+        # Titles share most shingles, so each shingle's permuted values are computed once
+        self._shingle_values: Dict[str, Tuple[int, ...]] = {}
+
+    def _values(self, shingle: str) -> Tuple[int, ...]:
+        values = self._shingle_values.get(shingle)
+        if values is None:
+            h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+            values = tuple((a * h + b) % self._PRIME for a, b in zip(self._a, self._b))
+            self._shingle_values[shingle] = values
+        return values
+
+    def band_keys(self, shingles: Set[str]) -> List[Tuple[int, Tuple[int, ...]]]:
+        signature = list(map(min, zip(*(self._values(s) for s in shingles))))
+        return [
+            (band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+
+def _pairs_within(members: List[int]) -> Iterable[Tuple[int, int]]:
+    for a in range(len(members)):
+        for b in range(a + 1, len(members)):
+            yield members[a], members[b]
+
+def find_duplicates(papers: Dict[str, Dict]) -> Dict[str, List[Tuple[str, str, float]]]:
+    """
+    Find duplicate papers without comparing every pair.
+
+    Candidate pairs come from blocking:
+    - hash maps on exact DOI / arXiv / PMID / bibcode (every exact match is found);
+    - MinHash LSH on title 4-grams plus a sorted-neighbourhood window over
+      normalized titles, for title+author matches (probabilistic: a near-duplicate
+      title lands in a shared bucket with ~99% probability at the 0.85 threshold).
+    Candidates are scored with are_duplicates, so results use the same reasons,
+    confidences and ordering as find_duplicates_pairwise.
+    Returns: Dictionary mapping paper_id -> list of (duplicate_id, reason, confidence)
+    """
+    print("\nFinding duplicates (indexed)...")
+    paper_ids = list(papers.keys())
+
+    id_pairs: Set[Tuple[int, int]] = set()
+    by_exact_id: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+    for index, paper_id in enumerate(paper_ids):
+        for key in _exact_id_keys(papers[paper_id]):
+            by_exact_id[key].append(index)
+    for members in by_exact_id.values():
+        id_pairs.update(_pairs_within(members))
+
+    title_pairs: Set[Tuple[int, int]] = set()
+    minhash = _TitleMinHash()
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
+    titled: List[Tuple[str, int]] = []
+    for index, paper_id in enumerate(paper_ids):
+        title = papers[paper_id].get("title", "")
+        if not isinstance(title, str) or not title:
+            continue
+        shingles = _title_shingles(title)
+        if not shingles:
+            continue
+        titled.append((normalize_text(title), index))
+        for key in minhash.band_keys(shingles):
+            buckets[key].append(index)
+        if (index + 1) % 5000 == 0:
+            print(f"  Indexed {index + 1}/{len(paper_ids)} titles...")
+    for members in buckets.values():
+        if len(members) > 1:
+            title_pairs.update(_pairs_within(members))
+    titled.sort()
+    for position in range(len(titled)):
+        for other in range(position + 1, min(position + SORTED_NEIGHBOURHOOD_WINDOW, len(titled))):
+            a, b = titled[position][1], titled[other][1]
+            title_pairs.add((a, b) if a < b else (b, a))
+    title_pairs -= id_pairs
+
+    print(f"  Candidate pairs: {len(id_pairs):,} by identifier, {len(title_pairs):,} by title "
+          f"(of {len(paper_ids) * (len(paper_ids) - 1) // 2:,} possible)")
+
+    duplicates = defaultdict(list)
+    compared = 0
+    # Sorted (i, j) order appends in the same sequence as the pairwise scan
+    for i, j in sorted(id_pairs | title_pairs):
+        paper1, paper2 = papers[paper_ids[i]], papers[paper_ids[j]]
+        if (i, j) in title_pairs:
+            # No identifier match, so only title_author_match is possible: check the cheap half first
+            authors1 = paper1.get("authors", [])
+            authors2 = paper2.get("authors", [])
+            if not (authors1 and authors2) or author_overlap(authors1, authors2) < AUTHOR_OVERLAP_THRESHOLD:
+                continue
+        compared += 1
+        is_dup, reason, confidence = are_duplicates(paper1, paper2)
+        if is_dup and confidence >= 0.8:
+            duplicates[paper_ids[i]].append((paper_ids[j], reason, confidence))
+            duplicates[paper_ids[j]].append((paper_ids[i], reason, confidence))
+
+    print(f"  Compared {compared:,} candidate pairs")
+    print(f"  ✅ Found {len(duplicates)} papers with potential duplicates")
+    return duplicates
+
 def merge_papers(primary: Dict, secondary: Dict) -> Dict:
     """Merge two paper records, keeping the best metadata from each."""
     merged = primary.copy()
@@ -419,6 +562,8 @@ def main():
     parser.add_argument("--sources", nargs="+", help="Source directories to scan (default: all in papers/)")
     parser.add_argument("--output", type=str, default=str(OUTPUT_DIR), help="Output directory")
     parser.add_argument("--test", action="store_true", help="Test mode: process only 100 papers")
+    parser.add_argument("--pairwise", action="store_true",
+                        help="Compare every pair of papers (exhaustive O(n^2) reference; slow beyond a few thousand)")
     args = parser.parse_args()
     
     print("=" * 60)
@@ -445,7 +590,7 @@ def main():
         all_papers = test_papers
     
     # Find duplicates
-    duplicates = find_duplicates(all_papers)
+    duplicates = find_duplicates_pairwise(all_papers) if args.pairwise else find_duplicates(all_papers)
     
     # Deduplicate
     deduplicated = deduplicate_papers(all_papers, duplicates)
@@ -0,0 +1,89 @@
+"""Tests for scripts/acquire_papers/deduplicate_papers.py: indexed vs pairwise duplicate detection."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts" / "acquire_papers"))
+
+import deduplicate_papers as dedup  # noqa: E402
+
+BASE_TITLE = "Hydrothermal vent chemistry and the origin of cellular life"
+# title_similarity to BASE_TITLE: 0.8504 and 0.8475 around TITLE_SIMILARITY_THRESHOLD (0.85)
+JUST_ABOVE = "Hydrothermal vent chemistry and the emergence of cellular metabolism"
+JUST_BELOW = "Hydrothermal vent geochemistry and the origin of protocells"
+AUTHORS = ["Lane, Nick", "William Martin"]
+
+TOPICS = ["quantum", "protein", "galaxy", "neural", "climate", "graphene", "enzyme", "plasma"]
+ASPECTS = ["dynamics", "structure", "evolution", "transport"]
+
+
+def _papers():
+    papers = {
+        "base": {"title": BASE_TITLE, "authors": AUTHORS, "doi": "10.1/vents"},
+        "respaced": {"title": BASE_TITLE.replace("cellular", "cellular  ") + "!", "authors": ["N. Lane", "W. Martin"]},
+        "above": {"title": JUST_ABOVE, "authors": AUTHORS},
+        "below": {"title": JUST_BELOW, "authors": AUTHORS},
+        "other_authors": {"title": BASE_TITLE, "authors": ["Ada Lovelace", "Alan Turing"]},
+        "doi_copy": {"title": "Completely different title", "doi": "https://doi.org/10.1/VENTS"},
+        "arxiv_a": {"title": "Preprint version", "arxiv_id": "2401.00001"},
+        "arxiv_b": {"title": "Journal version", "arxiv_id": "2401.00001", "pmid": "555"},
+        "pmid_copy": {"title": "PubMed record", "pmid": 555},
+    }
+    # Similar-looking titles so LSH buckets and the sorted window hold non-duplicates;
+    # papers on one topic share an author, which alone must not make them duplicates
+    for i, topic in enumerate(TOPICS):
+        for j, aspect in enumerate(ASPECTS):
+            papers[f"filler-{i}-{j}"] = {
+                "title": f"On the {aspect} of {topic} systems under extreme conditions",
+                "authors": [f"Author {i}", f"Coauthor {j}"],
+            }
+    return papers
+
+
+def _pairs(duplicates):
+    return {
+        frozenset((paper_id, other))
+        for paper_id, matches in duplicates.items()
+        for other, _reason, _confidence in matches
+    }
+
+
+def _clusters(duplicates):
+    parent = {}
+
+    def find(x):
+        while parent.setdefault(x, x) != x:
+            x = parent[x]
+        return x
+
+    for pair in _pairs(duplicates):
+        a, b = sorted(pair)
+        parent[find(a)] = find(b)
+    clusters = {}
+    for x in parent:
+        clusters.setdefault(find(x), set()).add(x)
+    return {frozenset(members) for members in clusters.values()}
+
+
+def test_indexed_matches_pairwise_clusters():
+    papers = _papers()
+    indexed = dedup.find_duplicates(papers)
+    pairwise = dedup.find_duplicates_pairwise(papers)
+
+    assert _clusters(indexed) == _clusters(pairwise)
+    # Same reasons, confidences and ordering, not just the same clusters
+    assert dict(indexed) == dict(pairwise)
+    assert _clusters(indexed) == {
+        frozenset({"base", "respaced", "above", "doi_copy"}),
+        frozenset({"arxiv_a", "arxiv_b", "pmid_copy"}),
+    }
+
+
+def test_near_threshold_titles():
+    assert dedup.title_similarity(BASE_TITLE, JUST_ABOVE) >= dedup.TITLE_SIMILARITY_THRESHOLD
+    assert dedup.title_similarity(BASE_TITLE, JUST_BELOW) < dedup.TITLE_SIMILARITY_THRESHOLD
+    papers = {key: _papers()[key] for key in ("base", "above", "below")}
+
+    for find in (dedup.find_duplicates, dedup.find_duplicates_pairwise):
+        pairs = _pairs(find(papers))
+        assert frozenset({"base", "above"}) in pairs
+        assert frozenset({"base", "below"}) not in pairs